@@ -0,0 +1,45 @@
+"""add BOM closure index table
+
+Revision ID: bom_closure_001
+Revises: notification_outbox_001
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "bom_closure_001"
+down_revision: Union[str, None] = "notification_outbox_001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    existing = set(inspector.get_table_names())
+
+    if "meta_bom_closure" not in existing:
+        op.create_table(
+            "meta_bom_closure",
+            sa.Column("ancestor_id", sa.String(), nullable=False),
+            sa.Column("descendant_id", sa.String(), nullable=False),
+            sa.Column("depth", sa.Integer(), nullable=False),
+            sa.Column("path_count", sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint("ancestor_id", "descendant_id", "depth"),
+        )
+        op.create_index(
+            "ix_meta_bom_closure_descendant_depth",
+            "meta_bom_closure",
+            ["descendant_id", "depth"],
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_meta_bom_closure_descendant_depth", table_name="meta_bom_closure")
+    op.drop_table("meta_bom_closure")
@@ -0,0 +1,69 @@
+"""add CAD artifact cache index table
+
+Revision ID: cad_artifact_cache_001
+Revises: item_search_001
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "cad_artifact_cache_001"
+down_revision: Union[str, None] = "item_search_001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    existing = set(inspector.get_table_names())
+
+    if "meta_cad_artifact_cache" not in existing:
+        op.create_table(
+            "meta_cad_artifact_cache",
+            sa.Column("cache_key", sa.String(length=64), nullable=False),
+            sa.Column("checksum", sa.String(), nullable=False),
+            sa.Column("kind", sa.String(), nullable=False),
+            sa.Column("backend", sa.String(), nullable=False),
+            sa.Column("params_version", sa.Integer(), nullable=False),
+            sa.Column("source_file_id", sa.String(), nullable=True),
+            sa.Column(
+                "artifacts",
+                sa.JSON().with_variant(
+                    postgresql.JSONB(astext_type=sa.Text()), "postgresql"
+                ),
+                nullable=False,
+            ),
+            sa.Column("size_bytes", sa.BigInteger(), nullable=False),
+            sa.Column("hit_count", sa.Integer(), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=False),
+            sa.Column("last_used_at", sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint("cache_key"),
+        )
+        op.create_index(
+            op.f("ix_meta_cad_artifact_cache_checksum"),
+            "meta_cad_artifact_cache",
+            ["checksum"],
+        )
+        op.create_index(
+            "ix_meta_cad_artifact_cache_last_used_at",
+            "meta_cad_artifact_cache",
+            ["last_used_at"],
+        )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_meta_cad_artifact_cache_last_used_at", table_name="meta_cad_artifact_cache"
+    )
+    op.drop_index(
+        op.f("ix_meta_cad_artifact_cache_checksum"), table_name="meta_cad_artifact_cache"
+    )
+    op.drop_table("meta_cad_artifact_cache")
@@ -0,0 +1,81 @@
+"""add cutted-parts rollup table
+
+Revision ID: cut_rollups_001
+Revises: cad_artifact_cache_001
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "cut_rollups_001"
+down_revision: Union[str, None] = "cad_artifact_cache_001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    existing = set(inspector.get_table_names())
+
+    if "meta_cut_rollups" not in existing:
+        op.create_table(
+            "meta_cut_rollups",
+            sa.Column("id", sa.String(), nullable=False),
+            sa.Column("material_id", sa.String(), nullable=True),
+            sa.Column("period", sa.String(length=7), nullable=False),
+            sa.Column("plan_count", sa.Integer(), nullable=False),
+            sa.Column(
+                "plans_by_state",
+                sa.JSON().with_variant(
+                    postgresql.JSONB(astext_type=sa.Text()), "postgresql"
+                ),
+                nullable=True,
+            ),
+            sa.Column("material_quantity", sa.Float(), nullable=False),
+            sa.Column("material_quantity_sq", sa.Float(), nullable=False),
+            sa.Column("total_parts", sa.Integer(), nullable=False),
+            sa.Column("ok_parts", sa.Integer(), nullable=False),
+            sa.Column("scrap_parts", sa.Integer(), nullable=False),
+            sa.Column("rework_parts", sa.Integer(), nullable=False),
+            sa.Column("util_plans", sa.Integer(), nullable=False),
+            sa.Column("util_sum", sa.Float(), nullable=False),
+            sa.Column("util_high", sa.Integer(), nullable=False),
+            sa.Column("util_medium", sa.Integer(), nullable=False),
+            sa.Column("util_low", sa.Integer(), nullable=False),
+            sa.Column("waste_plans", sa.Integer(), nullable=False),
+            sa.Column("waste_sum", sa.Float(), nullable=False),
+            sa.Column("waste_sq_sum", sa.Float(), nullable=False),
+            sa.Column("waste_min", sa.Float(), nullable=True),
+            sa.Column("waste_max", sa.Float(), nullable=True),
+            sa.Column("cut_count", sa.Integer(), nullable=False),
+            sa.Column("cut_ok", sa.Integer(), nullable=False),
+            sa.Column("cut_scrap", sa.Integer(), nullable=False),
+            sa.Column("cut_rework", sa.Integer(), nullable=False),
+            sa.Column("cut_scrap_weight", sa.Float(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index(
+            op.f("ix_meta_cut_rollups_material_id"),
+            "meta_cut_rollups",
+            ["material_id"],
+        )
+        op.create_index(
+            op.f("ix_meta_cut_rollups_period"), "meta_cut_rollups", ["period"]
+        )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_meta_cut_rollups_period"), table_name="meta_cut_rollups")
+    op.drop_index(
+        op.f("ix_meta_cut_rollups_material_id"), table_name="meta_cut_rollups"
+    )
+    op.drop_table("meta_cut_rollups")
@@ -0,0 +1,78 @@
+"""add DB full-text search index table
+
+Revision ID: item_search_001
+Revises: bom_closure_001
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "item_search_001"
+down_revision: Union[str, None] = "bom_closure_001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Lock-step with yuantus.meta_engine.models.item_search.
+_TABLE = "meta_item_search"
+_TSV_INDEX = "ix_meta_item_search_tsv"
+_FTS = "meta_item_search_fts"
+_SQLITE_FTS_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {_FTS} USING fts5("
+    "search_text, content='meta_item_search', content_rowid='id', "
+    "tokenize='unicode61')",
+    f"CREATE TRIGGER IF NOT EXISTS {_FTS}_ai AFTER INSERT ON meta_item_search "
+    f"BEGIN INSERT INTO {_FTS}(rowid, search_text) "
+    "VALUES (new.id, new.search_text); END",
+    f"CREATE TRIGGER IF NOT EXISTS {_FTS}_ad AFTER DELETE ON meta_item_search "
+    f"BEGIN INSERT INTO {_FTS}({_FTS}, rowid, search_text) "
+    "VALUES ('delete', old.id, old.search_text); END",
+    f"CREATE TRIGGER IF NOT EXISTS {_FTS}_au AFTER UPDATE ON meta_item_search "
+    f"BEGIN INSERT INTO {_FTS}({_FTS}, rowid, search_text) "
+    "VALUES ('delete', old.id, old.search_text); "
+    f"INSERT INTO {_FTS}(rowid, search_text) "
+    "VALUES (new.id, new.search_text); END",
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if _TABLE in set(inspector.get_table_names()):
+        return
+
+    op.create_table(
+        "meta_item_search",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("item_id", sa.String(), nullable=False),
+        sa.Column("search_text", sa.Text(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("item_id"),
+    )
+    if bind.dialect.name == "postgresql":
+        op.create_index(
+            _TSV_INDEX,
+            _TABLE,
+            [sa.text("to_tsvector('simple', search_text)")],
+            postgresql_using="gin",
+        )
+    elif bind.dialect.name == "sqlite":
+        for statement in _SQLITE_FTS_DDL:
+            op.execute(sa.text(statement))
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.drop_index(_TSV_INDEX, table_name=_TABLE)
+    elif bind.dialect.name == "sqlite":
+        for suffix in ("_au", "_ad", "_ai"):
+            op.execute(sa.text(f"DROP TRIGGER IF EXISTS {_FTS}{suffix}"))
+        op.execute(sa.text(f"DROP TABLE IF EXISTS {_FTS}"))
+    op.drop_table(_TABLE)
@@ -0,0 +1,53 @@
+"""add parallel-ops hourly job stats table
+
+Revision ID: parallel_ops_job_stats_001
+Revises: cut_rollups_001
+Create Date: 2026-10-18 00:00:00.000000
+"""
+
+from __future__ import annotations
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "parallel_ops_job_stats_001"
+down_revision: Union[str, None] = "cut_rollups_001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    existing = set(inspector.get_table_names())
+
+    if "meta_parallel_ops_job_stats" not in existing:
+        op.create_table(
+            "meta_parallel_ops_job_stats",
+            sa.Column("id", sa.String(), nullable=False),
+            sa.Column("hour_start", sa.DateTime(), nullable=False),
+            sa.Column("site_id", sa.String(), nullable=True),
+            sa.Column("direction", sa.String(length=10), nullable=False),
+            sa.Column("status", sa.String(length=20), nullable=False),
+            sa.Column("dead_letter", sa.Boolean(), nullable=False),
+            sa.Column("job_count", sa.Integer(), nullable=False),
+            sa.Column("attempt_sum", sa.Integer(), nullable=False),
+            sa.Column("refreshed_at", sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index(
+            "ix_meta_parallel_ops_job_stats_hour_start",
+            "meta_parallel_ops_job_stats",
+            ["hour_start"],
+        )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_meta_parallel_ops_job_stats_hour_start",
+        table_name="meta_parallel_ops_job_stats",
+    )
+    op.drop_table("meta_parallel_ops_job_stats")
@@ -86,6 +86,13 @@ def upgrade() -> None:
     sa.ForeignKeyConstraint(['parent_id'], ['meta_approval_categories.id'], ),
     sa.PrimaryKeyConstraint('id')
     )
+    op.create_table('meta_bom_closure',
+    sa.Column('ancestor_id', sa.String(), nullable=False),
+    sa.Column('descendant_id', sa.String(), nullable=False),
+    sa.Column('depth', sa.Integer(), nullable=False),
+    sa.Column('path_count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id', 'depth')
+    )
     op.create_table('meta_bom_writeback_audit',
     sa.Column('id', sa.String(length=36), nullable=False),
     sa.Column('idempotency_key', sa.String(length=64), nullable=False),
@@ -123,6 +130,20 @@ def upgrade() -> None:
     sa.Column('updated_at', sa.DateTime(), nullable=False),
     sa.PrimaryKeyConstraint('id')
     )
+    op.create_table('meta_cad_artifact_cache',
+    sa.Column('cache_key', sa.String(length=64), nullable=False),
+    sa.Column('checksum', sa.String(), nullable=False),
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('backend', sa.String(), nullable=False),
+    sa.Column('params_version', sa.Integer(), nullable=False),
+    sa.Column('source_file_id', sa.String(), nullable=True),
+    sa.Column('artifacts', sa.JSON().with_variant(postgresql.JSONB(astext_type=sa.Text()), 'postgresql'), nullable=False),
+    sa.Column('size_bytes', sa.BigInteger(), nullable=False),
+    sa.Column('hit_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('last_used_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('cache_key')
+    )
     op.create_table('meta_consumption_plans',
     sa.Column('id', sa.String(), nullable=False),
     sa.Column('name', sa.String(length=200), nullable=False),
@@ -168,6 +189,36 @@ def upgrade() -> None:
     sa.Column('created_by_id', sa.Integer(), nullable=True),
     sa.PrimaryKeyConstraint('id')
     )
+    op.create_table('meta_cut_rollups',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('material_id', sa.String(), nullable=True),
+    sa.Column('period', sa.String(length=7), nullable=False),
+    sa.Column('plan_count', sa.Integer(), nullable=False),
+    sa.Column('plans_by_state', sa.JSON().with_variant(postgresql.JSONB(astext_type=sa.Text()), 'postgresql'), nullable=True),
+    sa.Column('material_quantity', sa.Float(), nullable=False),
+    sa.Column('material_quantity_sq', sa.Float(), nullable=False),
+    sa.Column('total_parts', sa.Integer(), nullable=False),
+    sa.Column('ok_parts', sa.Integer(), nullable=False),
+    sa.Column('scrap_parts', sa.Integer(), nullable=False),
+    sa.Column('rework_parts', sa.Integer(), nullable=False),
+    sa.Column('util_plans', sa.Integer(), nullable=False),
+    sa.Column('util_sum', sa.Float(), nullable=False),
+    sa.Column('util_high', sa.Integer(), nullable=False),
+    sa.Column('util_medium', sa.Integer(), nullable=False),
+    sa.Column('util_low', sa.Integer(), nullable=False),
+    sa.Column('waste_plans', sa.Integer(), nullable=False),
+    sa.Column('waste_sum', sa.Float(), nullable=False),
+    sa.Column('waste_sq_sum', sa.Float(), nullable=False),
+    sa.Column('waste_min', sa.Float(), nullable=True),
+    sa.Column('waste_max', sa.Float(), nullable=True),
+    sa.Column('cut_count', sa.Integer(), nullable=False),
+    sa.Column('cut_ok', sa.Integer(), nullable=False),
+    sa.Column('cut_scrap', sa.Integer(), nullable=False),
+    sa.Column('cut_rework', sa.Integer(), nullable=False),
+    sa.Column('cut_scrap_weight', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
     op.create_table('meta_dashboards',
     sa.Column('id', sa.String(), nullable=False),
     sa.Column('name', sa.String(), nullable=False),
@@ -311,6 +362,14 @@ def upgrade() -> None:
     sa.Column('name', sa.String(), nullable=True),
     sa.PrimaryKeyConstraint('id')
     )
+    op.create_table('meta_item_search',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('item_id', sa.String(), nullable=False),
+    sa.Column('search_text', sa.Text(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('item_id')
+    )
     op.create_table('meta_lifecycle_maps',
     sa.Column('id', sa.String(), nullable=False),
     sa.Column('name', sa.String(), nullable=True),
@@ -410,6 +469,18 @@ def upgrade() -> None:
     sa.PrimaryKeyConstraint('id'),
     sa.UniqueConstraint('item_type_id', 'tenant_id', 'org_id', 'prefix', name='uq_numbering_sequence_scope')
     )
+    op.create_table('meta_parallel_ops_job_stats',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('hour_start', sa.DateTime(), nullable=False),
+    sa.Column('site_id', sa.String(), nullable=True),
+    sa.Column('direction', sa.String(length=10), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('dead_letter', sa.Boolean(), nullable=False),
+    sa.Column('job_count', sa.Integer(), nullable=False),
+    sa.Column('attempt_sum', sa.Integer(), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
     op.create_table('meta_permissions',
     sa.Column('id', sa.String(), nullable=False),
     sa.Column('name', sa.String(), nullable=True),
@@ -1975,6 +2046,7 @@ def upgrade() -> None:
     op.create_index(op.f('ix_meta_approval_automation_templates_template_key'), 'meta_approval_automation_templates', ['template_key'], unique=False)
     op.create_index(op.f('ix_meta_approval_automation_templates_tenant_id'), 'meta_approval_automation_templates', ['tenant_id'], unique=False)
     op.create_index(op.f('ix_meta_approval_categories_parent_id'), 'meta_approval_categories', ['parent_id'], unique=False)
+    op.create_index('ix_meta_bom_closure_descendant_depth', 'meta_bom_closure', ['descendant_id', 'depth'], unique=False)
     op.create_index(op.f('ix_meta_bom_writeback_audit_bom_line_id'), 'meta_bom_writeback_audit', ['bom_line_id'], unique=False)
     op.create_index(op.f('ix_meta_bom_writeback_audit_org_id'), 'meta_bom_writeback_audit', ['org_id'], unique=False)
     op.create_index(op.f('ix_meta_bom_writeback_audit_part_id'), 'meta_bom_writeback_audit', ['part_id'], unique=False)
@@ -1993,6 +2065,8 @@ def upgrade() -> None:
     op.create_index(op.f('ix_meta_breakage_incidents_severity'), 'meta_breakage_incidents', ['severity'], unique=False)
     op.create_index(op.f('ix_meta_breakage_incidents_status'), 'meta_breakage_incidents', ['status'], unique=False)
     op.create_index(op.f('ix_meta_breakage_incidents_version_id'), 'meta_breakage_incidents', ['version_id'], unique=False)
+    op.create_index(op.f('ix_meta_cad_artifact_cache_checksum'), 'meta_cad_artifact_cache', ['checksum'], unique=False)
+    op.create_index('ix_meta_cad_artifact_cache_last_used_at', 'meta_cad_artifact_cache', ['last_used_at'], unique=False)
     op.create_index(op.f('ix_meta_consumption_plans_item_id'), 'meta_consumption_plans', ['item_id'], unique=False)
     op.create_index(op.f('ix_meta_consumption_plans_name'), 'meta_consumption_plans', ['name'], unique=False)
     op.create_index(op.f('ix_meta_consumption_plans_state'), 'meta_consumption_plans', ['state'], unique=False)
@@ -2002,6 +2076,8 @@ def upgrade() -> None:
     op.create_index(op.f('ix_meta_consumption_records_source_id'), 'meta_consumption_records', ['source_id'], unique=False)
     op.create_index(op.f('ix_meta_conversion_jobs_dedupe_key'), 'meta_conversion_jobs', ['dedupe_key'], unique=False)
     op.create_index(op.f('ix_meta_conversion_jobs_status'), 'meta_conversion_jobs', ['status'], unique=False)
+    op.create_index(op.f('ix_meta_cut_rollups_material_id'), 'meta_cut_rollups', ['material_id'], unique=False)
+    op.create_index(op.f('ix_meta_cut_rollups_period'), 'meta_cut_rollups', ['period'], unique=False)
     op.create_index(op.f('ix_meta_date_obsolete_impacts_child_item_id'), 'meta_date_obsolete_impacts', ['child_item_id'], unique=False)
     op.create_index(op.f('ix_meta_date_obsolete_impacts_effectivity_id'), 'meta_date_obsolete_impacts', ['effectivity_id'], unique=False)
     op.create_index(op.f('ix_meta_date_obsolete_impacts_parent_item_id'), 'meta_date_obsolete_impacts', ['parent_item_id'], unique=False)
@@ -2013,6 +2089,7 @@ def upgrade() -> None:
     op.create_index(op.f('ix_meta_eco_activity_gates_eco_id'), 'meta_eco_activity_gates', ['eco_id'], unique=False)
     op.create_index(op.f('ix_meta_eco_activity_gates_status'), 'meta_eco_activity_gates', ['status'], unique=False)
     op.create_index(op.f('ix_meta_erp_publication_outbox_item_id'), 'meta_erp_publication_outbox', ['item_id'], unique=False)
+    op.create_index('ix_meta_item_search_tsv', 'meta_item_search', [sa.literal_column("to_tsvector('simple', search_text)")], unique=False, postgresql_using='gin')
     op.create_index(op.f('ix_meta_lifecycle_transition_history_created_at'), 'meta_lifecycle_transition_history', ['created_at'], unique=False)
     op.create_index('ix_meta_lifecycle_transition_history_item_created', 'meta_lifecycle_transition_history', ['item_id', 'created_at'], unique=False)
     op.create_index(op.f('ix_meta_lifecycle_transition_history_item_id'), 'meta_lifecycle_transition_history', ['item_id'], unique=False)
@@ -2028,6 +2105,7 @@ def upgrade() -> None:
     op.create_index(op.f('ix_meta_numbering_sequences_item_type_id'), 'meta_numbering_sequences', ['item_type_id'], unique=False)
     op.create_index(op.f('ix_meta_numbering_sequences_org_id'), 'meta_numbering_sequences', ['org_id'], unique=False)
     op.create_index(op.f('ix_meta_numbering_sequences_tenant_id'), 'meta_numbering_sequences', ['tenant_id'], unique=False)
+    op.create_index('ix_meta_parallel_ops_job_stats_hour_start', 'meta_parallel_ops_job_stats', ['hour_start'], unique=False)
     op.create_index(op.f('ix_meta_plugin_configs_org_id'), 'meta_plugin_configs', ['org_id'], unique=False)
     op.create_index(op.f('ix_meta_plugin_configs_plugin_id'), 'meta_plugin_configs', ['plugin_id'], unique=False)
     op.create_index(op.f('ix_meta_plugin_configs_tenant_id'), 'meta_plugin_configs', ['tenant_id'], unique=False)
@@ -2293,6 +2371,7 @@ def downgrade() -> None:
     op.drop_index(op.f('ix_meta_plugin_configs_tenant_id'), table_name='meta_plugin_configs')
     op.drop_index(op.f('ix_meta_plugin_configs_plugin_id'), table_name='meta_plugin_configs')
     op.drop_index(op.f('ix_meta_plugin_configs_org_id'), table_name='meta_plugin_configs')
+    op.drop_index('ix_meta_parallel_ops_job_stats_hour_start', table_name='meta_parallel_ops_job_stats')
     op.drop_index(op.f('ix_meta_numbering_sequences_tenant_id'), table_name='meta_numbering_sequences')
     op.drop_index(op.f('ix_meta_numbering_sequences_org_id'), table_name='meta_numbering_sequences')
     op.drop_index(op.f('ix_meta_numbering_sequences_item_type_id'), table_name='meta_numbering_sequences')
@@ -2308,6 +2387,7 @@ def downgrade() -> None:
     op.drop_index(op.f('ix_meta_lifecycle_transition_history_item_id'), table_name='meta_lifecycle_transition_history')
     op.drop_index('ix_meta_lifecycle_transition_history_item_created', table_name='meta_lifecycle_transition_history')
     op.drop_index(op.f('ix_meta_lifecycle_transition_history_created_at'), table_name='meta_lifecycle_transition_history')
+    op.drop_index('ix_meta_item_search_tsv', table_name='meta_item_search', postgresql_using='gin')
     op.drop_index(op.f('ix_meta_erp_publication_outbox_item_id'), table_name='meta_erp_publication_outbox')
     op.drop_index(op.f('ix_meta_eco_activity_gates_status'), table_name='meta_eco_activity_gates')
     op.drop_index(op.f('ix_meta_eco_activity_gates_eco_id'), table_name='meta_eco_activity_gates')
@@ -2319,6 +2399,8 @@ def downgrade() -> None:
     op.drop_index(op.f('ix_meta_date_obsolete_impacts_parent_item_id'), table_name='meta_date_obsolete_impacts')
     op.drop_index(op.f('ix_meta_date_obsolete_impacts_effectivity_id'), table_name='meta_date_obsolete_impacts')
     op.drop_index(op.f('ix_meta_date_obsolete_impacts_child_item_id'), table_name='meta_date_obsolete_impacts')
+    op.drop_index(op.f('ix_meta_cut_rollups_period'), table_name='meta_cut_rollups')
+    op.drop_index(op.f('ix_meta_cut_rollups_material_id'), table_name='meta_cut_rollups')
     op.drop_index(op.f('ix_meta_conversion_jobs_status'), table_name='meta_conversion_jobs')
     op.drop_index(op.f('ix_meta_conversion_jobs_dedupe_key'), table_name='meta_conversion_jobs')
     op.drop_index(op.f('ix_meta_consumption_records_source_id'), table_name='meta_consumption_records')
@@ -2328,6 +2410,8 @@ def downgrade() -> None:
     op.drop_index(op.f('ix_meta_consumption_plans_state'), table_name='meta_consumption_plans')
     op.drop_index(op.f('ix_meta_consumption_plans_name'), table_name='meta_consumption_plans')
     op.drop_index(op.f('ix_meta_consumption_plans_item_id'), table_name='meta_consumption_plans')
+    op.drop_index('ix_meta_cad_artifact_cache_last_used_at', table_name='meta_cad_artifact_cache')
+    op.drop_index(op.f('ix_meta_cad_artifact_cache_checksum'), table_name='meta_cad_artifact_cache')
     op.drop_index(op.f('ix_meta_breakage_incidents_version_id'), table_name='meta_breakage_incidents')
     op.drop_index(op.f('ix_meta_breakage_incidents_status'), table_name='meta_breakage_incidents')
     op.drop_index(op.f('ix_meta_breakage_incidents_severity'), table_name='meta_breakage_incidents')
@@ -2346,6 +2430,7 @@ def downgrade() -> None:
     op.drop_index(op.f('ix_meta_bom_writeback_audit_part_id'), table_name='meta_bom_writeback_audit')
     op.drop_index(op.f('ix_meta_bom_writeback_audit_org_id'), table_name='meta_bom_writeback_audit')
     op.drop_index(op.f('ix_meta_bom_writeback_audit_bom_line_id'), table_name='meta_bom_writeback_audit')
+    op.drop_index('ix_meta_bom_closure_descendant_depth', table_name='meta_bom_closure')
     op.drop_index(op.f('ix_meta_approval_categories_parent_id'), table_name='meta_approval_categories')
     op.drop_index(op.f('ix_meta_approval_automation_templates_tenant_id'), table_name='meta_approval_automation_templates')
     op.drop_index(op.f('ix_meta_approval_automation_templates_template_key'), table_name='meta_approval_automation_templates')
@@ -2440,6 +2525,7 @@ def downgrade() -> None:
     op.drop_table('meta_remote_sites')
     op.drop_table('meta_plugin_configs')
     op.drop_table('meta_permissions')
+    op.drop_table('meta_parallel_ops_job_stats')
     op.drop_table('meta_numbering_sequences')
     op.drop_table('meta_notification_outbox')
     op.drop_table('meta_methods')
@@ -2447,6 +2533,7 @@ def downgrade() -> None:
     op.drop_table('meta_maintenance_categories')
     op.drop_table('meta_lifecycle_transition_history')
     op.drop_table('meta_lifecycle_maps')
+    op.drop_table('meta_item_search')
     op.drop_table('meta_grid_views')
     op.drop_table('meta_forms')
     op.drop_table('meta_extension_points')
@@ -2457,11 +2544,14 @@ def downgrade() -> None:
     op.drop_table('meta_ecm_publication_outbox')
     op.drop_table('meta_date_obsolete_impacts')
     op.drop_table('meta_dashboards')
+    op.drop_table('meta_cut_rollups')
     op.drop_table('meta_conversion_jobs')
     op.drop_table('meta_consumption_records')
     op.drop_table('meta_consumption_plans')
+    op.drop_table('meta_cad_artifact_cache')
     op.drop_table('meta_breakage_incidents')
     op.drop_table('meta_bom_writeback_audit')
+    op.drop_table('meta_bom_closure')
     op.drop_table('meta_approval_categories')
     op.drop_table('meta_approval_automation_templates')
     op.drop_table('meta_app_registry')
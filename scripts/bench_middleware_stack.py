@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+API middleware stack micro-benchmark
+====================================
+Drives a FastAPI app in-process over raw ASGI (no sockets, no HTTP client)
+through the production middleware stack, once with the middleware modules at
+a baseline git ref and once with the working tree, and reports:
+
+  - per-request overhead on a small JSON endpoint (mean / p95, in µs), with the
+    bare app as the zero line;
+  - streamed-download throughput (MiB/s) and the number of body messages the
+    server emits for a chunked StreamingResponse.
+
+The baseline defaults to the last revision whose middleware was built on
+Starlette ``BaseHTTPMiddleware``. Inbound rate limiting is enabled with an
+effectively unlimited bucket so its path is exercised; auth runs in
+optional mode and audit stays off (both would otherwise measure the
+identity/audit databases, not the middleware).
+
+Usage:
+  python scripts/bench_middleware_stack.py
+  python scripts/bench_middleware_stack.py --requests 20000 --baseline-ref v0.9.0
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import time
+import types
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT / "src"))
+
+_MIDDLEWARE_DIR = "src/yuantus/api/middleware"
+# (module, class) in add_middleware order, as in yuantus.api.app.create_app.
+_STACK = (
+    ("audit", "AuditLogMiddleware"),
+    ("context", "TenantOrgContextMiddleware"),
+    ("rate_limit", "InboundRateLimitMiddleware"),
+    ("auth_enforce", "AuthEnforcementMiddleware"),
+    ("request_logging", "RequestLoggingMiddleware"),
+)
+
+
+def _git(*args: str) -> str:
+    return subprocess.check_output(  # noqa: S603,S607
+        ["git", "-C", str(REPO_ROOT), *args],
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+
+
+def _default_baseline_ref() -> str:
+    probe = f"{_MIDDLEWARE_DIR}/request_logging.py"
+    if "BaseHTTPMiddleware" in _git("show", f"HEAD:{probe}"):
+        return "HEAD"
+    # The most recent commit changing the number of occurrences removed it.
+    removed_in = _git(
+        "log", "-n1", "--format=%H", "-S", "BaseHTTPMiddleware", "--", probe
+    ).strip()
+    return f"{removed_in}^"
+
+
+def _load_stack(ref: Optional[str]) -> List[type]:
+    classes = []
+    for module_name, class_name in _STACK:
+        if ref is None:
+            module = __import__(f"yuantus.api.middleware.{module_name}", fromlist=[class_name])
+        else:
+            source = _git("show", f"{ref}:{_MIDDLEWARE_DIR}/{module_name}.py")
+            module = types.ModuleType(f"_bench_{module_name}")
+            sys.modules[module.__name__] = module  # dataclasses resolve through it
+            exec(compile(source, f"{ref}:{module_name}.py", "exec"), module.__dict__)  # noqa: S102
+        classes.append(getattr(module, class_name))
+    return classes
+
+
+def _build_app(stack: List[type], *, chunk_size: int, chunks: int):
+    from fastapi import FastAPI
+    from fastapi.responses import StreamingResponse
+
+    app = FastAPI()
+    payload = b"x" * chunk_size
+
+    @app.get("/api/v1/ping")
+    async def ping() -> Dict[str, str]:
+        return {"ok": "pong"}
+
+    @app.get("/api/v1/download")
+    async def download() -> StreamingResponse:
+        async def body():
+            for _ in range(chunks):
+                yield payload
+
+        return StreamingResponse(body(), media_type="application/octet-stream")
+
+    for cls in stack:
+        app.add_middleware(cls)
+    return app
+
+
+async def _call(app, path: str) -> Tuple[int, int]:
+    """Run one GET through ``app``; return (body bytes, body messages)."""
+    status = None
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench"), (b"x-tenant-id", b"tenant-1")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+    sent = False
+    size = 0
+    messages = 0
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.sleep(3600)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status, size, messages
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            size += len(message.get("body", b""))
+            messages += 1
+
+    await app(scope, receive, send)
+    if status != 200:
+        raise RuntimeError(f"GET {path} returned {status}")
+    return size, messages
+
+
+async def _bench_requests(app, count: int) -> Dict[str, float]:
+    for _ in range(min(200, count)):
+        await _call(app, "/api/v1/ping")
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        await _call(app, "/api/v1/ping")
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return {
+        "mean_us": statistics.fmean(samples),
+        "p95_us": samples[int(len(samples) * 0.95) - 1],
+    }
+
+
+async def _bench_download(app, count: int) -> Dict[str, float]:
+    await _call(app, "/api/v1/download")
+    total = 0
+    messages = 0
+    start = time.perf_counter()
+    for _ in range(count):
+        size, messages = await _call(app, "/api/v1/download")
+        total += size
+    elapsed = time.perf_counter() - start
+    return {"mib_s": total / (1024 * 1024) / elapsed, "body_messages": messages}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="API middleware stack micro-benchmark")
+    parser.add_argument("--requests", type=int, default=5000, help="JSON requests per variant")
+    parser.add_argument("--downloads", type=int, default=50, help="Streamed downloads per variant")
+    parser.add_argument("--chunk-kib", type=int, default=64, help="Streamed chunk size (KiB)")
+    parser.add_argument("--chunks", type=int, default=256, help="Chunks per streamed download")
+    parser.add_argument(
+        "--baseline-ref",
+        default="",
+        help="Git ref for the baseline middleware (default: last BaseHTTPMiddleware revision)",
+    )
+    args = parser.parse_args()
+
+    os.environ.setdefault("YUANTUS_INBOUND_RATE_LIMIT_ENABLED", "true")
+    os.environ.setdefault("YUANTUS_INBOUND_RATE_LIMIT_PER_MINUTE", "100000000")
+    os.environ.setdefault("YUANTUS_INBOUND_RATE_LIMIT_BURST", "100000000")
+    os.environ.setdefault("YUANTUS_AUTH_MODE", "optional")
+    os.environ.setdefault("YUANTUS_AUDIT_ENABLED", "false")
+    # Keep per-request log lines out of the measurement.
+    logging.getLogger("yuantus.request").disabled = True
+
+    baseline_ref = args.baseline_ref or _default_baseline_ref()
+    variants = [
+        ("bare app", []),
+        (f"baseline ({baseline_ref})", _load_stack(baseline_ref)),
+        ("working tree", _load_stack(None)),
+    ]
+
+    print("| variant | JSON mean (µs) | JSON p95 (µs) | download (MiB/s) | body messages |")
+    print("| --- | ---: | ---: | ---: | ---: |")
+    for name, stack in variants:
+        app = _build_app(stack, chunk_size=args.chunk_kib * 1024, chunks=args.chunks)
+        json_stats = asyncio.run(_bench_requests(app, args.requests))
+        download = asyncio.run(_bench_download(app, args.downloads))
+        print(
+            f"| {name} | {json_stats['mean_us']:.1f} | {json_stats['p95_us']:.1f} "
+            f"| {download['mib_s']:.1f} | {download['body_messages']} |"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
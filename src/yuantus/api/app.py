@@ -266,10 +266,22 @@ def _run_startup(app: FastAPI) -> None:
     )
 
     register_search_index_handlers()
+    from yuantus.integrations.http_pool import open_http_pools
+
+    open_http_pools()
     load_plugins(app)
 
 
 def _run_shutdown(app: FastAPI) -> None:
+    from yuantus.meta_engine.events.event_bus import event_bus
+
+    event_bus.stop_async_dispatch()
+    from yuantus.meta_engine.services.search_indexer import shutdown_bulk_indexing
+
+    shutdown_bulk_indexing()
+    from yuantus.security.audit_sink import shutdown_audit_sink
+
+    shutdown_audit_sink()
     manager = getattr(app.state, "plugin_manager", None)
     if manager and hasattr(manager, "shutdown"):
         manager.shutdown()
@@ -282,6 +294,9 @@ async def _lifespan(app: FastAPI):
         yield
     finally:
         _run_shutdown(app)
+        from yuantus.integrations.http_pool import aclose_http_pools
+
+        await aclose_http_pools()
 
 
 def create_app() -> FastAPI:
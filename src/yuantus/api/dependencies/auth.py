@@ -15,6 +15,7 @@ from yuantus.models.user import User as LocalUser
 from yuantus.security.auth.database import get_identity_db
 from yuantus.security.auth.jwt import JWTError, decode_hs256
 from yuantus.security.auth.models import AuthUser
+from yuantus.security.auth.principal_cache import Principal
 from yuantus.security.auth.service import AuthService
 from yuantus.security.rbac.models import RBACRole, RBACUser
 
@@ -70,6 +71,18 @@ def _get_bearer_token(request: Request) -> Optional[str]:
     return parts[1].strip() or None
 
 
+def _request_principal(request: Request, tenant_id: str, user_id: int) -> Optional[Principal]:
+    """The principal AuthEnforcementMiddleware resolved for this same token, if any."""
+    principal = getattr(request.state, "principal", None)
+    if (
+        isinstance(principal, Principal)
+        and principal.tenant_id == tenant_id
+        and principal.user_id == user_id
+    ):
+        return principal
+    return None
+
+
 def _auth_mode() -> str:
     mode = (get_settings().AUTH_MODE or "optional").strip().lower()
     if mode not in {"disabled", "optional", "required"}:
@@ -111,6 +124,17 @@ def get_current_identity(
     except Exception as e:
         raise HTTPException(status_code=401, detail="Invalid sub claim") from e
 
+    principal = _request_principal(request, str(tenant_id), user_id)
+    if principal is not None:
+        return Identity(
+            user_id=principal.user_id,
+            tenant_id=principal.tenant_id,
+            org_id=payload.get("org_id"),
+            username=principal.username,
+            email=principal.email,
+            is_superuser=principal.is_superuser,
+        )
+
     user: Optional[AuthUser] = (
         identity_db.query(AuthUser)
         .filter(AuthUser.id == user_id, AuthUser.tenant_id == str(tenant_id))
@@ -235,13 +259,18 @@ def get_current_user_optional(
     if not org_id:
         raise HTTPException(status_code=400, detail="Missing org id")
 
-    auth_service = AuthService(identity_db)
-    try:
-        roles = auth_service.get_roles_for_user_org(
-            tenant_id=identity.tenant_id, org_id=str(org_id), user_id=identity.user_id
-        )
-    except Exception:
-        raise HTTPException(status_code=403, detail="Not a member of this org")
+    principal = _request_principal(request, identity.tenant_id, identity.user_id)
+    if principal is not None and principal.roles is not None and principal.org_id == str(org_id):
+        # Membership already verified by AuthEnforcementMiddleware for this request.
+        roles = list(principal.roles)
+    else:
+        auth_service = AuthService(identity_db)
+        try:
+            roles = auth_service.get_roles_for_user_org(
+                tenant_id=identity.tenant_id, org_id=str(org_id), user_id=identity.user_id
+            )
+        except Exception:
+            raise HTTPException(status_code=403, detail="Not a member of this org")
 
     if identity.is_superuser:
         roles = list({*roles, "admin", "superuser"})
@@ -3,17 +3,20 @@ from __future__ import annotations
 import re
 from typing import Any, Optional
 
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
-from starlette.responses import JSONResponse, Response
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 from starlette.status import HTTP_401_UNAUTHORIZED, HTTP_403_FORBIDDEN
 
 from yuantus.config import get_settings
 from yuantus.context import org_id_var, tenant_id_var, user_id_var
 from yuantus.security.auth.database import get_identity_sessionmaker
 from yuantus.security.auth.jwt import JWTError, decode_hs256
-from yuantus.security.auth.models import AuthUser
-from yuantus.security.auth.service import AuthService
+from yuantus.security.auth.principal_cache import (
+    PrincipalUnavailable,
+    get_principal_cache,
+    load_principal,
+)
 
 
 def _get_bearer_token(request: Request) -> Optional[str]:
@@ -89,18 +92,32 @@ def _is_tenant_only_path(path: str) -> bool:
     }
 
 
-class AuthEnforcementMiddleware(BaseHTTPMiddleware):
+class AuthEnforcementMiddleware:
     """
     Enforce JWT authentication globally when `YUANTUS_AUTH_MODE=required`.
 
     This avoids relying on per-route dependencies to require authentication.
     """
 
-    async def dispatch(self, request: Request, call_next) -> Response:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        response = await self._enforce(Request(scope, receive), send)
+        if response is not None:
+            await response(scope, receive, send)
+
+    async def _enforce(self, request: Request, send: Send) -> Optional[JSONResponse]:
+        """Run the app (returning None) or return the rejection to send instead."""
+        scope, receive = request.scope, request.receive
         settings = get_settings()
         mode = (settings.AUTH_MODE or "optional").strip().lower()
         if mode != "required":
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return None
 
         if (
             request.method.upper() == "OPTIONS"
@@ -109,7 +126,8 @@ class AuthEnforcementMiddleware(BaseHTTPMiddleware):
         ):
             # MES ingest is whitelisted from JWT: its own dedicated credential
             # dependency is the sole, fail-closed auth (R2.2).
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return None
 
         token = _get_bearer_token(request)
         if not token:
@@ -159,35 +177,26 @@ class AuthEnforcementMiddleware(BaseHTTPMiddleware):
         request.state.org_id = org_id
         request.state.user_id = str(user_id)
         try:
-            SessionLocal = get_identity_sessionmaker()
-            db = SessionLocal()
-            try:
-                user = (
-                    db.query(AuthUser)
-                    .filter(AuthUser.id == user_id, AuthUser.tenant_id == tenant_id)
-                    .first()
-                )
-                if not user or not user.is_active:
-                    return JSONResponse(
-                        {"detail": "User not found or inactive"},
-                        status_code=HTTP_401_UNAUTHORIZED,
+            principal_org = None if tenant_only else org_id
+            cache = get_principal_cache()
+            cache_key = (tenant_id, principal_org, user_id, payload.get("iat"))
+            principal = cache.get(cache_key)
+            if principal is None:
+                SessionLocal = get_identity_sessionmaker()
+                db = SessionLocal()
+                try:
+                    principal = load_principal(
+                        db, tenant_id=tenant_id, user_id=user_id, org_id=principal_org
                     )
-
-                if not tenant_only:
-                    svc = AuthService(db)
-                    try:
-                        svc.get_roles_for_user_org(
-                            tenant_id=tenant_id, org_id=org_id, user_id=user_id
-                        )
-                    except Exception:
-                        return JSONResponse(
-                            {"detail": "Not a member of this org"},
-                            status_code=HTTP_403_FORBIDDEN,
-                        )
-            finally:
-                db.close()
-
-            return await call_next(request)
+                except PrincipalUnavailable as e:
+                    return JSONResponse({"detail": e.detail}, status_code=e.status_code)
+                finally:
+                    db.close()
+                cache.put(cache_key, principal)
+            request.state.principal = principal
+
+            await self.app(scope, receive, send)
+            return None
         finally:
             user_id_var.reset(user_token)
             org_id_var.reset(org_token)
@@ -1,17 +1,24 @@
 from __future__ import annotations
 
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from yuantus.api.middleware.auth_enforce import _is_mes_ingest_path
 from yuantus.config import get_settings
 from yuantus.context import org_id_var, tenant_id_var
 
 
-class TenantOrgContextMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next) -> Response:
+class TenantOrgContextMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         settings = get_settings()
+        request = Request(scope)
         # The MES ingest route is a machine entrypoint whose tenant is bound by its
         # dedicated credential (api/dependencies/mes_ingest_auth), NOT the request
         # header. Do NOT derive tenant/org from the untrusted x-tenant-id header for
@@ -37,7 +44,7 @@ class TenantOrgContextMiddleware(BaseHTTPMiddleware):
             org_token = org_id_var.set(org_id)
             request.state.org_id = org_id
         try:
-            return await call_next(request)
+            await self.app(scope, receive, send)
         finally:
             if tenant_token is not None:
                 tenant_id_var.reset(tenant_token)
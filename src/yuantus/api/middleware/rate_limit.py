@@ -5,10 +5,11 @@ import time
 from dataclasses import dataclass
 from typing import Optional
 
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
 from starlette.requests import Request
-from starlette.responses import JSONResponse, Response
+from starlette.responses import JSONResponse
 from starlette.status import HTTP_429_TOO_MANY_REQUESTS
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from yuantus.config import get_settings
 
@@ -88,22 +89,29 @@ def _rate_limit_key(request: Request) -> str:
     return f"ip:{host}"
 
 
-class InboundRateLimitMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next) -> Response:
+class InboundRateLimitMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         settings = get_settings()
-        if not settings.INBOUND_RATE_LIMIT_ENABLED:
-            return await call_next(request)
+        if scope["type"] != "http" or not settings.INBOUND_RATE_LIMIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
 
+        request = Request(scope)
         if _is_exempt_path(
             request.url.path,
             _split_csv(settings.INBOUND_RATE_LIMIT_EXEMPT_PATHS),
         ):
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
         rate_per_minute = int(settings.INBOUND_RATE_LIMIT_PER_MINUTE)
         burst = int(settings.INBOUND_RATE_LIMIT_BURST)
         if rate_per_minute <= 0 or burst <= 0:
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
 
         allowed, remaining, retry_after = _limiter.allow(
             _rate_limit_key(request),
@@ -111,12 +119,18 @@ class InboundRateLimitMiddleware(BaseHTTPMiddleware):
             burst=burst,
         )
         if allowed:
-            response = await call_next(request)
-            response.headers["X-RateLimit-Limit"] = str(burst)
-            response.headers["X-RateLimit-Remaining"] = str(remaining)
-            return response
 
-        return JSONResponse(
+            async def send_with_limits(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers["X-RateLimit-Limit"] = str(burst)
+                    headers["X-RateLimit-Remaining"] = str(remaining)
+                await send(message)
+
+            await self.app(scope, receive, send_with_limits)
+            return
+
+        response = JSONResponse(
             {"detail": "Rate limit exceeded"},
             status_code=HTTP_429_TOO_MANY_REQUESTS,
             headers={
@@ -125,3 +139,4 @@ class InboundRateLimitMiddleware(BaseHTTPMiddleware):
                 "X-RateLimit-Remaining": "0",
             },
         )
+        await response(scope, receive, send)
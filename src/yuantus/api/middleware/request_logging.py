@@ -6,9 +6,9 @@ import time
 import uuid
 from typing import Optional
 
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
 from starlette.requests import Request
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from yuantus.config import get_settings
 from yuantus.context import request_id_var
@@ -17,10 +17,22 @@ from yuantus.context import request_id_var
 _logger = logging.getLogger("yuantus.request")
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next) -> Response:
+class RequestLoggingMiddleware:
+    """Pure ASGI: the response streams straight through ``send`` and the log
+    line is emitted once the app returns. Latency is measured to the response
+    start, as it was when this ran on ``BaseHTTPMiddleware``."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         settings = get_settings()
         header_name = settings.REQUEST_ID_HEADER
+        request = Request(scope)
         incoming = request.headers.get(header_name)
         request_id = incoming or uuid.uuid4().hex
         request.state.request_id = request_id
@@ -28,18 +40,26 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
 
         start = time.perf_counter()
         status_code = 500
+        latency_ms: Optional[int] = None
         error: Optional[str] = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, latency_ms
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                latency_ms = int((time.perf_counter() - start) * 1000)
+                MutableHeaders(scope=message)[header_name] = request_id
+            await send(message)
+
         try:
-            response = await call_next(request)
-            status_code = response.status_code
-            response.headers[header_name] = request_id
-            return response
+            await self.app(scope, receive, send_wrapper)
         except Exception as exc:
             error = type(exc).__name__
             raise
         finally:
             try:
-                latency_ms = int((time.perf_counter() - start) * 1000)
+                if latency_ms is None:
+                    latency_ms = int((time.perf_counter() - start) * 1000)
                 fields = {
                     "request_id": request_id,
                     "tenant_id": getattr(request.state, "tenant_id", None),
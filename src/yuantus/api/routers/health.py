@@ -16,6 +16,7 @@ from yuantus.integrations import circuit_breaker
 from yuantus.integrations.athena import build_athena_breaker
 from yuantus.integrations.cad_ml import build_cad_ml_breaker
 from yuantus.integrations.dedup_vision import build_dedup_vision_breaker
+from yuantus.integrations.http_pool import list_http_pools
 from yuantus.meta_engine.services.file_service import FileService
 from yuantus.security.auth.database import get_identity_db_session
 
@@ -158,6 +159,11 @@ def health_deps() -> dict:
         external_checks.setdefault(service_key, {"configured": False})
         external_checks[service_key]["breaker"] = breaker.status()
 
+    # Keep-alive client pool of each pooled integration (see http_pool).
+    for pool_name, pool in list_http_pools().items():
+        external_checks.setdefault(pool_name, {"configured": False})
+        external_checks[pool_name]["http_pool"] = pool.status()
+
     return {
         "ok": overall_ok,
         "service": "yuantus-plm",
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from yuantus.api.middleware import audit as audit_mod
+from yuantus.api.middleware.audit import AuditLogMiddleware
+from yuantus.api.middleware.auth_enforce import AuthEnforcementMiddleware
+from yuantus.api.middleware.context import TenantOrgContextMiddleware
+from yuantus.api.middleware.rate_limit import InboundRateLimitMiddleware, _limiter
+from yuantus.api.middleware.request_logging import RequestLoggingMiddleware
+from yuantus.config import get_settings
+from yuantus.context import tenant_id_var
+
+_CHUNKS = 8
+
+
+def _stack_app() -> FastAPI:
+    """The production middleware order from create_app over a tiny app."""
+    started = []
+
+    @asynccontextmanager
+    async def lifespan(_app):
+        # Lifespan scopes must pass straight through every middleware.
+        started.append(True)
+        yield
+
+    app = FastAPI(lifespan=lifespan)
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def body():
+            for idx in range(_CHUNKS):
+                yield f"chunk-{idx};".encode()
+
+        return StreamingResponse(body(), media_type="text/plain")
+
+    @app.get("/tenant")
+    async def tenant() -> dict:
+        return {"tenant_id": tenant_id_var.get()}
+
+    @app.get("/missing")
+    async def missing() -> dict:
+        raise HTTPException(status_code=404, detail="nope")
+
+    for cls in (
+        AuditLogMiddleware,
+        TenantOrgContextMiddleware,
+        InboundRateLimitMiddleware,
+        AuthEnforcementMiddleware,
+        RequestLoggingMiddleware,
+    ):
+        app.add_middleware(cls)
+    app.state.started = started
+    return app
+
+
+def _enable_rate_limit(monkeypatch) -> None:
+    settings = get_settings()
+    monkeypatch.setattr(settings, "AUTH_MODE", "optional")
+    monkeypatch.setattr(settings, "INBOUND_RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(settings, "INBOUND_RATE_LIMIT_PER_MINUTE", 600)
+    monkeypatch.setattr(settings, "INBOUND_RATE_LIMIT_BURST", 50)
+    monkeypatch.setattr(settings, "INBOUND_RATE_LIMIT_EXEMPT_PATHS", "")
+    with _limiter._lock:
+        _limiter._buckets.clear()
+
+
+def test_streamed_body_passes_through_unbuffered_with_stack_headers(monkeypatch) -> None:
+    _enable_rate_limit(monkeypatch)
+    app = _stack_app()
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/stream",
+        "raw_path": b"/stream",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"test")],
+        "client": ("127.0.0.1", 5000),
+        "server": ("test", 80),
+    }
+    asyncio.run(app(scope, receive, send))
+
+    start, *bodies = messages
+    headers = {k.decode().lower(): v.decode() for k, v in start["headers"]}
+    assert start["status"] == 200
+    assert headers[get_settings().REQUEST_ID_HEADER.lower()]
+    assert headers["x-ratelimit-limit"] == "50"
+    # Every chunk reaches the server as its own message, plus the closing one.
+    assert len(bodies) == _CHUNKS + 1
+    assert b"".join(m["body"] for m in bodies) == b"".join(
+        f"chunk-{idx};".encode() for idx in range(_CHUNKS)
+    )
+
+
+def test_audit_sees_status_and_context_without_leaking_it(monkeypatch) -> None:
+    _enable_rate_limit(monkeypatch)
+    monkeypatch.setattr(get_settings(), "AUDIT_ENABLED", True)
+    monkeypatch.setattr(get_settings(), "AUDIT_ASYNC_ENABLED", False)
+    rows = []
+    monkeypatch.setattr(audit_mod, "write_audit_rows", rows.extend)
+
+    with TestClient(_stack_app()) as client:
+        assert client.app.state.started == [True]
+        ok = client.get("/tenant", headers={"x-tenant-id": "tenant-7"})
+        missing = client.get("/missing", headers={"x-tenant-id": "tenant-7"})
+
+    assert ok.json() == {"tenant_id": "tenant-7"}
+    assert missing.status_code == 404
+    assert [(row["path"], row["status_code"], row["tenant_id"]) for row in rows] == [
+        ("/tenant", 200, "tenant-7"),
+        ("/missing", 404, "tenant-7"),
+    ]
+    assert tenant_id_var.get() is None
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from yuantus.api.middleware.audit import AuditLogMiddleware
+from yuantus.config import get_settings
+from yuantus.models.audit import AuditLog
+from yuantus.security import audit_retention, audit_sink
+from yuantus.security.audit_sink import AuditLogSink, build_audit_row
+
+
+@pytest.fixture()
+def identity_db(monkeypatch):
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    AuditLog.__table__.create(engine)
+    SessionLocal = sessionmaker(bind=engine)
+    commits = []
+    event.listen(SessionLocal, "after_commit", lambda _s: commits.append(1))
+    monkeypatch.setattr(audit_sink, "get_identity_sessionmaker", lambda: SessionLocal)
+    monkeypatch.setattr(audit_retention, "_AUDIT_LAST_PRUNE_TS", {})
+    db = SessionLocal()
+    try:
+        yield db, commits
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def _row(path: str, tenant_id: str = "t-1", **values):
+    return build_audit_row(
+        tenant_id=tenant_id,
+        org_id=None,
+        user_id=None,
+        method="GET",
+        path=path,
+        status_code=200,
+        duration_ms=1,
+        **values,
+    )
+
+
+def test_sink_bulk_inserts_queued_rows_in_few_transactions(identity_db):
+    db, commits = identity_db
+    sink = AuditLogSink(batch_size=50, flush_interval=0.2)
+    try:
+        for n in range(120):
+            sink.submit(_row(f"/p/{n}"))
+        assert sink.flush(timeout=5)
+    finally:
+        sink.stop()
+
+    assert db.query(AuditLog).count() == 120
+    assert len(commits) <= 4
+    stats = sink.stats()
+    assert stats["written"] == 120 and stats["sync_writes"] == 0 and stats["pending"] == 0
+
+
+def test_sink_writes_synchronously_when_queue_is_full(identity_db, monkeypatch):
+    db, _commits = identity_db
+    started = threading.Event()
+    release = threading.Event()
+    written = []
+    real_write = audit_sink.write_audit_rows
+
+    def _slow_write(rows, *, prune=True):
+        if threading.current_thread().name == "AuditLogSink" and not started.is_set():
+            started.set()
+            release.wait(5)
+        written.append((threading.current_thread().name, [r["path"] for r in rows]))
+        real_write(rows, prune=prune)
+
+    monkeypatch.setattr(audit_sink, "write_audit_rows", _slow_write)
+    sink = AuditLogSink(queue_size=1, batch_size=1, flush_interval=0)
+    try:
+        sink.submit(_row("/first"))
+        assert started.wait(5)
+        sink.submit(_row("/queued"))
+        sink.submit(_row("/overflow"))
+        assert written[-1] == (threading.current_thread().name, ["/overflow"])
+        release.set()
+    finally:
+        sink.stop()
+
+    assert {r.path for r in db.query(AuditLog).all()} == {"/first", "/queued", "/overflow"}
+    assert sink.stats()["sync_writes"] == 1
+
+
+def test_sink_prunes_on_writer_thread_and_stop_drains(identity_db, monkeypatch):
+    db, _commits = identity_db
+    monkeypatch.setattr(get_settings(), "AUDIT_RETENTION_DAYS", 1)
+    db.execute(
+        AuditLog.__table__.insert(),
+        [_row("/old", created_at=datetime.utcnow() - timedelta(days=3))],
+    )
+    db.commit()
+
+    sink = AuditLogSink(flush_interval=60)
+    sink.submit(_row("/new"))
+    sink.stop()
+
+    assert [r.path for r in db.query(AuditLog).all()] == ["/new"]
+
+
+def test_middleware_queues_rows_when_async_enabled(identity_db, monkeypatch):
+    db, _commits = identity_db
+    monkeypatch.setattr(get_settings(), "AUDIT_ENABLED", True)
+    monkeypatch.setattr(get_settings(), "AUDIT_ASYNC_ENABLED", True)
+    sink = AuditLogSink(flush_interval=60)
+    monkeypatch.setattr(audit_sink, "_SINK", sink)
+
+    app = FastAPI()
+    app.add_middleware(AuditLogMiddleware)
+
+    @app.get("/ping")
+    def ping():
+        return {"ok": True}
+
+    client = TestClient(app)
+    try:
+        assert client.get("/ping").status_code == 200
+        assert client.get("/missing").status_code == 404
+        assert db.query(AuditLog).count() == 0
+        assert sink.stats()["queued"] == 2
+    finally:
+        audit_sink.shutdown_audit_sink()
+
+    rows = sorted((r.path, r.status_code) for r in db.query(AuditLog).all())
+    assert rows == [("/missing", 404), ("/ping", 200)]
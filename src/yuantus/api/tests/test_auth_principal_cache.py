@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.requests import Request
+
+from yuantus.api.dependencies.auth import get_current_identity
+from yuantus.api.middleware import auth_enforce
+from yuantus.api.middleware.auth_enforce import AuthEnforcementMiddleware
+from yuantus.config import get_settings
+from yuantus.models.base import Base
+from yuantus.security.auth.jwt import encode_hs256
+from yuantus.security.auth.models import AuthUser, OrgMembership
+from yuantus.security.auth.principal_cache import Principal, get_principal_cache
+from yuantus.security.auth.service import AuthService
+
+SECRET = "principal-cache-test-secret"
+
+
+@pytest.fixture()
+def auth_env(monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "AUTH_MODE", "required")
+    monkeypatch.setattr(settings, "JWT_SECRET_KEY", SECRET)
+    monkeypatch.setattr(settings, "AUTH_PRINCIPAL_CACHE_TTL_SECONDS", 30)
+
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(
+        engine,
+        tables=[
+            Base.metadata.tables[name]
+            for name in (
+                "auth_tenants",
+                "auth_organizations",
+                "auth_users",
+                "auth_credentials",
+                "auth_org_memberships",
+            )
+        ],
+    )
+    SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
+    db = SessionLocal()
+    svc = AuthService(db)
+    svc.ensure_tenant("t-1")
+    svc.ensure_org("t-1", "o-1")
+    user = svc.create_user(tenant_id="t-1", username="alice", password="pw", user_id=7)
+    svc.add_membership(tenant_id="t-1", org_id="o-1", user_id=user.id, roles=["engineer"])
+    db.commit()
+
+    loads = []
+    real_load = auth_enforce.load_principal
+
+    def _counting_load(*args, **kwargs):
+        loads.append(kwargs["org_id"])
+        return real_load(*args, **kwargs)
+
+    monkeypatch.setattr(auth_enforce, "get_identity_sessionmaker", lambda: SessionLocal)
+    monkeypatch.setattr(auth_enforce, "load_principal", _counting_load)
+    get_principal_cache().clear()
+
+    app = FastAPI()
+    app.add_middleware(AuthEnforcementMiddleware)
+
+    @app.get("/api/v1/things")
+    def things(request: Request):
+        principal = request.state.principal
+        return {"user": principal.username, "roles": list(principal.roles)}
+
+    token = encode_hs256(
+        {"sub": "7", "tenant_id": "t-1", "org_id": "o-1", "iat": int(time.time())},
+        secret=SECRET,
+    )
+    client = TestClient(app)
+    client.headers["Authorization"] = f"Bearer {token}"
+    try:
+        yield SimpleNamespace(client=client, db=db, loads=loads)
+    finally:
+        get_principal_cache().clear()
+        db.close()
+        engine.dispose()
+
+
+def test_principal_is_resolved_once_and_exposed_on_request_state(auth_env):
+    for _ in range(3):
+        response = auth_env.client.get("/api/v1/things")
+        assert response.status_code == 200
+        assert response.json() == {"user": "alice", "roles": ["engineer"]}
+
+    assert auth_env.loads == ["o-1"]
+
+
+def test_deactivating_user_invalidates_cached_principal(auth_env):
+    assert auth_env.client.get("/api/v1/things").status_code == 200
+
+    auth_env.db.get(AuthUser, 7).is_active = False
+    auth_env.db.commit()
+
+    response = auth_env.client.get("/api/v1/things")
+    assert response.status_code == 401
+    assert response.json() == {"detail": "User not found or inactive"}
+
+
+def test_membership_change_invalidates_cached_roles(auth_env):
+    assert auth_env.client.get("/api/v1/things").json()["roles"] == ["engineer"]
+
+    membership = auth_env.db.query(OrgMembership).filter_by(user_id=7).one()
+    membership.roles = ["engineer", "approver"]
+    auth_env.db.commit()
+    assert auth_env.client.get("/api/v1/things").json()["roles"] == ["engineer", "approver"]
+
+    membership.is_active = False
+    auth_env.db.commit()
+    assert auth_env.client.get("/api/v1/things").status_code == 403
+    assert len(auth_env.loads) == 3
+
+
+def test_zero_ttl_disables_the_cache(auth_env, monkeypatch):
+    monkeypatch.setattr(get_settings(), "AUTH_PRINCIPAL_CACHE_TTL_SECONDS", 0)
+
+    for _ in range(2):
+        assert auth_env.client.get("/api/v1/things").status_code == 200
+
+    assert len(auth_env.loads) == 2
+
+
+def test_identity_dependency_reuses_middleware_principal(monkeypatch):
+    monkeypatch.setattr(get_settings(), "AUTH_MODE", "required")
+    monkeypatch.setattr(get_settings(), "JWT_SECRET_KEY", SECRET)
+    token = encode_hs256({"sub": "7", "tenant_id": "t-1", "org_id": "o-1"}, secret=SECRET)
+    request = Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "headers": [(b"authorization", f"Bearer {token}".encode())],
+            "state": {},
+        }
+    )
+    request.state.principal = Principal(
+        tenant_id="t-1",
+        user_id=7,
+        org_id="o-1",
+        username="alice",
+        email=None,
+        is_superuser=False,
+        roles=("engineer",),
+    )
+    identity_db = MagicMock()
+
+    identity = get_current_identity(request, identity_db=identity_db)
+
+    assert (identity.user_id, identity.username, identity.org_id) == (7, "alice", "o-1")
+    identity_db.query.assert_not_called()
@@ -5,7 +5,7 @@ import sys
 import time
 import uuid
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 import typer
 import uvicorn
@@ -19,6 +19,12 @@ search_app = typer.Typer(help="Search index maintenance")
 app.add_typer(search_app, name="search")
 license_app = typer.Typer(help="Offline license import/verify (PLM-COLLAB-P1-C)")
 app.add_typer(license_app, name="license")
+bom_app = typer.Typer(help="BOM index maintenance")
+app.add_typer(bom_app, name="bom")
+cutted_parts_app = typer.Typer(help="Cutted-parts analytics maintenance")
+app.add_typer(cutted_parts_app, name="cutted-parts")
+parallel_ops_app = typer.Typer(help="Parallel-ops dashboard maintenance")
+app.add_typer(parallel_ops_app, name="parallel-ops")
 
 
 @license_app.command("import")
@@ -306,6 +312,19 @@ def worker(
     worker_id: Optional[str] = typer.Option(None, help="Worker id"),
     poll_interval: int = typer.Option(5, help="Poll interval seconds"),
     once: bool = typer.Option(False, help="Process one job then exit"),
+    dispatch: bool = typer.Option(
+        False,
+        "--dispatch/--no-dispatch",
+        help="Run jobs concurrently, woken by LISTEN/NOTIFY on PostgreSQL",
+    ),
+    concurrency: Optional[int] = typer.Option(
+        None, help="Concurrent jobs in --dispatch mode (default from settings)"
+    ),
+    task_limit: Optional[List[str]] = typer.Option(
+        None,
+        "--task-limit",
+        help="Per task_type cap in --dispatch mode, e.g. cad_conversion=2 (repeatable)",
+    ),
     tenant: Optional[str] = typer.Option(
         None, "--tenant", help="Tenant id (for db-per-tenant/org)"
     ),
@@ -317,6 +336,8 @@ def worker(
     Run a background job worker.
 
     This is a dev-friendly worker that polls the database for pending jobs.
+    With --dispatch it runs several jobs at once and, on PostgreSQL, wakes as
+    soon as a job is enqueued instead of waiting for the next poll.
     """
     if tenant is not None:
         tenant_id_var.set(tenant)
@@ -377,21 +398,44 @@ def worker(
     except Exception as exc:
         typer.echo(f"Warning: plugin job handlers not loaded: {exc}", err=True)
 
+    from yuantus.integrations.http_pool import close_http_pools, open_http_pools
+
+    open_http_pools()
     if once:
-        processed = w.run_once()
+        try:
+            processed = w.run_once()
+        finally:
+            close_http_pools()
         if processed:
             typer.echo("Processed one job.")
         else:
             typer.echo("No pending jobs.")
         return
 
-    w.start()
+    runner = w
+    if dispatch:
+        from yuantus.meta_engine.services.job_dispatcher import (
+            JobDispatcher,
+            parse_task_limits,
+        )
+
+        try:
+            task_limits = (
+                parse_task_limits(",".join(task_limit)) if task_limit else None
+            )
+        except ValueError as exc:
+            typer.echo(str(exc), err=True)
+            raise typer.Exit(2) from exc
+        runner = JobDispatcher(w, concurrency=concurrency, task_limits=task_limits)
+
+    runner.start()
     typer.echo(f"Worker '{w.worker_id}' started. Press Ctrl+C to stop.", err=True)
     try:
         while True:
             time.sleep(1)
     except KeyboardInterrupt:
-        w.stop()
+        runner.stop()
+        close_http_pools()
         typer.echo(f"Worker '{w.worker_id}' stopped.", err=True)
 
 
@@ -725,6 +769,22 @@ def search_reindex(
     reset: bool = typer.Option(False, help="Delete index before reindex"),
     limit: Optional[int] = typer.Option(None, help="Limit items to reindex"),
     batch_size: int = typer.Option(200, help="Batch size for reindex"),
+    partitions: int = typer.Option(
+        0,
+        help=(
+            "Build a new versioned index from N id-range partitions in parallel "
+            "and swap the alias onto it (0 = reindex in place)"
+        ),
+    ),
+    workers: Optional[int] = typer.Option(
+        None, help="Worker processes for --partitions (default: one per partition)"
+    ),
+    checkpoint_dir: Optional[str] = typer.Option(
+        None, help="Directory to checkpoint a partitioned run for resume"
+    ),
+    keep_previous: bool = typer.Option(
+        False, help="Keep the index the alias pointed at before the swap"
+    ),
     tenant: Optional[str] = typer.Option(
         None, "--tenant", help="Tenant id (for db-per-tenant/org)"
     ),
@@ -736,6 +796,13 @@ def search_reindex(
         tenant_id_var.set(tenant)
     if org is not None:
         org_id_var.set(org)
+    if partitions and (item_type or limit or reset):
+        typer.echo(
+            "--partitions rebuilds the whole index; it cannot be combined with "
+            "--item-type, --limit or --reset.",
+            err=True,
+        )
+        raise typer.Exit(2)
 
     from yuantus.meta_engine.bootstrap import import_all_models
     from yuantus.database import get_db_session
@@ -745,6 +812,20 @@ def search_reindex(
 
     with get_db_session() as session:
         service = SearchService(session)
+        if partitions:
+            from yuantus.meta_engine.services.search_reindex import SearchReindexer
+
+            result = SearchReindexer(session, service).run(
+                partitions=partitions,
+                workers=workers,
+                batch_size=batch_size,
+                checkpoint_dir=checkpoint_dir,
+                keep_previous=keep_previous,
+            )
+            typer.echo(json.dumps(result, indent=2, default=str))
+            if not result["ok"]:
+                raise typer.Exit(1)
+            return
         result = service.reindex_items(
             item_type_id=item_type,
             reset=reset,
@@ -791,6 +872,145 @@ def search_reindex_ecos(
     typer.echo(json.dumps(result, indent=2, default=str))
 
 
+@search_app.command("db-index-rebuild")
+def search_db_index_rebuild(
+    batch_size: int = typer.Option(1000, help="Rows per insert batch"),
+    tenant: Optional[str] = typer.Option(
+        None, "--tenant", help="Tenant id (for db-per-tenant/org)"
+    ),
+    org: Optional[str] = typer.Option(
+        None, "--org", help="Org id (for db-per-tenant-org)"
+    ),
+) -> None:
+    """
+    Recompute meta_item_search (DB full-text index) from meta_items.
+    Run once before enabling YUANTUS_SEARCH_DB_INDEX_ENABLED, and after bulk imports.
+    """
+    if tenant is not None:
+        tenant_id_var.set(tenant)
+    if org is not None:
+        org_id_var.set(org)
+
+    from yuantus.meta_engine.bootstrap import import_all_models
+    from yuantus.database import get_db_session
+    from yuantus.meta_engine.services.item_search_index_service import (
+        ItemSearchIndexService,
+    )
+
+    import_all_models()
+
+    with get_db_session() as session:
+        result = ItemSearchIndexService(session).rebuild(batch_size=batch_size)
+
+    typer.echo(json.dumps(result, indent=2, default=str))
+
+
+@bom_app.command("closure-rebuild")
+def bom_closure_rebuild(
+    batch_size: int = typer.Option(5000, help="Rows per insert batch"),
+    tenant: Optional[str] = typer.Option(
+        None, "--tenant", help="Tenant id (for db-per-tenant/org)"
+    ),
+    org: Optional[str] = typer.Option(
+        None, "--org", help="Org id (for db-per-tenant-org)"
+    ),
+) -> None:
+    """
+    Recompute meta_bom_closure from current relationship items.
+    Run once before enabling YUANTUS_BOM_CLOSURE_ENABLED, and after bulk imports.
+    """
+    if tenant is not None:
+        tenant_id_var.set(tenant)
+    if org is not None:
+        org_id_var.set(org)
+
+    from yuantus.meta_engine.bootstrap import import_all_models
+    from yuantus.database import get_db_session
+    from yuantus.meta_engine.services.bom_closure_service import BOMClosureService
+
+    import_all_models()
+
+    with get_db_session() as session:
+        result = BOMClosureService(session).rebuild(batch_size=batch_size)
+
+    typer.echo(json.dumps(result, indent=2, default=str))
+
+
+@cutted_parts_app.command("rollups-rebuild")
+def cutted_parts_rollups_rebuild(
+    tenant: Optional[str] = typer.Option(
+        None, "--tenant", help="Tenant id (for db-per-tenant/org)"
+    ),
+    org: Optional[str] = typer.Option(
+        None, "--org", help="Org id (for db-per-tenant-org)"
+    ),
+) -> None:
+    """
+    Recompute meta_cut_rollups from current cut plans and results.
+    Run once before enabling YUANTUS_CUTTED_PARTS_ROLLUPS_ENABLED, and after bulk imports.
+    """
+    if tenant is not None:
+        tenant_id_var.set(tenant)
+    if org is not None:
+        org_id_var.set(org)
+
+    from yuantus.meta_engine.bootstrap import import_all_models
+    from yuantus.database import get_db_session
+    from yuantus.meta_engine.cutted_parts.rollups import CutRollupService
+
+    import_all_models()
+
+    with get_db_session() as session:
+        result = CutRollupService(session).rebuild()
+
+    typer.echo(json.dumps(result, indent=2, default=str))
+
+
+@parallel_ops_app.command("job-stats-refresh")
+def parallel_ops_job_stats_refresh(
+    rebuild: bool = typer.Option(
+        False, "--rebuild", help="Drop all hourly stats and recompute from the earliest job"
+    ),
+    settle_hours: Optional[int] = typer.Option(
+        None,
+        "--settle-hours",
+        help="Hours before the last refreshed hour to recompute (default: setting)",
+    ),
+    tenant: Optional[str] = typer.Option(
+        None, "--tenant", help="Tenant id (for db-per-tenant/org)"
+    ),
+    org: Optional[str] = typer.Option(
+        None, "--org", help="Org id (for db-per-tenant-org)"
+    ),
+) -> None:
+    """
+    Refresh meta_parallel_ops_job_stats (hourly doc-sync job pre-aggregates).
+    Run with --rebuild once before enabling YUANTUS_PARALLEL_OPS_JOB_STATS_ENABLED,
+    then on a schedule (e.g. hourly).
+    """
+    if tenant is not None:
+        tenant_id_var.set(tenant)
+    if org is not None:
+        org_id_var.set(org)
+
+    from yuantus.meta_engine.bootstrap import import_all_models
+    from yuantus.database import get_db_session
+    from yuantus.meta_engine.services.parallel_ops_job_stats import (
+        ParallelOpsJobStatsService,
+    )
+
+    import_all_models()
+
+    with get_db_session() as session:
+        service = ParallelOpsJobStatsService(session)
+        if rebuild:
+            result = service.rebuild()
+        else:
+            result = service.refresh(settle_hours=settle_hours)
+
+    typer.echo(json.dumps(result, indent=2, default=str))
+
+
 @app.command("seed-identity")
 def seed_identity(
     tenant: str = typer.Option("tenant-1", help="Tenant id"),
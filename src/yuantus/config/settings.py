@@ -213,6 +213,21 @@ class Settings(BaseSettings):
     CIRCUIT_BREAKER_RENDER_SERVICE_RECOVERY_SECONDS: int = Field(default=30)
     CIRCUIT_BREAKER_RENDER_SERVICE_HALF_OPEN_MAX_CALLS: int = Field(default=1)
     CIRCUIT_BREAKER_RENDER_SERVICE_BACKOFF_MAX_SECONDS: int = Field(default=600)
+    # Shared keep-alive client pools of the CAD connector / extractor, CAD ML and
+    # DedupCAD Vision clients (one pool per integration, per process).
+    INTEGRATION_HTTP_MAX_CONNECTIONS: int = Field(
+        default=100, description="Integration HTTP pools: max connections per endpoint"
+    )
+    INTEGRATION_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = Field(
+        default=20, description="Integration HTTP pools: idle keep-alive connections kept"
+    )
+    INTEGRATION_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = Field(
+        default=30.0, description="Integration HTTP pools: idle connection expiry (seconds)"
+    )
+    INTEGRATION_HTTP2_ENABLED: bool = Field(
+        default=False,
+        description="Negotiate HTTP/2 for integration HTTP pools (requires the 'h2' package)",
+    )
     CAD_EXTRACTOR_BASE_URL: str = Field(
         default="",
         description="Optional CAD extractor service base URL",
@@ -259,6 +274,25 @@ class Settings(BaseSettings):
             "local-baseline and external-enterprise profiles keep their strict defaults"
         ),
     )
+    CAD_ARTIFACT_CACHE_ENABLED: bool = Field(
+        default=False,
+        description=(
+            "Reuse derived CAD previews/geometry/attributes/BOMs across files "
+            "with the same checksum instead of re-running converters"
+        ),
+    )
+    CAD_ARTIFACT_CACHE_PARAMS_VERSION: int = Field(
+        default=1,
+        description="Bump to invalidate CAD artifact cache entries after converter changes",
+    )
+    CAD_ARTIFACT_CACHE_MAX_ENTRIES: int = Field(
+        default=100_000,
+        description="Max CAD artifact cache entries before LRU eviction (0 disables limit)",
+    )
+    CAD_ARTIFACT_CACHE_MAX_BYTES: int = Field(
+        default=50 * 1024 * 1024 * 1024,
+        description="Max bytes of cached CAD artifacts before LRU eviction (0 disables limit)",
+    )
     CAD_CONNECTORS_CONFIG_PATH: str = Field(
         default="",
         description="Optional JSON config path for custom CAD connectors",
@@ -362,6 +396,67 @@ class Settings(BaseSettings):
     AUTH_LEEWAY_SECONDS: int = Field(
         default=0, description="JWT exp leeway seconds"
     )
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: int = Field(
+        default=0,
+        description=(
+            "Cache resolved principals (user + org roles) in AuthEnforcementMiddleware "
+            "for N seconds (0=disabled). Entries are dropped when the user or its "
+            "memberships change in this process"
+        ),
+    )
+    AUTH_PRINCIPAL_CACHE_MAX_ENTRIES: int = Field(
+        default=10000, description="Max cached principals (least recently used evicted)"
+    )
+    META_PERMISSION_CACHE_TTL_SECONDS: int = Field(
+        default=0,
+        description=(
+            "Share compiled ACLs (per-action role bitsets + lifecycle state overrides) "
+            "across requests of a tenant for N seconds (0=per service instance only). "
+            "Writes to Access/Permission/LifecycleState in this process invalidate them"
+        ),
+    )
+    META_METADATA_CACHE_TTL_SECONDS: int = Field(
+        default=0,
+        description=(
+            "Share the ItemType/Property metadata snapshot used by AML query, engine "
+            "and GraphQL lookups across requests of a tenant for N seconds "
+            "(0=per session transaction only). Meta schema writes in this process "
+            "invalidate it"
+        ),
+    )
+    BOX_ANALYTICS_CACHE_TTL_SECONDS: int = Field(
+        default=0,
+        description=(
+            "Share fleet-level box analytics panels (overview, capacity, occupancy, "
+            "aging, ...) across requests of a tenant for N seconds (0=disabled). "
+            "Box and content writes through BoxService in this process invalidate them"
+        ),
+    )
+    QUERY_ACL_PUSHDOWN_ENABLED: bool = Field(
+        default=False,
+        description=(
+            "Compile the caller's read permissions (ItemType ACL, lifecycle state "
+            "overrides, owner identities) into the SQL of /aml/query and report "
+            "searches, so pages and totals only ever cover readable items"
+        ),
+    )
+    GRAPHQL_DB_MAX_THREADS: int = Field(
+        default=8,
+        description=(
+            "Worker threads GraphQL resolvers and DataLoaders may occupy for "
+            "synchronous DB work (kept off the event loop)"
+        ),
+    )
+    GRAPHQL_MAX_QUERY_DEPTH: int = Field(
+        default=0, description="Reject GraphQL queries nested deeper than N (0=off)"
+    )
+    GRAPHQL_MAX_QUERY_TOKENS: int = Field(
+        default=0, description="Reject GraphQL documents with more than N tokens (0=off)"
+    )
+    GRAPHQL_BOM_EXPLODE_MAX_LINES: int = Field(
+        default=0,
+        description="Fail a GraphQL bomExplode that would load more than N BOM lines (0=off)",
+    )
 
     # PLM-COLLAB-P3-D1: embed-token minting (Ed25519, asymmetric). The signing PRIVATE key is
     # Yuantus-only and NEVER committed; a consumer verifies offline with the matching PUBLIC
@@ -522,6 +617,23 @@ class Settings(BaseSettings):
     AUDIT_RETENTION_PRUNE_INTERVAL_SECONDS: int = Field(
         default=600, description="Min seconds between audit prune runs"
     )
+    AUDIT_ASYNC_ENABLED: bool = Field(
+        default=False,
+        description=(
+            "Queue audit rows and bulk-insert them from a background writer "
+            "instead of committing one row per request"
+        ),
+    )
+    AUDIT_ASYNC_QUEUE_SIZE: int = Field(
+        default=10000,
+        description="Bounded audit queue size; when full, the request writes its row itself",
+    )
+    AUDIT_ASYNC_BATCH_SIZE: int = Field(
+        default=500, description="Max audit rows per bulk insert"
+    )
+    AUDIT_ASYNC_FLUSH_INTERVAL_MS: int = Field(
+        default=500, description="Max time an audit row waits in the queue"
+    )
     HEALTHCHECK_EXTERNAL: bool = Field(
         default=False, description="Enable external dependency checks in /health/deps"
     )
@@ -557,6 +669,52 @@ class Settings(BaseSettings):
     SEARCH_ENGINE_URL: str = Field(default="")
     SEARCH_ENGINE_USERNAME: str = Field(default="")
     SEARCH_ENGINE_PASSWORD: str = Field(default="")
+    SEARCH_BULK_ENABLED: bool = Field(
+        default=False,
+        description="Route incremental item indexing through the buffered _bulk pipeline",
+    )
+    SEARCH_BULK_MAX_ACTIONS: int = Field(
+        default=500, description="Flush the search bulk buffer at this many actions"
+    )
+    SEARCH_BULK_MAX_BYTES: int = Field(
+        default=5 * 1024 * 1024,
+        description="Flush the search bulk buffer at this many request bytes",
+    )
+    SEARCH_BULK_FLUSH_INTERVAL_MS: int = Field(
+        default=1000,
+        description="Flush the search bulk buffer this long after the first pending action",
+    )
+    SEARCH_BULK_MAX_RETRIES: int = Field(
+        default=3, description="Retries for retryable (429/5xx) bulk item failures"
+    )
+    SEARCH_DB_INDEX_ENABLED: bool = Field(
+        default=False,
+        description=(
+            "Serve the no-Elasticsearch search fallback from the meta_item_search "
+            "index (PostgreSQL tsvector / SQLite FTS5). Run `yuantus search "
+            "db-index-rebuild` before enabling"
+        ),
+    )
+
+    # Domain event bus
+    EVENT_BUS_ASYNC_ENABLED: bool = Field(
+        default=False,
+        description=(
+            "Deliver events to batch subscribers (e.g. the search indexer) from a "
+            "background thread instead of the publishing request"
+        ),
+    )
+    EVENT_BUS_QUEUE_SIZE: int = Field(
+        default=10000,
+        description="Bounded queue size for async event delivery; when full, delivery is synchronous",
+    )
+    EVENT_BUS_BATCH_WINDOW_MS: int = Field(
+        default=200,
+        description="Window for collecting (and coalescing) events into one batch",
+    )
+    EVENT_BUS_BATCH_MAX: int = Field(
+        default=500, description="Max events handed to a batch subscriber at once"
+    )
 
     # File storage (Meta Engine)
     STORAGE_TYPE: str = Field(default="local", description="local|s3")
@@ -566,6 +724,10 @@ class Settings(BaseSettings):
         default=0,
         description="Max upload size in bytes (0 disables limit)",
     )
+    FILE_UPLOAD_CHUNK_BYTES: int = Field(
+        default=1024 * 1024,
+        description="Chunk size used to hash and enforce limits on uploads as they stream",
+    )
     FILE_ALLOWED_EXTENSIONS: str = Field(
         default="",
         description="Comma-separated allowed file extensions (no dot). Empty allows all.",
@@ -604,6 +766,27 @@ class Settings(BaseSettings):
     JOB_STALE_TIMEOUT_SECONDS: int = Field(
         default=900, description="Requeue processing jobs after this timeout (seconds)"
     )
+    JOB_REAPER_INTERVAL_SECONDS: int = Field(
+        default=60,
+        description=(
+            "How often workers run the stale PROCESSING job requeue (seconds); "
+            "<= 0 runs it on every poll"
+        ),
+    )
+    JOB_NOTIFY_CHANNEL: str = Field(
+        default="yuantus_jobs",
+        description="PostgreSQL LISTEN/NOTIFY channel signalled when jobs are enqueued",
+    )
+    JOB_WORKER_CONCURRENCY: int = Field(
+        default=4, description="Jobs a dispatching worker runs at once"
+    )
+    JOB_TASK_CONCURRENCY: str = Field(
+        default="",
+        description=(
+            "Per task_type concurrency caps for dispatching workers, "
+            "e.g. 'cad_conversion=2,cad_ml_vision=1'"
+        ),
+    )
     # PLM->ERP publication outbox worker (G2 R2 worker daemon)
     PUBLICATION_OUTBOX_POLL_INTERVAL_SECONDS: int = Field(
         default=10, description="PLM->ERP publication worker poll interval (seconds)"
@@ -814,6 +997,43 @@ class Settings(BaseSettings):
             "and never fails the transition. Set false to disable both audit writes."
         ),
     )
+    BOM_CLOSURE_ENABLED: bool = Field(
+        default=False,
+        description=(
+            "Maintain and read the meta_bom_closure index (multi-level where-used). "
+            "Run `yuantus bom closure-rebuild` before enabling; ignored when the "
+            "table does not exist. Restart-only."
+        ),
+    )
+    CUTTED_PARTS_ROLLUPS_ENABLED: bool = Field(
+        default=False,
+        description=(
+            "Maintain meta_cut_rollups (per-material, per-month plan/cut aggregates) "
+            "on cutted-parts writes and serve the fleet analytics from it. Run "
+            "`yuantus cutted-parts rollups-rebuild` before enabling; ignored when "
+            "the table does not exist"
+        ),
+    )
+    PARALLEL_OPS_JOB_STATS_ENABLED: bool = Field(
+        default=False,
+        description=(
+            "Serve parallel-ops doc-sync summaries, trends and metrics from the hourly "
+            "meta_parallel_ops_job_stats pre-aggregates, counting only the hours not "
+            "yet refreshed live. Schedule `yuantus parallel-ops job-stats-refresh`; "
+            "ignored when the table does not exist"
+        ),
+    )
+    PARALLEL_OPS_JOB_STATS_SETTLE_HOURS: int = Field(
+        default=48,
+        description=(
+            "Hours before the last refreshed hour that each job-stats refresh "
+            "recomputes, so retries and dead-lettering of recent jobs are picked up"
+        ),
+    )
+    BOM_CLOSURE_MAX_DEPTH: int = Field(
+        default=64,
+        description="Deepest path length recorded in meta_bom_closure",
+    )
     PUBLICATION_ECM_PATH: str = Field(
         default="/cmis/browser",
         description="CMIS compliance-reference endpoint path; not used by Transfer Receiver",
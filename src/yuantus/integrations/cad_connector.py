@@ -4,10 +4,9 @@ import json
 import os
 from typing import Any, Dict, Optional
 
-import httpx
-
 from yuantus.config import get_settings
 from yuantus.integrations.http import build_outbound_headers
+from yuantus.integrations.http_pool import HttpClientPool, get_http_pool
 
 
 class CadConnectorClient:
@@ -17,6 +16,9 @@ class CadConnectorClient:
         self._service_token = settings.CAD_CONNECTOR_SERVICE_TOKEN
         self.timeout_s = timeout_s
 
+    def _http(self) -> HttpClientPool:
+        return get_http_pool("cad_connector")
+
     def _resolve_authorization(self, authorization: Optional[str]) -> Optional[str]:
         token = authorization or self._service_token
         if not token:
@@ -29,13 +31,13 @@ class CadConnectorClient:
         return f"Bearer {token}"
 
     def health(self) -> Dict[str, Any]:
-        with httpx.Client(base_url=self.base_url, timeout=self.timeout_s) as client:
+        with self._http().client(self.base_url, timeout=self.timeout_s) as client:
             resp = client.get("/health")
             resp.raise_for_status()
             return resp.json()
 
     def capabilities(self) -> Dict[str, Any]:
-        with httpx.Client(base_url=self.base_url, timeout=self.timeout_s) as client:
+        with self._http().client(self.base_url, timeout=self.timeout_s) as client:
             resp = client.get("/capabilities")
             resp.raise_for_status()
             return resp.json()
@@ -90,7 +92,7 @@ class CadConnectorClient:
             files = {"file": (resolved_name, opened)}
 
         try:
-            with httpx.Client(base_url=self.base_url, timeout=self.timeout_s) as client:
+            with self._http().client(self.base_url, timeout=self.timeout_s) as client:
                 resp = client.post("/api/v1/convert", data=data, files=files, headers=headers)
                 resp.raise_for_status()
                 return resp.json()
@@ -3,10 +3,9 @@ from __future__ import annotations
 import os
 from typing import Any, Dict, Optional
 
-import httpx
-
 from yuantus.config import get_settings
 from yuantus.integrations.http import build_outbound_headers
+from yuantus.integrations.http_pool import HttpClientPool, get_http_pool
 
 
 class CadExtractorClient:
@@ -16,6 +15,9 @@ class CadExtractorClient:
         self._service_token = settings.CAD_EXTRACTOR_SERVICE_TOKEN
         self.timeout_s = timeout_s
 
+    def _http(self) -> HttpClientPool:
+        return get_http_pool("cad_extractor")
+
     def _resolve_authorization(self, authorization: Optional[str]) -> Optional[str]:
         token = authorization or self._service_token
         if not token:
@@ -49,7 +51,7 @@ class CadExtractorClient:
             data["cad_format"] = cad_format
         if cad_connector_id:
             data["cad_connector_id"] = cad_connector_id
-        with httpx.Client(base_url=self.base_url, timeout=self.timeout_s) as client:
+        with self._http().client(self.base_url, timeout=self.timeout_s) as client:
             with open(file_path, "rb") as f:
                 files = {"file": (name, f)}
                 resp = client.post("/api/v1/extract", files=files, data=data, headers=headers)
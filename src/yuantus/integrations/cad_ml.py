@@ -11,6 +11,7 @@ from yuantus.integrations.circuit_breaker import (
     get_or_create_breaker,
 )
 from yuantus.integrations.http import build_outbound_headers
+from yuantus.integrations.http_pool import HttpClientPool, get_http_pool
 
 
 CAD_ML_BREAKER_NAME = "cad_ml"
@@ -71,6 +72,9 @@ class CadMLClient:
         self.timeout_s = timeout_s
         self._breaker = build_cad_ml_breaker()
 
+    def _http(self) -> HttpClientPool:
+        return get_http_pool("cad_ml")
+
     def _resolve_authorization(self, authorization: Optional[str]) -> Optional[str]:
         token = authorization or self._service_token
         if not token:
@@ -91,7 +95,7 @@ class CadMLClient:
         headers = build_outbound_headers(
             authorization=self._resolve_authorization(authorization)
         ).as_dict()
-        async with httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout_s) as client:
+        async with self._http().async_client(self.base_url, timeout=self.timeout_s) as client:
             resp = await client.get("/api/v1/health", headers=headers)
             resp.raise_for_status()
             return resp.json()
@@ -138,7 +142,7 @@ class CadMLClient:
             "include_ocr": include_ocr,
             "ocr_provider": "auto",
         }
-        with httpx.Client(base_url=self.base_url, timeout=self.timeout_s) as client:
+        with self._http().client(self.base_url, timeout=self.timeout_s) as client:
             resp = client.post(
                 "/api/v1/vision/analyze", json=payload, params=params, headers=headers
             )
@@ -179,7 +183,7 @@ class CadMLClient:
         if provider:
             params["provider"] = provider
         name = filename or os.path.basename(file_path)
-        with httpx.Client(base_url=self.base_url, timeout=self.timeout_s) as client:
+        with self._http().client(self.base_url, timeout=self.timeout_s) as client:
             with open(file_path, "rb") as f:
                 files = {"file": (name, f)}
                 resp = client.post("/api/v1/ocr/extract", params=params, files=files, headers=headers)
@@ -214,7 +218,7 @@ class CadMLClient:
             authorization=self._resolve_authorization(authorization)
         ).as_dict()
         name = filename or os.path.basename(file_path)
-        with httpx.Client(base_url=self.base_url, timeout=self.timeout_s) as client:
+        with self._http().client(self.base_url, timeout=self.timeout_s) as client:
             with open(file_path, "rb") as f:
                 files = {"file": (name, f)}
                 resp = client.post("/api/v1/render/cad", files=files, headers=headers)
@@ -13,6 +13,7 @@ from yuantus.integrations.circuit_breaker import (
     get_or_create_breaker,
 )
 from yuantus.integrations.http import build_outbound_headers
+from yuantus.integrations.http_pool import HttpClientPool, get_http_pool
 
 logger = logging.getLogger(__name__)
 
@@ -121,6 +122,9 @@ class DedupVisionClient:
             urls.append(fallback)
         return urls
 
+    def _http(self) -> HttpClientPool:
+        return get_http_pool("dedup_vision")
+
     def _resolve_authorization(self, authorization: Optional[str]) -> Optional[str]:
         token = authorization or self._service_token
         if not token:
@@ -145,7 +149,7 @@ class DedupVisionClient:
         base_urls = self._candidate_base_urls()
         for i, base_url in enumerate(base_urls):
             try:
-                async with httpx.AsyncClient(base_url=base_url, timeout=self.timeout_s) as client:
+                async with self._http().async_client(base_url, timeout=self.timeout_s) as client:
                     resp = await client.get("/health", headers=headers)
                     resp.raise_for_status()
                     return resp.json()
@@ -220,7 +224,7 @@ class DedupVisionClient:
         base_urls = self._candidate_base_urls()
         for i, base_url in enumerate(base_urls):
             try:
-                with httpx.Client(base_url=base_url, timeout=self.timeout_s) as client:
+                with self._http().client(base_url, timeout=self.timeout_s) as client:
                     v2_data = {
                         "mode": v2_mode,
                         "max_results": str(max_results),
@@ -306,7 +310,7 @@ class DedupVisionClient:
         base_urls = self._candidate_base_urls()
         for i, base_url in enumerate(base_urls):
             try:
-                with httpx.Client(base_url=base_url, timeout=self.timeout_s) as client:
+                with self._http().client(base_url, timeout=self.timeout_s) as client:
                     with open(file_path, "rb") as f:
                         files = {"file": (upload_name, f)}
                         resp = client.post(
@@ -0,0 +1,247 @@
+"""
+Shared keep-alive HTTP client pools for outbound integrations.
+
+Integration clients used to build a fresh `httpx.Client` per call, paying a
+TCP/TLS handshake every time. Each integration now borrows a long-lived
+client from its named pool instead; connections are reused up to the
+configured limits and released when the process shuts down.
+
+One underlying client exists per (base_url, timeout) of an integration so
+fallback endpoints keep their own connection pool. Async clients are bound
+to the event loop that created them; a call from another loop gets its own,
+and the client it replaces is closed on its original loop while that loop
+still runs.
+
+Pools are opened by the API lifespan and the worker CLI and expose a status
+snapshot for the health and metrics surfaces next to the circuit breakers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Dict, Iterator, Tuple
+
+import httpx
+
+from yuantus.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Integrations whose clients borrow from a pool; opened eagerly at startup so
+# their status is visible before the first call.
+INTEGRATION_POOL_NAMES: Tuple[str, ...] = (
+    "cad_connector",
+    "cad_extractor",
+    "cad_ml",
+    "dedup_vision",
+)
+
+_ClientKey = Tuple[str, float]
+
+
+def _http2_enabled() -> bool:
+    if not get_settings().INTEGRATION_HTTP2_ENABLED:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning(
+            "INTEGRATION_HTTP2_ENABLED is set but 'h2' is not installed; using HTTP/1.1"
+        )
+        return False
+    return True
+
+
+class HttpClientPool:
+    """Long-lived httpx clients of one integration. Thread-safe."""
+
+    def __init__(self, name: str) -> None:
+        settings = get_settings()
+        self.name = name
+        self.limits = httpx.Limits(
+            max_connections=int(settings.INTEGRATION_HTTP_MAX_CONNECTIONS),
+            max_keepalive_connections=int(
+                settings.INTEGRATION_HTTP_MAX_KEEPALIVE_CONNECTIONS
+            ),
+            keepalive_expiry=float(settings.INTEGRATION_HTTP_KEEPALIVE_EXPIRY_SECONDS),
+        )
+        self.http2 = _http2_enabled()
+        self._lock = threading.Lock()
+        self._clients: Dict[_ClientKey, httpx.Client] = {}
+        self._async_clients: Dict[
+            _ClientKey, Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]
+        ] = {}
+        self._in_flight = 0
+        self._requests_total = 0
+
+    @contextmanager
+    def client(self, base_url: str, *, timeout: float) -> Iterator[httpx.Client]:
+        """Borrow the shared client for `base_url`; it stays open afterwards."""
+        key = (base_url, float(timeout))
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None or client.is_closed:
+                client = self._clients[key] = httpx.Client(
+                    base_url=base_url,
+                    timeout=timeout,
+                    limits=self.limits,
+                    http2=self.http2,
+                )
+        with self._borrowed():
+            yield client
+
+    @asynccontextmanager
+    async def async_client(
+        self, base_url: str, *, timeout: float
+    ) -> AsyncIterator[httpx.AsyncClient]:
+        """Async variant of `client()`, bound to the running event loop."""
+        key = (base_url, float(timeout))
+        loop = asyncio.get_running_loop()
+        replaced = None
+        with self._lock:
+            entry = self._async_clients.get(key)
+            if entry is None or entry[0] is not loop or entry[1].is_closed:
+                # A client from another loop cannot be reused from here.
+                replaced = entry
+                entry = self._async_clients[key] = (
+                    loop,
+                    httpx.AsyncClient(
+                        base_url=base_url,
+                        timeout=timeout,
+                        limits=self.limits,
+                        http2=self.http2,
+                    ),
+                )
+        if replaced is not None:
+            _close_on_owner_loop(*replaced)
+        with self._borrowed():
+            yield entry[1]
+
+    @contextmanager
+    def _borrowed(self) -> Iterator[None]:
+        with self._lock:
+            self._in_flight += 1
+            self._requests_total += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def close(self) -> None:
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+        for client in clients:
+            client.close()
+
+    async def aclose(self) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entries = list(self._async_clients.values())
+            self._async_clients.clear()
+        for owner, client in entries:
+            if owner is loop:
+                await client.aclose()
+            else:
+                _close_on_owner_loop(owner, client)
+        self.close()
+
+    def status(self) -> Dict[str, object]:
+        with self._lock:
+            clients = list(self._clients.values()) + [
+                client for _, client in self._async_clients.values()
+            ]
+            in_flight = self._in_flight
+            requests_total = self._requests_total
+        connections = idle = 0
+        for client in clients:
+            open_count, idle_count = _connection_counts(client)
+            connections += open_count
+            idle += idle_count
+        return {
+            "name": self.name,
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "clients": len(clients),
+            "connections": connections,
+            "idle_connections": idle,
+            "in_flight": in_flight,
+            "requests_total": requests_total,
+        }
+
+
+def _close_on_owner_loop(
+    owner: asyncio.AbstractEventLoop, client: httpx.AsyncClient
+) -> None:
+    """Close an async client on the loop it belongs to, if that loop still runs.
+
+    A client of a closed loop cannot be awaited any more; its connections were
+    torn down with the loop.
+    """
+    if client.is_closed or owner.is_closed() or not owner.is_running():
+        return
+    closing = client.aclose()
+    try:
+        asyncio.run_coroutine_threadsafe(closing, owner)
+    except RuntimeError:  # the loop closed in the meantime
+        closing.close()
+
+
+def _connection_counts(client: httpx.BaseClient) -> Tuple[int, int]:
+    """(open, idle) connections of the client's httpcore pool, best effort."""
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", None) or ())
+    idle = 0
+    for connection in connections:
+        try:
+            idle += bool(connection.is_idle())
+        except Exception:  # pragma: no cover - httpcore internals
+            continue
+    return len(connections), idle
+
+
+_pools: Dict[str, HttpClientPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_http_pool(name: str) -> HttpClientPool:
+    """Return the shared pool for integration `name`, creating on first call."""
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            pool = _pools[name] = HttpClientPool(name)
+        return pool
+
+
+def list_http_pools() -> Dict[str, HttpClientPool]:
+    with _pools_lock:
+        return dict(_pools)
+
+
+def open_http_pools() -> None:
+    """Create the integration pools at process startup."""
+    for name in INTEGRATION_POOL_NAMES:
+        get_http_pool(name)
+
+
+def close_http_pools() -> None:
+    """Close every pooled sync client and forget the pools."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+async def aclose_http_pools() -> None:
+    """Like `close_http_pools()`, also closing async clients of this loop."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        await pool.aclose()
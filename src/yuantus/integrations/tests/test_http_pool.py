@@ -0,0 +1,130 @@
+"""Keep-alive integration client pools — a local HTTP/1.1 server counts the
+TCP connections the pooled clients open."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from yuantus.integrations import http_pool
+from yuantus.integrations.cad_extractor import CadExtractorClient
+from yuantus.observability.metrics import render_http_pool_metrics
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):  # noqa: N802 - http.server API
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self.server.peers.add(self.client_address)
+        body = json.dumps({"ok": True, "attributes": {"n": len(self.server.peers)}})
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    do_GET = do_POST
+
+    def log_message(self, *_args):
+        pass
+
+
+@pytest.fixture()
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.peers = set()
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield httpd, f"http://127.0.0.1:{httpd.server_address[1]}"
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pools():
+    http_pool.close_http_pools()
+    yield
+    http_pool.close_http_pools()
+
+
+def test_client_calls_reuse_one_connection(server, tmp_path):
+    httpd, url = server
+    cad = tmp_path / "part.step"
+    cad.write_bytes(b"ISO-10303-21;")
+    client = CadExtractorClient(base_url=url)
+    for _ in range(3):
+        assert client.extract_sync(file_path=str(cad))["ok"] is True
+    assert len(httpd.peers) == 1
+
+    status = http_pool.get_http_pool("cad_extractor").status()
+    assert status["requests_total"] == 3
+    assert status["in_flight"] == 0
+    assert status["clients"] == 1
+    assert status["connections"] == status["idle_connections"] == 1
+
+
+def test_async_clients_are_bound_to_their_loop(server):
+    httpd, url = server
+    pool = http_pool.get_http_pool("cad_ml")
+
+    async def call_twice():
+        for _ in range(2):
+            async with pool.async_client(url, timeout=5) as client:
+                (await client.get("/")).raise_for_status()
+        await http_pool.aclose_http_pools()
+
+    asyncio.run(call_twice())
+    asyncio.run(call_twice())
+    # one connection per event loop, none leaked across loops
+    assert len(httpd.peers) == 2
+    assert http_pool.list_http_pools() == {}
+
+
+def test_replaced_async_client_is_closed_on_its_own_loop(server):
+    _httpd, url = server
+    pool = http_pool.get_http_pool("cad_ml")
+    other_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=other_loop.run_forever, daemon=True)
+    thread.start()
+
+    async def borrow():
+        async with pool.async_client(url, timeout=5) as client:
+            (await client.get("/")).raise_for_status()
+            return client
+
+    try:
+        old = asyncio.run_coroutine_threadsafe(borrow(), other_loop).result(5)
+        new = asyncio.run(borrow())
+        assert new is not old
+        # The replaced client's aclose() runs on the loop that owns it.
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0.05), other_loop).result(5)
+        assert old.is_closed
+        assert pool.status()["clients"] == 1
+    finally:
+        other_loop.call_soon_threadsafe(other_loop.stop)
+        thread.join(5)
+        other_loop.close()
+
+
+def test_open_close_and_metrics():
+    http_pool.open_http_pools()
+    pools = http_pool.list_http_pools()
+    assert sorted(pools) == sorted(http_pool.INTEGRATION_POOL_NAMES)
+    with pools["dedup_vision"].client("http://127.0.0.1:9", timeout=1) as client:
+        assert pools["dedup_vision"].status()["in_flight"] == 1
+    text = render_http_pool_metrics(pool.status() for pool in pools.values())
+    assert "# TYPE yuantus_http_pool_requests_total counter" in text
+    assert 'yuantus_http_pool_requests_total{name="dedup_vision"} 1' in text
+    assert 'yuantus_http_pool_in_flight{name="cad_ml"} 0' in text
+
+    http_pool.close_http_pools()
+    assert client.is_closed
+    assert http_pool.list_http_pools() == {}
+    assert render_http_pool_metrics([]) == ""
@@ -27,6 +27,30 @@ def import_all_models() -> None:
     from yuantus.meta_engine.models import (  # noqa: F401
         meta_bom_writeback_audit as _meta_bom_writeback_audit,
     )
+    from yuantus.meta_engine.models import bom_closure as _bom_closure  # noqa: F401
+    # Registers the flush hooks that keep meta_bom_closure current.
+    from yuantus.meta_engine.services import (  # noqa: F401
+        bom_closure_service as _bom_closure_service,
+    )
+    from yuantus.meta_engine.models import (  # noqa: F401
+        cad_artifact_cache as _cad_artifact_cache,
+    )
+    from yuantus.meta_engine.models import (  # noqa: F401
+        parallel_ops_job_stats as _parallel_ops_job_stats,
+    )
+    from yuantus.meta_engine.models import item_search as _item_search  # noqa: F401
+    # Registers the flush hook that keeps meta_item_search current.
+    from yuantus.meta_engine.services import (  # noqa: F401
+        item_search_index_service as _item_search_index_service,
+    )
+    # Registers the flush hooks that invalidate compiled ACLs.
+    from yuantus.meta_engine.services import (  # noqa: F401
+        meta_permission_service as _meta_permission_service,
+    )
+    # Registers the flush hooks that version the ItemType metadata cache.
+    from yuantus.meta_engine.services import (  # noqa: F401
+        metadata_cache as _metadata_cache,
+    )
     from yuantus.meta_engine.dedup import models as _dedup  # noqa: F401
     from yuantus.meta_engine.erp_publication import models as _erp_publication  # noqa: F401
     from yuantus.meta_engine.ecm_publication import models as _ecm_publication  # noqa: F401
@@ -4,12 +4,19 @@ for the PLM box / packaging domain.
 """
 from __future__ import annotations
 
+import copy
+import functools
+import threading
+import time
 import uuid
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
 
+from sqlalchemy import Float, and_, case, cast, event, func, or_, select
 from sqlalchemy.orm import Session
 
+from yuantus.config import get_settings
 from yuantus.meta_engine.box.models import BoxContent, BoxItem, BoxState, BoxType
+from yuantus.meta_engine.services.sql_helpers import session_scope_key
 
 
 # ---------------------------------------------------------------------------
@@ -23,6 +30,156 @@ _ALLOWED_TRANSITIONS: Dict[str, List[str]] = {
 }
 
 
+# ---------------------------------------------------------------------------
+# Fleet analytics result cache
+# ---------------------------------------------------------------------------
+#
+# Fleet-level panels are single grouped queries, but a dashboard polls a dozen
+# of them. With BOX_ANALYTICS_CACHE_TTL_SECONDS > 0 each panel's result is
+# shared per tenant scope for that many seconds; box/content writes through
+# BoxService in this process drop every cached panel, and again once their
+# transaction commits. A session holding flushed but uncommitted box writes
+# neither reads nor fills the cache, so a rollback leaves no phantom rows.
+
+_PanelKey = Tuple[str, Optional[str], Optional[str], str]
+
+_PANEL_CACHE: Dict[_PanelKey, Tuple[float, Dict[str, Any]]] = {}
+_PANEL_CACHE_LOCK = threading.Lock()
+_PANEL_GENERATION = 0
+
+_F = TypeVar("_F", bound=Callable[..., Dict[str, Any]])
+
+_BOX_MODELS = (BoxItem, BoxContent)
+_TOUCHED_KEY = "yuantus.box_analytics.touched"
+_REGISTERED = False
+_REGISTER_LOCK = threading.Lock()
+
+
+def invalidate_box_analytics_cache() -> None:
+    """Drop every cached fleet analytics panel in this process."""
+    global _PANEL_GENERATION
+    with _PANEL_CACHE_LOCK:
+        _PANEL_GENERATION += 1
+        _PANEL_CACHE.clear()
+
+
+def _cached_panel(fn: _F) -> _F:
+    @functools.wraps(fn)
+    def wrapper(self: "BoxService") -> Dict[str, Any]:
+        ttl = get_settings().BOX_ANALYTICS_CACHE_TTL_SECONDS
+        if ttl <= 0 or self.session.info.get(_TOUCHED_KEY):
+            return fn(self)
+        key = (*session_scope_key(self.session), fn.__name__)
+        now = time.monotonic()
+        with _PANEL_CACHE_LOCK:
+            cached = _PANEL_CACHE.get(key)
+            generation = _PANEL_GENERATION
+        if cached is not None and cached[0] > now:
+            return copy.deepcopy(cached[1])
+
+        result = fn(self)
+        with _PANEL_CACHE_LOCK:
+            if _PANEL_GENERATION == generation:
+                for stale in [k for k, (exp, _) in _PANEL_CACHE.items() if exp <= now]:
+                    del _PANEL_CACHE[stale]
+                _PANEL_CACHE[key] = (now + ttl, copy.deepcopy(result))
+        return result
+
+    return wrapper  # type: ignore[return-value]
+
+
+def _after_flush(session: Session, flush_context) -> None:  # type: ignore[no-untyped-def]
+    if any(
+        isinstance(obj, _BOX_MODELS)
+        for obj in (*session.new, *session.dirty, *session.deleted)
+    ):
+        session.info[_TOUCHED_KEY] = True
+
+
+def _after_commit(session: Session) -> None:
+    if session.info.pop(_TOUCHED_KEY, False):
+        invalidate_box_analytics_cache()
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_TOUCHED_KEY, None)
+
+
+def register_session_hooks() -> None:
+    global _REGISTERED
+    if _REGISTERED:
+        return
+    with _REGISTER_LOCK:
+        if _REGISTERED:
+            return
+        event.listen(Session, "after_flush", _after_flush)
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_rollback", _after_rollback)
+        _REGISTERED = True
+
+
+register_session_hooks()
+
+
+# ---------------------------------------------------------------------------
+# SQL building blocks for fleet analytics
+# ---------------------------------------------------------------------------
+
+
+def _has_text(column):
+    """SQL twin of ``bool(value)`` for optional string columns."""
+    return and_(column.isnot(None), column != "")
+
+
+def _count_if(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+_HAS_DIMENSIONS = and_(
+    BoxItem.width.isnot(None),
+    BoxItem.height.isnot(None),
+    BoxItem.depth.isnot(None),
+)
+
+
+def _contents_stats():
+    """Per-box content aggregates: line count, total quantity, traced lines."""
+    return (
+        select(
+            BoxContent.box_id.label("box_id"),
+            func.count(BoxContent.id).label("lines"),
+            func.sum(func.coalesce(BoxContent.quantity, 0.0)).label("quantity"),
+            func.sum(case((_has_text(BoxContent.lot_serial), 1), else_=0)).label(
+                "traced"
+            ),
+        )
+        .group_by(BoxContent.box_id)
+        .subquery("box_contents_stats")
+    )
+
+
+def _fill_pct(count: int, max_quantity: Optional[int]) -> float:
+    if max_quantity is not None and max_quantity > 0:
+        return round(count / max_quantity * 100, 1)
+    return 0.0
+
+
+def _turnover_class(count: int) -> str:
+    if count >= 5:
+        return "high"
+    if count == 0:
+        return "low"
+    return "normal"
+
+
+def _age_tier(count: int) -> str:
+    if count > 10:
+        return "mature"
+    if count >= 4:
+        return "active"
+    return "fresh"
+
+
 class BoxService:
     """Domain service for PLM box / packaging management."""
 
@@ -84,6 +241,7 @@ class BoxService:
         )
         self.session.add(box)
         self.session.flush()
+        invalidate_box_analytics_cache()
         return box
 
     def get_box(self, box_id: str) -> Optional[BoxItem]:
@@ -113,6 +271,7 @@ class BoxService:
             if hasattr(box, key) and key not in ("id", "created_at", "created_by_id"):
                 setattr(box, key, value)
         self.session.flush()
+        invalidate_box_analytics_cache()
         return box
 
     # ------------------------------------------------------------------
@@ -132,6 +291,7 @@ class BoxService:
             )
         box.state = target_state
         self.session.flush()
+        invalidate_box_analytics_cache()
         return box
 
     # ------------------------------------------------------------------
@@ -161,6 +321,7 @@ class BoxService:
         )
         self.session.add(content)
         self.session.flush()
+        invalidate_box_analytics_cache()
         return content
 
     def list_contents(self, box_id: str) -> List[BoxContent]:
@@ -177,6 +338,7 @@ class BoxService:
             return False
         self.session.delete(content)
         self.session.flush()
+        invalidate_box_analytics_cache()
         return True
 
     # ------------------------------------------------------------------
@@ -224,48 +386,116 @@ class BoxService:
             ],
         }
 
+    # ------------------------------------------------------------------
+    # Fleet query helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _stats():
+        """Content aggregates subquery and the per-box line count (0 if empty)."""
+        stats = _contents_stats()
+        return stats, func.coalesce(stats.c.lines, 0)
+
+    def _count_by_state(self) -> Dict[str, int]:
+        rows = self.session.execute(
+            select(BoxItem.state, func.count()).group_by(BoxItem.state)
+        ).all()
+        return {state: count for state, count in rows}
+
+    def _flagged_ids(self, stats, **conditions) -> Tuple[int, Dict[str, List[str]]]:
+        """Fleet size plus, per named condition, the ids of matching boxes."""
+        total = self.session.execute(
+            select(func.count()).select_from(BoxItem)
+        ).scalar_one()
+        flagged: Dict[str, List[str]] = {name: [] for name in conditions}
+        rows = self.session.execute(
+            select(
+                BoxItem.id,
+                *(case((cond, 1), else_=0) for cond in conditions.values()),
+            )
+            .outerjoin(stats, stats.c.box_id == BoxItem.id)
+            .where(or_(*conditions.values()))
+            .order_by(BoxItem.id)
+        )
+        for box_id, *flags in rows:
+            for name, flag in zip(conditions, flags):
+                if flag:
+                    flagged[name].append(box_id)
+        return total, flagged
+
+    def _per_box_rows(self) -> List[Tuple[Any, ...]]:
+        """(id, name, state, max_quantity, contents count, total quantity) per box."""
+        stats, lines = self._stats()
+        return self.session.execute(
+            select(
+                BoxItem.id,
+                BoxItem.name,
+                BoxItem.state,
+                BoxItem.max_quantity,
+                lines,
+                func.coalesce(stats.c.quantity, 0.0),
+            )
+            .outerjoin(stats, stats.c.box_id == BoxItem.id)
+            .order_by(BoxItem.id)
+        ).all()
+
     # ------------------------------------------------------------------
     # Analytics (C20)
     # ------------------------------------------------------------------
 
+    @_cached_panel
     def overview(self) -> Dict[str, Any]:
         """High-level overview: total counts, state and type breakdowns."""
-        boxes = self.session.query(BoxItem).all()
+        rows = self.session.execute(
+            select(
+                BoxItem.state,
+                BoxItem.box_type,
+                func.count(),
+                _count_if(BoxItem.is_active),
+                func.sum(BoxItem.cost),
+            ).group_by(BoxItem.state, BoxItem.box_type)
+        ).all()
         by_state: Dict[str, int] = {}
         by_type: Dict[str, int] = {}
+        total = 0
         active_count = 0
         total_cost = 0.0
 
-        for b in boxes:
-            by_state[b.state] = by_state.get(b.state, 0) + 1
-            by_type[b.box_type] = by_type.get(b.box_type, 0) + 1
-            if b.is_active:
-                active_count += 1
-            if b.cost is not None:
-                total_cost += b.cost
+        for state, box_type, count, active, cost in rows:
+            by_state[state] = by_state.get(state, 0) + count
+            by_type[box_type] = by_type.get(box_type, 0) + count
+            total += count
+            active_count += int(active)
+            if cost is not None:
+                total_cost += cost
 
         return {
-            "total": len(boxes),
+            "total": total,
             "active": active_count,
             "by_state": by_state,
             "by_type": by_type,
             "total_cost": total_cost,
         }
 
+    @_cached_panel
     def material_analytics(self) -> Dict[str, Any]:
         """Breakdown of boxes by material value."""
-        boxes = self.session.query(BoxItem).all()
+        rows = self.session.execute(
+            select(BoxItem.material, func.count()).group_by(BoxItem.material)
+        ).all()
         by_material: Dict[str, int] = {}
+        total = 0
         no_material = 0
 
-        for b in boxes:
-            if b.material:
-                by_material[b.material] = by_material.get(b.material, 0) + 1
+        for material, count in rows:
+            total += count
+            if material:
+                by_material[material] = count
             else:
-                no_material += 1
+                no_material += count
 
         return {
-            "total": len(boxes),
+            "total": total,
             "by_material": by_material,
             "no_material": no_material,
         }
@@ -329,56 +559,50 @@ class BoxService:
     # Analytics / ops report (C23)
     # ------------------------------------------------------------------
 
+    @_cached_panel
     def transition_summary(self) -> Dict[str, Any]:
         """Aggregate state distribution across all boxes with transition eligibility counts."""
-        boxes = self.session.query(BoxItem).all()
-        by_state: Dict[str, int] = {}
-        draft_to_active_eligible = 0
-        active_to_archive_eligible = 0
-
-        for b in boxes:
-            by_state[b.state] = by_state.get(b.state, 0) + 1
-            if b.state == BoxState.DRAFT.value:
-                draft_to_active_eligible += 1
-            elif b.state == BoxState.ACTIVE.value:
-                active_to_archive_eligible += 1
+        by_state = self._count_by_state()
 
         return {
-            "total": len(boxes),
+            "total": sum(by_state.values()),
             "by_state": by_state,
-            "draft_to_active_eligible": draft_to_active_eligible,
-            "active_to_archive_eligible": active_to_archive_eligible,
+            "draft_to_active_eligible": by_state.get(BoxState.DRAFT.value, 0),
+            "active_to_archive_eligible": by_state.get(BoxState.ACTIVE.value, 0),
         }
 
+    @_cached_panel
     def active_archive_breakdown(self) -> Dict[str, Any]:
         """Breakdown of active vs archived boxes with cost and type detail."""
-        boxes = self.session.query(BoxItem).all()
-
-        active_boxes: List[BoxItem] = []
-        archived_boxes: List[BoxItem] = []
-
-        for b in boxes:
-            if b.state == BoxState.ACTIVE.value:
-                active_boxes.append(b)
-            elif b.state == BoxState.ARCHIVED.value:
-                archived_boxes.append(b)
-
-        def _build_group(group: List[BoxItem]) -> Dict[str, Any]:
-            total_cost = 0.0
-            by_type: Dict[str, int] = {}
-            for b in group:
-                if b.cost is not None:
-                    total_cost += b.cost
-                by_type[b.box_type] = by_type.get(b.box_type, 0) + 1
-            return {
-                "count": len(group),
-                "total_cost": total_cost,
-                "by_type": by_type,
-            }
+        rows = self.session.execute(
+            select(
+                BoxItem.state,
+                BoxItem.box_type,
+                func.count(),
+                func.sum(BoxItem.cost),
+            )
+            .where(
+                BoxItem.state.in_(
+                    [BoxState.ACTIVE.value, BoxState.ARCHIVED.value]
+                )
+            )
+            .group_by(BoxItem.state, BoxItem.box_type)
+        ).all()
+        groups: Dict[str, Dict[str, Any]] = {
+            state: {"count": 0, "total_cost": 0.0, "by_type": {}}
+            for state in (BoxState.ACTIVE.value, BoxState.ARCHIVED.value)
+        }
+
+        for state, box_type, count, cost in rows:
+            group = groups[state]
+            group["count"] += count
+            if cost is not None:
+                group["total_cost"] += cost
+            group["by_type"][box_type] = count
 
         return {
-            "active": _build_group(active_boxes),
-            "archived": _build_group(archived_boxes),
+            "active": groups[BoxState.ACTIVE.value],
+            "archived": groups[BoxState.ARCHIVED.value],
         }
 
     def ops_report(self, box_id: str) -> Dict[str, Any]:
@@ -417,32 +641,28 @@ class BoxService:
     # Reconciliation / audit (C26)
     # ------------------------------------------------------------------
 
+    @_cached_panel
     def reconciliation_overview(self) -> Dict[str, Any]:
         """Fleet-wide reconciliation: completeness and consistency metrics."""
-        boxes = self.session.query(BoxItem).all()
-
-        total = len(boxes)
-        with_contents = 0
-        without_contents = 0
-        with_barcode = 0
-        without_barcode = 0
-        with_dimensions = 0
-        with_weight = 0
-
-        for b in boxes:
-            contents = self.list_contents(b.id)
-            if contents:
-                with_contents += 1
-            else:
-                without_contents += 1
-            if b.barcode:
-                with_barcode += 1
-            else:
-                without_barcode += 1
-            if b.width is not None and b.height is not None and b.depth is not None:
-                with_dimensions += 1
-            if b.tare_weight is not None or b.max_gross_weight is not None:
-                with_weight += 1
+        stats, lines = self._stats()
+        total, with_contents, with_barcode, with_dimensions, with_weight = (
+            self.session.execute(
+                select(
+                    func.count(),
+                    _count_if(lines > 0),
+                    _count_if(_has_text(BoxItem.barcode)),
+                    _count_if(_HAS_DIMENSIONS),
+                    _count_if(
+                        or_(
+                            BoxItem.tare_weight.isnot(None),
+                            BoxItem.max_gross_weight.isnot(None),
+                        )
+                    ),
+                )
+                .select_from(BoxItem)
+                .outerjoin(stats, stats.c.box_id == BoxItem.id)
+            ).one()
+        )
 
         completeness_pct = round(
             (with_barcode + with_dimensions + with_weight) / (total * 3) * 100, 1
@@ -451,45 +671,38 @@ class BoxService:
         return {
             "total": total,
             "with_contents": with_contents,
-            "without_contents": without_contents,
+            "without_contents": total - with_contents,
             "with_barcode": with_barcode,
-            "without_barcode": without_barcode,
+            "without_barcode": total - with_barcode,
             "with_dimensions": with_dimensions,
             "with_weight": with_weight,
             "completeness_pct": completeness_pct,
         }
 
+    @_cached_panel
     def audit_summary(self) -> Dict[str, Any]:
         """Audit checks: missing fields, data quality issues."""
-        boxes = self.session.query(BoxItem).all()
-
-        no_material: List[str] = []
-        no_dimensions: List[str] = []
-        no_cost: List[str] = []
-        archived_with_contents: List[str] = []
-
-        for b in boxes:
-            if not b.material:
-                no_material.append(b.id)
-            if b.width is None or b.height is None or b.depth is None:
-                no_dimensions.append(b.id)
-            if b.cost is None:
-                no_cost.append(b.id)
-            if b.state == BoxState.ARCHIVED.value:
-                contents = self.list_contents(b.id)
-                if contents:
-                    archived_with_contents.append(b.id)
+        stats, lines = self._stats()
+        total, flagged = self._flagged_ids(
+            stats,
+            no_material=~_has_text(BoxItem.material),
+            no_dimensions=~_HAS_DIMENSIONS,
+            no_cost=BoxItem.cost.is_(None),
+            archived_with_contents=and_(
+                BoxItem.state == BoxState.ARCHIVED.value, lines > 0
+            ),
+        )
 
         return {
-            "total": len(boxes),
-            "no_material": len(no_material),
-            "no_material_ids": no_material,
-            "no_dimensions": len(no_dimensions),
-            "no_dimensions_ids": no_dimensions,
-            "no_cost": len(no_cost),
-            "no_cost_ids": no_cost,
-            "archived_with_contents": len(archived_with_contents),
-            "archived_with_contents_ids": archived_with_contents,
+            "total": total,
+            "no_material": len(flagged["no_material"]),
+            "no_material_ids": flagged["no_material"],
+            "no_dimensions": len(flagged["no_dimensions"]),
+            "no_dimensions_ids": flagged["no_dimensions"],
+            "no_cost": len(flagged["no_cost"]),
+            "no_cost_ids": flagged["no_cost"],
+            "archived_with_contents": len(flagged["archived_with_contents"]),
+            "archived_with_contents_ids": flagged["archived_with_contents"],
         }
 
     def box_reconciliation(self, box_id: str) -> Dict[str, Any]:
@@ -546,87 +759,80 @@ class BoxService:
     # Capacity / Compliance (C29)
     # ------------------------------------------------------------------
 
+    @_cached_panel
     def capacity_overview(self) -> Dict[str, Any]:
         """Fleet-wide capacity metrics: fill rates and utilization bands."""
-        boxes = self.session.query(BoxItem).all()
-
-        total = len(boxes)
-        with_max_quantity = 0
-        with_weight_limit = 0
-        fill_rates: List[float] = []
-        bands: Dict[str, int] = {"high": 0, "medium": 0, "low": 0}
-
-        for b in boxes:
-            if b.max_quantity is not None:
-                with_max_quantity += 1
-            if b.max_gross_weight is not None:
-                with_weight_limit += 1
-
-            # Fill rate: contents count / max_quantity for boxes that have both
-            if b.max_quantity is not None and b.max_quantity > 0:
-                contents = self.list_contents(b.id)
-                fill_pct = len(contents) / b.max_quantity * 100
-                fill_rates.append(fill_pct)
-                if fill_pct >= 80:
-                    bands["high"] += 1
-                elif fill_pct >= 50:
-                    bands["medium"] += 1
-                else:
-                    bands["low"] += 1
-
-        avg_fill_rate = round(sum(fill_rates) / len(fill_rates), 1) if fill_rates else 0.0
+        stats, lines = self._stats()
+        # Fill rate: contents count / max_quantity for boxes that have both
+        sized = BoxItem.max_quantity > 0
+        fill = cast(lines, Float) / func.nullif(BoxItem.max_quantity, 0) * 100
+        (
+            total,
+            with_max_quantity,
+            with_weight_limit,
+            avg_fill,
+            high,
+            medium,
+            low,
+        ) = self.session.execute(
+            select(
+                func.count(),
+                _count_if(BoxItem.max_quantity.isnot(None)),
+                _count_if(BoxItem.max_gross_weight.isnot(None)),
+                func.avg(case((sized, fill))),
+                _count_if(and_(sized, fill >= 80)),
+                _count_if(and_(sized, fill >= 50, fill < 80)),
+                _count_if(and_(sized, fill < 50)),
+            )
+            .select_from(BoxItem)
+            .outerjoin(stats, stats.c.box_id == BoxItem.id)
+        ).one()
 
         return {
             "total": total,
             "with_max_quantity": with_max_quantity,
             "with_weight_limit": with_weight_limit,
-            "average_fill_rate": avg_fill_rate,
-            "bands": bands,
+            "average_fill_rate": round(avg_fill, 1) if avg_fill is not None else 0.0,
+            "bands": {"high": high, "medium": medium, "low": low},
         }
 
+    @_cached_panel
     def compliance_summary(self) -> Dict[str, Any]:
         """Dimensional compliance checks across all boxes."""
-        boxes = self.session.query(BoxItem).all()
-
-        missing_dimensions = 0
-        missing_weight = 0
-        exceeding_weight_limit = 0
-        over_capacity = 0
-        compliant = 0
-        non_compliant = 0
-
-        for b in boxes:
-            is_compliant = True
-
-            if b.width is None or b.height is None or b.depth is None:
-                missing_dimensions += 1
-                is_compliant = False
-
-            if b.tare_weight is None:
-                missing_weight += 1
-                is_compliant = False
-
-            contents = self.list_contents(b.id)
-            if contents and b.max_gross_weight is None:
-                exceeding_weight_limit += 1
-                is_compliant = False
-
-            if b.max_quantity is not None and len(contents) > b.max_quantity:
-                over_capacity += 1
-                is_compliant = False
-
-            if is_compliant:
-                compliant += 1
-            else:
-                non_compliant += 1
+        stats, lines = self._stats()
+        missing_dimensions = ~_HAS_DIMENSIONS
+        missing_weight = BoxItem.tare_weight.is_(None)
+        exceeding_weight_limit = and_(lines > 0, BoxItem.max_gross_weight.is_(None))
+        over_capacity = and_(
+            BoxItem.max_quantity.isnot(None), lines > BoxItem.max_quantity
+        )
+        total, dims, weight, exceeding, over, non_compliant = self.session.execute(
+            select(
+                func.count(),
+                _count_if(missing_dimensions),
+                _count_if(missing_weight),
+                _count_if(exceeding_weight_limit),
+                _count_if(over_capacity),
+                _count_if(
+                    or_(
+                        missing_dimensions,
+                        missing_weight,
+                        exceeding_weight_limit,
+                        over_capacity,
+                    )
+                ),
+            )
+            .select_from(BoxItem)
+            .outerjoin(stats, stats.c.box_id == BoxItem.id)
+        ).one()
 
         return {
-            "total": len(boxes),
-            "missing_dimensions": missing_dimensions,
-            "missing_weight": missing_weight,
-            "exceeding_weight_limit": exceeding_weight_limit,
-            "over_capacity": over_capacity,
-            "compliant": compliant,
+            "total": total,
+            "missing_dimensions": dims,
+            "missing_weight": weight,
+            "exceeding_weight_limit": exceeding,
+            "over_capacity": over,
+            "compliant": total - non_compliant,
             "non_compliant": non_compliant,
         }
 
@@ -684,37 +890,29 @@ class BoxService:
     # Policy / Exceptions (C32)
     # ------------------------------------------------------------------
 
+    @_cached_panel
     def policy_overview(self) -> Dict[str, Any]:
         """Fleet-wide policy summary: compliance checks across all boxes."""
-        boxes = self.session.query(BoxItem).all()
-
-        total = len(boxes)
-        with_barcode = 0
-        with_material = 0
-        with_dimensions = 0
-        with_cost = 0
-        fully_compliant = 0
-
-        for b in boxes:
-            has_barcode = bool(b.barcode)
-            has_material = bool(b.material)
-            has_dims = (
-                b.width is not None
-                and b.height is not None
-                and b.depth is not None
-            )
-            has_cost = b.cost is not None
-
-            if has_barcode:
-                with_barcode += 1
-            if has_material:
-                with_material += 1
-            if has_dims:
-                with_dimensions += 1
-            if has_cost:
-                with_cost += 1
-            if has_barcode and has_material and has_dims and has_cost:
-                fully_compliant += 1
+        has_barcode = _has_text(BoxItem.barcode)
+        has_material = _has_text(BoxItem.material)
+        has_cost = BoxItem.cost.isnot(None)
+        (
+            total,
+            with_barcode,
+            with_material,
+            with_dimensions,
+            with_cost,
+            fully_compliant,
+        ) = self.session.execute(
+            select(
+                func.count(),
+                _count_if(has_barcode),
+                _count_if(has_material),
+                _count_if(_HAS_DIMENSIONS),
+                _count_if(has_cost),
+                _count_if(and_(has_barcode, has_material, _HAS_DIMENSIONS, has_cost)),
+            ).select_from(BoxItem)
+        ).one()
 
         policy_compliance_pct = (
             round(fully_compliant / total * 100, 1) if total > 0 else None
@@ -730,47 +928,26 @@ class BoxService:
             "policy_compliance_pct": policy_compliance_pct,
         }
 
+    @_cached_panel
     def exceptions_summary(self) -> Dict[str, Any]:
         """Exception flags across fleet: lists of box IDs with issues."""
-        boxes = self.session.query(BoxItem).all()
-
-        missing_barcode: List[str] = []
-        missing_material: List[str] = []
-        missing_cost: List[str] = []
-        archived_active_contents: List[str] = []
-        over_max_quantity: List[str] = []
-
-        for b in boxes:
-            if not b.barcode:
-                missing_barcode.append(b.id)
-            if not b.material:
-                missing_material.append(b.id)
-            if b.cost is None:
-                missing_cost.append(b.id)
-            if b.state == BoxState.ARCHIVED.value:
-                contents = self.list_contents(b.id)
-                if contents:
-                    archived_active_contents.append(b.id)
-            if b.max_quantity is not None:
-                contents = self.list_contents(b.id)
-                if len(contents) > b.max_quantity:
-                    over_max_quantity.append(b.id)
-
-        total_exceptions = (
-            len(missing_barcode)
-            + len(missing_material)
-            + len(missing_cost)
-            + len(archived_active_contents)
-            + len(over_max_quantity)
+        stats, lines = self._stats()
+        _, flagged = self._flagged_ids(
+            stats,
+            missing_barcode=~_has_text(BoxItem.barcode),
+            missing_material=~_has_text(BoxItem.material),
+            missing_cost=BoxItem.cost.is_(None),
+            archived_active_contents=and_(
+                BoxItem.state == BoxState.ARCHIVED.value, lines > 0
+            ),
+            over_max_quantity=and_(
+                BoxItem.max_quantity.isnot(None), lines > BoxItem.max_quantity
+            ),
         )
 
         return {
-            "missing_barcode": missing_barcode,
-            "missing_material": missing_material,
-            "missing_cost": missing_cost,
-            "archived_active_contents": archived_active_contents,
-            "over_max_quantity": over_max_quantity,
-            "total_exceptions": total_exceptions,
+            **flagged,
+            "total_exceptions": sum(len(ids) for ids in flagged.values()),
         }
 
     def box_policy_check(self, box_id: str) -> Dict[str, Any]:
@@ -825,65 +1002,61 @@ class BoxService:
     # Reservations / Traceability (C35)
     # ------------------------------------------------------------------
 
+    @_cached_panel
     def reservations_overview(self) -> Dict[str, Any]:
         """Fleet-wide reservation metrics: box counts by state, content fill rates, reservation readiness."""
-        boxes = self.session.query(BoxItem).all()
-
-        total = len(boxes)
+        stats, lines = self._stats()
+        # One row per (state, contents count, max_quantity) combination; the
+        # per-box rounding of the fill rate is applied to each combination.
+        rows = self.session.execute(
+            select(BoxItem.state, lines, BoxItem.max_quantity, func.count())
+            .select_from(BoxItem)
+            .outerjoin(stats, stats.c.box_id == BoxItem.id)
+            .group_by(BoxItem.state, lines, BoxItem.max_quantity)
+        ).all()
+
+        total = 0
         by_state: Dict[str, int] = {}
         reserved = 0  # boxes that have at least one content line
-        unreserved = 0
-        fill_rates: List[float] = []
-
-        for b in boxes:
-            by_state[b.state] = by_state.get(b.state, 0) + 1
-            contents = self.list_contents(b.id)
-            if contents:
-                reserved += 1
-                if b.max_quantity is not None and b.max_quantity > 0:
-                    fill_rates.append(
-                        round(len(contents) / b.max_quantity * 100, 1)
-                    )
-            else:
-                unreserved += 1
+        fill_sum = 0.0
+        fill_count = 0
 
-        avg_fill_rate = (
-            round(sum(fill_rates) / len(fill_rates), 1) if fill_rates else 0.0
-        )
+        for state, count, max_quantity, boxes in rows:
+            total += boxes
+            by_state[state] = by_state.get(state, 0) + boxes
+            if count:
+                reserved += boxes
+                if max_quantity is not None and max_quantity > 0:
+                    fill_sum += round(count / max_quantity * 100, 1) * boxes
+                    fill_count += boxes
+
+        avg_fill_rate = round(fill_sum / fill_count, 1) if fill_count else 0.0
 
         return {
             "total": total,
             "by_state": by_state,
             "reserved": reserved,
-            "unreserved": unreserved,
+            "unreserved": total - reserved,
             "average_fill_rate": avg_fill_rate,
         }
 
+    @_cached_panel
     def traceability_summary(self) -> Dict[str, Any]:
         """Traceability summary: content lineage counts, boxes with lot/serial tracking."""
-        boxes = self.session.query(BoxItem).all()
-
-        total_contents = 0
-        with_lot_serial = 0
-        without_lot_serial = 0
-        boxes_with_traceability = 0
-        boxes_without_traceability = 0
-
-        for b in boxes:
-            contents = self.list_contents(b.id)
-            box_has_trace = False
-            for c in contents:
-                total_contents += 1
-                if c.lot_serial:
-                    with_lot_serial += 1
-                    box_has_trace = True
-                else:
-                    without_lot_serial += 1
-            if contents:
-                if box_has_trace:
-                    boxes_with_traceability += 1
-                else:
-                    boxes_without_traceability += 1
+        stats, _ = self._stats()
+        (
+            total_contents,
+            with_lot_serial,
+            boxes_with_traceability,
+            boxes_with_contents,
+        ) = self.session.execute(
+            select(
+                func.coalesce(func.sum(stats.c.lines), 0),
+                func.coalesce(func.sum(stats.c.traced), 0),
+                _count_if(stats.c.traced > 0),
+                func.count(),
+            ).select_from(stats.join(BoxItem, BoxItem.id == stats.c.box_id))
+        ).one()
 
         traceability_pct = (
             round(with_lot_serial / total_contents * 100, 1)
@@ -894,9 +1067,11 @@ class BoxService:
         return {
             "total_contents": total_contents,
             "with_lot_serial": with_lot_serial,
-            "without_lot_serial": without_lot_serial,
+            "without_lot_serial": total_contents - with_lot_serial,
             "boxes_with_traceability": boxes_with_traceability,
-            "boxes_without_traceability": boxes_without_traceability,
+            "boxes_without_traceability": (
+                boxes_with_contents - boxes_with_traceability
+            ),
             "traceability_pct": traceability_pct,
         }
 
@@ -945,26 +1120,29 @@ class BoxService:
 
     def export_traceability(self) -> Dict[str, Any]:
         """Export-ready combined reservations + traceability + per-box details."""
-        boxes = self.session.query(BoxItem).all()
-        per_box: List[Dict[str, Any]] = []
-
-        for b in boxes:
-            contents = self.list_contents(b.id)
-            if contents:
-                contents_count = len(contents)
-                lot_serial_count = sum(1 for c in contents if c.lot_serial)
-                fill_pct = (
-                    round(contents_count / b.max_quantity * 100, 1)
-                    if b.max_quantity is not None and b.max_quantity > 0
-                    else 0.0
-                )
-                per_box.append({
-                    "box_id": b.id,
-                    "box_name": b.name,
-                    "contents_count": contents_count,
-                    "lot_serial_count": lot_serial_count,
-                    "fill_pct": fill_pct,
-                })
+        stats, _ = self._stats()
+        rows = self.session.execute(
+            select(
+                BoxItem.id,
+                BoxItem.name,
+                BoxItem.max_quantity,
+                stats.c.lines,
+                stats.c.traced,
+            )
+            .join(stats, stats.c.box_id == BoxItem.id)
+            .order_by(BoxItem.id)
+        ).all()
+
+        per_box: List[Dict[str, Any]] = [
+            {
+                "box_id": box_id,
+                "box_name": name,
+                "contents_count": count,
+                "lot_serial_count": traced,
+                "fill_pct": _fill_pct(count, max_quantity),
+            }
+            for box_id, name, max_quantity, count, traced in rows
+        ]
 
         return {
             "reservations_overview": self.reservations_overview(),
@@ -976,23 +1154,21 @@ class BoxService:
     # Allocation / Custody helpers (C38)
     # ------------------------------------------------------------------
 
+    @_cached_panel
     def allocations_overview(self) -> Dict[str, Any]:
         """Fleet-wide allocation summary: total boxes, allocated vs unallocated,
         allocation rate, boxes by state."""
-        boxes = self.session.query(BoxItem).all()
-
-        total = len(boxes)
-        allocated = 0
-        unallocated = 0
-        by_state: Dict[str, int] = {}
-
-        for b in boxes:
-            by_state[b.state] = by_state.get(b.state, 0) + 1
-            contents = self.list_contents(b.id)
-            if contents:
-                allocated += 1
-            else:
-                unallocated += 1
+        stats, lines = self._stats()
+        rows = self.session.execute(
+            select(BoxItem.state, func.count(), _count_if(lines > 0))
+            .select_from(BoxItem)
+            .outerjoin(stats, stats.c.box_id == BoxItem.id)
+            .group_by(BoxItem.state)
+        ).all()
+
+        by_state: Dict[str, int] = {state: count for state, count, _ in rows}
+        total = sum(by_state.values())
+        allocated = sum(int(allocated) for _, _, allocated in rows)
 
         allocation_rate = (
             round(allocated / total * 100, 1) if total > 0 else 0.0
@@ -1001,38 +1177,37 @@ class BoxService:
         return {
             "total": total,
             "allocated": allocated,
-            "unallocated": unallocated,
+            "unallocated": total - allocated,
             "allocation_rate": allocation_rate,
             "by_state": by_state,
         }
 
+    @_cached_panel
     def custody_summary(self) -> Dict[str, Any]:
         """Custody chain summary: boxes with contents, custody depth stats,
         avg contents per box."""
-        boxes = self.session.query(BoxItem).all()
-
-        total = len(boxes)
-        boxes_with_contents = 0
-        custody_depths: List[int] = []
-        total_contents_count = 0
-
-        for b in boxes:
-            contents = self.list_contents(b.id)
-            depth = len(contents)
-            if depth > 0:
-                boxes_with_contents += 1
-            custody_depths.append(depth)
-            total_contents_count += depth
-
-        max_custody_depth = max(custody_depths) if custody_depths else 0
+        stats, lines = self._stats()
+        total, boxes_with_contents, max_depth, total_contents_count = (
+            self.session.execute(
+                select(
+                    func.count(),
+                    _count_if(lines > 0),
+                    func.max(lines),
+                    func.sum(lines),
+                )
+                .select_from(BoxItem)
+                .outerjoin(stats, stats.c.box_id == BoxItem.id)
+            ).one()
+        )
+
         avg_contents_per_box = (
-            round(total_contents_count / total, 2) if total > 0 else 0.0
+            round((total_contents_count or 0) / total, 2) if total > 0 else 0.0
         )
 
         return {
             "total": total,
             "boxes_with_contents": boxes_with_contents,
-            "max_custody_depth": max_custody_depth,
+            "max_custody_depth": max_depth or 0,
             "avg_contents_per_box": avg_contents_per_box,
         }
 
@@ -1069,21 +1244,17 @@ class BoxService:
     def export_custody(self) -> Dict[str, Any]:
         """Export-ready payload combining allocations_overview, custody_summary,
         and per-box custody details."""
-        boxes = self.session.query(BoxItem).all()
-        per_box: List[Dict[str, Any]] = []
-
-        for b in boxes:
-            contents = self.list_contents(b.id)
-            total_quantity = 0.0
-            for c in contents:
-                total_quantity += (c.quantity or 0.0)
-            per_box.append({
-                "box_id": b.id,
-                "box_name": b.name,
-                "state": b.state,
-                "custody_depth": len(contents),
-                "total_quantity": total_quantity,
-            })
+        rows = self._per_box_rows()
+        per_box: List[Dict[str, Any]] = [
+            {
+                "box_id": box_id,
+                "box_name": name,
+                "state": state,
+                "custody_depth": count,
+                "total_quantity": quantity,
+            }
+            for box_id, name, state, _, count, quantity in rows
+        ]
 
         return {
             "allocations_overview": self.allocations_overview(),
@@ -1095,76 +1266,73 @@ class BoxService:
     # Occupancy / Turnover helpers (C41)
     # ------------------------------------------------------------------
 
+    @_cached_panel
     def occupancy_overview(self) -> Dict[str, Any]:
         """Fleet-wide occupancy summary: total boxes, occupied vs empty,
         occupancy rate, avg fill level (contents qty / max_quantity)."""
-        boxes = self.session.query(BoxItem).all()
-
-        total = len(boxes)
-        occupied = 0
-        empty = 0
-        fill_levels: List[float] = []
-
-        for b in boxes:
-            contents = self.list_contents(b.id)
-            if contents:
-                occupied += 1
-                if b.max_quantity is not None and b.max_quantity > 0:
-                    total_qty = sum((c.quantity or 0.0) for c in contents)
-                    fill_levels.append(
-                        round(total_qty / b.max_quantity * 100, 1)
-                    )
-            else:
-                empty += 1
+        stats, lines = self._stats()
+        total, occupied = self.session.execute(
+            select(func.count(), _count_if(lines > 0))
+            .select_from(BoxItem)
+            .outerjoin(stats, stats.c.box_id == BoxItem.id)
+        ).one()
+        # Fill levels are rounded per box, so group occupied, sized boxes by
+        # (quantity, max_quantity) and weight each level by its box count.
+        levels = self.session.execute(
+            select(stats.c.quantity, BoxItem.max_quantity, func.count())
+            .select_from(stats.join(BoxItem, BoxItem.id == stats.c.box_id))
+            .where(BoxItem.max_quantity > 0)
+            .group_by(stats.c.quantity, BoxItem.max_quantity)
+        ).all()
+
+        fill_sum = 0.0
+        fill_count = 0
+        for quantity, max_quantity, boxes in levels:
+            fill_sum += round((quantity or 0.0) / max_quantity * 100, 1) * boxes
+            fill_count += boxes
 
         occupancy_rate = (
             round(occupied / total * 100, 1) if total > 0 else 0.0
         )
-        avg_fill_level = (
-            round(sum(fill_levels) / len(fill_levels), 1)
-            if fill_levels
-            else 0.0
-        )
+        avg_fill_level = round(fill_sum / fill_count, 1) if fill_count else 0.0
 
         return {
             "total": total,
             "occupied": occupied,
-            "empty": empty,
+            "empty": total - occupied,
             "occupancy_rate": occupancy_rate,
             "avg_fill_level": avg_fill_level,
         }
 
+    @_cached_panel
     def turnover_summary(self) -> Dict[str, Any]:
         """Turnover summary across the fleet: boxes by state transition
         potential, avg contents per active box, high/low turnover detection."""
-        boxes = self.session.query(BoxItem).all()
-
-        total = len(boxes)
-        active_boxes: List[BoxItem] = []
-        active_contents_counts: List[int] = []
-        high_turnover = 0
-        low_turnover = 0
-
-        for b in boxes:
-            if b.state == BoxState.ACTIVE.value:
-                active_boxes.append(b)
-                contents = self.list_contents(b.id)
-                count = len(contents)
-                active_contents_counts.append(count)
-                if count > 5:
-                    high_turnover += 1
-                elif count == 0:
-                    low_turnover += 1
+        stats, lines = self._stats()
+        is_active = BoxItem.state == BoxState.ACTIVE.value
+        total, active_boxes, active_contents, high_turnover, low_turnover = (
+            self.session.execute(
+                select(
+                    func.count(),
+                    _count_if(is_active),
+                    func.sum(case((is_active, lines), else_=0)),
+                    _count_if(and_(is_active, lines > 5)),
+                    _count_if(and_(is_active, lines == 0)),
+                )
+                .select_from(BoxItem)
+                .outerjoin(stats, stats.c.box_id == BoxItem.id)
+            ).one()
+        )
 
         avg_contents = (
-            round(sum(active_contents_counts) / len(active_contents_counts), 2)
-            if active_contents_counts
+            round((active_contents or 0) / active_boxes, 2)
+            if active_boxes
             else 0.0
         )
 
         return {
             "total": total,
-            "active_boxes": len(active_boxes),
+            "active_boxes": active_boxes,
             "avg_contents_per_active": avg_contents,
             "high_turnover": high_turnover,
             "low_turnover": low_turnover,
@@ -1206,32 +1374,18 @@ class BoxService:
     def export_turnover(self) -> Dict[str, Any]:
         """Export-ready payload combining occupancy_overview, turnover_summary,
         and per-box turnover details."""
-        boxes = self.session.query(BoxItem).all()
-        per_box: List[Dict[str, Any]] = []
-
-        for b in boxes:
-            contents = self.list_contents(b.id)
-            contents_count = len(contents)
-            fill_ratio = (
-                round(contents_count / b.max_quantity * 100, 1)
-                if b.max_quantity is not None and b.max_quantity > 0
-                else 0.0
-            )
-            if contents_count >= 5:
-                classification = "high"
-            elif contents_count == 0:
-                classification = "low"
-            else:
-                classification = "normal"
-
-            per_box.append({
-                "box_id": b.id,
-                "box_name": b.name,
-                "state": b.state,
-                "contents_count": contents_count,
-                "fill_ratio": fill_ratio,
-                "classification": classification,
-            })
+        rows = self._per_box_rows()
+        per_box: List[Dict[str, Any]] = [
+            {
+                "box_id": box_id,
+                "box_name": name,
+                "state": state,
+                "contents_count": count,
+                "fill_ratio": _fill_pct(count, max_quantity),
+                "classification": _turnover_class(count),
+            }
+            for box_id, name, state, max_quantity, count, _ in rows
+        ]
 
         return {
             "occupancy_overview": self.occupancy_overview(),
@@ -1243,69 +1397,54 @@ class BoxService:
     # Dwell / Aging helpers (C44)
     # ------------------------------------------------------------------
 
+    @_cached_panel
     def dwell_overview(self) -> Dict[str, Any]:
         """Fleet-wide dwell summary: total boxes, avg items per box,
         boxes with high item count (>10), boxes with low item count (<=2)."""
-        boxes = self.session.query(BoxItem).all()
-
-        total = len(boxes)
-        item_counts: List[int] = []
-        high_dwell: List[str] = []
-        low_dwell: List[str] = []
-
-        for b in boxes:
-            contents = self.list_contents(b.id)
-            count = len(contents)
-            item_counts.append(count)
-            if count > 10:
-                high_dwell.append(b.id)
-            if count <= 2:
-                low_dwell.append(b.id)
-
-        avg_items = (
-            round(sum(item_counts) / len(item_counts), 2)
-            if item_counts
-            else 0.0
+        stats, lines = self._stats()
+        total, flagged = self._flagged_ids(
+            stats, high_dwell=lines > 10, low_dwell=lines <= 2
         )
+        total_items = self.session.execute(
+            select(func.coalesce(func.sum(stats.c.lines), 0)).select_from(
+                stats.join(BoxItem, BoxItem.id == stats.c.box_id)
+            )
+        ).scalar_one()
+
+        avg_items = round(total_items / total, 2) if total else 0.0
 
         return {
             "total": total,
             "avg_items_per_box": avg_items,
-            "high_dwell": len(high_dwell),
-            "high_dwell_ids": high_dwell,
-            "low_dwell": len(low_dwell),
-            "low_dwell_ids": low_dwell,
+            "high_dwell": len(flagged["high_dwell"]),
+            "high_dwell_ids": flagged["high_dwell"],
+            "low_dwell": len(flagged["low_dwell"]),
+            "low_dwell_ids": flagged["low_dwell"],
         }
 
+    @_cached_panel
     def aging_summary(self) -> Dict[str, Any]:
         """Aging summary: boxes grouped by age tier based on item count.
         - mature: >10 items (heavily used)
         - active: 4-10 items
         - fresh: 0-3 items (newly created or underutilized)"""
-        boxes = self.session.query(BoxItem).all()
-
-        mature: List[str] = []
-        active: List[str] = []
-        fresh: List[str] = []
-
-        for b in boxes:
-            contents = self.list_contents(b.id)
-            count = len(contents)
-            if count > 10:
-                mature.append(b.id)
-            elif count >= 4:
-                active.append(b.id)
-            else:
-                fresh.append(b.id)
+        stats, lines = self._stats()
+        tiers: Dict[str, List[str]] = {"mature": [], "active": [], "fresh": []}
+        for box_id, count in self.session.execute(
+            select(BoxItem.id, lines)
+            .outerjoin(stats, stats.c.box_id == BoxItem.id)
+            .order_by(BoxItem.id)
+        ):
+            tiers[_age_tier(count)].append(box_id)
 
         return {
-            "total": len(boxes),
-            "mature": len(mature),
-            "mature_ids": mature,
-            "active": len(active),
-            "active_ids": active,
-            "fresh": len(fresh),
-            "fresh_ids": fresh,
+            "total": sum(len(ids) for ids in tiers.values()),
+            "mature": len(tiers["mature"]),
+            "mature_ids": tiers["mature"],
+            "active": len(tiers["active"]),
+            "active_ids": tiers["active"],
+            "fresh": len(tiers["fresh"]),
+            "fresh_ids": tiers["fresh"],
         }
 
     def box_aging(self, box_id: str) -> Dict[str, Any]:
@@ -1351,32 +1490,18 @@ class BoxService:
     def export_aging(self) -> Dict[str, Any]:
         """Export-ready payload combining dwell_overview, aging_summary,
         and per-box aging details."""
-        boxes = self.session.query(BoxItem).all()
-        per_box: List[Dict[str, Any]] = []
-
-        for b in boxes:
-            contents = self.list_contents(b.id)
-            item_count = len(contents)
-
-            if item_count > 10:
-                age_tier = "mature"
-            elif item_count >= 4:
-                age_tier = "active"
-            else:
-                age_tier = "fresh"
-
-            total_quantity = 0.0
-            for c in contents:
-                total_quantity += (c.quantity or 0.0)
-
-            per_box.append({
-                "box_id": b.id,
-                "box_name": b.name,
-                "state": b.state,
-                "item_count": item_count,
-                "age_tier": age_tier,
-                "total_quantity": total_quantity,
-            })
+        rows = self._per_box_rows()
+        per_box: List[Dict[str, Any]] = [
+            {
+                "box_id": box_id,
+                "box_name": name,
+                "state": state,
+                "item_count": count,
+                "age_tier": _age_tier(count),
+                "total_quantity": quantity,
+            }
+            for box_id, name, state, _, count, quantity in rows
+        ]
 
         return {
             "dwell_overview": self.dwell_overview(),
@@ -7,6 +7,7 @@ and individual cut results with waste/usage tracking.
   - RawMaterial  (meta_raw_materials)  – stock material available for cutting
   - CutPlan      (meta_cut_plans)      – a cutting plan / nesting job
   - CutResult    (meta_cut_results)    – individual cut piece outcome
+  - CutRollup    (meta_cut_rollups)    – maintained per-material, per-month aggregates
 """
 from __future__ import annotations
 
@@ -179,3 +180,51 @@ class CutResult(Base):
 
     # Relationships
     plan = relationship("CutPlan", back_populates="cuts")
+
+
+class CutRollup(Base):
+    """Aggregates of the plans of one material created in one month.
+
+    Maintained by ``CutRollupService`` when plans and cuts are written so the
+    fleet analytics read O(materials x months) rows instead of every plan and
+    cut. Plans without a material roll up under ``material_id`` NULL.
+    """
+
+    __tablename__ = "meta_cut_rollups"
+
+    id = Column(String, primary_key=True)  # "<period>:<material_id or ->"
+    material_id = Column(String, nullable=True, index=True)
+    period = Column(String(7), nullable=False, index=True)  # plan created_at, "YYYY-MM" UTC
+
+    # Plans
+    plan_count = Column(Integer, default=0, nullable=False)
+    plans_by_state = Column(JSON().with_variant(JSONB, "postgresql"), nullable=True)
+    material_quantity = Column(Float, default=0.0, nullable=False)
+    material_quantity_sq = Column(Float, default=0.0, nullable=False)
+    total_parts = Column(Integer, default=0, nullable=False)
+    ok_parts = Column(Integer, default=0, nullable=False)
+    scrap_parts = Column(Integer, default=0, nullable=False)
+    rework_parts = Column(Integer, default=0, nullable=False)
+
+    # Utilization (ok_count / total_parts of plans with total_parts > 0)
+    util_plans = Column(Integer, default=0, nullable=False)
+    util_sum = Column(Float, default=0.0, nullable=False)
+    util_high = Column(Integer, default=0, nullable=False)
+    util_medium = Column(Integer, default=0, nullable=False)
+    util_low = Column(Integer, default=0, nullable=False)
+
+    # Waste (plans with waste_pct set)
+    waste_plans = Column(Integer, default=0, nullable=False)
+    waste_sum = Column(Float, default=0.0, nullable=False)
+    waste_sq_sum = Column(Float, default=0.0, nullable=False)
+    waste_min = Column(Float, nullable=True)
+    waste_max = Column(Float, nullable=True)
+
+    # Cut results
+    cut_count = Column(Integer, default=0, nullable=False)
+    cut_ok = Column(Integer, default=0, nullable=False)
+    cut_scrap = Column(Integer, default=0, nullable=False)
+    cut_rework = Column(Integer, default=0, nullable=False)
+    cut_scrap_weight = Column(Float, default=0.0, nullable=False)
+
+    updated_at = Column(DateTime(timezone=True), nullable=True)
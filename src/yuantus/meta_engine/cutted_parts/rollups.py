@@ -0,0 +1,462 @@
+"""
+Maintained rollups for cutted-parts fleet analytics.
+
+``meta_cut_rollups`` keeps one row of plan/cut aggregates per material and
+plan creation month. ``CuttedPartsService`` keeps the rows current inside the
+writing transaction:
+
+  - ``create_plan`` / ``update_plan`` / ``transition_plan_state`` recompute
+    the affected (material, month) rows from their plans with grouped SQL, so
+    a write costs one month of one material rather than the fleet;
+  - ``add_cut`` bumps the cut counters of the plan's row in place.
+
+The fleet panels (overview, utilization, material utilization, variance,
+throughput) then read O(materials x months) rows instead of every plan and
+cut. Rollups are only maintained and read when ``CUTTED_PARTS_ROLLUPS_ENABLED``
+is set and the table exists; run ``rebuild()`` (``yuantus cutted-parts
+rollups-rebuild``) before enabling, and after bulk imports that bypass the
+service.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Float, and_, case, cast, delete, func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from yuantus.config import get_settings
+from yuantus.meta_engine.cutted_parts.models import (
+    CutPlan,
+    CutResult,
+    CutResultStatus,
+    CutRollup,
+    RawMaterial,
+)
+from yuantus.meta_engine.services.sql_helpers import table_present
+
+
+def rollup_period(created_at: Optional[datetime]) -> str:
+    """UTC ``YYYY-MM`` month a plan rolls up under."""
+    if created_at is None:
+        created_at = datetime.now(timezone.utc)
+    elif created_at.tzinfo is not None:
+        created_at = created_at.astimezone(timezone.utc)
+    return created_at.strftime("%Y-%m")
+
+
+def _period_bounds(period: str) -> Tuple[datetime, datetime]:
+    year, month = (int(part) for part in period.split("-"))
+    start = datetime(year, month, 1, tzinfo=timezone.utc)
+    if month == 12:
+        return start, datetime(year + 1, 1, 1, tzinfo=timezone.utc)
+    return start, datetime(year, month + 1, 1, tzinfo=timezone.utc)
+
+
+def _rollup_id(material_id: Optional[str], period: str) -> str:
+    return f"{period}:{material_id or '-'}"
+
+
+def _count_if(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def _mean_std(count: int, total: float, squares: float) -> Tuple[float, float]:
+    """Mean rounded to 2 places and the population std around that mean."""
+    mean = round(total / count, 2)
+    variance = (squares - 2 * mean * total + count * mean * mean) / count
+    return mean, round(max(variance, 0.0) ** 0.5, 2)
+
+
+class CutRollupService:
+    def __init__(self, session: Session):
+        self.session = session
+
+    # ========== Availability ==========
+
+    def enabled(self) -> bool:
+        """True when the rollups may be read and must be maintained."""
+        if not get_settings().CUTTED_PARTS_ROLLUPS_ENABLED:
+            return False
+        return table_present(self.session, CutRollup.__tablename__)
+
+    # ========== Maintenance ==========
+
+    def plan_written(self, plan: CutPlan, previous_material_id: Optional[str]) -> None:
+        """Recompute the row ``plan`` belongs to, and the one it left."""
+        if not self.enabled():
+            return
+        period = rollup_period(plan.created_at)
+        self.refresh(plan.material_id, period)
+        if previous_material_id != plan.material_id:
+            self.refresh(previous_material_id, period)
+
+    def cut_added(self, plan: CutPlan, cut: CutResult) -> None:
+        if not self.enabled():
+            return
+        period = rollup_period(plan.created_at)
+        values: Dict[str, Any] = {
+            "cut_count": CutRollup.cut_count + 1,
+            "cut_scrap_weight": CutRollup.cut_scrap_weight + (cut.scrap_weight or 0.0),
+            "updated_at": datetime.now(timezone.utc),
+        }
+        counter = {
+            CutResultStatus.OK.value: "cut_ok",
+            CutResultStatus.SCRAP.value: "cut_scrap",
+            CutResultStatus.REWORK.value: "cut_rework",
+        }.get(cut.status)
+        if counter:
+            values[counter] = getattr(CutRollup, counter) + 1
+        result = self.session.execute(
+            update(CutRollup)
+            .where(CutRollup.id == _rollup_id(plan.material_id, period))
+            .values(**values)
+        )
+        if not result.rowcount:
+            # Plan predates the rollups (or the row was dropped): build it.
+            self.refresh(plan.material_id, period)
+
+    def refresh(self, material_id: Optional[str], period: str) -> Optional[CutRollup]:
+        """Recompute one (material, month) row from its plans and cuts."""
+        try:
+            with self.session.begin_nested():
+                return self._refresh(material_id, period)
+        except IntegrityError:
+            # A concurrent writer inserted this (material, month) row first.
+            # begin_nested() only unwound to the SAVEPOINT; the winner has
+            # committed, so recompute over its plans too and update in place.
+            return self._refresh(material_id, period)
+
+    def _refresh(self, material_id: Optional[str], period: str) -> Optional[CutRollup]:
+        start, end = _period_bounds(period)
+        in_group = and_(
+            CutPlan.material_id.is_(None)
+            if material_id is None
+            else CutPlan.material_id == material_id,
+            CutPlan.created_at >= start,
+            CutPlan.created_at < end,
+        )
+        has_util = CutPlan.total_parts > 0
+        util = cast(CutPlan.ok_count, Float) / func.nullif(CutPlan.total_parts, 0) * 100
+        quantity = func.coalesce(CutPlan.material_quantity, 0.0)
+        plans = self.session.execute(
+            select(
+                func.count(),
+                func.coalesce(func.sum(quantity), 0.0),
+                func.coalesce(func.sum(quantity * quantity), 0.0),
+                func.coalesce(func.sum(CutPlan.total_parts), 0),
+                func.coalesce(func.sum(CutPlan.ok_count), 0),
+                func.coalesce(func.sum(CutPlan.scrap_count), 0),
+                func.coalesce(func.sum(CutPlan.rework_count), 0),
+                _count_if(has_util),
+                func.coalesce(func.sum(case((has_util, util))), 0.0),
+                _count_if(and_(has_util, util >= 80)),
+                _count_if(and_(has_util, util >= 50, util < 80)),
+                _count_if(and_(has_util, util < 50)),
+                func.count(CutPlan.waste_pct),
+                func.coalesce(func.sum(CutPlan.waste_pct), 0.0),
+                func.coalesce(func.sum(CutPlan.waste_pct * CutPlan.waste_pct), 0.0),
+                func.min(CutPlan.waste_pct),
+                func.max(CutPlan.waste_pct),
+            ).where(in_group)
+        ).one()
+
+        key = _rollup_id(material_id, period)
+        row = self.session.get(CutRollup, key)
+        if not plans[0]:
+            if row is not None:
+                self.session.delete(row)
+                self.session.flush()
+            return None
+
+        states = self.session.execute(
+            select(CutPlan.state, func.count()).where(in_group).group_by(CutPlan.state)
+        ).all()
+        cuts = self.session.execute(
+            select(
+                func.count(CutResult.id),
+                _count_if(CutResult.status == CutResultStatus.OK.value),
+                _count_if(CutResult.status == CutResultStatus.SCRAP.value),
+                _count_if(CutResult.status == CutResultStatus.REWORK.value),
+                func.coalesce(func.sum(func.coalesce(CutResult.scrap_weight, 0.0)), 0.0),
+            )
+            .select_from(CutResult)
+            .join(CutPlan, CutPlan.id == CutResult.plan_id)
+            .where(in_group)
+        ).one()
+
+        if row is None:
+            row = CutRollup(id=key, material_id=material_id, period=period)
+        (
+            row.plan_count,
+            row.material_quantity,
+            row.material_quantity_sq,
+            row.total_parts,
+            row.ok_parts,
+            row.scrap_parts,
+            row.rework_parts,
+            row.util_plans,
+            row.util_sum,
+            row.util_high,
+            row.util_medium,
+            row.util_low,
+            row.waste_plans,
+            row.waste_sum,
+            row.waste_sq_sum,
+            row.waste_min,
+            row.waste_max,
+        ) = plans
+        row.plans_by_state = {state: count for state, count in states}
+        (
+            row.cut_count,
+            row.cut_ok,
+            row.cut_scrap,
+            row.cut_rework,
+            row.cut_scrap_weight,
+        ) = cuts
+        row.updated_at = datetime.now(timezone.utc)
+        self.session.add(row)
+        self.session.flush()
+        return row
+
+    def rebuild(self) -> Dict[str, int]:
+        """Drop and recompute every rollup row from the current plans."""
+        self.session.execute(delete(CutRollup))
+        groups = {
+            (material_id, rollup_period(created_at))
+            for material_id, created_at in self.session.execute(
+                select(CutPlan.material_id, CutPlan.created_at)
+            )
+        }
+        for material_id, period in sorted(groups, key=lambda g: (g[1], g[0] or "")):
+            self.refresh(material_id, period)
+        return {"rows": len(groups)}
+
+    # ========== Fleet panels ==========
+
+    def _rows(self) -> List[CutRollup]:
+        return self.session.query(CutRollup).all()
+
+    def overview(self) -> Dict[str, Any]:
+        rows = self._rows()
+        by_state: Dict[str, int] = {}
+        for row in rows:
+            for state, count in (row.plans_by_state or {}).items():
+                by_state[state] = by_state.get(state, 0) + count
+        total_materials = self.session.execute(
+            select(func.count()).select_from(RawMaterial)
+        ).scalar_one()
+
+        return {
+            "total_plans": sum(row.plan_count for row in rows),
+            "plans_by_state": by_state,
+            "total_materials": total_materials,
+            "total_parts": sum(row.total_parts for row in rows),
+            "total_ok": sum(row.ok_parts for row in rows),
+            "total_scrap": sum(row.scrap_parts for row in rows),
+            "total_rework": sum(row.rework_parts for row in rows),
+        }
+
+    def utilization_overview(self) -> Dict[str, Any]:
+        rows = self._rows()
+        plans_with_data = sum(row.util_plans for row in rows)
+        avg_utilization = (
+            round(sum(row.util_sum for row in rows) / plans_with_data, 2)
+            if plans_with_data > 0
+            else None
+        )
+
+        return {
+            "total_plans": sum(row.plan_count for row in rows),
+            "plans_with_data": plans_with_data,
+            "avg_utilization_pct": avg_utilization,
+            "high_utilization": sum(row.util_high for row in rows),
+            "medium_utilization": sum(row.util_medium for row in rows),
+            "low_utilization": sum(row.util_low for row in rows),
+        }
+
+    def _by_material(self):
+        return (
+            select(
+                CutRollup.material_id.label("material_id"),
+                func.sum(CutRollup.plan_count).label("plan_count"),
+                func.sum(CutRollup.material_quantity).label("quantity"),
+                func.sum(CutRollup.material_quantity_sq).label("quantity_sq"),
+            )
+            .where(CutRollup.material_id.isnot(None))
+            .group_by(CutRollup.material_id)
+            .subquery("cut_rollups_by_material")
+        )
+
+    def material_utilization(self) -> Dict[str, Any]:
+        rollup = self._by_material()
+        rows = self.session.execute(
+            select(
+                RawMaterial.id,
+                RawMaterial.name,
+                RawMaterial.material_type,
+                RawMaterial.stock_quantity,
+                func.coalesce(rollup.c.quantity, 0.0),
+                func.coalesce(rollup.c.plan_count, 0),
+            )
+            .outerjoin(rollup, rollup.c.material_id == RawMaterial.id)
+            .order_by(RawMaterial.created_at, RawMaterial.id)
+        ).all()
+
+        items: List[Dict[str, Any]] = []
+        total_stock = 0.0
+        total_consumed = 0.0
+        for material_id, name, material_type, stock, consumed, plan_count in rows:
+            stock = stock or 0.0
+            total_stock += stock
+            total_consumed += consumed
+            items.append({
+                "material_id": material_id,
+                "material_name": name,
+                "material_type": material_type,
+                "stock_quantity": stock,
+                "consumed_quantity": consumed,
+                "remaining_quantity": stock - consumed,
+                "plan_count": plan_count,
+                "consumption_pct": (
+                    round(consumed / stock * 100, 2) if stock > 0 else None
+                ),
+            })
+
+        return {
+            "total_materials": len(items),
+            "total_stock": total_stock,
+            "total_consumed": total_consumed,
+            "materials": items,
+        }
+
+    def variance_overview(self) -> Dict[str, Any]:
+        rows = self._rows()
+        waste_count = sum(row.waste_plans for row in rows)
+
+        waste_mean: Optional[float] = None
+        waste_std: Optional[float] = None
+        waste_range: Optional[float] = None
+        if waste_count:
+            waste_mean, waste_std = _mean_std(
+                waste_count,
+                sum(row.waste_sum for row in rows),
+                sum(row.waste_sq_sum for row in rows),
+            )
+            waste_range = round(
+                max(row.waste_max for row in rows if row.waste_plans)
+                - min(row.waste_min for row in rows if row.waste_plans),
+                2,
+            )
+
+        # Plan cost = cost_per_unit * material_quantity, summed per material.
+        rollup = self._by_material()
+        cost_count, cost_sum, cost_sq_sum = self.session.execute(
+            select(
+                func.coalesce(func.sum(rollup.c.plan_count), 0),
+                func.coalesce(
+                    func.sum(RawMaterial.cost_per_unit * rollup.c.quantity), 0.0
+                ),
+                func.coalesce(
+                    func.sum(
+                        RawMaterial.cost_per_unit
+                        * RawMaterial.cost_per_unit
+                        * rollup.c.quantity_sq
+                    ),
+                    0.0,
+                ),
+            )
+            .select_from(rollup)
+            .join(RawMaterial, RawMaterial.id == rollup.c.material_id)
+            .where(RawMaterial.cost_per_unit.isnot(None))
+        ).one()
+
+        cost_mean: Optional[float] = None
+        cost_std: Optional[float] = None
+        if cost_count:
+            cost_mean, cost_std = _mean_std(cost_count, cost_sum, cost_sq_sum)
+
+        # Outliers: plans with waste > mean + 1 std
+        outlier_ids: List[str] = []
+        if waste_mean is not None and waste_std is not None and waste_std > 0:
+            outlier_ids = list(
+                self.session.execute(
+                    select(CutPlan.id)
+                    .where(CutPlan.waste_pct > waste_mean + waste_std)
+                    .order_by(CutPlan.created_at, CutPlan.id)
+                ).scalars()
+            )
+
+        return {
+            "total_plans": sum(row.plan_count for row in rows),
+            "plans_with_waste_data": waste_count,
+            "waste_mean": waste_mean,
+            "waste_std": waste_std,
+            "waste_range": waste_range,
+            "cost_mean": cost_mean,
+            "cost_std": cost_std,
+            "outlier_plan_ids": outlier_ids,
+            "outlier_count": len(outlier_ids),
+        }
+
+    def throughput_overview(self) -> Dict[str, Any]:
+        rows = self._rows()
+        total_plans = sum(row.plan_count for row in rows)
+        if not total_plans:
+            return {
+                "total_plans": 0,
+                "total_cuts": 0,
+                "avg_cuts_per_plan": None,
+                "max_cuts_plan_id": None,
+                "min_cuts_plan_id": None,
+                "fleet_yield_pct": None,
+            }
+
+        total_cuts = sum(row.cut_count for row in rows)
+        total_ok = sum(row.cut_ok for row in rows)
+        max_plan = self._extreme_plan(descending=True)
+        min_plan = self._extreme_plan(descending=False)
+
+        return {
+            "total_plans": total_plans,
+            "total_cuts": total_cuts,
+            "avg_cuts_per_plan": round(total_cuts / total_plans, 2),
+            "max_cuts_plan_id": max_plan[0],
+            "max_cuts_count": max_plan[1],
+            "min_cuts_plan_id": min_plan[0],
+            "min_cuts_count": min_plan[1],
+            "fleet_yield_pct": (
+                round(total_ok / total_cuts * 100, 2) if total_cuts > 0 else None
+            ),
+        }
+
+    def _extreme_plan(self, *, descending: bool) -> Tuple[str, int]:
+        cuts = func.count(CutResult.id)
+        return tuple(
+            self.session.execute(
+                select(CutPlan.id, cuts)
+                .outerjoin(CutResult, CutResult.plan_id == CutPlan.id)
+                .group_by(CutPlan.id, CutPlan.created_at)
+                .order_by(
+                    cuts.desc() if descending else cuts.asc(),
+                    CutPlan.created_at,
+                    CutPlan.id,
+                )
+                .limit(1)
+            ).one()
+        )
+
+    def plan_cut_counts(self) -> Dict[str, Tuple[int, int, int, int]]:
+        """(total, ok, scrap, rework) cuts per plan id, plans without cuts omitted."""
+        rows = self.session.execute(
+            select(
+                CutResult.plan_id,
+                func.count(),
+                _count_if(CutResult.status == CutResultStatus.OK.value),
+                _count_if(CutResult.status == CutResultStatus.SCRAP.value),
+                _count_if(CutResult.status == CutResultStatus.REWORK.value),
+            ).group_by(CutResult.plan_id)
+        ).all()
+        return {plan_id: tuple(counts) for plan_id, *counts in rows}
@@ -17,6 +17,7 @@ from yuantus.meta_engine.cutted_parts.models import (
     MaterialType,
     RawMaterial,
 )
+from yuantus.meta_engine.cutted_parts.rollups import CutRollupService
 
 
 # ---------------------------------------------------------------------------
@@ -46,6 +47,7 @@ class CuttedPartsService:
 
     def __init__(self, session: Session) -> None:
         self.session = session
+        self.rollups = CutRollupService(session)
 
     # ------------------------------------------------------------------
     # Raw materials
@@ -137,6 +139,7 @@ class CuttedPartsService:
         )
         self.session.add(plan)
         self.session.flush()
+        self.rollups.plan_written(plan, plan.material_id)
         return plan
 
     def get_plan(self, plan_id: str) -> Optional[CutPlan]:
@@ -159,12 +162,14 @@ class CuttedPartsService:
         plan = self.get_plan(plan_id)
         if plan is None:
             return None
+        previous_material_id = plan.material_id
         for key, value in fields.items():
             if hasattr(plan, key) and key not in (
                 "id", "created_at", "created_by_id",
             ):
                 setattr(plan, key, value)
         self.session.flush()
+        self.rollups.plan_written(plan, previous_material_id)
         return plan
 
     def transition_plan_state(
@@ -182,6 +187,7 @@ class CuttedPartsService:
             )
         plan.state = target_state
         self.session.flush()
+        self.rollups.plan_written(plan, plan.material_id)
         return plan
 
     # ------------------------------------------------------------------
@@ -224,6 +230,7 @@ class CuttedPartsService:
         )
         self.session.add(cut)
         self.session.flush()
+        self.rollups.cut_added(plan, cut)
         return cut
 
     def list_cuts(self, plan_id: str) -> List[CutResult]:
@@ -276,6 +283,8 @@ class CuttedPartsService:
 
     def overview(self) -> Dict[str, Any]:
         """High-level overview: plan counts, state breakdown, totals."""
+        if self.rollups.enabled():
+            return self.rollups.overview()
         plans = self.session.query(CutPlan).all()
         materials = self.session.query(RawMaterial).all()
 
@@ -405,6 +414,8 @@ class CuttedPartsService:
 
     def utilization_overview(self) -> Dict[str, Any]:
         """Fleet-wide utilization summary across all plans."""
+        if self.rollups.enabled():
+            return self.rollups.utilization_overview()
         plans = self.session.query(CutPlan).all()
 
         plans_with_data = 0
@@ -444,6 +455,8 @@ class CuttedPartsService:
 
     def material_utilization(self) -> Dict[str, Any]:
         """Material consumption and remaining-stock analysis."""
+        if self.rollups.enabled():
+            return self.rollups.material_utilization()
         materials = self.session.query(RawMaterial).all()
         plans = self.session.query(CutPlan).all()
 
@@ -876,6 +889,8 @@ class CuttedPartsService:
     def variance_overview(self) -> Dict[str, Any]:
         """Fleet-wide variance analysis: waste spread, cost deviation,
         outlier identification across all plans."""
+        if self.rollups.enabled():
+            return self.rollups.variance_overview()
         plans = self.session.query(CutPlan).all()
 
         waste_values = [
@@ -1440,6 +1455,8 @@ class CuttedPartsService:
         Computes total cuts across all plans, cuts per plan, yield rate,
         and identifies highest/lowest throughput plans.
         """
+        if self.rollups.enabled():
+            return self.rollups.throughput_overview()
         plans = self.session.query(CutPlan).all()
 
         if not plans:
@@ -1567,10 +1584,13 @@ class CuttedPartsService:
     # ------------------------------------------------------------------
 
     def _plan_cut_density(self, plan: CutPlan, cuts: List[CutResult]) -> float:
+        return self._cut_density(plan, len(cuts))
+
+    def _cut_density(self, plan: CutPlan, total_cuts: int) -> float:
         material_quantity = plan.material_quantity or 0.0
         if material_quantity > 0:
-            return round(len(cuts) / material_quantity, 2)
-        return float(len(cuts))
+            return round(total_cuts / material_quantity, 2)
+        return float(total_cuts)
 
     def _saturation_bucket(self, cut_density: float) -> str:
         if cut_density >= 5.0:
@@ -1651,9 +1671,18 @@ class CuttedPartsService:
         material_signals: Dict[str, int] = {}
         congested_plan_ids: List[str] = []
         blocked_plan_ids: List[str] = []
+        # With rollups on, cut counts for every plan come from one grouped query.
+        cut_counts = (
+            self.rollups.plan_cut_counts() if self.rollups.enabled() else None
+        )
 
         for plan in plans:
-            detail = self.plan_bottlenecks(plan.id)
+            if cut_counts is None:
+                detail = self.plan_bottlenecks(plan.id)
+            else:
+                detail = self._bottleneck_detail(
+                    plan, *cut_counts.get(plan.id, (0, 0, 0, 0))
+                )
             if detail["saturation_bucket"] in {"high", "critical"}:
                 congested_plan_ids.append(plan.id)
             if detail["bottlenecks"]:
@@ -1692,15 +1721,23 @@ class CuttedPartsService:
             raise ValueError(f"Plan '{plan_id}' not found")
 
         cuts = self.list_cuts(plan.id)
-        total_cuts = len(cuts)
-        ok_count = sum(1 for cut in cuts if cut.status == CutResultStatus.OK.value)
-        scrap_count = sum(
-            1 for cut in cuts if cut.status == CutResultStatus.SCRAP.value
+        return self._bottleneck_detail(
+            plan,
+            len(cuts),
+            sum(1 for cut in cuts if cut.status == CutResultStatus.OK.value),
+            sum(1 for cut in cuts if cut.status == CutResultStatus.SCRAP.value),
+            sum(1 for cut in cuts if cut.status == CutResultStatus.REWORK.value),
         )
-        rework_count = sum(
-            1 for cut in cuts if cut.status == CutResultStatus.REWORK.value
-        )
-        cut_density = self._plan_cut_density(plan, cuts)
+
+    def _bottleneck_detail(
+        self,
+        plan: CutPlan,
+        total_cuts: int,
+        ok_count: int,
+        scrap_count: int,
+        rework_count: int,
+    ) -> Dict[str, Any]:
+        cut_density = self._cut_density(plan, total_cuts)
         saturation_bucket = self._saturation_bucket(cut_density)
         yield_pct = (
             round(ok_count / total_cuts * 100, 2) if total_cuts > 0 else None
@@ -1,17 +1,76 @@
 """
 In-memory Event Bus for Domain Events.
 Provides a simple publish/subscribe mechanism.
+
+Handlers subscribed with ``batch=True`` receive a list of events. With
+``EVENT_BUS_ASYNC_ENABLED`` those lists are built by a background thread from a
+bounded queue: events published within ``EVENT_BUS_BATCH_WINDOW_MS`` are
+grouped (per handler and tenant/org/user context) and repeated
+``ItemUpdatedEvent``s for the same item are coalesced into one. Without it,
+batch handlers are called synchronously with a one-element list. Plain
+handlers are always called synchronously, as before.
 """
 
+import atexit
+import contextvars
 import logging  # Added logging
-from typing import Callable, List, Dict, Type
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple, Type
 from threading import Lock
 
-from yuantus.meta_engine.events.domain_events import DomainEvent
+from yuantus.context import org_id_var, tenant_id_var, user_id_var
+from yuantus.meta_engine.events.domain_events import DomainEvent, ItemUpdatedEvent
 
 logger = logging.getLogger(__name__)  # Initialize logger
 
 EventHandler = Callable[[DomainEvent], None]
+BatchEventHandler = Callable[[List[DomainEvent]], None]
+
+
+class _QueuedEvent(NamedTuple):
+    handler: Callable[..., None]
+    event: DomainEvent
+    context_key: Tuple[Any, ...]
+    context: contextvars.Context
+
+
+_STOP = object()
+
+
+def coalesce_item_updates(events: List[DomainEvent]) -> List[DomainEvent]:
+    """
+    Merge repeated ``ItemUpdatedEvent``s for the same item into one.
+
+    Only an update directly following another update of the same item (no
+    create/delete/state change in between) is merged, so the per-item event
+    order is preserved. The merged event is the latest one, carrying the union
+    of ``changes`` (later values win) and ``metadata["coalesced"]``.
+    """
+    merged: List[DomainEvent] = []
+    last_index: Dict[str, int] = {}
+    for event in events:
+        item_id = getattr(event, "item_id", None)
+        if isinstance(event, ItemUpdatedEvent) and item_id is not None:
+            index = last_index.get(item_id)
+            previous = merged[index] if index is not None else None
+            if isinstance(previous, ItemUpdatedEvent):
+                merged[index] = event.model_copy(
+                    update={
+                        "changes": {**previous.changes, **event.changes},
+                        "metadata": {
+                            **previous.metadata,
+                            **event.metadata,
+                            "coalesced": previous.metadata.get("coalesced", 1) + 1,
+                        },
+                    }
+                )
+                continue
+        if item_id is not None:
+            last_index[item_id] = len(merged)
+        merged.append(event)
+    return merged
 
 
 class EventBus:
@@ -25,18 +84,35 @@ class EventBus:
                 cls._instance._subscribers: Dict[
                     Type[DomainEvent], List[EventHandler]
                 ] = {}
+                cls._instance._batch_handlers: Set[int] = set()
+                cls._instance._queue: Optional[queue.Queue] = None
+                cls._instance._dispatcher: Optional[threading.Thread] = None
+                cls._instance._dispatch_lock = Lock()
+                cls._instance._dispatch_stopped = False
+                cls._instance._batch_window = 0.2
+                cls._instance._batch_max = 500
             return cls._instance
 
-    def subscribe(self, event_type: Type[DomainEvent], handler: EventHandler):
+    def subscribe(
+        self,
+        event_type: Type[DomainEvent],
+        handler: EventHandler,
+        *,
+        batch: bool = False,
+    ):
         """
         Subscribes a handler function to a specific event type.
         Args:
             event_type: The type of the DomainEvent to subscribe to.
-            handler: A callable that takes a DomainEvent instance as its argument.
+            handler: A callable that takes a DomainEvent instance as its argument,
+                or a list of them when ``batch`` is set.
+            batch: Deliver lists of events (asynchronously when enabled).
         """
         if event_type not in self._subscribers:
             self._subscribers[event_type] = []
         self._subscribers[event_type].append(handler)
+        if batch:
+            self._batch_handlers.add(id(handler))
         logger.debug(f"Subscribed handler {handler.__name__} to {event_type.__name__}")
 
     def publish(self, event: DomainEvent):
@@ -50,6 +126,9 @@ class EventBus:
         # Publish to handlers specific to the event's exact type
         handlers_for_exact_type = self._subscribers.get(type(event), [])
         for handler in handlers_for_exact_type:
+            if id(handler) in self._batch_handlers:
+                self._deliver_batched(handler, event)
+                continue
             try:
                 handler(event)
             except Exception as e:
@@ -66,6 +145,9 @@ class EventBus:
                 type(event) is not DomainEvent
                 and handler not in handlers_for_exact_type
             ):  # Avoid double-processing
+                if id(handler) in self._batch_handlers:
+                    self._deliver_batched(handler, event)
+                    continue
                 try:
                     handler(event)
                 except Exception as e:
@@ -74,6 +156,166 @@ class EventBus:
                         exc_info=True,
                     )
 
+    # ========== Batched / async delivery ==========
+
+    def _deliver_batched(self, handler: BatchEventHandler, event: DomainEvent) -> None:
+        q = self._queue if self._async_enabled() else None
+        if q is not None:
+            entry = _QueuedEvent(
+                handler,
+                event,
+                (tenant_id_var.get(), org_id_var.get(), user_id_var.get()),
+                contextvars.copy_context(),
+            )
+            try:
+                q.put_nowait(entry)
+                return
+            except queue.Full:
+                # Backpressure: never drop, pay the handler cost on this thread.
+                logger.warning(
+                    "Event queue full; delivering %s to %s synchronously",
+                    event.event_type,
+                    handler.__name__,
+                )
+        self._call_batch(handler, [event])
+
+    def _async_enabled(self) -> bool:
+        from yuantus.config import get_settings
+
+        if not get_settings().EVENT_BUS_ASYNC_ENABLED:
+            return False
+        if self._queue is None:
+            with self._dispatch_lock:
+                # Once stopped (shutdown), only an explicit start restarts it.
+                if self._dispatch_stopped:
+                    return False
+                self._start_dispatcher()
+        return True
+
+    def start_async_dispatch(
+        self,
+        *,
+        queue_size: Optional[int] = None,
+        batch_window_ms: Optional[int] = None,
+        batch_max: Optional[int] = None,
+    ) -> None:
+        """Start the background dispatcher (idempotent)."""
+        with self._dispatch_lock:
+            self._dispatch_stopped = False
+            self._start_dispatcher(
+                queue_size=queue_size, batch_window_ms=batch_window_ms, batch_max=batch_max
+            )
+
+    def _start_dispatcher(
+        self,
+        *,
+        queue_size: Optional[int] = None,
+        batch_window_ms: Optional[int] = None,
+        batch_max: Optional[int] = None,
+    ) -> None:
+        """Start the dispatcher unless running; caller holds ``_dispatch_lock``."""
+        from yuantus.config import get_settings
+
+        settings = get_settings()
+        if self._queue is not None:
+            return
+        size = queue_size if queue_size is not None else settings.EVENT_BUS_QUEUE_SIZE
+        window = (
+            batch_window_ms
+            if batch_window_ms is not None
+            else settings.EVENT_BUS_BATCH_WINDOW_MS
+        )
+        self._batch_window = max(window, 0) / 1000.0
+        self._batch_max = max(
+            1, batch_max if batch_max is not None else settings.EVENT_BUS_BATCH_MAX
+        )
+        self._queue = queue.Queue(maxsize=max(size, 1))
+        self._dispatcher = threading.Thread(
+            target=self._run_dispatcher,
+            args=(self._queue,),
+            name="EventBus-Dispatcher",
+            daemon=True,
+        )
+        self._dispatcher.start()
+
+    def stop_async_dispatch(self, timeout: Optional[float] = 10.0) -> None:
+        """Deliver what is queued, then stop the background dispatcher.
+
+        Batched deliveries stay synchronous until ``start_async_dispatch()``.
+        """
+        with self._dispatch_lock:
+            q, thread = self._queue, self._dispatcher
+            self._queue = None
+            self._dispatcher = None
+            self._dispatch_stopped = True
+        if q is None:
+            return
+        # New publishes already go synchronous; the sentinel drains the rest.
+        q.put(_STOP)
+        if thread is not None:
+            thread.join(timeout)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued event was handed to its handler."""
+        q = self._queue
+        if q is None:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with q.all_tasks_done:
+            while q.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                q.all_tasks_done.wait(remaining)
+        return True
+
+    def _run_dispatcher(self, q: queue.Queue) -> None:
+        stopping = False
+        while not stopping:
+            first = q.get()
+            if first is _STOP:
+                q.task_done()
+                return
+            batch = [first]
+            deadline = time.monotonic() + self._batch_window
+            while len(batch) < self._batch_max:
+                remaining = deadline - time.monotonic()
+                try:
+                    entry = q.get(timeout=remaining) if remaining > 0 else q.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    q.task_done()
+                    stopping = True
+                    break
+                batch.append(entry)
+            try:
+                self._dispatch_batch(batch)
+            finally:
+                for _ in batch:
+                    q.task_done()
+
+    def _dispatch_batch(self, batch: List[_QueuedEvent]) -> None:
+        groups: Dict[Tuple[int, Tuple[Any, ...]], List[_QueuedEvent]] = {}
+        for entry in batch:
+            groups.setdefault((id(entry.handler), entry.context_key), []).append(entry)
+        for entries in groups.values():
+            handler = entries[0].handler
+            events = coalesce_item_updates([entry.event for entry in entries])
+            # Run with the publisher's tenant/org/user context.
+            entries[-1].context.run(self._call_batch, handler, events)
+
+    @staticmethod
+    def _call_batch(handler: BatchEventHandler, events: List[DomainEvent]) -> None:
+        try:
+            handler(events)
+        except Exception as e:
+            logger.error(
+                f"Batch event handler {handler.__name__} failed for {len(events)} event(s): {e}",
+                exc_info=True,
+            )
+
 
 # Global instance of the EventBus
 event_bus = EventBus()
+atexit.register(event_bus.stop_async_dispatch)
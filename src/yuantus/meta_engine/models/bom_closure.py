@@ -0,0 +1,29 @@
+"""BOM closure index: one row per (ancestor, descendant, depth).
+
+Materializes the transitive closure of current relationship items
+(``source_id -> related_id``) so multi-level where-used is a single indexed lookup
+and cycle detection is an existence check. ``path_count`` is the number of distinct
+paths of that length, which lets an edge removal subtract exactly what its insertion
+added. Maintained by ``BOMClosureService``; rows carry no FKs because they are
+derived data and are rebuilt wholesale by ``yuantus bom closure-rebuild``.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import Column, Index, Integer, String
+
+from yuantus.models.base import Base
+
+
+class BOMClosure(Base):
+    __tablename__ = "meta_bom_closure"
+
+    ancestor_id = Column(String, primary_key=True)
+    descendant_id = Column(String, primary_key=True)
+    depth = Column(Integer, primary_key=True)
+    path_count = Column(Integer, nullable=False, default=1)
+
+    # The PK serves "descendants of X"; this index serves where-used ("ancestors of X").
+    __table_args__ = (
+        Index("ix_meta_bom_closure_descendant_depth", "descendant_id", "depth"),
+    )
@@ -0,0 +1,39 @@
+"""CAD artifact cache index: derived outputs keyed by source content.
+
+One row per (source checksum, task kind, converter backend/profile, parameters)
+points at the storage keys (and inline values) a CAD pipeline task produced,
+so a later file with identical content links them instead of re-running the
+converter. ``cache_key`` is the sha256 of that tuple. The artifacts themselves
+stay owned by ``source_file_id``; evicting a row never deletes storage, and
+rows carry no FKs because they are derived data maintained by
+``CadArtifactCacheService``.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import JSON, BigInteger, Column, DateTime, Index, Integer, String
+from sqlalchemy.dialects.postgresql import JSONB
+
+from yuantus.models.base import Base
+
+
+class CadArtifactCacheEntry(Base):
+    __tablename__ = "meta_cad_artifact_cache"
+
+    cache_key = Column(String(64), primary_key=True)
+    checksum = Column(String, nullable=False, index=True)
+    kind = Column(String, nullable=False)  # preview | geometry | extract | bom
+    backend = Column(String, nullable=False)
+    params_version = Column(Integer, nullable=False)
+    source_file_id = Column(String, nullable=True)
+    # FileContainer field -> value to copy onto a container on a hit.
+    artifacts = Column(JSON().with_variant(JSONB, "postgresql"), nullable=False)
+    size_bytes = Column(BigInteger, nullable=False, default=0)
+    hit_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=False)
+    last_used_at = Column(DateTime, nullable=False)
+
+    # Eviction walks entries least recently used first.
+    __table_args__ = (
+        Index("ix_meta_cad_artifact_cache_last_used_at", "last_used_at"),
+    )
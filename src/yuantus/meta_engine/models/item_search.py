@@ -0,0 +1,76 @@
+"""DB search index: one ``search_text`` row per item.
+
+Backs ``SearchService`` when Elasticsearch is not configured. The text is the
+same ``_build_search_text`` blob the ES documents carry (plus id/state), kept
+current by ``ItemSearchIndexService``'s flush hook. PostgreSQL searches it via
+a GIN ``to_tsvector`` expression index; SQLite mirrors it into the FTS5 table
+``meta_item_search_fts`` through triggers created alongside the table. Rows
+carry no FK to ``meta_items`` because they are derived data and are rebuilt
+wholesale by ``yuantus search db-index-rebuild``.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import DDL, Column, DateTime, Index, Integer, String, Text, event, text
+
+from yuantus.models.base import Base
+
+FTS_TABLE = "meta_item_search_fts"
+TSVECTOR_CONFIG = "simple"
+
+
+class ItemSearchText(Base):
+    __tablename__ = "meta_item_search"
+
+    # Integer rowid so the SQLite external-content FTS table can reference it.
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    item_id = Column(String, nullable=False, unique=True)
+    search_text = Column(Text, nullable=False, default="")
+    updated_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index(
+            "ix_meta_item_search_tsv",
+            text(f"to_tsvector('{TSVECTOR_CONFIG}', search_text)"),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+    )
+
+
+# SQLite: external-content FTS5 table kept in sync by triggers, so every write
+# to meta_item_search (ORM, hook, rebuild) is mirrored without extra code.
+SQLITE_FTS_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "search_text, content='meta_item_search', content_rowid='id', "
+    "tokenize='unicode61')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON meta_item_search "
+    f"BEGIN INSERT INTO {FTS_TABLE}(rowid, search_text) "
+    "VALUES (new.id, new.search_text); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON meta_item_search "
+    f"BEGIN INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_text) "
+    "VALUES ('delete', old.id, old.search_text); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON meta_item_search "
+    f"BEGIN INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, search_text) "
+    "VALUES ('delete', old.id, old.search_text); "
+    f"INSERT INTO {FTS_TABLE}(rowid, search_text) "
+    "VALUES (new.id, new.search_text); END",
+)
+SQLITE_FTS_DROP_DDL = (
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+)
+
+for _statement in SQLITE_FTS_DDL:
+    event.listen(
+        ItemSearchText.__table__,
+        "after_create",
+        DDL(_statement).execute_if(dialect="sqlite"),
+    )
+for _statement in SQLITE_FTS_DROP_DDL:
+    event.listen(
+        ItemSearchText.__table__,
+        "before_drop",
+        DDL(_statement).execute_if(dialect="sqlite"),
+    )
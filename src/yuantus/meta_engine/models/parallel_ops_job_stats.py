@@ -0,0 +1,32 @@
+"""Hourly pre-aggregates of document-sync jobs for the parallel-ops dashboards.
+
+One row per (created hour, site, direction, status, dead-letter flag) counts the
+``document_sync_*`` conversion jobs created in that hour and sums their
+attempts, so ``ParallelOpsOverviewService`` summaries, trends and Prometheus
+metrics read hours instead of jobs. Rows are derived data refreshed by
+``ParallelOpsJobStatsService``; they carry no FKs.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, String
+
+from yuantus.models.base import Base
+
+
+class ParallelOpsJobStat(Base):
+    __tablename__ = "meta_parallel_ops_job_stats"
+
+    id = Column(String, primary_key=True)
+    hour_start = Column(DateTime, nullable=False)  # naive UTC, truncated to the hour
+    site_id = Column(String, nullable=True)  # trimmed payload.site_id
+    direction = Column(String(10), nullable=False)  # push | pull | unknown
+    status = Column(String(20), nullable=False)  # lower-cased job status
+    dead_letter = Column(Boolean, nullable=False, default=False)
+    job_count = Column(Integer, nullable=False, default=0)
+    attempt_sum = Column(Integer, nullable=False, default=0)
+    refreshed_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_meta_parallel_ops_job_stats_hour_start", "hour_start"),
+    )
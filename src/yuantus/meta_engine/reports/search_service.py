@@ -7,9 +7,12 @@ from typing import Any, Dict, List, Optional
 from sqlalchemy import String, or_, cast, Float
 from sqlalchemy.orm import Session
 
+from yuantus.config import get_settings
 from yuantus.meta_engine.locale.service import resolve_localized_property
 from yuantus.meta_engine.models.item import Item
 from yuantus.meta_engine.reports.models import SavedSearch
+from yuantus.meta_engine.schemas.aml import AMLAction
+from yuantus.meta_engine.services.meta_permission_service import MetaPermissionService
 
 
 class AdvancedSearchService:
@@ -45,6 +48,8 @@ class AdvancedSearchService:
         page: int = 1,
         page_size: int = 25,
         include_count: bool = True,
+        user_id: Optional[str] = None,
+        user_roles: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
         return self._search_with_sql(
             item_type_id=item_type_id,
@@ -58,6 +63,8 @@ class AdvancedSearchService:
             page=page,
             page_size=page_size,
             include_count=include_count,
+            user_id=user_id,
+            user_roles=user_roles,
         )
 
     def _search_with_sql(
@@ -74,12 +81,22 @@ class AdvancedSearchService:
         page: int = 1,
         page_size: int = 25,
         include_count: bool = True,
+        user_id: Optional[str] = None,
+        user_roles: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
         query = self.session.query(Item)
 
         if item_type_id:
             query = query.filter(Item.item_type_id == item_type_id)
 
+        # Pushed-down ACL: total and page only cover items the caller may read.
+        if user_id is not None and get_settings().QUERY_ACL_PUSHDOWN_ENABLED:
+            clause = MetaPermissionService(self.session).readable_clause(
+                user_id, user_roles, AMLAction.get, item_type_id=item_type_id
+            )
+            if clause is not None:
+                query = query.filter(clause)
+
         if filters:
             for f in filters:
                 query = self._apply_filter(query, f)
@@ -352,6 +369,8 @@ class SavedSearchService:
         *,
         page: int = 1,
         page_size: Optional[int] = None,
+        user_id: Optional[str] = None,
+        user_roles: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
         saved = self.get_saved_search(saved_search_id)
         if not saved:
@@ -370,6 +389,8 @@ class SavedSearchService:
             page=page,
             page_size=page_size or saved.page_size or 25,
             include_count=True,
+            user_id=user_id,
+            user_roles=user_roles,
         )
 
         saved.use_count = (saved.use_count or 0) + 1
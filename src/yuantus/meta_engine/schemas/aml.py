@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional
 from pydantic import BaseModel, ConfigDict, Field
 from enum import Enum
 
@@ -75,6 +75,18 @@ class AMLQueryRequest(BaseModel):
         default=None, description="Sort fields, e.g. ['created_at:desc', 'name:asc']"
     )
 
+    # 游标分页 (keyset)
+    cursor: Optional[str] = Field(
+        default=None,
+        description="next_cursor of the previous page; switches to keyset pagination (page is ignored)",
+    )
+
+    # 计数模式
+    count_mode: Literal["exact", "estimate", "none"] = Field(
+        default="exact",
+        description="exact: COUNT(*); estimate: planner estimate (PostgreSQL) or capped count; none: skip",
+    )
+
     model_config = ConfigDict(populate_by_name=True)
 
 
@@ -82,7 +94,15 @@ class AMLQueryResponse(BaseModel):
     """AML 查询响应"""
 
     items: List[Dict[str, Any]] = Field(default_factory=list)
-    total: int = Field(default=0, description="Total count without pagination")
+    total: Optional[int] = Field(
+        default=0, description="Total count without pagination (null for count_mode=none)"
+    )
+    total_relation: Optional[str] = Field(
+        default=None, description="Set for non-exact counts: eq / gte / estimate"
+    )
     page: int = Field(default=1)
     page_size: int = Field(default=50)
     has_more: bool = Field(default=False)
+    next_cursor: Optional[str] = Field(
+        default=None, description="Cursor for the next page (keyset pagination)"
+    )
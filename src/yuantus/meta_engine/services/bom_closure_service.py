@@ -0,0 +1,323 @@
+"""
+BOM closure index maintenance and lookups.
+
+``meta_bom_closure`` holds (ancestor, descendant, depth, path_count) for every
+current relationship item (``source_id -> related_id``), i.e. the same graph that
+``BOMService.get_where_used`` walks. Paths deeper than ``BOM_CLOSURE_MAX_DEPTH``
+are not recorded, so cycle checks do not rely on it.
+
+Maintenance is incremental: Session flush hooks turn every inserted, deleted or
+re-pointed relationship item (``add_child``, ``remove_child``, ECO
+apply, AML writes, ...) into closure deltas inside the same transaction. Bulk
+``Query.update``/Core writes bypass the ORM and therefore the hook; run
+``rebuild()`` (``yuantus bom closure-rebuild``) after such imports.
+
+The index is only used when ``BOM_CLOSURE_ENABLED`` is set and the table exists
+on the bound database, so readers fall back to the per-level queries otherwise.
+"""
+
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from threading import Lock
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, event, inspect, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from yuantus.config import get_settings
+from yuantus.meta_engine.models.bom_closure import BOMClosure
+from yuantus.meta_engine.models.item import Item
+from yuantus.meta_engine.services.sql_helpers import chunks, table_present
+
+_TABLE = BOMClosure.__table__
+_EDGE_ATTRS = ("source_id", "related_id", "is_current")
+
+_REGISTER_LOCK = Lock()
+_REGISTERED = False
+
+Edge = Tuple[str, str]
+ClosureKey = Tuple[str, str, int]
+
+
+class BOMClosureService:
+    def __init__(self, session: Session):
+        self.session = session
+
+    # ========== Availability ==========
+
+    def enabled(self) -> bool:
+        """True when the closure index may be read and must be maintained."""
+        if not get_settings().BOM_CLOSURE_ENABLED:
+            return False
+        return table_present(self.session, BOMClosure.__tablename__)
+
+    @staticmethod
+    def _max_depth() -> int:
+        return max(1, int(get_settings().BOM_CLOSURE_MAX_DEPTH))
+
+    def covers_depth(self, depth: int) -> bool:
+        """Whether every path up to ``depth`` levels is recorded in the index."""
+        return depth <= self._max_depth()
+
+    # ========== Lookups ==========
+
+    def has_path(self, ancestor_id: str, descendant_id: str) -> bool:
+        """Whether ``descendant_id`` is reachable from ``ancestor_id``."""
+        row = (
+            self.session.query(BOMClosure.depth)
+            .filter(
+                BOMClosure.ancestor_id == ancestor_id,
+                BOMClosure.descendant_id == descendant_id,
+            )
+            .first()
+        )
+        return row is not None
+
+    def ancestor_ids(
+        self, descendant_id: str, max_depth: Optional[int] = None
+    ) -> List[str]:
+        """Distinct ancestors of ``descendant_id`` within ``max_depth`` levels."""
+        query = self.session.query(BOMClosure.ancestor_id).filter(
+            BOMClosure.descendant_id == descendant_id
+        )
+        if max_depth is not None:
+            query = query.filter(BOMClosure.depth <= max_depth)
+        return list(dict.fromkeys(row[0] for row in query.all()))
+
+    def descendant_ids(
+        self, ancestor_id: str, max_depth: Optional[int] = None
+    ) -> List[str]:
+        """Distinct descendants of ``ancestor_id`` within ``max_depth`` levels."""
+        query = self.session.query(BOMClosure.descendant_id).filter(
+            BOMClosure.ancestor_id == ancestor_id
+        )
+        if max_depth is not None:
+            query = query.filter(BOMClosure.depth <= max_depth)
+        return list(dict.fromkeys(row[0] for row in query.all()))
+
+    # ========== Maintenance ==========
+
+    def apply_edge_changes(self, connection, changes: List[Tuple[Edge, int]]) -> None:
+        """
+        Apply ``[((source_id, related_id), +1/-1), ...]`` to the closure.
+
+        Each edge is applied against the closure as left by the previous one, so
+        several lines inserted in one flush compose correctly.
+        """
+        max_depth = self._max_depth()
+        for (source_id, related_id), sign in changes:
+            ups = [(source_id, 0, 1)] + [
+                tuple(row)
+                for row in connection.execute(
+                    select(_TABLE.c.ancestor_id, _TABLE.c.depth, _TABLE.c.path_count)
+                    .where(_TABLE.c.descendant_id == source_id)
+                )
+            ]
+            downs = [(related_id, 0, 1)] + [
+                tuple(row)
+                for row in connection.execute(
+                    select(_TABLE.c.descendant_id, _TABLE.c.depth, _TABLE.c.path_count)
+                    .where(_TABLE.c.ancestor_id == related_id)
+                )
+            ]
+            deltas: Dict[ClosureKey, int] = defaultdict(int)
+            for ancestor, up_depth, up_count in ups:
+                for descendant, down_depth, down_count in downs:
+                    depth = up_depth + down_depth + 1
+                    if depth > max_depth:
+                        continue
+                    deltas[(ancestor, descendant, depth)] += sign * up_count * down_count
+            self._merge_counts(connection, deltas)
+
+    def _merge_counts(self, connection, deltas: Dict[ClosureKey, int]) -> None:
+        rows = [
+            {"ancestor_id": a, "descendant_id": d, "depth": depth, "path_count": n}
+            for (a, d, depth), n in deltas.items()
+            if n
+        ]
+        if not rows:
+            return
+
+        dialect = connection.dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            insert = pg_insert if dialect == "postgresql" else sqlite_insert
+            stmt = insert(_TABLE)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["ancestor_id", "descendant_id", "depth"],
+                set_={"path_count": _TABLE.c.path_count + stmt.excluded.path_count},
+            )
+            connection.execute(stmt, rows)
+        else:
+            for row in rows:
+                key = (
+                    (_TABLE.c.ancestor_id == row["ancestor_id"])
+                    & (_TABLE.c.descendant_id == row["descendant_id"])
+                    & (_TABLE.c.depth == row["depth"])
+                )
+                result = connection.execute(
+                    _TABLE.update()
+                    .where(key)
+                    .values(path_count=_TABLE.c.path_count + row["path_count"])
+                )
+                if not result.rowcount:
+                    connection.execute(_TABLE.insert(), [row])
+
+        shrunk = sorted({row["ancestor_id"] for row in rows if row["path_count"] < 0})
+        for chunk in chunks(shrunk):
+            connection.execute(
+                delete(_TABLE).where(
+                    _TABLE.c.ancestor_id.in_(chunk), _TABLE.c.path_count <= 0
+                )
+            )
+
+    def rebuild(self, batch_size: int = 5000) -> Dict[str, int]:
+        """Recompute the whole closure from current relationship items."""
+        edges = Counter(
+            (source_id, related_id)
+            for source_id, related_id in self.session.query(
+                Item.source_id, Item.related_id
+            ).filter(
+                Item.source_id.isnot(None),
+                Item.related_id.isnot(None),
+                Item.is_current.is_(True),
+            )
+        )
+        children: Dict[str, List[Tuple[str, int]]] = defaultdict(list)
+        for (source_id, related_id), count in edges.items():
+            children[source_id].append((related_id, count))
+
+        self.session.execute(delete(_TABLE))
+        max_depth = self._max_depth()
+        buffer: List[Dict[str, object]] = []
+        total = 0
+        for ancestor in children:
+            # Level-by-level path counting; bounded by max_depth even on cycles.
+            frontier: Dict[str, int] = {ancestor: 1}
+            for depth in range(1, max_depth + 1):
+                reached: Dict[str, int] = defaultdict(int)
+                for node, paths in frontier.items():
+                    for child, count in children.get(node, ()):
+                        reached[child] += paths * count
+                if not reached:
+                    break
+                for descendant, paths in reached.items():
+                    buffer.append(
+                        {
+                            "ancestor_id": ancestor,
+                            "descendant_id": descendant,
+                            "depth": depth,
+                            "path_count": paths,
+                        }
+                    )
+                frontier = reached
+            if len(buffer) >= batch_size:
+                self.session.execute(_TABLE.insert(), buffer)
+                total += len(buffer)
+                buffer = []
+        if buffer:
+            self.session.execute(_TABLE.insert(), buffer)
+            total += len(buffer)
+        self.session.flush()
+        return {"edges": sum(edges.values()), "rows": total}
+
+
+# ========== Session hook ==========
+
+
+_PENDING_CHANGES_KEY = "meta_engine_bom_closure_changes"
+
+
+def _as_edge(source_id, related_id, is_current) -> Optional[Edge]:
+    # Unset is_current on a pending row means the column default (True).
+    if source_id and related_id and is_current is not False:
+        return (source_id, related_id)
+    return None
+
+
+def _collect_edge_changes(session: Session) -> List[Tuple[Edge, int]]:
+    """Diff relationship edges of pending ORM changes against the stored rows."""
+    changes: List[Tuple[Edge, int]] = []
+    for obj in session.new:
+        if isinstance(obj, Item):
+            state = inspect(obj)
+            edge = _as_edge(*(state.dict.get(attr) for attr in _EDGE_ATTRS))
+            if edge:
+                changes.append((edge, 1))
+
+    touched: Dict[str, Optional[Item]] = {}
+    for obj in session.deleted:
+        if isinstance(obj, Item) and obj.id:
+            touched[obj.id] = None
+    for obj in session.dirty:
+        if isinstance(obj, Item) and obj.id and obj.id not in touched:
+            state = inspect(obj)
+            if any(state.attrs[attr].history.has_changes() for attr in _EDGE_ATTRS):
+                touched[obj.id] = obj
+    if not touched:
+        return changes
+
+    # Old values come from the database (still pre-flush here): the in-memory
+    # history does not keep previous values of attributes that were never loaded.
+    item_table = Item.__table__
+    connection = session.connection()
+    stored: Dict[str, Optional[Edge]] = {}
+    for chunk in chunks(list(touched)):
+        for row in connection.execute(
+            select(
+                item_table.c.id,
+                item_table.c.source_id,
+                item_table.c.related_id,
+                item_table.c.is_current,
+            ).where(item_table.c.id.in_(chunk))
+        ):
+            stored[row[0]] = _as_edge(row[1], row[2], row[3])
+
+    for item_id, obj in touched.items():
+        before = stored.get(item_id)
+        after = None
+        if obj is not None:
+            after = _as_edge(*(getattr(obj, attr) for attr in _EDGE_ATTRS))
+        if before == after:
+            continue
+        if before:
+            changes.append((before, -1))
+        if after:
+            changes.append((after, 1))
+    return changes
+
+
+def _before_flush(session: Session, flush_context, instances) -> None:  # type: ignore[no-untyped-def]
+    session.info.pop(_PENDING_CHANGES_KEY, None)
+    if not get_settings().BOM_CLOSURE_ENABLED:
+        return
+    if not any(isinstance(obj, Item) for obj in (*session.new, *session.dirty, *session.deleted)):
+        return
+    if not BOMClosureService(session).enabled():
+        return
+    changes = _collect_edge_changes(session)
+    if changes:
+        session.info[_PENDING_CHANGES_KEY] = changes
+
+
+def _after_flush(session: Session, flush_context) -> None:  # type: ignore[no-untyped-def]
+    changes = session.info.pop(_PENDING_CHANGES_KEY, None)
+    if changes:
+        BOMClosureService(session).apply_edge_changes(session.connection(), changes)
+
+
+def register_session_hooks() -> None:
+    global _REGISTERED
+    if _REGISTERED:
+        return
+    with _REGISTER_LOCK:
+        if _REGISTERED:
+            return
+        event.listen(Session, "before_flush", _before_flush)
+        event.listen(Session, "after_flush", _after_flush)
+        _REGISTERED = True
+
+
+register_session_hooks()
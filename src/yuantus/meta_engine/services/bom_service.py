@@ -1,4 +1,4 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional
 import json
 import csv
 from yuantus.meta_engine.web.csv_export_safety import safe_dict_writer
@@ -10,7 +10,9 @@ from sqlalchemy.orm import Session
 from yuantus.meta_engine.models.item import Item
 from yuantus.meta_engine.services.latest_released_guard import assert_latest_released
 from yuantus.meta_engine.services.suspended_guard import assert_not_suspended
+from .bom_closure_service import BOMClosureService
 from .effectivity_service import EffectivityService, EffectivityContext
+from .sql_helpers import chunks
 
 
 def _normalize_bom_uom(value: Optional[Any], *, default: str = "EA") -> str:
@@ -142,6 +144,9 @@ class BOMService:
         "include_substitutes": False,
         "include_effectivity": False,
     }
+    # "level": breadth-first explosion, one batch of IN() queries per level.
+    # "recursive": legacy per-line recursion (one query per parent/child).
+    EXPLOSION_MODES = ("level", "recursive")
     DELTA_EXPORT_FIELDS = (
         "op",
         "line_key",
@@ -228,15 +233,38 @@ class BOMService:
         lot_number: Optional[str] = None,
         serial_number: Optional[str] = None,
         unit_position: Optional[str] = None,
+        explosion_mode: str = "level",
     ) -> Dict[str, Any]:
         """
         Return hierarchical BOM structure.
         Supports Effectivity filtering.
+
+        ``explosion_mode="level"`` (default) explodes the tree breadth-first and
+        batches every relationship, child item, effectivity and substitute of a
+        level into a handful of queries. ``"recursive"`` keeps the legacy
+        per-line traversal. Both return the same nested shape.
         """
+        if explosion_mode not in self.EXPLOSION_MODES:
+            allowed = ", ".join(self.EXPLOSION_MODES)
+            raise ValueError(f"explosion_mode must be one of: {allowed}")
+
         root = self.session.get(Item, item_id)
         if not root:
             raise ValueError(f"Item {item_id} not found")
 
+        if explosion_mode == "level":
+            return self._build_tree_by_level(
+                root,
+                max_level=levels,
+                effective_date=effective_date,
+                include_substitutes=include_substitutes,
+                relationship_types=relationship_types,
+                config_selection=config_selection,
+                lot_number=lot_number,
+                serial_number=serial_number,
+                unit_position=unit_position,
+            )
+
         return self._build_tree(
             root,
             current_level=0,
@@ -271,6 +299,238 @@ class BOMService:
             unit_position=unit_position,
         )
 
+    def _build_tree_by_level(
+        self,
+        root: Item,
+        max_level: int,
+        effective_date: datetime = None,
+        include_substitutes: bool = False,
+        relationship_types: Optional[List[str]] = None,
+        config_selection: Optional[Dict[str, Any]] = None,
+        lot_number: Optional[str] = None,
+        serial_number: Optional[str] = None,
+        unit_position: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Breadth-first counterpart of ``_build_tree``.
+
+        Each level costs one relationship query, one child-item query and (when
+        requested) one effectivity and one substitute query per chunk of ids,
+        instead of one round trip per line. Relationship lists are memoized per
+        parent, so shared sub-assemblies are only fetched once per request.
+        """
+        eff_ctx = self._build_effectivity_context(
+            effective_date, lot_number, serial_number, unit_position
+        )
+        sub_svc = None
+        if include_substitutes:
+            from .substitute_service import SubstituteService
+
+            sub_svc = SubstituteService(self.session)
+
+        root_node = root.to_dict()
+        root_node["children"] = []
+
+        rels_by_parent: Dict[str, List[Item]] = {}
+        items_by_id: Dict[str, Item] = {root.id: root}
+        rel_passes: Dict[str, bool] = {}
+        subs_by_line: Dict[str, List[tuple]] = {}
+
+        # frontier entries: (item_id, node, ancestor ids); ancestors are only
+        # tracked for unbounded explosions, where a cycle would never end.
+        unbounded = max_level == -1
+        frontier = [(root.id, root_node, frozenset((root.id,)) if unbounded else None)]
+        level = 0
+        while frontier and (unbounded or level < max_level):
+            pending = [
+                pid
+                for pid in dict.fromkeys(entry[0] for entry in frontier)
+                if pid not in rels_by_parent
+            ]
+            for pid in pending:
+                rels_by_parent[pid] = []
+            for chunk in chunks(pending):
+                query = self.session.query(Item).filter(
+                    Item.source_id.in_(chunk),
+                    Item.is_current.is_(True),
+                )
+                if relationship_types:
+                    query = query.filter(Item.item_type_id.in_(relationship_types))
+                for rel in query.all():
+                    rels_by_parent[rel.source_id].append(rel)
+
+            # Decide config/effectivity once per relationship line.
+            new_rels: List[Item] = []
+            for pid, _node, _ancestors in frontier:
+                for rel in rels_by_parent[pid]:
+                    if rel.id in rel_passes:
+                        continue
+                    passes = bool(rel.related_id)
+                    if passes and config_selection is not None:
+                        passes = self._match_config_condition(
+                            (rel.properties or {}).get("config_condition"),
+                            config_selection,
+                        )
+                    rel_passes[rel.id] = passes
+                    if passes:
+                        new_rels.append(rel)
+
+            if eff_ctx and new_rels:
+                effective = self.eff_service.check_effectivity_batch(
+                    [r.id for r in new_rels], eff_ctx
+                )
+                for rel in new_rels:
+                    if not effective.get(rel.id, True):
+                        rel_passes[rel.id] = False
+                new_rels = [r for r in new_rels if rel_passes[r.id]]
+
+            missing_children = [
+                cid
+                for cid in dict.fromkeys(r.related_id for r in new_rels)
+                if cid not in items_by_id
+            ]
+            for chunk in chunks(missing_children):
+                for child in self.session.query(Item).filter(Item.id.in_(chunk)).all():
+                    items_by_id[child.id] = child
+
+            if sub_svc is not None and new_rels:
+                subs_by_line.update(
+                    sub_svc.load_bom_substitute_rows([r.id for r in new_rels])
+                )
+
+            next_frontier = []
+            for pid, node, ancestors in frontier:
+                for rel in rels_by_parent[pid]:
+                    if not rel_passes.get(rel.id):
+                        continue
+                    child_item = items_by_id.get(rel.related_id)
+                    if not child_item or not child_item.is_current:
+                        continue
+                    if ancestors is not None and child_item.id in ancestors:
+                        continue
+
+                    rel_dict = rel.to_dict()
+                    # Explicitly include properties for downstream processing (e.g. ECOService)
+                    rel_dict["properties"] = rel.properties or {}
+                    child_node = child_item.to_dict()
+                    child_node["children"] = []
+
+                    entry = {"relationship": rel_dict, "child": child_node}
+                    if sub_svc is not None:
+                        entry["substitutes"] = [
+                            sub_svc._format_bom_substitute(sub, part)
+                            for sub, part in subs_by_line.get(rel.id, [])
+                        ]
+                    node["children"].append(entry)
+                    next_frontier.append(
+                        (
+                            child_item.id,
+                            child_node,
+                            ancestors | {child_item.id} if ancestors is not None else None,
+                        )
+                    )
+
+            frontier = next_frontier
+            level += 1
+
+        return root_node
+
+    def iter_bom_nodes(
+        self,
+        item_id: str,
+        levels: int = 10,
+        effective_date: datetime = None,
+        relationship_types: Optional[List[str]] = None,
+        config_selection: Optional[Dict[str, Any]] = None,
+        lot_number: Optional[str] = None,
+        serial_number: Optional[str] = None,
+        unit_position: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the BOM explosion depth-first, one node record at a time.
+
+        Yields ``{"level", "path", "parent_id", "relationship", "item"}`` in the
+        same pre-order as ``get_bom_structure`` (root first, ``relationship`` is
+        None for it). Only the sibling lists of the current path are held, so
+        memory is bounded by depth x fan-out instead of the line count.
+        Raises ValueError eagerly when the root does not exist.
+        """
+        root = self.session.get(Item, item_id)
+        if not root:
+            raise ValueError(f"Item {item_id} not found")
+
+        eff_ctx = self._build_effectivity_context(
+            effective_date, lot_number, serial_number, unit_position
+        )
+
+        def _children(parent_id: str) -> List[tuple]:
+            query = self.session.query(Item).filter(
+                Item.source_id == parent_id,
+                Item.is_current.is_(True),
+            )
+            if relationship_types:
+                query = query.filter(Item.item_type_id.in_(relationship_types))
+            rels = []
+            for rel in query.all():
+                if not rel.related_id:
+                    continue
+                if config_selection is not None and not self._match_config_condition(
+                    (rel.properties or {}).get("config_condition"), config_selection
+                ):
+                    continue
+                rels.append(rel)
+            if eff_ctx and rels:
+                effective = self.eff_service.check_effectivity_batch(
+                    [r.id for r in rels], eff_ctx
+                )
+                rels = [r for r in rels if effective.get(r.id, True)]
+            child_ids = list(dict.fromkeys(r.related_id for r in rels))
+            items: Dict[str, Item] = {}
+            for chunk in chunks(child_ids):
+                for child in self.session.query(Item).filter(Item.id.in_(chunk)).all():
+                    items[child.id] = child
+            return [
+                (rel, items[rel.related_id])
+                for rel in rels
+                if rel.related_id in items and items[rel.related_id].is_current
+            ]
+
+        def _walk() -> Iterator[Dict[str, Any]]:
+            yield {
+                "level": 0,
+                "path": [root.id],
+                "parent_id": None,
+                "relationship": None,
+                "item": root.to_dict(),
+            }
+            if levels != -1 and levels <= 0:
+                return
+            stack = [([root.id], iter(_children(root.id)))]
+            while stack:
+                path, siblings = stack[-1]
+                entry = next(siblings, None)
+                if entry is None:
+                    stack.pop()
+                    continue
+                rel, child = entry
+                # Unbounded explosions skip back-edges that would never end.
+                if levels == -1 and child.id in path:
+                    continue
+                child_path = path + [child.id]
+                rel_dict = rel.to_dict()
+                rel_dict["properties"] = rel.properties or {}
+                yield {
+                    "level": len(path),
+                    "path": child_path,
+                    "parent_id": path[-1],
+                    "relationship": rel_dict,
+                    "item": child.to_dict(),
+                }
+                if levels == -1 or len(child_path) <= levels:
+                    stack.append((child_path, iter(_children(child.id))))
+
+        return _walk()
+
     def _build_tree(
         self,
         parent_item: Item,
@@ -372,7 +632,8 @@ class BOMService:
         Check if adding parent -> child creates a cycle.
         Returns the cycle path if found.
 
-        Algorithm: BFS starting from 'child'. If 'parent' is found, reconstruct path.
+        Algorithm: level-by-level BFS starting from 'child'. If 'parent' is
+        found, reconstruct path.
 
         Returns:
             {
@@ -386,35 +647,37 @@ class BOMService:
                 "cycle_path": [parent_id, child_id]
             }
 
-        # BFS with path tracking
-        # queue items: (current_id, path_to_current)
-        queue: List[tuple] = [(child_id, [parent_id, child_id])]
-        visited = set()
-
-        while queue:
-            curr, path = queue.pop(0)
-
-            if curr == parent_id:
-                # Found cycle! path already includes parent_id at start
-                return {
-                    "has_cycle": True,
-                    "cycle_path": path
-                }
-
-            if curr in visited:
-                continue
-            visited.add(curr)
-
-            # Get all children of curr
-            rels = (
-                self.session.query(Item)
-                .filter(Item.source_id == curr, Item.is_current.is_(True))
-                .all()
-            )
-
-            for r in rels:
-                if r.related_id and r.related_id not in visited:
-                    queue.append((r.related_id, path + [r.related_id]))
+        # BFS from 'child', one query per level. The closure table is not
+        # consulted: it stops at BOM_CLOSURE_MAX_DEPTH and misses edges written
+        # around the session hooks, so a negative answer from it is not proof.
+        came_from: Dict[str, Optional[str]] = {child_id: None}
+        frontier = [child_id]
+        while frontier:
+            children: Dict[str, List[str]] = {}
+            for chunk in chunks(frontier):
+                for source_id, related_id in self.session.query(
+                    Item.source_id, Item.related_id
+                ).filter(Item.source_id.in_(chunk), Item.is_current.is_(True)):
+                    if related_id:
+                        children.setdefault(source_id, []).append(related_id)
+
+            next_frontier = []
+            for curr in frontier:
+                for related_id in children.get(curr, ()):
+                    if related_id in came_from:
+                        continue
+                    came_from[related_id] = curr
+                    if related_id == parent_id:
+                        # Found cycle! Walk back to 'child' and prepend parent.
+                        path = [related_id]
+                        while came_from[path[-1]] is not None:
+                            path.append(came_from[path[-1]])
+                        return {
+                            "has_cycle": True,
+                            "cycle_path": [parent_id] + path[::-1],
+                        }
+                    next_frontier.append(related_id)
+            frontier = next_frontier
 
         return {
             "has_cycle": False,
@@ -435,6 +698,15 @@ class BOMService:
         """
         if _visited is None:
             _visited = set()
+            if recursive and _current_level < max_levels:
+                closure = BOMClosureService(self.session)
+                # Deeper than BOM_CLOSURE_MAX_DEPTH the index has no paths; walk.
+                if closure.enabled() and closure.covers_depth(
+                    max_levels - _current_level - 1
+                ):
+                    return self._get_where_used_from_closure(
+                        closure, item_id, max_levels, _current_level
+                    )
 
         if item_id in _visited:
             return []
@@ -455,30 +727,10 @@ class BOMService:
                 continue
             parent = self.session.get(Item, rel.source_id)
             if parent:
-                rel_props = rel.properties or {}
-                norm_props = self._normalize_properties(rel_props)
                 child_item = self.session.get(Item, rel.related_id) if rel.related_id else None
-                parent_props = parent.properties or {}
-                child_props = child_item.properties if child_item else {}
-                parent_number = parent_props.get("item_number") or parent_props.get("number")
-                child_number = None
-                child_name = None
-                if child_props:
-                    child_number = child_props.get("item_number") or child_props.get("number")
-                    child_name = child_props.get("name")
-                parent_entry = {
-                    "relationship": rel.to_dict(),
-                    "parent": parent.to_dict(),
-                    "child": child_item.to_dict() if child_item else None,
-                    "line": self._line_fields(rel_props),
-                    "line_normalized": self._line_fields_normalized(norm_props),
-                    "level": _current_level + 1,
-                    "parent_number": parent_number,
-                    "parent_name": parent_props.get("name"),
-                    "child_number": child_number,
-                    "child_name": child_name,
-                }
-                parents.append(parent_entry)
+                parents.append(
+                    self._where_used_entry(rel, parent, child_item, _current_level + 1)
+                )
 
                 if recursive:
                     grandparents = self.get_where_used(
@@ -492,6 +744,93 @@ class BOMService:
 
         return parents
 
+    def _get_where_used_from_closure(
+        self,
+        closure: BOMClosureService,
+        item_id: str,
+        max_levels: int,
+        start_level: int,
+    ) -> List[Dict[str, Any]]:
+        """
+        Recursive where-used backed by the closure index.
+
+        One closure lookup yields every ancestor that the walk can reach, then
+        their relationship lines and items are fetched in chunked batches; the
+        depth-first walk is replayed in memory so entries, order and levels match
+        the per-level recursion exactly.
+        """
+        nodes = [item_id] + closure.ancestor_ids(
+            item_id, max_depth=max_levels - start_level - 1
+        )
+        rels_by_child: Dict[str, List[Item]] = {node: [] for node in nodes}
+        for chunk in chunks(nodes):
+            for rel in (
+                self.session.query(Item)
+                .filter(Item.related_id.in_(chunk), Item.is_current.is_(True))
+                .all()
+            ):
+                rels_by_child[rel.related_id].append(rel)
+
+        item_ids = set(nodes)
+        for rels in rels_by_child.values():
+            item_ids.update(rel.source_id for rel in rels if rel.source_id)
+        items: Dict[str, Item] = {}
+        for chunk in chunks(sorted(item_ids)):
+            for item in self.session.query(Item).filter(Item.id.in_(chunk)).all():
+                items[item.id] = item
+
+        visited: set = set()
+
+        def walk(node_id: str, level: int) -> List[Dict[str, Any]]:
+            if node_id in visited:
+                return []
+            visited.add(node_id)
+            if level >= max_levels:
+                return []
+            entries: List[Dict[str, Any]] = []
+            for rel in rels_by_child.get(node_id, []):
+                if not rel.source_id:
+                    continue
+                parent = items.get(rel.source_id)
+                if parent:
+                    entries.append(
+                        self._where_used_entry(rel, parent, items.get(rel.related_id), level + 1)
+                    )
+                    entries.extend(walk(parent.id, level + 1))
+            return entries
+
+        return walk(item_id, start_level)
+
+    def _where_used_entry(
+        self,
+        rel: Item,
+        parent: Item,
+        child_item: Optional[Item],
+        level: int,
+    ) -> Dict[str, Any]:
+        rel_props = rel.properties or {}
+        norm_props = self._normalize_properties(rel_props)
+        parent_props = parent.properties or {}
+        child_props = child_item.properties if child_item else {}
+        parent_number = parent_props.get("item_number") or parent_props.get("number")
+        child_number = None
+        child_name = None
+        if child_props:
+            child_number = child_props.get("item_number") or child_props.get("number")
+            child_name = child_props.get("name")
+        return {
+            "relationship": rel.to_dict(),
+            "parent": parent.to_dict(),
+            "child": child_item.to_dict() if child_item else None,
+            "line": self._line_fields(rel_props),
+            "line_normalized": self._line_fields_normalized(norm_props),
+            "level": level,
+            "parent_number": parent_number,
+            "parent_name": parent_props.get("name"),
+            "child_number": child_number,
+            "child_name": child_name,
+        }
+
     def get_bom_for_version(
         self,
         version_id: str,
@@ -0,0 +1,282 @@
+"""
+Content-addressed cache of derived CAD artifacts.
+
+The CAD pipeline tasks (``cad_preview``, ``cad_geometry``, ``cad_extract``,
+``cad_bom``) download the source and run a converter for every file, even when
+an identical file was already processed. ``meta_cad_artifact_cache`` remembers
+what a task produced keyed by the source checksum, the task kind, the converter
+backend/profile and the parameters (``CAD_ARTIFACT_CACHE_PARAMS_VERSION`` plus
+the task's own inputs). On a hit the task links the recorded storage keys onto
+the new container instead of recomputing them.
+
+A hit is only served when every recorded storage key still exists; stale
+entries are dropped and count as a miss. The index is bounded by
+``CAD_ARTIFACT_CACHE_MAX_ENTRIES`` and ``CAD_ARTIFACT_CACHE_MAX_BYTES`` and
+evicts least recently used entries. Eviction removes index rows only: the
+artifacts belong to the container that produced them and may be linked from
+others.
+
+Hit/miss/store/eviction counters are process-local and exported with the
+runtime Prometheus text.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from datetime import datetime
+from threading import Lock
+from typing import Any, Dict, List, Mapping, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from yuantus.config import get_settings
+from yuantus.meta_engine.models.cad_artifact_cache import CadArtifactCacheEntry
+from yuantus.meta_engine.models.file import FileContainer
+from yuantus.meta_engine.services.file_service import FileService
+
+logger = logging.getLogger(__name__)
+
+_EVICT_BATCH = 500
+_COUNTERS = ("hits", "misses", "stores", "evictions")
+
+_STATS: Dict[str, Dict[str, int]] = {}
+_STATS_LOCK = Lock()
+
+
+def _record(kind: str, counter: str, amount: int = 1) -> None:
+    with _STATS_LOCK:
+        stats = _STATS.setdefault(kind, dict.fromkeys(_COUNTERS, 0))
+        stats[counter] += amount
+
+
+def cad_artifact_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Per-kind hit/miss/store/eviction counters of this process."""
+    with _STATS_LOCK:
+        return {kind: dict(stats) for kind, stats in _STATS.items()}
+
+
+def reset_cad_artifact_cache_stats() -> None:
+    with _STATS_LOCK:
+        _STATS.clear()
+
+
+def cad_artifact_cache_key(
+    checksum: str,
+    kind: str,
+    backend: str,
+    params_version: int,
+    params: Optional[Mapping[str, Any]] = None,
+) -> str:
+    blob = json.dumps(
+        [checksum, kind, backend, int(params_version), dict(params or {})],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _storage_paths(artifacts: Mapping[str, Any]) -> List[str]:
+    return [
+        str(value)
+        for name, value in artifacts.items()
+        if name.endswith("_path") and value
+    ]
+
+
+class CadArtifactCacheService:
+    def __init__(self, session: Session, file_service: Optional[FileService] = None):
+        self.session = session
+        self.file_service = file_service or FileService()
+        self.settings = get_settings()
+
+    def enabled(self) -> bool:
+        return bool(self.settings.CAD_ARTIFACT_CACHE_ENABLED)
+
+    def _key(
+        self,
+        file_container: FileContainer,
+        kind: str,
+        backend: str,
+        params: Optional[Mapping[str, Any]],
+    ) -> Optional[str]:
+        if not self.enabled() or not file_container.checksum:
+            return None
+        return cad_artifact_cache_key(
+            file_container.checksum,
+            kind,
+            backend,
+            self.settings.CAD_ARTIFACT_CACHE_PARAMS_VERSION,
+            params,
+        )
+
+    # ========== Lookups ==========
+
+    def lookup(
+        self,
+        file_container: FileContainer,
+        kind: str,
+        backend: str,
+        params: Optional[Mapping[str, Any]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Artifacts recorded for this content, or ``None`` on a miss.
+
+        A container never hits its own entry, so re-running a task for the
+        same file recomputes.
+        """
+        key = self._key(file_container, kind, backend, params)
+        if key is None:
+            return None
+        entry = self.session.get(CadArtifactCacheEntry, key)
+        if entry is None or entry.source_file_id == file_container.id:
+            _record(kind, "misses")
+            return None
+
+        artifacts = dict(entry.artifacts or {})
+        missing = [
+            path
+            for path in _storage_paths(artifacts)
+            if not self.file_service.file_exists(path)
+        ]
+        if missing:
+            logger.info(
+                "CAD artifact cache entry %s is stale (missing %s); dropping",
+                key,
+                missing[0],
+            )
+            self.session.delete(entry)
+            self.session.flush()
+            _record(kind, "misses")
+            return None
+
+        entry.hit_count = (entry.hit_count or 0) + 1
+        entry.last_used_at = datetime.utcnow()
+        self.session.add(entry)
+        self.session.flush()
+        _record(kind, "hits")
+        return artifacts
+
+    @staticmethod
+    def link(file_container: FileContainer, artifacts: Mapping[str, Any]) -> None:
+        """Copy cached FileContainer fields onto ``file_container``."""
+        for name, value in artifacts.items():
+            if hasattr(FileContainer, name):
+                setattr(file_container, name, value)
+
+    # ========== Writes ==========
+
+    def store(
+        self,
+        file_container: FileContainer,
+        kind: str,
+        backend: str,
+        artifacts: Mapping[str, Any],
+        params: Optional[Mapping[str, Any]] = None,
+    ) -> Optional[CadArtifactCacheEntry]:
+        """Record what ``kind`` produced for this content and enforce the bounds."""
+        key = self._key(file_container, kind, backend, params)
+        if key is None:
+            return None
+        artifacts = dict(artifacts)
+        paths = _storage_paths(artifacts)
+        if file_container.system_path in paths:
+            # The "artifact" is the source itself; nothing was derived.
+            return None
+
+        size_bytes = self._size_of(artifacts, paths)
+        now = datetime.utcnow()
+        try:
+            # Best effort: a worker converting the same content may insert the
+            # key first; that must not fail the conversion that just succeeded.
+            with self.session.begin_nested():
+                entry = self.session.get(CadArtifactCacheEntry, key)
+                if entry is None:
+                    entry = CadArtifactCacheEntry(
+                        cache_key=key, hit_count=0, created_at=now
+                    )
+                entry.checksum = file_container.checksum
+                entry.kind = kind
+                entry.backend = backend
+                entry.params_version = int(
+                    self.settings.CAD_ARTIFACT_CACHE_PARAMS_VERSION
+                )
+                entry.source_file_id = file_container.id
+                entry.artifacts = artifacts
+                entry.size_bytes = size_bytes
+                entry.last_used_at = now
+                self.session.add(entry)
+                self.session.flush()
+                self.evict()
+        except SQLAlchemyError as exc:
+            logger.warning("CAD artifact cache store for %s skipped: %s", kind, exc)
+            return None
+        _record(kind, "stores")
+        return entry
+
+    def _size_of(self, artifacts: Mapping[str, Any], paths: List[str]) -> int:
+        if not paths:
+            return len(json.dumps(artifacts, default=str).encode("utf-8"))
+        total = 0
+        for path in paths:
+            try:
+                info = self.file_service.get_file_info(path) or {}
+            except Exception:
+                continue
+            total += int(info.get("size") or 0)
+        return total
+
+    def evict(self) -> int:
+        """Drop least recently used entries until both bounds hold."""
+        max_entries = int(self.settings.CAD_ARTIFACT_CACHE_MAX_ENTRIES or 0)
+        max_bytes = int(self.settings.CAD_ARTIFACT_CACHE_MAX_BYTES or 0)
+        if max_entries <= 0 and max_bytes <= 0:
+            return 0
+
+        count, total = self.session.execute(
+            select(
+                func.count(),
+                func.coalesce(func.sum(CadArtifactCacheEntry.size_bytes), 0),
+            )
+        ).one()
+        count, total = int(count), int(total)
+
+        def over() -> bool:
+            return (max_entries > 0 and count > max_entries) or (
+                max_bytes > 0 and total > max_bytes
+            )
+
+        evicted = 0
+        while over():
+            rows = self.session.execute(
+                select(
+                    CadArtifactCacheEntry.cache_key,
+                    CadArtifactCacheEntry.kind,
+                    CadArtifactCacheEntry.size_bytes,
+                )
+                .order_by(
+                    CadArtifactCacheEntry.last_used_at.asc(),
+                    CadArtifactCacheEntry.cache_key.asc(),
+                )
+                .limit(_EVICT_BATCH)
+            ).all()
+            if not rows:
+                break
+            victims = []
+            for cache_key, kind, size_bytes in rows:
+                if not over():
+                    break
+                victims.append(cache_key)
+                count -= 1
+                total -= int(size_bytes or 0)
+                _record(kind, "evictions")
+            self.session.execute(
+                delete(CadArtifactCacheEntry)
+                .where(CadArtifactCacheEntry.cache_key.in_(victims))
+                .execution_options(synchronize_session="fetch")
+            )
+            evicted += len(victims)
+        return evicted
@@ -14,7 +14,7 @@ there is no per-part N+1 and no full-tree materialization.
 
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, List
 
 from sqlalchemy.orm import Session
 
@@ -25,15 +25,10 @@ from yuantus.meta_engine.models.file import (
     ItemFile,
 )
 from yuantus.meta_engine.relationship.service import RelationshipService
+from yuantus.meta_engine.services.sql_helpers import chunks
 
 _DOC_2D = DocumentType.CAD_2D.value  # "2d"
 _DRAWING_ROLES = [FileRole.DRAWING.value, FileRole.NATIVE_CAD.value]
-_IN_CHUNK = 500  # keep the IN() clause well under SQLite's parameter cap
-
-
-def _chunks(seq: List[str], size: int = _IN_CHUNK) -> Iterable[List[str]]:
-    for i in range(0, len(seq), size):
-        yield seq[i : i + size]
 
 
 class CadStaleDrawingsService:
@@ -48,7 +43,7 @@ class CadStaleDrawingsService:
         meta_by_part = {r["item_id"]: r for r in reachable}
 
         drawings: List[Dict[str, Any]] = []
-        for chunk in _chunks(part_ids):
+        for chunk in chunks(part_ids):
             rows = (
                 self.session.query(ItemFile, FileContainer)
                 .join(FileContainer, FileContainer.id == ItemFile.file_id)
@@ -6,12 +6,14 @@ Supports Date (v1.2), Lot/Serial (v1.4+), and Unit (v2.0+) effectivity types.
 """
 
 import uuid
-from dataclasses import dataclass
+from bisect import bisect_right
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 from sqlalchemy.orm import Session
 from ..models.effectivity import Effectivity
 from .latest_released_guard import assert_latest_released
+from .sql_helpers import chunks
 from .suspended_guard import assert_not_suspended
 
 # Sentinel: "field not provided" in a partial update (distinct from an explicit None).
@@ -78,6 +80,63 @@ class EffectivityContext:
     unit_position: Optional[str] = None  # Unit Effectivity (v2.0+)
 
 
+@dataclass
+class EffectivityIndex:
+    """
+    Precomputed effectivity rules for one item, used by batch evaluation.
+
+    Date windows are merged into sorted, disjoint intervals so a reference date
+    is resolved with one bisect; serial/unit lists become sets. Evaluation is
+    equivalent to OR-ing ``EffectivityService._check_single`` over the rows.
+    """
+
+    date_starts: List[datetime] = field(default_factory=list)
+    date_ends: List[datetime] = field(default_factory=list)
+    lot_ranges: List[Tuple[Optional[str], Optional[str]]] = field(default_factory=list)
+    serials: Set[Any] = field(default_factory=set)
+    unit_positions: Set[Any] = field(default_factory=set)
+    # Non-list payload values keep the original ``in`` semantics.
+    serial_containers: List[Any] = field(default_factory=list)
+    unit_containers: List[Any] = field(default_factory=list)
+
+    def matches_date(self, ref_date: datetime) -> bool:
+        idx = bisect_right(self.date_starts, ref_date) - 1
+        return idx >= 0 and ref_date <= self.date_ends[idx]
+
+    def matches(self, ctx: "EffectivityContext", ref_date: datetime) -> bool:
+        if self.date_starts and self.matches_date(ref_date):
+            return True
+        lot = ctx.lot_number
+        if lot:
+            for lot_start, lot_end in self.lot_ranges:
+                if (not lot_start or lot >= lot_start) and (not lot_end or lot <= lot_end):
+                    return True
+        serial = ctx.serial_number
+        if serial and (
+            serial in self.serials
+            or any(serial in c for c in self.serial_containers)
+        ):
+            return True
+        unit = ctx.unit_position
+        if unit and (
+            unit in self.unit_positions
+            or any(unit in c for c in self.unit_containers)
+        ):
+            return True
+        return False
+
+
+def _add_members(values: Any, members: Set[Any], containers: List[Any]) -> None:
+    if isinstance(values, (list, tuple, set)):
+        for value in values:
+            try:
+                members.add(value)
+            except TypeError:
+                continue  # unhashable payload entries can never equal a str
+    elif values:
+        containers.append(values)
+
+
 class EffectivityService:
     """
     Service for managing and checking Item/Relationship Effectivity.
@@ -361,6 +420,94 @@ class EffectivityService:
         positions = payload.get("unit_positions", [])
         return ctx.unit_position in positions
 
+    # ========== Batch Evaluation ==========
+
+    def load_effectivity_index(
+        self, item_ids: Iterable[str]
+    ) -> Dict[str, EffectivityIndex]:
+        """
+        Load every effectivity of ``item_ids`` (one query per chunk of ids) and
+        compile them into per-item ``EffectivityIndex`` structures.
+        Items without effectivity rows are absent from the result.
+        """
+        ids = list(dict.fromkeys(i for i in item_ids if i))
+        rows: Dict[str, List[Effectivity]] = {}
+        for chunk in chunks(ids):
+            for eff in (
+                self.session.query(Effectivity)
+                .filter(Effectivity.item_id.in_(chunk))
+                .all()
+            ):
+                rows.setdefault(eff.item_id, []).append(eff)
+        return {item_id: self._compile_index(effs) for item_id, effs in rows.items()}
+
+    def _compile_index(self, effectivities: List[Effectivity]) -> EffectivityIndex:
+        index = EffectivityIndex()
+        windows: List[Tuple[datetime, datetime]] = []
+        for eff in effectivities:
+            payload = eff.payload or {}
+            if eff.effectivity_type == "Date":
+                start = (
+                    self._normalize_utc_naive(eff.start_date)
+                    if eff.start_date
+                    else datetime.min
+                )
+                end = (
+                    self._normalize_utc_naive(eff.end_date)
+                    if eff.end_date
+                    else datetime.max
+                )
+                if start <= end:
+                    windows.append((start, end))
+            elif eff.effectivity_type == "Lot":
+                index.lot_ranges.append(
+                    (payload.get("lot_start") or None, payload.get("lot_end") or None)
+                )
+            elif eff.effectivity_type == "Serial":
+                _add_members(
+                    payload.get("serials", []),
+                    index.serials,
+                    index.serial_containers,
+                )
+            elif eff.effectivity_type == "Unit":
+                _add_members(
+                    payload.get("unit_positions", []),
+                    index.unit_positions,
+                    index.unit_containers,
+                )
+            # Unknown types never match (same as _check_single) but still
+            # count as "effectivity defined" for the item.
+
+        windows.sort()
+        for start, end in windows:
+            if index.date_ends and start <= index.date_ends[-1]:
+                index.date_ends[-1] = max(index.date_ends[-1], end)
+            else:
+                index.date_starts.append(start)
+                index.date_ends.append(end)
+        return index
+
+    def check_effectivity_batch(
+        self, item_ids: Iterable[str], context: Optional[EffectivityContext] = None
+    ) -> Dict[str, bool]:
+        """
+        Batch variant of ``check_effectivity``.
+
+        Loads the effectivities of all ``item_ids`` at once and returns
+        ``{item_id: is_effective}``; items without effectivity are effective.
+        """
+        if context is None:
+            context = EffectivityContext(reference_date=datetime.now())
+        ids = list(dict.fromkeys(i for i in item_ids if i))
+        indexes = self.load_effectivity_index(ids)
+        ref_date = self._normalize_utc_naive(context.reference_date or datetime.now())
+        return {
+            item_id: (
+                item_id not in indexes or indexes[item_id].matches(context, ref_date)
+            )
+            for item_id in ids
+        }
+
     # ========== BOM Integration ==========
 
     def filter_bom_by_effectivity(
@@ -377,8 +524,7 @@ class EffectivityService:
         if context is None:
             context = EffectivityContext(reference_date=datetime.now())
 
-        return [
-            line
-            for line in bom_lines
-            if self.check_effectivity(line.get("item_id"), context)
-        ]
+        effective = self.check_effectivity_batch(
+            [line.get("item_id") for line in bom_lines], context
+        )
+        return [line for line in bom_lines if effective.get(line.get("item_id"), True)]
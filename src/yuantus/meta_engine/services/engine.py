@@ -2,7 +2,6 @@ import json
 import uuid
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import select
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session
 from jsonschema import (
@@ -19,6 +18,7 @@ from ..models.item import Item
 from ..models.meta_schema import ItemType, Property
 from ..schemas.aml import AMLAction, GenericItem
 from .meta_permission_service import MetaPermissionService
+from .metadata_cache import get_metadata
 from .bom_service import BOMService
 from .job_service import JobService
 from .checkin_service import CheckinService
@@ -583,6 +583,8 @@ class AMLEngine:
         """
         Get flattened BOM.
         args: [item_id]
+        kwargs: stream=True returns a lazy iterator of per-occurrence lines
+        (level, path, extended quantity) that the RPC router sends as NDJSON.
         """
         item_id = args[0] if args else kwargs.get("item_id") or kwargs.get("id")
 
@@ -590,6 +592,8 @@ class AMLEngine:
             raise ValueError("Missing item_id")
 
         svc = ReportService(self.session)
+        if kwargs.get("stream"):
+            return svc.iter_flattened_bom_lines(item_id)
         return svc.get_flattened_bom(item_id)
 
     @rpc_exposed("CAD", "sync_attributes")
@@ -668,12 +672,12 @@ class AMLEngine:
 
         return {"error": "Action not supported yet"}
 
-    def _get_item_type(self, type_name: str) -> ItemType:
-        # Cache this lookup in production!
+    def _get_item_type(self, type_name: str) -> Optional[ItemType]:
+        # Existence is answered by the metadata cache; the row itself then
+        # comes from the identity map on repeated (nested) lookups.
         try:
-            return self.session.execute(
-                select(ItemType).where(ItemType.id == type_name)
-            ).scalar_one_or_none()
+            meta = get_metadata(self.session).get(type_name)
+            return self.session.get(ItemType, meta.id) if meta else None
         except OperationalError as exc:
             raise ValidationError(
                 "Meta schema not initialized; run migrations/meta_seed first.",
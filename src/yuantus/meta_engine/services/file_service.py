@@ -4,7 +4,7 @@ Abstraction for file operations, supporting Local and S3 (MinIO).
 """
 
 import io
-from typing import BinaryIO, Dict, Any, Optional, List
+from typing import BinaryIO, Dict, Any, Iterator, Optional, List
 
 from yuantus.config import get_settings
 from yuantus.config.settings import Settings  # Import Settings
@@ -91,6 +91,19 @@ class FileService:
         """Checks if a file exists."""
         return self.storage_provider.file_exists(file_path)
 
+    def get_file_info(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Returns size/etag/last_modified of a stored file, or None."""
+        return self.storage_provider.get_file_info(file_path)
+
+    def iter_file(
+        self,
+        file_path: str,
+        start: int = 0,
+        end: Optional[int] = None,
+    ) -> Iterator[bytes]:
+        """Streams a file (or an inclusive byte range) in chunks."""
+        return self.storage_provider.iter_file(file_path, start, end)
+
     def get_presigned_url(
         self, file_path: str, expiration: int = 3600, http_method: str = "GET"
     ) -> str:
@@ -0,0 +1,215 @@
+"""
+DB-side full-text index for item search without Elasticsearch.
+
+``meta_item_search`` holds one ``search_text`` per item (the ES document's
+``search_text`` plus id and state). PostgreSQL matches it with a prefix
+``tsquery`` against the GIN ``to_tsvector('simple', search_text)`` index and
+ranks by ``ts_rank``; SQLite matches the FTS5 mirror and ranks by ``bm25``.
+Both tokenize on word characters, so ``"P-00"`` finds ``P-001`` the way the
+ILIKE fallback did, but through an index instead of a ``meta_items`` scan.
+
+Maintenance is incremental: a Session flush hook re-derives the text of every
+inserted, deleted or re-stated/re-propertied Item in the same transaction.
+Bulk ``Query.update``/Core writes bypass the ORM; run ``rebuild()``
+(``yuantus search db-index-rebuild``) after such imports.
+
+The index is only used when ``SEARCH_DB_INDEX_ENABLED`` is set, the table
+exists on the bound database and the dialect is PostgreSQL or SQLite.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import datetime
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional
+
+import sqlalchemy.dialects.postgresql  # noqa: F401  (registers to_tsvector & co.)
+from sqlalchemy import delete, event, func, inspect, literal_column, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Subquery, column, table
+
+from yuantus.config import get_settings
+from yuantus.meta_engine.models.item import Item
+from yuantus.meta_engine.models.item_search import (
+    FTS_TABLE,
+    TSVECTOR_CONFIG,
+    ItemSearchText,
+)
+from yuantus.meta_engine.services.sql_helpers import chunks, table_present
+
+_TABLE = ItemSearchText.__table__
+_FTS = table(FTS_TABLE, column("rowid"))
+_TEXT_ATTRS = ("properties", "state")
+_SUPPORTED_DIALECTS = ("postgresql", "sqlite")
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+_REGISTER_LOCK = Lock()
+_REGISTERED = False
+
+
+def build_search_text(item_id: str, state: Optional[str], properties: Any) -> str:
+    """The indexed text: the ES ``search_text`` plus the id and state."""
+    from yuantus.meta_engine.services.search_service import SearchService
+
+    parts = [SearchService._build_search_text(properties or {}), item_id, state]
+    return " ".join(part for part in parts if part)
+
+
+def query_tokens(query_string: str) -> List[str]:
+    return [token.lower() for token in _TOKEN_RE.findall(query_string or "")]
+
+
+class ItemSearchIndexService:
+    def __init__(self, session: Session):
+        self.session = session
+
+    # ========== Availability ==========
+
+    def enabled(self) -> bool:
+        """True when the index may be read and must be maintained."""
+        if not get_settings().SEARCH_DB_INDEX_ENABLED:
+            return False
+        return self.table_present()
+
+    def table_present(self) -> bool:
+        bind = self.session.get_bind()
+        if bind.dialect.name not in _SUPPORTED_DIALECTS:
+            return False
+        return table_present(self.session, ItemSearchText.__tablename__)
+
+    # ========== Lookups ==========
+
+    def matches(self, query_string: str) -> Optional[Subquery]:
+        """
+        ``(item_id, rank)`` rows matching every token of ``query_string`` as a
+        prefix; ``None`` when the query has no word characters.
+        """
+        tokens = query_tokens(query_string)
+        if not tokens:
+            return None
+        if self.session.get_bind().dialect.name == "postgresql":
+            # Inline the config so the expression matches the GIN index.
+            config = literal_column(f"'{TSVECTOR_CONFIG}'")
+            vector = func.to_tsvector(config, _TABLE.c.search_text)
+            query = func.to_tsquery(config, " & ".join(f"{t}:*" for t in tokens))
+            stmt = select(
+                _TABLE.c.item_id, func.ts_rank(vector, query).label("rank")
+            ).where(vector.op("@@")(query))
+        else:
+            match = " ".join(f'"{t}"*' for t in tokens)
+            stmt = (
+                select(
+                    _TABLE.c.item_id,
+                    (-func.bm25(literal_column(FTS_TABLE))).label("rank"),
+                )
+                .select_from(_TABLE.join(_FTS, _FTS.c.rowid == _TABLE.c.id))
+                .where(text(f"{FTS_TABLE} MATCH :fts_match").bindparams(fts_match=match))
+            )
+        return stmt.subquery("item_search_match")
+
+    # ========== Maintenance ==========
+
+    def refresh(
+        self, connection, upserts: Dict[str, str], deletes: Iterable[str] = ()
+    ) -> None:
+        """Write ``{item_id: search_text}`` and drop ``deletes``."""
+        deleted = [item_id for item_id in deletes if item_id not in upserts]
+        for chunk in chunks(deleted):
+            connection.execute(delete(_TABLE).where(_TABLE.c.item_id.in_(chunk)))
+        if not upserts:
+            return
+        now = datetime.utcnow()
+        rows = [
+            {"item_id": item_id, "search_text": search_text, "updated_at": now}
+            for item_id, search_text in upserts.items()
+        ]
+        insert = pg_insert if connection.dialect.name == "postgresql" else sqlite_insert
+        stmt = insert(_TABLE)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["item_id"],
+            set_={
+                "search_text": stmt.excluded.search_text,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        connection.execute(stmt, rows)
+
+    def rebuild(self, batch_size: int = 1000) -> Dict[str, int]:
+        """Recompute the whole index from ``meta_items``."""
+        self.session.execute(delete(_TABLE))
+        now = datetime.utcnow()
+        buffer: List[Dict[str, Any]] = []
+        total = 0
+        rows = self.session.execute(
+            select(Item.id, Item.state, Item.properties).execution_options(
+                yield_per=batch_size
+            )
+        )
+        for item_id, state, properties in rows:
+            buffer.append(
+                {
+                    "item_id": item_id,
+                    "search_text": build_search_text(item_id, state, properties),
+                    "updated_at": now,
+                }
+            )
+            if len(buffer) >= batch_size:
+                self.session.execute(_TABLE.insert(), buffer)
+                total += len(buffer)
+                buffer = []
+        if buffer:
+            self.session.execute(_TABLE.insert(), buffer)
+            total += len(buffer)
+        self.session.flush()
+        return {"items": total}
+
+
+# ========== Session hook ==========
+
+
+def _collect_changes(session: Session):
+    upserts: Dict[str, str] = {}
+    deletes: List[str] = []
+    for obj in session.deleted:
+        if isinstance(obj, Item) and obj.id:
+            deletes.append(obj.id)
+    for obj in (*session.new, *session.dirty):
+        if not isinstance(obj, Item) or not obj.id or obj in session.deleted:
+            continue
+        if obj not in session.new:
+            state = inspect(obj)
+            if not any(state.attrs[attr].history.has_changes() for attr in _TEXT_ATTRS):
+                continue
+        upserts[obj.id] = build_search_text(obj.id, obj.state, obj.properties)
+    return upserts, deletes
+
+
+def _after_flush(session: Session, flush_context) -> None:  # type: ignore[no-untyped-def]
+    # new/dirty/deleted and attribute history still describe this flush here.
+    if not get_settings().SEARCH_DB_INDEX_ENABLED:
+        return
+    if not any(isinstance(obj, Item) for obj in (*session.new, *session.dirty, *session.deleted)):
+        return
+    service = ItemSearchIndexService(session)
+    if not service.enabled():
+        return
+    upserts, deletes = _collect_changes(session)
+    if upserts or deletes:
+        service.refresh(session.connection(), upserts, deletes)
+
+
+def register_session_hooks() -> None:
+    global _REGISTERED
+    if _REGISTERED:
+        return
+    with _REGISTER_LOCK:
+        if _REGISTERED:
+            return
+        event.listen(Session, "after_flush", _after_flush)
+        _REGISTERED = True
+
+
+register_session_hooks()
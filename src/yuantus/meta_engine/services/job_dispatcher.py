@@ -0,0 +1,365 @@
+"""
+Job Dispatcher
+Push-woken, concurrent front end for JobWorker.
+
+``JobWorker._run_loop`` handles one job at a time and sleeps ``poll_interval``
+between polls. The dispatcher keeps the same handlers and ``_execute_job`` but:
+
+- wakes as soon as ``JobService.create_job`` commits (PostgreSQL
+  ``LISTEN/NOTIFY`` on ``JOB_NOTIFY_CHANNEL``), with the poll interval as the
+  fallback on SQLite or when the listener connection is down;
+- runs up to ``JOB_WORKER_CONCURRENCY`` jobs at once on a thread pool, with
+  optional per ``task_type`` caps (``JOB_TASK_CONCURRENCY``);
+- moves the stale PROCESSING requeue to a periodic reaper thread
+  (``JOB_REAPER_INTERVAL_SECONDS``; ``<= 0`` reaps every poll interval).
+"""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+import select
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from yuantus.config import get_settings
+from yuantus.database import get_db_session
+from yuantus.meta_engine.services.job_service import JobService
+from yuantus.meta_engine.services.job_worker import JobWorker
+
+logger = logging.getLogger(__name__)
+
+
+def parse_task_limits(value: Optional[str]) -> Dict[str, int]:
+    """Parse ``"cad_conversion=2,cad_ml_vision=1"`` into ``{task_type: cap}``."""
+    limits: Dict[str, int] = {}
+    for part in (value or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        task_type, sep, raw = part.partition("=")
+        task_type = task_type.strip()
+        if not sep or not task_type:
+            raise ValueError(f"Invalid task concurrency entry: {part!r}")
+        try:
+            cap = int(raw)
+        except ValueError as exc:
+            raise ValueError(f"Invalid task concurrency entry: {part!r}") from exc
+        if cap < 1:
+            raise ValueError(f"Task concurrency must be >= 1: {part!r}")
+        limits[task_type] = cap
+    return limits
+
+
+class JobNotificationListener:
+    """
+    Dedicated ``LISTEN`` connection calling ``on_notify`` for every NOTIFY.
+
+    Only meaningful on PostgreSQL; ``start()`` returns False for other dialects
+    so callers keep their poll fallback. The connection is re-established after
+    errors, waiting ``retry_interval`` seconds between attempts.
+    """
+
+    def __init__(
+        self,
+        engine,
+        channel: str,
+        on_notify: Callable[[str], None],
+        *,
+        retry_interval: float = 5.0,
+    ):
+        self.engine = engine
+        self.channel = channel
+        self.on_notify = on_notify
+        self.retry_interval = retry_interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> bool:
+        if not self.channel or self.engine.dialect.name != "postgresql":
+            return False
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=f"JobListener-{self.channel}", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.retry_interval + 1)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            raw = None
+            try:
+                raw = self.engine.raw_connection()
+                self._listen(raw.driver_connection)
+            except Exception as e:
+                logger.warning(
+                    "Job listener on '%s' failed: %s; retrying in %ss",
+                    self.channel,
+                    e,
+                    self.retry_interval,
+                )
+                # Whatever was enqueued meanwhile is picked up by the poll.
+                self.on_notify("")
+                self._stop.wait(self.retry_interval)
+            finally:
+                if raw is not None:
+                    try:
+                        raw.invalidate()
+                    except Exception:
+                        pass
+
+    def _listen(self, conn) -> None:
+        from psycopg import sql
+
+        conn.autocommit = True
+        conn.add_notify_handler(lambda notify: self.on_notify(notify.payload))
+        conn.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self.channel)))
+        logger.info("Job listener subscribed to '%s'", self.channel)
+        while not self._stop.is_set():
+            readable, _, _ = select.select([conn.fileno()], [], [], 1.0)
+            if readable:
+                # Any round trip makes psycopg consume the pending notifications.
+                conn.execute("SELECT 1")
+
+
+class JobDispatcher:
+    def __init__(
+        self,
+        worker: JobWorker,
+        *,
+        concurrency: Optional[int] = None,
+        task_limits: Optional[Dict[str, int]] = None,
+        poll_interval: Optional[float] = None,
+        reaper_interval: Optional[float] = None,
+        listen: bool = True,
+    ):
+        settings = get_settings()
+        self.worker = worker
+        self.concurrency = max(
+            1,
+            concurrency if concurrency is not None else settings.JOB_WORKER_CONCURRENCY,
+        )
+        self.task_limits = (
+            dict(task_limits)
+            if task_limits is not None
+            else parse_task_limits(settings.JOB_TASK_CONCURRENCY)
+        )
+        self.poll_interval = (
+            poll_interval if poll_interval is not None else worker.poll_interval
+        )
+        self.reaper_interval = (
+            reaper_interval
+            if reaper_interval is not None
+            else settings.JOB_REAPER_INTERVAL_SECONDS
+        )
+        self.listen = listen
+
+        self._lock = threading.Lock()
+        self._inflight: Counter = Counter()
+        self._inflight_total = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._threads: List[threading.Thread] = []
+        self._listener: Optional[JobNotificationListener] = None
+
+    @property
+    def worker_id(self) -> str:
+        return self.worker.worker_id
+
+    def inflight(self) -> Dict[str, int]:
+        with self._lock:
+            return {k: v for k, v in self._inflight.items() if v}
+
+    # ========== Lifecycle ==========
+
+    def start(self) -> None:
+        if self._executor is not None:
+            logger.warning(f"Dispatcher '{self.worker_id}' is already running.")
+            return
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.concurrency,
+            thread_name_prefix=f"Worker-{self.worker_id}-Job",
+        )
+        if self.listen:
+            self._start_listener()
+        # Threads inherit the tenant/org context the CLI set up.
+        for name, target in (
+            ("Loop", self._run_loop),
+            ("Reaper", self._run_reaper),
+        ):
+            ctx = contextvars.copy_context()
+            thread = threading.Thread(
+                target=ctx.run, args=(target,), name=f"Worker-{self.worker_id}-{name}"
+            )
+            thread.start()
+            self._threads.append(thread)
+        logger.info(
+            "Dispatcher '%s' started (concurrency=%s, task_limits=%s, listen=%s)",
+            self.worker_id,
+            self.concurrency,
+            self.task_limits,
+            self._listener is not None,
+        )
+
+    def stop(self, wait: bool = True) -> None:
+        """Stop claiming new jobs; with ``wait`` let running jobs finish."""
+        if self._executor is None:
+            logger.warning(f"Dispatcher '{self.worker_id}' is not running.")
+            return
+        self._stop.set()
+        self._wake.set()
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+        for thread in self._threads:
+            thread.join(timeout=self.poll_interval + 1)
+        self._threads = []
+        self._executor.shutdown(wait=wait)
+        self._executor = None
+        logger.info(f"Dispatcher '{self.worker_id}' stopped.")
+
+    def _start_listener(self) -> None:
+        try:
+            with get_db_session() as session:
+                engine = session.get_bind()
+        except Exception as e:
+            logger.warning("Dispatcher '%s' cannot resolve engine: %s", self.worker_id, e)
+            return
+        listener = JobNotificationListener(
+            engine,
+            get_settings().JOB_NOTIFY_CHANNEL,
+            lambda _payload: self._wake.set(),
+            retry_interval=max(self.poll_interval, 1),
+        )
+        if listener.start():
+            self._listener = listener
+
+    def _run_loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.dispatch_once()
+            except Exception as e:
+                logger.error(
+                    f"Dispatcher '{self.worker_id}' encountered an error during dispatch: {e}",
+                    exc_info=True,
+                )
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def _run_reaper(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.reap_stale_jobs()
+            except Exception as e:
+                logger.error(
+                    f"Dispatcher '{self.worker_id}' reaper error: {e}", exc_info=True
+                )
+            self._stop.wait(self._reaper_wait())
+
+    def _reaper_wait(self) -> float:
+        """Seconds between reaper passes; ``<= 0`` means every poll, as in JobWorker."""
+        if self.reaper_interval > 0:
+            return self.reaper_interval
+        return max(self.poll_interval, 1)
+
+    # ========== Dispatch ==========
+
+    def reap_stale_jobs(self) -> int:
+        with get_db_session() as session:
+            requeued = JobService(session).requeue_stale_jobs()
+        if requeued:
+            logger.warning(
+                "Worker '%s' requeued %s stale job(s)", self.worker_id, requeued
+            )
+            self._wake.set()
+        return requeued
+
+    def dispatch_once(self) -> int:
+        """Claim and submit jobs until capacity or the queue runs out."""
+        if self._executor is None:
+            raise RuntimeError("Dispatcher is not started")
+        submitted = 0
+        while not self._stop.is_set():
+            claimed = 0
+            for task_types, n in self._claim_plan():
+                n = min(n, self._free_slots())
+                if n <= 0:
+                    break
+                for job_id, task_type in self._claim(task_types, n):
+                    self._submit(job_id, task_type)
+                    claimed += 1
+            if not claimed:
+                break
+            submitted += claimed
+        return submitted
+
+    def _free_slots(self) -> int:
+        with self._lock:
+            return self.concurrency - self._inflight_total
+
+    def _claim_plan(self) -> List[Tuple[Optional[List[str]], int]]:
+        """``[(task_types, n), ...]`` batches that fit the free slots and caps."""
+        with self._lock:
+            free = self.concurrency - self._inflight_total
+            if free <= 0:
+                return []
+            if not self.task_limits:
+                return [(None, free)]
+            plan: List[Tuple[Optional[List[str]], int]] = []
+            for task_type, cap in self.task_limits.items():
+                room = min(cap - self._inflight[task_type], free)
+                if room > 0:
+                    plan.append(([task_type], room))
+        uncapped = [t for t in self.worker.task_handlers if t not in self.task_limits]
+        if uncapped:
+            plan.append((uncapped, free))
+        return plan
+
+    def _claim(self, task_types: Optional[List[str]], n: int) -> List[Tuple[str, str]]:
+        # Claim only what can start right away: prefetching more would leave
+        # claimed jobs idle in PROCESSING, where only the reaper can free them.
+        with get_db_session() as session:
+            jobs = JobService(session).claim_batch(
+                self.worker_id, n, task_types=task_types
+            )
+            for job in jobs:
+                logger.info(
+                    f"Worker '{self.worker_id}' picked up job {job.id} ({job.task_type})"
+                )
+            return [(job.id, job.task_type) for job in jobs]
+
+    def _submit(self, job_id: str, task_type: str) -> None:
+        with self._lock:
+            self._inflight[task_type] += 1
+            self._inflight_total += 1
+        ctx = contextvars.copy_context()
+        future = self._executor.submit(ctx.run, self._run_job, job_id)
+        future.add_done_callback(lambda _f: self._job_done(task_type))
+
+    def _run_job(self, job_id: str) -> None:
+        try:
+            with get_db_session() as session:
+                job_service = JobService(session)
+                job = job_service.get_job(job_id)
+                if job is not None:
+                    self.worker._execute_job(job, job_service)
+        except Exception as e:
+            logger.error(
+                f"Worker '{self.worker_id}' error running job {job_id}: {e}",
+                exc_info=True,
+            )
+
+    def _job_done(self, task_type: str) -> None:
+        with self._lock:
+            self._inflight[task_type] -= 1
+            self._inflight_total -= 1
+        self._wake.set()
@@ -4,10 +4,10 @@ Manages the lifecycle of asynchronous jobs.
 Phase 4: Conversion Orchestration
 """
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import asc
+from sqlalchemy import asc, func, select, update
 from yuantus.meta_engine.models.job import ConversionJob, JobStatus
 from yuantus.config import get_settings
 from yuantus.observability.metrics import record_job_lifecycle
@@ -78,9 +78,25 @@ class JobService:
             dedupe_key=dedupe_key,
         )
         self.session.add(job)
+        self.notify_jobs_available(task_type)
         self.session.commit()
         return job
 
+    def notify_jobs_available(self, task_type: Optional[str] = None) -> None:
+        """
+        Wake LISTENing workers once the current transaction commits.
+
+        PostgreSQL only (``pg_notify`` is transactional, so a rolled back
+        enqueue never wakes anyone); other dialects rely on the poll fallback.
+        """
+        bind = self.session.get_bind()
+        if bind is None or bind.dialect.name != "postgresql":
+            return
+        channel = get_settings().JOB_NOTIFY_CHANNEL
+        if not channel:
+            return
+        self.session.execute(select(func.pg_notify(channel, task_type or "")))
+
     def poll_next_job(
         self, worker_id: str, task_types: Optional[list[str]] = None
     ) -> Optional[ConversionJob]:
@@ -122,6 +138,87 @@ class JobService:
             return job
         return None
 
+    def claim_batch(
+        self,
+        worker_id: str,
+        n: int,
+        task_types: Optional[list[str]] = None,
+    ) -> List[ConversionJob]:
+        """
+        Lock and mark up to ``n`` pending jobs for this worker in one statement.
+
+        PostgreSQL: ``UPDATE ... WHERE id IN (SELECT ... FOR UPDATE SKIP LOCKED
+        LIMIT n) RETURNING id``, so concurrent workers never claim the same row.
+        Other dialects select the candidates first and guard the update on
+        ``status = pending`` (single-writer dev setups). One commit and one
+        quota evaluation per batch instead of per job.
+        """
+        if n <= 0:
+            return []
+        n = self._processing_slots(n)
+        if n <= 0:
+            return []
+
+        now = datetime.utcnow()
+        jobs = ConversionJob.__table__
+        candidates = (
+            select(jobs.c.id)
+            .where(
+                jobs.c.status == JobStatus.PENDING.value,
+                jobs.c.scheduled_at <= now,
+            )
+            .order_by(asc(jobs.c.priority), asc(jobs.c.created_at))
+            .limit(n)
+        )
+        if task_types:
+            candidates = candidates.where(jobs.c.task_type.in_(list(task_types)))
+        claim = update(jobs).values(
+            status=JobStatus.PROCESSING.value,
+            worker_id=worker_id,
+            started_at=now,
+            attempt_count=func.coalesce(jobs.c.attempt_count, 0) + 1,
+        )
+
+        dialect = self.session.bind.dialect.name if self.session.bind else "unknown"
+        if dialect == "postgresql":
+            candidates = candidates.with_for_update(skip_locked=True)
+            claimed_ids = list(
+                self.session.execute(
+                    claim.where(jobs.c.id.in_(candidates.scalar_subquery())).returning(
+                        jobs.c.id
+                    )
+                ).scalars()
+            )
+        else:
+            candidate_ids = list(self.session.execute(candidates).scalars())
+            claimed_ids = []
+            if candidate_ids:
+                self.session.execute(
+                    claim.where(
+                        jobs.c.id.in_(candidate_ids),
+                        jobs.c.status == JobStatus.PENDING.value,
+                    )
+                )
+                claimed_ids = list(
+                    self.session.execute(
+                        select(jobs.c.id).where(
+                            jobs.c.id.in_(candidate_ids),
+                            jobs.c.worker_id == worker_id,
+                            jobs.c.started_at == now,
+                        )
+                    ).scalars()
+                )
+        self.session.commit()
+        if not claimed_ids:
+            return []
+        return (
+            self.session.query(ConversionJob)
+            .filter(ConversionJob.id.in_(claimed_ids))
+            .order_by(asc(ConversionJob.priority), asc(ConversionJob.created_at))
+            .populate_existing()
+            .all()
+        )
+
     def complete_job(self, job_id: str, result: Any = None):
         """Mark a job as successfully completed (optionally persisting result into payload)."""
         job = self.session.get(ConversionJob, job_id)
@@ -339,6 +436,7 @@ class JobService:
                 job.completed_at = datetime.utcnow()
                 job.last_error = "stale_timeout_failed"
         self.session.add_all(stale_jobs)
+        self.notify_jobs_available()
         self.session.commit()
         return len(stale_jobs)
 
@@ -407,5 +505,28 @@ class JobService:
             decisions = quota_service.evaluate(tenant_id, deltas={"processing_jobs": 1})
             return bool(decisions)
 
+    def _processing_slots(self, requested: int) -> int:
+        """How many of ``requested`` jobs the tenant's processing quota allows."""
+        settings = get_settings()
+        if settings.QUOTA_MODE != "enforce":
+            return requested
+
+        tenant_id = self._resolve_tenant_id({})
+        if not tenant_id:
+            return requested
+
+        from yuantus.security.auth.database import get_identity_db_session
+        from yuantus.security.auth.quota_service import QuotaService
+
+        with get_identity_db_session() as identity_db:
+            quota_service = QuotaService(identity_db, meta_db=self.session)
+            decisions = quota_service.evaluate(
+                tenant_id, deltas={"processing_jobs": requested}
+            )
+        for decision in decisions:
+            if decision.resource == "processing_jobs":
+                return max(0, min(requested, decision.limit - decision.used))
+        return requested
+
     def get_job(self, job_id: str) -> Optional[ConversionJob]:
         return self.session.get(ConversionJob, job_id)
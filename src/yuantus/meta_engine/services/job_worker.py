@@ -9,6 +9,7 @@ import threading
 import inspect
 import contextvars
 from typing import Callable, Dict, Any, Optional
+from yuantus.config import get_settings
 from yuantus.meta_engine.services.job_service import JobService
 from yuantus.meta_engine.services.job_errors import JobFatalError
 from yuantus.database import get_db_session
@@ -26,6 +27,7 @@ class JobWorker:
         self.task_handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
         self._running = False
         self._thread: Optional[threading.Thread] = None  # To hold the worker thread
+        self._last_reaped_at: Optional[float] = None
 
     def register_handler(
         self, task_type: str, handler: Callable[[Dict[str, Any]], Any]
@@ -80,13 +82,7 @@ class JobWorker:
             try:
                 with get_db_session() as session:
                     job_service = JobService(session)
-                    requeued = job_service.requeue_stale_jobs()
-                    if requeued:
-                        logger.warning(
-                            "Worker '%s' requeued %s stale job(s)",
-                            self.worker_id,
-                            requeued,
-                        )
+                    self._maybe_requeue_stale(job_service)
                     job: Optional[ConversionJob] = job_service.poll_next_job(
                         self.worker_id
                     )
@@ -107,6 +103,24 @@ class JobWorker:
             finally:
                 time.sleep(self.poll_interval)
 
+    def _maybe_requeue_stale(self, job_service: JobService) -> int:
+        """Run the stale PROCESSING scan at most every JOB_REAPER_INTERVAL_SECONDS."""
+        interval = get_settings().JOB_REAPER_INTERVAL_SECONDS
+        now = time.monotonic()
+        if (
+            self._last_reaped_at is not None
+            and interval > 0
+            and now - self._last_reaped_at < interval
+        ):
+            return 0
+        self._last_reaped_at = now
+        requeued = job_service.requeue_stale_jobs()
+        if requeued:
+            logger.warning(
+                "Worker '%s' requeued %s stale job(s)", self.worker_id, requeued
+            )
+        return requeued
+
     def stop(self):
         """Stops the worker and waits for its thread to finish."""
         if not self._running:
@@ -1,19 +1,155 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, event, false, or_, true
+from sqlalchemy.orm import Session, selectinload
+
+from yuantus.config import get_settings
+from ..models.item import Item
 from ..models.meta_schema import ItemType
-from ..permission.models import Access
+from ..permission.models import Access, Permission
 from ..lifecycle.models import LifecycleState, StateIdentityPermission
 from ..schemas.aml import AMLAction
+from .sql_helpers import ScopeKey, session_scope_key
+
+# Per-action bits of a compiled ACL.
+_BIT_GET = 1
+_BIT_ADD = 2
+_BIT_UPDATE = 4
+_BIT_DELETE = 8
+_BIT_PROMOTE = 16
+
+_ACTION_BITS = {
+    AMLAction.get: _BIT_GET,
+    AMLAction.add: _BIT_ADD,
+    AMLAction.update: _BIT_UPDATE,
+    AMLAction.delete: _BIT_DELETE,
+    AMLAction.promote: _BIT_PROMOTE,
+}
+
+_OWNER_IDENTITIES = ("Creator", "Owner")
+
+# Writes to these invalidate every compiled ACL.
+_ACL_MODELS = (Permission, Access, LifecycleState, StateIdentityPermission, ItemType)
+
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class CompiledAcl:
+    """Identity -> action bitmask, plus the mask granted to the item's owner."""
+
+    role_masks: Dict[str, int]
+    owner_mask: int = 0
+
+    def mask_for(self, effective_roles: Iterable[str], is_owner: bool) -> int:
+        mask = self.owner_mask if is_owner else 0
+        for role in effective_roles:
+            mask |= self.role_masks.get(role, 0)
+        return mask
+
+
+@dataclass(frozen=True)
+class StateOverride:
+    permission_id: Optional[str]
+    identity_acl: Optional[CompiledAcl]
+
+
+@dataclass
+class _CompiledScope:
+    """Compiled ACL data of one tenant database, filled lazily."""
+
+    generation: int
+    expires_at: float
+    item_types: Dict[str, Optional[Tuple[Optional[str], Optional[str]]]] = field(
+        default_factory=dict
+    )
+    states: Dict[Tuple[str, str], Optional[StateOverride]] = field(default_factory=dict)
+    map_states: Dict[str, List[str]] = field(default_factory=dict)
+    all_item_types_loaded: bool = False
+    acls: Dict[str, CompiledAcl] = field(default_factory=dict)
+
+
+_GENERATION = 0
+_SCOPES: Dict[ScopeKey, _CompiledScope] = {}
+_SCOPES_LOCK = threading.Lock()
+
+_REGISTER_LOCK = threading.Lock()
+_REGISTERED = False
+
+
+def invalidate_permission_cache() -> None:
+    """Drop every compiled ACL (shared and per-instance)."""
+    global _GENERATION
+    with _SCOPES_LOCK:
+        _GENERATION += 1
+        _SCOPES.clear()
+
+
+def _compile_access(aces: List[Access]) -> CompiledAcl:
+    role_masks: Dict[str, int] = {}
+    owner_mask = 0
+    for ace in aces:
+        mask = 0
+        if ace.can_get:
+            mask |= _BIT_GET
+        if ace.can_create:
+            mask |= _BIT_ADD
+        if ace.can_update:
+            # Promote is gated by the update bit of the permission set.
+            mask |= _BIT_UPDATE | _BIT_PROMOTE
+        if ace.can_delete:
+            mask |= _BIT_DELETE
+        if not mask:
+            continue
+        role_masks[ace.identity_id] = role_masks.get(ace.identity_id, 0) | mask
+        if ace.identity_id in _OWNER_IDENTITIES:
+            owner_mask |= mask
+    return CompiledAcl(role_masks=role_masks, owner_mask=owner_mask)
+
+
+def _compile_state_identity(
+    perms: List[StateIdentityPermission],
+) -> Optional[CompiledAcl]:
+    if not perms:
+        return None
+    role_masks: Dict[str, int] = {}
+    owner_mask = 0
+    for p in perms:
+        mask = 0
+        if p.can_read:
+            mask |= _BIT_GET
+        if p.can_update:
+            mask |= _BIT_UPDATE
+        if p.can_delete:
+            mask |= _BIT_DELETE
+        if p.can_promote:
+            mask |= _BIT_PROMOTE
+        if p.identity_type == "role":
+            role_masks[p.identity_value] = role_masks.get(p.identity_value, 0) | mask
+        elif p.identity_type == "dynamic" and p.identity_value in _OWNER_IDENTITIES:
+            owner_mask |= mask
+    return CompiledAcl(role_masks=role_masks, owner_mask=owner_mask)
 
 
 class MetaPermissionService:
     """
     Service for handling unified permission checks (ACL + State-based + Dynamic).
     ADR-002 Implementation.
+
+    ItemType permission sources, lifecycle state overrides and permission sets
+    are compiled once into per-action role bitsets and then evaluated in memory.
+    Compiled data lives on the service instance, or is shared per tenant for
+    ``META_PERMISSION_CACHE_TTL_SECONDS``; ORM writes to the ACL models
+    invalidate both.
     """
 
     def __init__(self, session: Session):
         self.session = session
+        self._local: Optional[_CompiledScope] = None
 
     def check_permission(
         self,
@@ -37,153 +173,337 @@ class MetaPermissionService:
             item_owner_id: ID of the user who owns the item.
             permission_id: Explicit permission set ID to check against (bypasses ItemType lookup).
         """
+        effective_roles = self._effective_roles(user_id, user_roles)
+        # Admin and superuser roles bypass all permission checks
+        if "admin" in effective_roles or "superuser" in effective_roles:
+            return True
+
+        is_owner = bool(item_owner_id and user_id == item_owner_id)
+        mask = self._allowed_mask(
+            item_type_id, item_state, permission_id, effective_roles, is_owner
+        )
+        return bool(mask & _ACTION_BITS.get(action, 0))
+
+    def filter_readable(
+        self,
+        items: Iterable[Any],
+        user_id: str = "guest",
+        user_roles: List[str] = None,
+        action: AMLAction = AMLAction.get,
+    ) -> List[Any]:
+        """
+        Items the user may perform ``action`` on, in input order.
+
+        Same rules as ``check_permission`` with the item's type, state and
+        creator as owner, but each (type, state) is resolved once per page.
+        """
+        items = list(items)
+        effective_roles = self._effective_roles(user_id, user_roles)
+        if "admin" in effective_roles or "superuser" in effective_roles:
+            return items
+
+        bit = _ACTION_BITS.get(action, 0)
+        decisions: Dict[Tuple[Optional[str], Optional[str]], Tuple[bool, bool]] = {}
+        visible = []
+        for item in items:
+            key = (item.item_type_id, item.state)
+            decision = decisions.get(key)
+            if decision is None:
+                decision = decisions[key] = (
+                    bool(self._allowed_mask(*key, None, effective_roles, False) & bit),
+                    bool(self._allowed_mask(*key, None, effective_roles, True) & bit),
+                )
+            owner_id = str(item.created_by_id) if item.created_by_id else None
+            if decision[bool(owner_id and user_id == owner_id)]:
+                visible.append(item)
+        return visible
+
+    def readable_clause(
+        self,
+        user_id: str = "guest",
+        user_roles: List[str] = None,
+        action: AMLAction = AMLAction.get,
+        item_type_id: Optional[str] = None,
+    ):
+        """
+        SQL predicate on ``meta_items`` matching exactly the rows
+        ``filter_readable`` would keep, or None when unrestricted.
+
+        Per ItemType, the lifecycle states granting ``action`` become an
+        ``IN`` list; states granting it only to the owner are additionally
+        bound to ``created_by_id``. Items of unknown types never match.
+        """
+        effective_roles = self._effective_roles(user_id, user_roles)
+        if "admin" in effective_roles or "superuser" in effective_roles:
+            return None
+
+        scope = self._scope()
+        if item_type_id:
+            entries = {item_type_id: self._item_type(scope, item_type_id)}
+        else:
+            entries = self._all_item_types(scope)
+        owner_id = int(user_id) if str(user_id).isdigit() else None
+        bit = _ACTION_BITS.get(action, 0)
+
+        clauses = []
+        for type_id, entry in entries.items():
+            if entry is None:
+                continue
+            state_names = self._map_states(scope, entry[1]) if entry[1] else []
 
+            def allowed(state: Optional[str], is_owner: bool) -> bool:
+                mask = self._allowed_mask(
+                    type_id, state, None, effective_roles, is_owner
+                )
+                return bool(mask & bit)
+
+            plain = self._state_predicate(
+                [s for s in state_names if allowed(s, False)],
+                allowed(None, False),
+                state_names,
+            )
+            owned = None
+            if owner_id is not None:
+                owned = self._state_predicate(
+                    [s for s in state_names if allowed(s, True)],
+                    allowed(None, True),
+                    state_names,
+                )
+            parts = []
+            if plain is not None:
+                parts.append(plain)
+            if owned is not None:
+                parts.append(and_(Item.created_by_id == owner_id, owned))
+            if parts:
+                clauses.append(and_(Item.item_type_id == type_id, or_(*parts)))
+        return or_(*clauses) if clauses else false()
+
+    @staticmethod
+    def _state_predicate(
+        allowed_states: List[str], default_allowed: bool, state_names: List[str]
+    ):
+        """Predicate on ``Item.state``; None when no state qualifies."""
+        if default_allowed and len(allowed_states) == len(state_names):
+            return true()
+        parts = []
+        if allowed_states:
+            parts.append(Item.state.in_(allowed_states))
+        if default_allowed:
+            # States outside the lifecycle map fall back to the ItemType ACL.
+            parts.append(Item.state.is_(None))
+            parts.append(Item.state.notin_(state_names))
+        return or_(*parts) if parts else None
+
+    # ========== Evaluation ==========
+
+    @staticmethod
+    def _effective_roles(user_id: str, user_roles: Optional[List[str]]) -> Set[str]:
         # Expanded roles include user_id itself (for direct assignment) and "World"
         effective_roles = set(user_roles) if user_roles else set()
         effective_roles.add(user_id)
         effective_roles.add("world")
-        # Admin and superuser roles bypass all permission checks
-        if "admin" in effective_roles or "superuser" in effective_roles:
-            return True
+        return effective_roles
 
+    def _allowed_mask(
+        self,
+        item_type_id: Optional[str],
+        item_state: Optional[str],
+        permission_id: Optional[str],
+        effective_roles: Set[str],
+        is_owner: bool,
+    ) -> int:
+        scope = self._scope()
         base_permission_id = permission_id
-        state_identity_perms = []
+        state_acl: Optional[CompiledAcl] = None
 
         # 1. Resolve Permissions Source (State vs ItemType) if not explicitly provided
         if not base_permission_id and item_type_id:
+            item_type = self._item_type(scope, item_type_id)
+
+            # If state context exists, check for state-specific permission overrides
+            if item_state and item_type and item_type[1]:
+                override = self._state_override(scope, item_type[1], item_state)
+                if override:
+                    base_permission_id = override.permission_id
+                    state_acl = override.identity_acl
+
+            # Fallback to ItemType default permission
+            if not base_permission_id and item_type:
+                base_permission_id = item_type[0]
+
+        mask = 0
+        # 2. Base ACL (Permission Set + ACEs)
+        if base_permission_id:
+            mask |= self._acl(scope, base_permission_id).mask_for(
+                effective_roles, is_owner
+            )
+        # 3. State-Identity specific overrides
+        if state_acl:
+            mask |= state_acl.mask_for(effective_roles, is_owner)
+        return mask
+
+    # ========== Compiled data ==========
+
+    def _scope(self) -> _CompiledScope:
+        ttl = int(get_settings().META_PERMISSION_CACHE_TTL_SECONDS or 0)
+        now = time.monotonic()
+        if ttl <= 0:
+            if self._local is None or self._local.generation != _GENERATION:
+                self._local = _CompiledScope(generation=_GENERATION, expires_at=0.0)
+            return self._local
+
+        key = session_scope_key(self.session)
+        with _SCOPES_LOCK:
+            scope = _SCOPES.get(key)
+            if scope is None or scope.generation != _GENERATION or scope.expires_at <= now:
+                scope = _SCOPES[key] = _CompiledScope(
+                    generation=_GENERATION, expires_at=now + ttl
+                )
+        return scope
+
+    def _item_type(
+        self, scope: _CompiledScope, item_type_id: str
+    ) -> Optional[Tuple[Optional[str], Optional[str]]]:
+        entry = scope.item_types.get(item_type_id, _MISSING)
+        if entry is _MISSING:
             item_type = (
                 self.session.query(ItemType).filter(ItemType.id == item_type_id).first()
             )
+            entry = (
+                (item_type.permission_id, item_type.lifecycle_map_id)
+                if item_type
+                else None
+            )
+            scope.item_types[item_type_id] = entry
+        return entry
 
-            # If state context exists, check for state-specific permission overrides
-            if item_state and item_type and item_type.lifecycle_map_id:
-                lc_state = (
-                    self.session.query(LifecycleState)
-                    .filter(
-                        LifecycleState.lifecycle_map_id == item_type.lifecycle_map_id
-                    )
-                    .filter(LifecycleState.name == item_state)
-                    .first()
+    def _all_item_types(
+        self, scope: _CompiledScope
+    ) -> Dict[str, Optional[Tuple[Optional[str], Optional[str]]]]:
+        if not scope.all_item_types_loaded:
+            rows = self.session.query(
+                ItemType.id, ItemType.permission_id, ItemType.lifecycle_map_id
+            ).all()
+            for type_id, perm_id, map_id in rows:
+                scope.item_types[type_id] = (perm_id, map_id)
+            scope.all_item_types_loaded = True
+        return {k: v for k, v in scope.item_types.items() if v is not None}
+
+    def _map_states(self, scope: _CompiledScope, lifecycle_map_id: str) -> List[str]:
+        names = scope.map_states.get(lifecycle_map_id)
+        if names is None:
+            lc_states = (
+                self.session.query(LifecycleState)
+                .options(selectinload(LifecycleState.identity_permissions))
+                .filter(LifecycleState.lifecycle_map_id == lifecycle_map_id)
+                .all()
+            )
+            for lc_state in lc_states:
+                scope.states.setdefault(
+                    (lifecycle_map_id, lc_state.name),
+                    StateOverride(
+                        permission_id=lc_state.permission_id or None,
+                        identity_acl=_compile_state_identity(
+                            list(lc_state.identity_permissions or [])
+                        ),
+                    ),
                 )
+            names = scope.map_states[lifecycle_map_id] = sorted(
+                {lc_state.name for lc_state in lc_states if lc_state.name}
+            )
+        return names
 
-                if lc_state:
-                    if lc_state.permission_id:
-                        base_permission_id = lc_state.permission_id
-                    state_identity_perms = lc_state.identity_permissions
+    def _state_override(
+        self, scope: _CompiledScope, lifecycle_map_id: str, state_name: str
+    ) -> Optional[StateOverride]:
+        key = (lifecycle_map_id, state_name)
+        entry = scope.states.get(key, _MISSING)
+        if entry is _MISSING:
+            lc_state = (
+                self.session.query(LifecycleState)
+                .filter(LifecycleState.lifecycle_map_id == lifecycle_map_id)
+                .filter(LifecycleState.name == state_name)
+                .first()
+            )
+            entry = (
+                StateOverride(
+                    permission_id=lc_state.permission_id or None,
+                    identity_acl=_compile_state_identity(
+                        list(lc_state.identity_permissions or [])
+                    ),
+                )
+                if lc_state
+                else None
+            )
+            scope.states[key] = entry
+        return entry
 
-            # Fallback to ItemType default permission
-            if not base_permission_id and item_type:
-                base_permission_id = item_type.permission_id
+    def _acl(self, scope: _CompiledScope, permission_id: str) -> CompiledAcl:
+        acl = scope.acls.get(permission_id)
+        if acl is None:
+            aces = (
+                self.session.query(Access)
+                .filter(Access.permission_id == permission_id)
+                .all()
+            )
+            acl = scope.acls[permission_id] = _compile_access(aces)
+        return acl
 
-        if not base_permission_id and not state_identity_perms:
-            return False
 
-        # 2. Check Base ACL (Permission Set + ACEs)
-        if base_permission_id:
-            if self._check_acl(
-                base_permission_id, action, effective_roles, item_owner_id, user_id
-            ):
-                return True
+def pushdown_user_kwargs(user: Any) -> Dict[str, Any]:
+    """
+    ``user_id``/``user_roles`` for services that push read ACLs into SQL.
 
-        # 3. Check State-Identity specific overrides
-        if state_identity_perms:
-            if self._check_state_identity(
-                state_identity_perms, action, effective_roles, item_owner_id, user_id
-            ):
-                return True
+    Empty when QUERY_ACL_PUSHDOWN_ENABLED is off; anonymous callers are
+    evaluated as "guest" (World identities only).
+    """
+    if not get_settings().QUERY_ACL_PUSHDOWN_ENABLED:
+        return {}
+    if user is None:
+        return {"user_id": "guest", "user_roles": []}
+    roles = list(getattr(user, "roles", None) or [])
+    if getattr(user, "is_superuser", False) and "superuser" not in roles:
+        roles.append("superuser")
+    return {"user_id": str(user.id), "user_roles": roles}
 
-        return False
 
-    def _check_acl(
-        self,
-        permission_id: str,
-        action: AMLAction,
-        effective_roles: set,
-        item_owner_id: str,
-        user_id: str,
-    ) -> bool:
-        """Check standard Access Control List"""
-        aces = (
-            self.session.query(Access)
-            .filter(Access.permission_id == permission_id)
-            .all()
-        )
-        for ace in aces:
-            # Match Identity
-            identity_match = False
-
-            # Static Identity (Role/User)
-            if ace.identity_id in effective_roles:
-                identity_match = True
-
-            # Dynamic Identity Check (e.g., if ace.identity_id is a placeholder for 'Creator')
-            # NOTE: Access table usually stores specific IDs.
-            # If we store "Creator" reserved word in Access.identity_id:
-            if (
-                ace.identity_id == "Creator"
-                and item_owner_id
-                and user_id == item_owner_id
-            ):
-                identity_match = True
-            elif (
-                ace.identity_id == "Owner"
-                and item_owner_id
-                and user_id == item_owner_id
-            ):
-                identity_match = True
-
-            if identity_match:
-                if self._action_allowed(ace, action):
-                    return True
-        return False
-
-    def _check_state_identity(
-        self,
-        perms: List[StateIdentityPermission],
-        action: AMLAction,
-        effective_roles: set,
-        item_owner_id: str,
-        user_id: str,
-    ) -> bool:
-        """Check State-Identity Permission extensions"""
-        for p in perms:
-            identity_match = False
-
-            if p.identity_type == "role":
-                if p.identity_value in effective_roles:
-                    identity_match = True
-            elif p.identity_type == "dynamic":
-                if (
-                    p.identity_value in ["Creator", "Owner"]
-                    and item_owner_id
-                    and user_id == item_owner_id
-                ):
-                    identity_match = True
-
-            if identity_match:
-                # Check specific bits in StateIdentityPermission
-                if action == AMLAction.get and p.can_read:
-                    return True
-                if action == AMLAction.update and p.can_update:
-                    return True
-                if action == AMLAction.delete and p.can_delete:
-                    return True
-                if action == AMLAction.promote and p.can_promote:
-                    return True
-                # logic for add? usually state permissions apply to existing items, so 'add' is moot here
-                # unless it's the start state logic.
-
-        return False
-
-    def _action_allowed(self, ace: Access, action: AMLAction) -> bool:
-        if action == AMLAction.get:
-            return ace.can_get
-        if action == AMLAction.add:
-            return ace.can_create
-        if action == AMLAction.update:
-            return ace.can_update
-        if action == AMLAction.delete:
-            return ace.can_delete
-        if action == AMLAction.promote:
-            return ace.can_update  # Promote usually mapped to update or separate bit?
-        return False
+# ========== Session hooks ==========
+
+_TOUCHED_KEY = "meta_permission_acl_touched"
+
+
+def _after_flush(session: Session, flush_context) -> None:  # type: ignore[no-untyped-def]
+    if any(
+        isinstance(obj, _ACL_MODELS)
+        for obj in (*session.new, *session.dirty, *session.deleted)
+    ):
+        invalidate_permission_cache()
+        # Again at commit: a concurrent request may re-compile pre-commit rows.
+        session.info[_TOUCHED_KEY] = True
+
+
+def _after_commit(session: Session) -> None:
+    if session.info.pop(_TOUCHED_KEY, False):
+        invalidate_permission_cache()
+
+
+def _after_rollback(session: Session) -> None:
+    # Flushed-then-rolled-back rows may have been compiled by this session.
+    if session.info.pop(_TOUCHED_KEY, False):
+        invalidate_permission_cache()
+
+
+def register_session_hooks() -> None:
+    global _REGISTERED
+    if _REGISTERED:
+        return
+    with _REGISTER_LOCK:
+        if _REGISTERED:
+            return
+        event.listen(Session, "after_flush", _after_flush)
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_rollback", _after_rollback)
+        _REGISTERED = True
+
+
+register_session_hooks()
@@ -3,6 +3,7 @@ import json
 from typing import Dict, Any
 from sqlalchemy.orm import Session
 from ..models.meta_schema import ItemType
+from .metadata_cache import bump_schema_version
 from yuantus.integrations.cad_connectors import resolve_cad_sync_key
 
 
@@ -65,6 +66,7 @@ class MetaSchemaService:
             item_type.properties_schema = None
             self.session.add(item_type)
             self.session.commit()
+            bump_schema_version()
 
             if self.redis_client:
                 self.redis_client.delete(f"schema_etag:{item_type_id}")
@@ -144,6 +146,7 @@ class MetaSchemaService:
         item_type.properties_schema = schema
         self.session.add(item_type)
         self.session.commit()
+        bump_schema_version()
         return schema
 
     def get_full_definition(self, item_type_id: str) -> Dict[str, Any]:
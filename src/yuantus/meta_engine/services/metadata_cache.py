@@ -0,0 +1,219 @@
+"""
+Versioned ItemType metadata cache.
+
+ItemTypes and their Property definitions are loaded as one immutable
+snapshot per tenant database and reused by the query service, the AML
+engine and the GraphQL loaders instead of querying ``meta_item_types`` per
+lookup. A process-wide schema version, bumped by writes to the meta models
+(and explicitly by ``MetaSchemaService``), invalidates every snapshot.
+
+With META_METADATA_CACHE_TTL_SECONDS=0 a snapshot lives for one session
+transaction; otherwise it is shared across requests for that many seconds.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from yuantus.config import get_settings
+from ..models.meta_schema import ItemType, Property
+from .sql_helpers import ScopeKey, session_scope_key
+
+# Writes to these bump the schema version.
+_META_MODELS = (ItemType, Property)
+
+_SNAPSHOT_KEY = "yuantus.metadata_cache.snapshot"
+_TOUCHED_KEY = "yuantus.metadata_cache.touched"
+
+
+@dataclass(frozen=True)
+class PropertyMeta:
+    name: str
+    label: Optional[str]
+    data_type: Optional[str]
+    length: Optional[int]
+    is_required: bool
+    default_value: Optional[str]
+    data_source_id: Optional[str]
+
+
+@dataclass(frozen=True)
+class ItemTypeMeta:
+    """Detached copy of an ItemType row; safe to share across sessions."""
+
+    id: str
+    label: Optional[str]
+    is_relationship: bool
+    permission_id: Optional[str]
+    lifecycle_map_id: Optional[str]
+    source_item_type_id: Optional[str]
+    related_item_type_id: Optional[str]
+    properties_schema: Any
+    properties: Tuple[PropertyMeta, ...] = ()
+
+
+class MetadataSnapshot:
+    """All ItemTypes of one database at one schema version."""
+
+    def __init__(self, version: int, item_types: List[ItemTypeMeta], expires_at: float):
+        self.version = version
+        self.expires_at = expires_at
+        self.item_types: Dict[str, ItemTypeMeta] = {it.id: it for it in item_types}
+        self._by_label: Dict[str, ItemTypeMeta] = {}
+        for it in item_types:
+            if it.label:
+                self._by_label.setdefault(it.label, it)
+
+    def get(self, item_type_id: str) -> Optional[ItemTypeMeta]:
+        return self.item_types.get(item_type_id)
+
+    def resolve(self, name: str) -> Optional[ItemTypeMeta]:
+        """Look up by id, falling back to label."""
+        return self.item_types.get(name) or self._by_label.get(name)
+
+    def type_ids(self, predicate: Callable[[ItemTypeMeta], bool]) -> List[str]:
+        return [it.id for it in self.item_types.values() if predicate(it)]
+
+
+_VERSION = 0
+_SNAPSHOTS: Dict[ScopeKey, MetadataSnapshot] = {}
+_LOCK = threading.Lock()
+
+_REGISTERED = False
+_REGISTER_LOCK = threading.Lock()
+
+
+def schema_version() -> int:
+    return _VERSION
+
+
+def bump_schema_version() -> None:
+    """Invalidate every cached metadata snapshot in this process."""
+    global _VERSION
+    with _LOCK:
+        _VERSION += 1
+        _SNAPSHOTS.clear()
+
+
+def get_metadata(session: Session) -> MetadataSnapshot:
+    """Current metadata snapshot for the session's tenant database."""
+    version = _VERSION
+    local = session.info.get(_SNAPSHOT_KEY)
+    if local is not None and local.version == version:
+        return local
+
+    ttl = get_settings().META_METADATA_CACHE_TTL_SECONDS
+    # Uncommitted meta writes must not leak into (or hide behind) the shared copy.
+    shared = ttl > 0 and not session.info.get(_TOUCHED_KEY)
+    now = time.monotonic()
+    if shared:
+        key = session_scope_key(session)
+        with _LOCK:
+            snapshot = _SNAPSHOTS.get(key)
+        if snapshot is not None and snapshot.version == version and snapshot.expires_at > now:
+            session.info[_SNAPSHOT_KEY] = snapshot
+            return snapshot
+
+    snapshot = _load(session, version, now + ttl)
+    # Loading may autoflush meta writes of this session; re-check before sharing.
+    if shared and not session.info.get(_TOUCHED_KEY):
+        with _LOCK:
+            if _VERSION == version:
+                _SNAPSHOTS[key] = snapshot
+    session.info[_SNAPSHOT_KEY] = snapshot
+    return snapshot
+
+
+def _load(session: Session, version: int, expires_at: float) -> MetadataSnapshot:
+    properties: Dict[str, List[PropertyMeta]] = {}
+    for row in session.execute(
+        select(
+            Property.item_type_id,
+            Property.name,
+            Property.label,
+            Property.data_type,
+            Property.length,
+            Property.is_required,
+            Property.default_value,
+            Property.data_source_id,
+        ).order_by(Property.item_type_id, Property.name)
+    ):
+        properties.setdefault(row.item_type_id, []).append(
+            PropertyMeta(
+                name=row.name,
+                label=row.label,
+                data_type=row.data_type,
+                length=row.length,
+                is_required=bool(row.is_required),
+                default_value=row.default_value,
+                data_source_id=row.data_source_id,
+            )
+        )
+
+    item_types = [
+        ItemTypeMeta(
+            id=row.id,
+            label=row.label,
+            is_relationship=bool(row.is_relationship),
+            permission_id=row.permission_id,
+            lifecycle_map_id=row.lifecycle_map_id,
+            source_item_type_id=row.source_item_type_id,
+            related_item_type_id=row.related_item_type_id,
+            properties_schema=row.properties_schema,
+            properties=tuple(properties.get(row.id, ())),
+        )
+        for row in session.execute(
+            select(
+                ItemType.id,
+                ItemType.label,
+                ItemType.is_relationship,
+                ItemType.permission_id,
+                ItemType.lifecycle_map_id,
+                ItemType.source_item_type_id,
+                ItemType.related_item_type_id,
+                ItemType.properties_schema,
+            ).order_by(ItemType.id)
+        )
+    ]
+    return MetadataSnapshot(version, item_types, expires_at)
+
+
+def _after_flush(session: Session, flush_context) -> None:  # type: ignore[no-untyped-def]
+    if any(
+        isinstance(obj, _META_MODELS)
+        for obj in (*session.new, *session.dirty, *session.deleted)
+    ):
+        session.info.pop(_SNAPSHOT_KEY, None)
+        session.info[_TOUCHED_KEY] = True
+
+
+def _after_commit(session: Session) -> None:
+    # A session-local snapshot lasts one transaction, like the identity map.
+    session.info.pop(_SNAPSHOT_KEY, None)
+    if session.info.pop(_TOUCHED_KEY, False):
+        bump_schema_version()
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_SNAPSHOT_KEY, None)
+    session.info.pop(_TOUCHED_KEY, None)
+
+
+def register_session_hooks() -> None:
+    global _REGISTERED
+    if _REGISTERED:
+        return
+    with _REGISTER_LOCK:
+        if _REGISTERED:
+            return
+        event.listen(Session, "after_flush", _after_flush)
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_rollback", _after_rollback)
+        _REGISTERED = True
+
+
+register_session_hooks()
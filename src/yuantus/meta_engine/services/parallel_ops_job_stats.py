@@ -0,0 +1,269 @@
+"""
+Grouped document-sync job counts for the parallel-ops dashboards.
+
+``ParallelOpsOverviewService`` summaries, trends and Prometheus metrics only need
+job counts per (time bucket, direction, status, dead-letter). ``bucket_counts``
+computes them with one grouped query: bucket assignment, payload
+``site_id``/``direction`` extraction and dead-letter classification all run in
+SQL, so no ``ConversionJob`` rows are loaded.
+
+With ``PARALLEL_OPS_JOB_STATS_ENABLED`` set and ``meta_parallel_ops_job_stats``
+present, whole hours up to the last refresh come from the hourly
+pre-aggregates. Only the leading partial hour, hours cut by a bucket
+boundary and the hours after the last refresh are counted live. ``refresh()``
+(``yuantus parallel-ops job-stats-refresh``) recomputes from
+``PARALLEL_OPS_JOB_STATS_SETTLE_HOURS`` before the last refreshed hour up to
+the current hour. Until the next refresh, status changes to older jobs are
+not reflected.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, case, delete, func, insert, or_, select
+from sqlalchemy.orm import Session
+
+from yuantus.config import get_settings
+from yuantus.meta_engine.models.job import ConversionJob, JobStatus
+from yuantus.meta_engine.models.parallel_ops_job_stats import ParallelOpsJobStat
+from yuantus.meta_engine.services.sql_helpers import table_present
+
+DOC_SYNC_TASK_PATTERN = "document_sync_%"
+_HOUR = timedelta(hours=1)
+_INSERT_CHUNK = 1000
+_ATTEMPT_SUM = func.coalesce(func.sum(func.coalesce(ConversionJob.attempt_count, 0)), 0)
+
+# (bucket index, direction, status, dead letter, job count, attempt sum)
+BucketCount = Tuple[int, str, str, bool, int, int]
+
+
+def time_bucket(column, starts: Sequence[datetime]):
+    """Index of the bucket ``column`` falls in, given ascending bucket starts.
+
+    Values past the last start land in the last bucket; callers filter
+    ``column >= starts[0]``.
+    """
+    whens = [(column < start, idx) for idx, start in enumerate(starts[1:])]
+    if not whens:
+        # A single bucket still needs a groupable expression.
+        whens = [(column.is_(None), 0)]
+    return case(*whens, else_=len(starts) - 1)
+
+
+def doc_sync_site_id():
+    return func.trim(func.coalesce(ConversionJob.payload["site_id"].as_string(), ""))
+
+
+def doc_sync_direction():
+    """payload.direction when push/pull, else the task type suffix, else unknown."""
+    requested = func.lower(func.trim(ConversionJob.payload["direction"].as_string()))
+    task_type = func.lower(func.trim(ConversionJob.task_type))
+    return case(
+        (requested.in_(("push", "pull")), requested),
+        (task_type == "document_sync_push", "push"),
+        (task_type == "document_sync_pull", "pull"),
+        else_="unknown",
+    )
+
+
+def job_status():
+    return func.lower(func.coalesce(func.nullif(ConversionJob.status, ""), "unknown"))
+
+
+def is_dead_letter(status):
+    max_attempts = func.coalesce(ConversionJob.max_attempts, 0)
+    return and_(
+        status == JobStatus.FAILED.value,
+        max_attempts > 0,
+        func.coalesce(ConversionJob.attempt_count, 0) >= max_attempts,
+    )
+
+
+def _floor_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _ceil_hour(value: datetime) -> datetime:
+    floor = _floor_hour(value)
+    return floor if floor == value else floor + _HOUR
+
+
+def _hour_start(dialect_name: str):
+    if dialect_name == "postgresql":
+        return func.date_trunc("hour", ConversionJob.created_at)
+    return func.strftime("%Y-%m-%d %H:00:00", ConversionJob.created_at)
+
+
+def _as_datetime(value: Any) -> datetime:
+    return value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+
+
+class ParallelOpsJobStatsService:
+    def __init__(self, session: Session):
+        self.session = session
+
+    # ========== Availability ==========
+
+    def enabled(self) -> bool:
+        """True when the hourly pre-aggregates may be read."""
+        if not get_settings().PARALLEL_OPS_JOB_STATS_ENABLED:
+            return False
+        return table_present(self.session, ParallelOpsJobStat.__tablename__)
+
+    def covered_until(self) -> Optional[datetime]:
+        """End of the last refreshed hour holding jobs (earlier hours are complete)."""
+        last = self.session.execute(
+            select(func.max(ParallelOpsJobStat.hour_start))
+        ).scalar_one_or_none()
+        return _as_datetime(last) + _HOUR if last is not None else None
+
+    # ========== Reads ==========
+
+    def bucket_counts(
+        self,
+        *,
+        since: datetime,
+        starts: Sequence[datetime],
+        site_id: Optional[str] = None,
+    ) -> List[BucketCount]:
+        """Document-sync job counts created at/after ``since``, per bucket of ``starts``."""
+        site = str(site_id).strip() if site_id else None
+        live_ranges = None
+        rows: List[BucketCount] = []
+
+        first_hour = _ceil_hour(since)
+        covered_until = self.covered_until() if self.enabled() else None
+        if covered_until is not None and first_hour < covered_until:
+            straddled = sorted(
+                {
+                    _floor_hour(start)
+                    for start in starts[1:]
+                    if start != _floor_hour(start)
+                    and first_hour <= _floor_hour(start) < covered_until
+                }
+            )
+            stat = ParallelOpsJobStat
+            keys = (
+                time_bucket(stat.hour_start, starts),
+                stat.direction,
+                stat.status,
+                stat.dead_letter,
+            )
+            query = (
+                select(*keys, func.sum(stat.job_count), func.sum(stat.attempt_sum))
+                .where(stat.hour_start >= first_hour, stat.hour_start < covered_until)
+                .group_by(*keys)
+            )
+            if straddled:
+                query = query.where(stat.hour_start.notin_(straddled))
+            if site:
+                query = query.where(stat.site_id == site)
+            rows.extend(self._typed(self.session.execute(query)))
+
+            created_at = ConversionJob.created_at
+            live_ranges = or_(
+                created_at < first_hour,
+                created_at >= covered_until,
+                *(and_(created_at >= hour, created_at < hour + _HOUR) for hour in straddled),
+            )
+
+        status = job_status()
+        keys = (
+            time_bucket(ConversionJob.created_at, starts),
+            doc_sync_direction(),
+            status,
+            case((is_dead_letter(status), 1), else_=0),
+        )
+        query = (
+            select(*keys, func.count(), _ATTEMPT_SUM)
+            .where(
+                ConversionJob.task_type.like(DOC_SYNC_TASK_PATTERN),
+                ConversionJob.created_at >= since,
+            )
+            .group_by(*keys)
+        )
+        if live_ranges is not None:
+            query = query.where(live_ranges)
+        if site:
+            query = query.where(doc_sync_site_id() == site)
+        rows.extend(self._typed(self.session.execute(query)))
+        return rows
+
+    @staticmethod
+    def _typed(result) -> List[BucketCount]:
+        return [
+            (int(idx), direction, status, bool(dead), int(count or 0), int(attempts or 0))
+            for idx, direction, status, dead, count, attempts in result
+        ]
+
+    # ========== Maintenance ==========
+
+    def refresh(self, *, settle_hours: Optional[int] = None) -> Dict[str, Any]:
+        """Recompute hours from the settle window before the last refresh up to now."""
+        if settle_hours is None:
+            settle_hours = get_settings().PARALLEL_OPS_JOB_STATS_SETTLE_HOURS
+        until = _floor_hour(datetime.utcnow())
+        covered_until = self.covered_until()
+        if covered_until is not None:
+            start = covered_until - _HOUR - timedelta(hours=max(0, int(settle_hours)))
+        else:
+            earliest = self.session.execute(
+                select(func.min(ConversionJob.created_at)).where(
+                    ConversionJob.task_type.like(DOC_SYNC_TASK_PATTERN)
+                )
+            ).scalar_one_or_none()
+            start = _floor_hour(_as_datetime(earliest)) if earliest is not None else until
+        if start >= until:
+            return {"from": start.isoformat(), "until": until.isoformat(), "rows": 0}
+
+        stat = ParallelOpsJobStat
+        self.session.execute(
+            delete(stat).where(stat.hour_start >= start, stat.hour_start < until)
+        )
+        status = job_status()
+        keys = (
+            _hour_start(self.session.get_bind().dialect.name),
+            doc_sync_site_id(),
+            doc_sync_direction(),
+            status,
+            case((is_dead_letter(status), 1), else_=0),
+        )
+        query = (
+            select(*keys, func.count(), _ATTEMPT_SUM)
+            .where(
+                ConversionJob.task_type.like(DOC_SYNC_TASK_PATTERN),
+                ConversionJob.created_at >= start,
+                ConversionJob.created_at < until,
+            )
+            .group_by(*keys)
+        )
+        refreshed_at = datetime.utcnow()
+        values = []
+        for hour_start, site_id, direction, status_key, dead, count, attempts in (
+            self.session.execute(query)
+        ):
+            hour_start = _as_datetime(hour_start).replace(tzinfo=None)
+            values.append(
+                {
+                    "id": f"{hour_start:%Y%m%d%H}|{direction}|{status_key}|{int(dead)}|{site_id}",
+                    "hour_start": hour_start,
+                    "site_id": site_id or None,
+                    "direction": direction,
+                    "status": status_key,
+                    "dead_letter": bool(dead),
+                    "job_count": int(count),
+                    "attempt_sum": int(attempts or 0),
+                    "refreshed_at": refreshed_at,
+                }
+            )
+        for offset in range(0, len(values), _INSERT_CHUNK):
+            self.session.execute(insert(stat), values[offset : offset + _INSERT_CHUNK])
+        self.session.flush()
+        return {"from": start.isoformat(), "until": until.isoformat(), "rows": len(values)}
+
+    def rebuild(self) -> Dict[str, Any]:
+        """Drop every pre-aggregate and recompute from the earliest job."""
+        self.session.execute(delete(ParallelOpsJobStat))
+        return self.refresh()
@@ -18,6 +18,7 @@ from typing import Any, Dict, Iterable, List, Optional
 from zipfile import ZIP_DEFLATED, ZipFile
 
 import httpx
+from sqlalchemy import case as sa_case
 from sqlalchemy import func as sa_func
 from sqlalchemy import or_ as sa_or
 from sqlalchemy import select as sa_select
@@ -43,6 +44,10 @@ from yuantus.meta_engine.models.parallel_tasks import (
 )
 from yuantus.meta_engine.report_locale.service import ReportLocaleService
 from yuantus.meta_engine.services.job_service import JobService
+from yuantus.meta_engine.services.parallel_ops_job_stats import (
+    ParallelOpsJobStatsService,
+    time_bucket,
+)
 from yuantus.meta_engine.services.breakage_db_resolver_contract import (
     BreakageIncidentRow,
     resolve_breakage_eco_closure_descriptor,
@@ -7794,46 +7799,31 @@ class ParallelOpsOverviewService:
         since: datetime,
         site_id: Optional[str] = None,
     ) -> Dict[str, Any]:
-        jobs = (
-            self.session.query(ConversionJob)
-            .filter(ConversionJob.task_type.like("document_sync_%"))
-            .filter(ConversionJob.created_at >= since)
-            .order_by(ConversionJob.created_at.desc())
-            .all()
-        )
-        filtered: List[ConversionJob] = []
-        for job in jobs:
-            payload = job.payload if isinstance(job.payload, dict) else {}
-            if site_id and str(payload.get("site_id") or "").strip() != str(site_id).strip():
-                continue
-            filtered.append(job)
+        by_status: Counter[str] = Counter()
+        by_direction: Counter[str] = Counter()
+        dead_letter_total = 0
+        attempt_total = 0
+        for _, direction, status, dead_letter, count, attempts in (
+            ParallelOpsJobStatsService(self.session).bucket_counts(
+                since=since, starts=[since], site_id=site_id
+            )
+        ):
+            by_status[status] += count
+            by_direction[direction] += count
+            if dead_letter:
+                dead_letter_total += count
+            attempt_total += attempts
 
-        by_status = Counter(str(job.status or "unknown").lower() for job in filtered)
-        by_direction = Counter()
-        for job in filtered:
-            payload = job.payload if isinstance(job.payload, dict) else {}
-            by_direction[self._doc_sync_direction_for_job(job, payload)] += 1
-        dead_letter = [
-            job
-            for job in filtered
-            if str(job.status or "").lower() == JobStatus.FAILED.value
-            and int(job.max_attempts or 0) > 0
-            and int(job.attempt_count or 0) >= int(job.max_attempts or 0)
-        ]
         success_count = int(by_status.get(JobStatus.COMPLETED.value, 0))
-        total = len(filtered)
-        avg_attempts = (
-            sum(int(job.attempt_count or 0) for job in filtered) / float(total)
-            if total > 0
-            else 0.0
-        )
+        total = int(sum(by_status.values()))
+        avg_attempts = attempt_total / float(total) if total > 0 else 0.0
         return {
             "total": total,
             "by_status": dict(by_status),
             "by_direction": dict(by_direction),
             "success_rate": self._safe_ratio(success_count, total),
-            "dead_letter_total": len(dead_letter),
-            "dead_letter_rate": self._safe_ratio(len(dead_letter), total),
+            "dead_letter_total": dead_letter_total,
+            "dead_letter_rate": self._safe_ratio(dead_letter_total, total),
             "avg_attempt_count": round(avg_attempts, 4),
             "site_filter": site_id,
         }
@@ -7934,7 +7924,6 @@ class ParallelOpsOverviewService:
         normalized_bucket = self._normalize_bucket_days(bucket_days)
         now = _utcnow()
         bucket_span = timedelta(days=normalized_bucket)
-        bucket_seconds = float(bucket_span.total_seconds())
 
         points: List[Dict[str, Any]] = []
         cursor = since
@@ -7963,60 +7952,22 @@ class ParallelOpsOverviewService:
                 }
             )
 
-        def bucket_index(created_at: Optional[datetime]) -> Optional[int]:
-            if created_at is None:
-                return None
-            delta = (created_at - since).total_seconds()
-            if delta < 0:
-                return None
-            idx = int(delta // bucket_seconds) if bucket_seconds > 0 else 0
-            if idx < 0:
-                return None
-            if idx >= len(points):
-                return len(points) - 1
-            return idx
-
-        jobs = (
-            self.session.query(ConversionJob)
-            .filter(ConversionJob.task_type.like("document_sync_%"))
-            .filter(ConversionJob.created_at >= since)
-            .all()
-        )
-        for job in jobs:
-            payload = job.payload if isinstance(job.payload, dict) else {}
-            current_site_id = str(payload.get("site_id") or "").strip() or None
-            if site_id and current_site_id != str(site_id).strip():
-                continue
-            idx = bucket_index(job.created_at)
-            if idx is None:
-                continue
-            point = points[idx]
-            point["total"] = int(point.get("total") or 0) + 1
-            direction_key = self._doc_sync_direction_for_job(job, payload)
-            direction_counts = (
-                point.get("directions") if isinstance(point.get("directions"), dict) else {}
+        starts = [since + bucket_span * idx for idx in range(len(points))]
+        for idx, direction_key, _, dead_letter, count, _ in (
+            ParallelOpsJobStatsService(self.session).bucket_counts(
+                since=since, starts=starts, site_id=site_id
             )
-            direction_counts[direction_key] = int(direction_counts.get(direction_key) or 0) + 1
-            point["directions"] = direction_counts
-            status = str(job.status or "").strip().lower()
-            max_attempts = int(job.max_attempts or 0)
-            attempt_count = int(job.attempt_count or 0)
-            is_dead_letter = (
-                status == JobStatus.FAILED.value
-                and max_attempts > 0
-                and attempt_count >= max_attempts
-            )
-            if is_dead_letter:
-                point["dead_letter_total"] = int(point.get("dead_letter_total") or 0) + 1
-                dead_direction_counts = (
-                    point.get("dead_letter_directions")
-                    if isinstance(point.get("dead_letter_directions"), dict)
-                    else {}
-                )
-                dead_direction_counts[direction_key] = (
-                    int(dead_direction_counts.get(direction_key) or 0) + 1
+        ):
+            point = points[idx]
+            point["total"] += count
+            point["directions"][direction_key] = (
+                int(point["directions"].get(direction_key) or 0) + count
+            )
+            if dead_letter:
+                point["dead_letter_total"] += count
+                point["dead_letter_directions"][direction_key] = (
+                    int(point["dead_letter_directions"].get(direction_key) or 0) + count
                 )
-                point["dead_letter_directions"] = dead_direction_counts
 
         values: List[int] = []
         direction_totals = Counter()
@@ -8852,6 +8803,37 @@ class ParallelOpsOverviewService:
             "slo_thresholds": thresholds,
         }
 
+    def _bucketed_status_counts(
+        self,
+        model: Any,
+        starts: List[datetime],
+        *,
+        status_value: str,
+        extra_filter: Any = None,
+    ) -> List[tuple]:
+        """(bucket index, total, rows with ``status_value``) for rows created since ``starts[0]``."""
+        bucket = time_bucket(model.created_at, starts)
+        query = (
+            sa_select(
+                bucket,
+                sa_func.count(),
+                sa_func.coalesce(
+                    sa_func.sum(
+                        sa_case((sa_func.lower(model.status) == status_value, 1), else_=0)
+                    ),
+                    0,
+                ),
+            )
+            .where(model.created_at >= starts[0])
+            .group_by(bucket)
+        )
+        if extra_filter is not None:
+            query = query.where(extra_filter)
+        return [
+            (int(idx), int(total), int(matched or 0))
+            for idx, total, matched in self.session.execute(query)
+        ]
+
     def trends(
         self,
         *,
@@ -8922,94 +8904,49 @@ class ParallelOpsOverviewService:
                 }
             )
 
-        bucket_seconds = float(bucket_span.total_seconds())
-
-        def bucket_index(created_at: Optional[datetime]) -> Optional[int]:
-            if created_at is None:
-                return None
-            delta = (created_at - since).total_seconds()
-            if delta < 0:
-                return None
-            idx = int(delta // bucket_seconds) if bucket_seconds > 0 else 0
-            if idx < 0:
-                return None
-            if idx >= len(points):
-                return len(points) - 1
-            return idx
-
-        jobs = (
-            self.session.query(ConversionJob)
-            .filter(ConversionJob.task_type.like("document_sync_%"))
-            .filter(ConversionJob.created_at >= since)
-            .all()
-        )
-        for job in jobs:
-            payload = job.payload if isinstance(job.payload, dict) else {}
-            row_site_id = str(payload.get("site_id") or "").strip()
-            if site_id and row_site_id != str(site_id).strip():
-                continue
-            idx = bucket_index(job.created_at)
-            if idx is None:
-                continue
+        starts = [since + bucket_span * idx for idx in range(len(points))]
+        for idx, direction_key, status, dead_letter, count, _ in (
+            ParallelOpsJobStatsService(self.session).bucket_counts(
+                since=since, starts=starts, site_id=site_id
+            )
+        ):
             row = points[idx]
             doc_sync = row["doc_sync"]
-            doc_sync["total"] += 1
-            direction_key = self._doc_sync_direction_for_job(job, payload)
-            direction_counts = (
-                doc_sync.get("directions") if isinstance(doc_sync.get("directions"), dict) else {}
+            doc_sync["total"] += count
+            doc_sync["directions"][direction_key] = (
+                int(doc_sync["directions"].get(direction_key) or 0) + count
             )
-            direction_counts[direction_key] = int(direction_counts.get(direction_key) or 0) + 1
-            doc_sync["directions"] = direction_counts
-            status = str(job.status or "").lower()
             if status == JobStatus.COMPLETED.value:
-                row["_doc_sync_success_total"] += 1
+                row["_doc_sync_success_total"] += count
             if status == JobStatus.FAILED.value:
-                doc_sync["failed_total"] += 1
-                max_attempts = int(job.max_attempts or 0)
-                attempt_count = int(job.attempt_count or 0)
-                if max_attempts > 0 and attempt_count >= max_attempts:
-                    doc_sync["dead_letter_total"] += 1
-                    dead_direction_counts = (
-                        doc_sync.get("dead_letter_directions")
-                        if isinstance(doc_sync.get("dead_letter_directions"), dict)
-                        else {}
-                    )
-                    dead_direction_counts[direction_key] = (
-                        int(dead_direction_counts.get(direction_key) or 0) + 1
-                    )
-                    doc_sync["dead_letter_directions"] = dead_direction_counts
+                doc_sync["failed_total"] += count
+            if dead_letter:
+                doc_sync["dead_letter_total"] += count
+                doc_sync["dead_letter_directions"][direction_key] = (
+                    int(doc_sync["dead_letter_directions"].get(direction_key) or 0)
+                    + count
+                )
 
-        workflow_query = self.session.query(WorkflowCustomActionRun).filter(
-            WorkflowCustomActionRun.created_at >= since
-        )
-        if target_object:
-            workflow_query = workflow_query.filter(
+        for idx, total, failed_total in self._bucketed_status_counts(
+            WorkflowCustomActionRun,
+            starts,
+            status_value="failed",
+            extra_filter=(
                 WorkflowCustomActionRun.target_object == target_object
-            )
-        for run in workflow_query.all():
-            idx = bucket_index(run.created_at)
-            if idx is None:
-                continue
-            row = points[idx]
-            workflow = row["workflow_actions"]
-            workflow["total"] += 1
-            if str(run.status or "").lower() == "failed":
-                workflow["failed_total"] += 1
+                if target_object
+                else None
+            ),
+        ):
+            workflow = points[idx]["workflow_actions"]
+            workflow["total"] += total
+            workflow["failed_total"] += failed_total
 
-        incidents = (
-            self.session.query(BreakageIncident)
-            .filter(BreakageIncident.created_at >= since)
-            .all()
-        )
-        for incident in incidents:
-            idx = bucket_index(incident.created_at)
-            if idx is None:
-                continue
-            row = points[idx]
-            breakages = row["breakages"]
-            breakages["total"] += 1
-            if str(incident.status or "").lower() == "open":
-                breakages["open_total"] += 1
+        for idx, total, open_total in self._bucketed_status_counts(
+            BreakageIncident, starts, status_value="open"
+        ):
+            breakages = points[idx]["breakages"]
+            breakages["total"] += total
+            breakages["open_total"] += open_total
 
         for row in points:
             doc_sync = row["doc_sync"]
@@ -9563,6 +9500,89 @@ class ParallelOpsOverviewService:
             "jobs": paged["rows"],
         }
 
+    def _breakage_helpdesk_payload_text(
+        self, key: str, sections: tuple = ("helpdesk_sync", "result")
+    ) -> Any:
+        """SQL: first non-empty ``key`` among payload ``sections`` then the payload itself."""
+        payload = ConversionJob.payload
+        return sa_func.coalesce(
+            *(sa_func.nullif(payload[(section, key)].as_string(), "") for section in sections),
+            sa_func.nullif(payload[key].as_string(), ""),
+        )
+
+    def _breakage_helpdesk_bucket_counts(
+        self,
+        *,
+        since: datetime,
+        starts: List[datetime],
+        provider_filter: Optional[str] = None,
+        provider_ticket_status_filter: Optional[str] = None,
+    ) -> List[tuple]:
+        """(bucket index, failed, failure category, jobs) for helpdesk sync jobs.
+
+        Grouped-SQL counterpart of ``_collect_breakage_helpdesk_rows`` for trends:
+        the payload fallbacks (helpdesk_sync -> result -> payload) are resolved in
+        the query instead of per loaded job.
+        """
+        payload_text = self._breakage_helpdesk_payload_text
+        job_status = sa_func.lower(sa_func.trim(sa_func.coalesce(ConversionJob.status, "")))
+        sync_status = sa_func.lower(
+            sa_func.trim(sa_func.coalesce(payload_text("sync_status"), ConversionJob.status, ""))
+        )
+        provider_value = sa_func.coalesce(
+            sa_func.nullif(
+                sa_func.lower(
+                    sa_func.trim(
+                        sa_func.coalesce(
+                            payload_text("provider", ("helpdesk_sync", "integration", "result")),
+                            "unknown",
+                        )
+                    )
+                ),
+                "",
+            ),
+            "unknown",
+        )
+        ticket_status = sa_func.lower(
+            sa_func.trim(sa_func.coalesce(payload_text("provider_ticket_status"), ""))
+        )
+        keys = (
+            time_bucket(ConversionJob.created_at, starts),
+            sa_case(
+                (
+                    sa_or(
+                        sync_status == JobStatus.FAILED.value,
+                        job_status == JobStatus.FAILED.value,
+                    ),
+                    1,
+                ),
+                else_=0,
+            ),
+            sa_func.coalesce(
+                sa_func.nullif(
+                    sa_func.lower(
+                        sa_func.trim(sa_func.coalesce(payload_text("failure_category"), ""))
+                    ),
+                    "",
+                ),
+                "unknown",
+            ),
+        )
+        query = (
+            sa_select(*keys, sa_func.count())
+            .where(ConversionJob.task_type == self._BREAKAGE_HELPDESK_TASK_TYPE)
+            .where(ConversionJob.created_at >= since)
+            .group_by(*keys)
+        )
+        if provider_filter:
+            query = query.where(provider_value == provider_filter)
+        if provider_ticket_status_filter:
+            query = query.where(ticket_status == provider_ticket_status_filter)
+        return [
+            (int(idx), bool(failed), str(category), int(count))
+            for idx, failed, category, count in self.session.execute(query)
+        ]
+
     def breakage_helpdesk_failure_trends(
         self,
         *,
@@ -9580,7 +9600,6 @@ class ParallelOpsOverviewService:
         since = self._window_since(normalized_window)
         now = _utcnow()
         bucket_span = timedelta(days=normalized_bucket)
-        bucket_seconds = float(bucket_span.total_seconds())
 
         points: List[Dict[str, Any]] = []
         cursor = since
@@ -9607,42 +9626,28 @@ class ParallelOpsOverviewService:
                 }
             )
 
-        def bucket_index(created_at: Optional[datetime]) -> Optional[int]:
-            if created_at is None:
-                return None
-            delta = (created_at - since).total_seconds()
-            if delta < 0:
-                return None
-            idx = int(delta // bucket_seconds) if bucket_seconds > 0 else 0
-            if idx < 0:
-                return None
-            if idx >= len(points):
-                return len(points) - 1
-            return idx
-
         provider_filter = str(provider or "").strip().lower() or None
         category_filter = str(failure_category or "").strip().lower() or None
         provider_ticket_status_filter = (
             str(provider_ticket_status or "").strip().lower() or None
         )
-        raw_rows = self._collect_breakage_helpdesk_rows(
-            since=since,
-            provider_filter=provider_filter,
-            provider_ticket_status_filter=provider_ticket_status_filter,
-        )
-        for raw_row in raw_rows:
-            idx = bucket_index(raw_row.get("_created_at_dt"))
-            if idx is None:
-                continue
+        starts = [since + bucket_span * idx for idx in range(len(points))]
+        for idx, is_failed, row_failure_category, count in (
+            self._breakage_helpdesk_bucket_counts(
+                since=since,
+                starts=starts,
+                provider_filter=provider_filter,
+                provider_ticket_status_filter=provider_ticket_status_filter,
+            )
+        ):
             bucket_row = points[idx]
-            bucket_row["total_jobs"] += 1
-            if not bool(raw_row.get("_is_failed")):
+            bucket_row["total_jobs"] += count
+            if not is_failed:
                 continue
-            row_failure_category = str(raw_row.get("failure_category") or "unknown")
             if category_filter and row_failure_category != category_filter:
                 continue
-            bucket_row["failed_jobs"] += 1
-            bucket_row["_failed_by_category"][row_failure_category] += 1
+            bucket_row["failed_jobs"] += count
+            bucket_row["_failed_by_category"][row_failure_category] += count
 
         by_failure_category: Counter[str] = Counter()
         for row in points:
@@ -3,19 +3,31 @@ AML Query Service (ADR-007)
 增强的 AML 查询服务，支持 select/expand/depth 能力
 """
 
-from typing import Any, Dict, List, Optional, Set
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import String, and_, asc, cast, desc, func, or_
+from sqlalchemy import String, and_, asc, cast, desc, false, func, or_
 
-from yuantus.meta_engine.schemas.aml import AMLQueryRequest, AMLQueryResponse
+from yuantus.config import get_settings
+from yuantus.meta_engine.schemas.aml import AMLAction, AMLQueryRequest, AMLQueryResponse
 from yuantus.meta_engine.models.item import Item
-from yuantus.meta_engine.models.meta_schema import ItemType
 from yuantus.meta_engine.services.item_number_keys import (
     ITEM_NUMBER_READ_KEYS,
     get_item_number,
 )
+from yuantus.meta_engine.services.meta_permission_service import MetaPermissionService
+from yuantus.meta_engine.services.metadata_cache import ItemTypeMeta, get_metadata
+from yuantus.meta_engine.services.search_service import planner_row_estimate
 import logging
 
+# "estimate" on dialects without planner estimates counts at most this many rows.
+_ESTIMATE_COUNT_CAP = 1000
+
+# (sort expression, descending)
+OrderKey = Tuple[Any, bool]
+
 
 class AMLQueryService:
     """
@@ -25,17 +37,27 @@ class AMLQueryService:
     - select: 字段选择，减少数据传输
     - expand: 关系展开，解决 N+1 问题
     - depth: 递归展开深度控制
-    - 分页和排序
+    - 分页和排序 (offset 或 keyset 游标)
     """
 
     def __init__(self, session: Session):
         self.session = session
         self._expand_cache: Dict[str, Any] = {}
 
-    def query(self, request: AMLQueryRequest) -> AMLQueryResponse:
+    def query(
+        self,
+        request: AMLQueryRequest,
+        *,
+        user_id: Optional[str] = None,
+        user_roles: Optional[List[str]] = None,
+    ) -> AMLQueryResponse:
         """
         执行 AML 增强查询
 
+        With QUERY_ACL_PUSHDOWN_ENABLED and a ``user_id``, the caller's read
+        permissions are part of the SQL, so ``total`` and the page only
+        cover items the caller may read.
+
         Example:
             request = AMLQueryRequest(
                 type="Part",
@@ -59,18 +81,39 @@ class AMLQueryService:
         if request.where:
             base_query = self._apply_where(base_query, request.where)
 
-        # 4. 获取总数 (分页前)
-        total = base_query.count()
-
-        # 5. 应用排序
-        if request.order_by:
-            base_query = self._apply_order(base_query, request.order_by)
-        else:
-            base_query = base_query.order_by(desc(Item.created_at))
+        # 3b. 权限下推 (ACL pushdown)
+        if user_id is not None and get_settings().QUERY_ACL_PUSHDOWN_ENABLED:
+            clause = MetaPermissionService(self.session).readable_clause(
+                user_id, user_roles, AMLAction.get, item_type_id=item_type.id
+            )
+            if clause is not None:
+                base_query = base_query.filter(clause)
 
-        # 6. 应用分页
-        offset = (request.page - 1) * request.page_size
-        items = base_query.offset(offset).limit(request.page_size).all()
+        # 4. 获取总数 (分页前)
+        total, total_relation = self._count(base_query, request.count_mode)
+
+        # 5. 应用排序 (id 为末位键, 保证顺序稳定、游标唯一)
+        order = self._order_keys(request.order_by or [])
+        order.append((Item.id, order[-1][1]))
+        query = base_query.add_columns(
+            *[expr.label(f"_key{i}") for i, (expr, _) in enumerate(order)]
+        ).order_by(*[self._order_clause(expr, is_desc) for expr, is_desc in order])
+
+        # 6. 应用分页: keyset 游标或 offset; 多取一行判断 has_more
+        if request.cursor is not None:
+            values = self._decode_cursor(request.cursor, request.order_by or [], len(order))
+            query = query.filter(self._after_keys(order, values))
+        elif request.page > 1:
+            query = query.offset((request.page - 1) * request.page_size)
+        rows = query.limit(request.page_size + 1).all()
+        has_more = len(rows) > request.page_size
+        rows = rows[: request.page_size]
+        items = [row[0] for row in rows]
+        next_cursor = (
+            self._encode_cursor(request.order_by or [], rows[-1][1:])
+            if has_more
+            else None
+        )
 
         # 7. 转换为字典
         result_items = [self._item_to_dict(item) for item in items]
@@ -90,11 +133,24 @@ class AMLQueryService:
         return AMLQueryResponse(
             items=result_items,
             total=total,
+            total_relation=total_relation,
             page=request.page,
             page_size=request.page_size,
-            has_more=(offset + len(items)) < total,
+            has_more=has_more,
+            next_cursor=next_cursor,
         )
 
+    def _count(self, query, count_mode: str) -> Tuple[Optional[int], Optional[str]]:
+        """``(total, relation)``; relation is only set for non-exact modes."""
+        if count_mode == "none":
+            return None, None
+        if count_mode == "estimate":
+            if self.session.get_bind().dialect.name == "postgresql":
+                return planner_row_estimate(self.session, query.statement), "estimate"
+            total = query.limit(_ESTIMATE_COUNT_CAP).count()
+            return total, "gte" if total >= _ESTIMATE_COUNT_CAP else "eq"
+        return query.count(), None
+
     def get_by_id(
         self,
         item_type: str,
@@ -104,10 +160,11 @@ class AMLQueryService:
         depth: int = 1,
     ) -> Optional[Dict[str, Any]]:
         """获取单个 Item"""
+        if not self._get_item_type(item_type):
+            return None
         item = (
             self.session.query(Item)
-            .join(ItemType, Item.item_type_id == ItemType.id)
-            .filter(ItemType.id == item_type)
+            .filter(Item.item_type_id == item_type)
             .filter(Item.id == item_id)
             .first()
         )
@@ -125,9 +182,9 @@ class AMLQueryService:
 
         return result
 
-    def _get_item_type(self, type_name: str) -> Optional[ItemType]:
-        """获取 ItemType"""
-        return self.session.query(ItemType).filter(ItemType.id == type_name).first()
+    def _get_item_type(self, type_name: str) -> Optional[ItemTypeMeta]:
+        """获取 ItemType (元数据缓存)"""
+        return get_metadata(self.session).get(type_name)
 
     def _json_text(self, expr):
         """
@@ -206,8 +263,9 @@ class AMLQueryService:
 
         return query
 
-    def _apply_order(self, query, order_by: List[str]):
-        """应用排序"""
+    def _order_keys(self, order_by: List[str]) -> List[OrderKey]:
+        """解析排序字段; 无有效字段时按 created_at 倒序"""
+        keys: List[OrderKey] = []
         for order_spec in order_by:
             if ":" in order_spec:
                 field, direction = order_spec.split(":")
@@ -236,12 +294,58 @@ class AMLQueryService:
             else:
                 continue
 
-            if direction.lower() == "desc":
-                query = query.order_by(desc(col))
-            else:
-                query = query.order_by(asc(col))
-
-        return query
+            keys.append((col, direction.lower() == "desc"))
+
+        return keys or [(Item.created_at, True)]
+
+    @staticmethod
+    def _order_clause(expr, is_desc: bool):
+        # NULLS LAST in both directions, so the keyset predicate is dialect-independent.
+        return (desc(expr) if is_desc else asc(expr)).nulls_last()
+
+    @staticmethod
+    def _after_keys(order: Sequence[OrderKey], values: Sequence[Any]):
+        """Rows strictly after ``values`` in ``order`` (NULLS LAST)."""
+        clauses = []
+        equal: List[Any] = []
+        for (expr, is_desc), value in zip(order, values):
+            if expr is Item.id:
+                # Unique and NOT NULL: the final tie-breaker.
+                beyond = Item.id < value if is_desc else Item.id > value
+                clauses.append(and_(*equal, beyond))
+                break
+            if value is None:
+                # Inside the NULL tail of this key: only later keys can advance.
+                equal.append(expr.is_(None))
+                continue
+            beyond = expr < value if is_desc else expr > value
+            clauses.append(and_(*equal, or_(beyond, expr.is_(None))))
+            equal.append(expr == value)
+        return or_(*clauses) if clauses else false()
+
+    @staticmethod
+    def _encode_cursor(order_by: List[str], values: Sequence[Any]) -> str:
+        keys = [
+            {"$dt": value.isoformat()} if isinstance(value, datetime) else value
+            for value in values
+        ]
+        raw = json.dumps({"o": order_by, "k": keys}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str, order_by: List[str], size: int) -> List[Any]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            keys = payload["k"]
+            if payload["o"] != order_by or len(keys) != size:
+                raise ValueError("cursor does not match order_by")
+            return [
+                datetime.fromisoformat(value["$dt"]) if isinstance(value, dict) else value
+                for value in keys
+            ]
+        except (ValueError, KeyError, TypeError) as exc:
+            raise ValueError(f"Invalid cursor: {exc}") from exc
 
     def _item_to_dict(self, item: Item) -> Dict[str, Any]:
         """Item 转字典"""
@@ -365,11 +469,7 @@ class AMLQueryService:
             return
 
         # 查询关系类型：仅使用 ItemType.is_relationship（legacy 已移除）
-        rel_item_type = (
-            self.session.query(ItemType)
-            .filter((ItemType.id == rel_name) | (ItemType.label == rel_name))
-            .first()
-        )
+        rel_item_type = get_metadata(self.session).resolve(rel_name)
         if not rel_item_type or not rel_item_type.is_relationship:
             self._expand_builtin_relation(
                 items, item_ids, rel_name, sub_expand, remaining_depth
@@ -5,7 +5,7 @@ Phase 5: Reporting
 """
 
 from datetime import datetime, timedelta
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 from yuantus.meta_engine.services.bom_service import BOMService, _normalize_bom_uom
@@ -385,6 +385,44 @@ class ReportService:
         _recurse(bom_tree)
         return summary
 
+    def iter_flattened_bom_lines(self, item_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        Stream every BOM occurrence with its extended (rolled-up) quantity.
+
+        Built on ``BOMService.iter_bom_nodes`` so the full tree is never held in
+        memory; the multiplier of each ancestor is kept per level of the path.
+        """
+        nodes = self.bom_service.iter_bom_nodes(item_id, levels=-1)
+
+        def _walk() -> Iterator[Dict[str, Any]]:
+            multipliers: List[float] = []
+            for node in nodes:
+                level = node["level"]
+                if level == 0:
+                    multipliers = [1.0]
+                    continue
+                props = node["relationship"].get("properties", {})
+                uom = _normalize_bom_uom(props.get("uom"))
+                try:
+                    qty = float(props.get("quantity", props.get("qty", 1.0)))
+                except (ValueError, TypeError):
+                    qty = 1.0
+                del multipliers[level:]
+                total_qty = qty * multipliers[level - 1]
+                multipliers.append(total_qty)
+                child = node["item"]
+                yield {
+                    "level": level,
+                    "path": node["path"],
+                    "id": child["id"],
+                    "name": child.get("properties", {}).get("name", "Unknown"),
+                    "quantity": qty,
+                    "total_quantity": total_qty,
+                    "uom": uom,
+                }
+
+        return _walk()
+
     def get_flattened_bom(self, item_id: str) -> List[Dict[str, Any]]:
         """
         Returns a list of all components with total quantities (Rollup).
@@ -0,0 +1,213 @@
+"""
+Bulk indexing buffer for the search engine ``_bulk`` API.
+
+Pending operations are kept per document id (the last upsert/delete wins) and
+flushed as one ``_bulk`` request when the buffer reaches ``max_actions`` or
+``max_bytes``, or ``flush_interval`` seconds after the first pending
+operation. Items that fail with a retryable status (429 / 5xx) are resent with
+exponential backoff; transport errors retry the whole batch.
+
+Producers only hold the buffer lock while touching ``_pending``; sending
+(retries and backoff included) runs under a separate send lock, so an outage
+stalls the flushing thread, not every ``upsert``/``delete``. A size-triggered
+flush that finds another batch in flight leaves its operations queued for the
+next flush. Batches go out in the order they were taken, so the last write
+per document id still wins.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_RETRYABLE_STATUS = {429, 502, 503, 504}
+
+# (op, doc_id) -> (action, source or None, encoded size)
+_Pending = Tuple[str, Optional[Dict[str, Any]], int]
+
+
+def _encode(payload: Dict[str, Any]) -> str:
+    return json.dumps(payload, default=str, separators=(",", ":"))
+
+
+class BulkIndexBuffer:
+    def __init__(
+        self,
+        client,
+        index_name: str,
+        *,
+        max_actions: int = 500,
+        max_bytes: int = 5 * 1024 * 1024,
+        flush_interval: float = 1.0,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        on_batch: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ):
+        self.client = client
+        self.index_name = index_name
+        self.max_actions = max(1, max_actions)
+        self.max_bytes = max(1, max_bytes)
+        self.flush_interval = flush_interval
+        self.max_retries = max(0, max_retries)
+        self.retry_backoff = retry_backoff
+        self.on_batch = on_batch
+        self._pending: "OrderedDict[str, _Pending]" = OrderedDict()
+        self._pending_bytes = 0
+        self._first_pending_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    # ========== Enqueue ==========
+
+    def upsert(self, doc_id: str, document: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return self._add(doc_id, "index", document)
+
+    def delete(self, doc_id: str) -> Optional[Dict[str, Any]]:
+        return self._add(doc_id, "delete", None)
+
+    def _add(
+        self, doc_id: str, op: str, document: Optional[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        size = len(_encode({op: {"_index": self.index_name, "_id": doc_id}})) + 1
+        if document is not None:
+            size += len(_encode(document)) + 1
+        with self._lock:
+            previous = self._pending.pop(doc_id, None)
+            if previous is not None:
+                self._pending_bytes -= previous[2]
+            self._pending[doc_id] = (op, document, size)
+            self._pending_bytes += size
+            if self._first_pending_at is None:
+                self._first_pending_at = time.monotonic()
+            full = (
+                len(self._pending) >= self.max_actions
+                or self._pending_bytes >= self.max_bytes
+            )
+        if full:
+            return self.flush(wait=False)
+        return None
+
+    # ========== Flush ==========
+
+    def due(self) -> bool:
+        with self._lock:
+            return (
+                self._first_pending_at is not None
+                and time.monotonic() - self._first_pending_at >= self.flush_interval
+            )
+
+    def flush_if_due(self) -> Optional[Dict[str, Any]]:
+        if not self.due():
+            return None
+        return self.flush()
+
+    def flush(self, *, wait: bool = True) -> Optional[Dict[str, Any]]:
+        """Send everything pending as one ``_bulk`` batch; returns its stats.
+
+        With ``wait=False`` nothing is sent (and None returned) while another
+        batch is in flight.
+        """
+        if not self._send_lock.acquire(blocking=wait):
+            return None
+        try:
+            with self._lock:
+                if not self._pending:
+                    return None
+                batch = list(self._pending.items())
+                batch_bytes = self._pending_bytes
+                self._pending = OrderedDict()
+                self._pending_bytes = 0
+                self._first_pending_at = None
+            return self._send(batch, batch_bytes)
+        finally:
+            self._send_lock.release()
+
+    def _send(self, batch: List[Tuple[str, _Pending]], batch_bytes: int) -> Dict[str, Any]:
+        started = time.monotonic()
+        stats = {
+            "index": self.index_name,
+            "actions": len(batch),
+            "bytes": batch_bytes,
+            "indexed": 0,
+            "deleted": 0,
+            "failed": 0,
+            "retries": 0,
+            "errors": [],
+        }
+        remaining = batch
+        attempt = 0
+        while remaining:
+            try:
+                response = self.client.bulk(operations=self._operations(remaining))
+                retry = self._collect(remaining, response, stats)
+            except Exception as exc:
+                logger.warning("Search bulk request failed: %s", exc)
+                retry = remaining
+                if attempt >= self.max_retries:
+                    stats["errors"].append(str(exc)[:300])
+            if not retry or attempt >= self.max_retries:
+                stats["failed"] += len(retry)
+                break
+            attempt += 1
+            stats["retries"] += 1
+            remaining = retry
+            time.sleep(self.retry_backoff * (2 ** (attempt - 1)))
+        stats["duration_ms"] = round((time.monotonic() - started) * 1000.0, 3)
+        if stats["failed"]:
+            logger.error(
+                "Search bulk batch for %s left %s of %s action(s) unindexed",
+                self.index_name,
+                stats["failed"],
+                stats["actions"],
+            )
+        if self.on_batch is not None:
+            try:
+                self.on_batch(stats)
+            except Exception:
+                logger.exception("Search bulk batch callback failed")
+        return stats
+
+    def _operations(self, batch: List[Tuple[str, _Pending]]) -> List[Dict[str, Any]]:
+        operations: List[Dict[str, Any]] = []
+        for doc_id, (op, document, _size) in batch:
+            operations.append({op: {"_index": self.index_name, "_id": doc_id}})
+            if document is not None:
+                operations.append(document)
+        return operations
+
+    @staticmethod
+    def _collect(
+        batch: List[Tuple[str, _Pending]], response: Any, stats: Dict[str, Any]
+    ) -> List[Tuple[str, _Pending]]:
+        """Count outcomes; return the entries worth retrying."""
+        body = getattr(response, "body", response) or {}
+        items = body.get("items") or []
+        retry: List[Tuple[str, _Pending]] = []
+        for entry, result in zip(batch, items):
+            op = entry[1][0]
+            outcome = result.get(op) or next(iter(result.values()), {})
+            status = int(outcome.get("status", 200))
+            if status < 300 or (op == "delete" and status == 404):
+                stats["deleted" if op == "delete" else "indexed"] += 1
+            elif status in _RETRYABLE_STATUS or status >= 500:
+                retry.append(entry)
+            else:
+                stats["failed"] += 1
+                error = outcome.get("error")
+                if error and len(stats["errors"]) < 5:
+                    stats["errors"].append(
+                        f"{entry[0]}: {error if isinstance(error, str) else error.get('type')}"
+                    )
+        # A response shorter than the request means the rest was not applied.
+        retry.extend(batch[len(items):])
+        return retry
@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import atexit
 import logging
 import re
+import threading
 from datetime import datetime, timezone
 from threading import Lock
 from typing import Any, Callable
 
+from yuantus.config import get_settings
+
 from yuantus.database import get_db_session
 from yuantus.meta_engine.events.domain_events import (
+    DomainEvent,
     EcoCreatedEvent,
     EcoDeletedEvent,
     EcoUpdatedEvent,
@@ -19,6 +24,7 @@ from yuantus.meta_engine.events.domain_events import (
 from yuantus.meta_engine.events.event_bus import event_bus
 from yuantus.meta_engine.models.eco import ECO
 from yuantus.meta_engine.models.item import Item
+from yuantus.meta_engine.services.search_bulk import BulkIndexBuffer
 from yuantus.meta_engine.services.search_service import SearchService
 
 logger = logging.getLogger(__name__)
@@ -65,6 +71,20 @@ _LAST_ERROR_EVENT_TYPE: str | None = None
 _LAST_ERROR_AT: str | None = None
 _LAST_ERROR_RECORDED_AT: datetime | None = None
 _LAST_ERROR: str | None = None
+_BULK_LOCK = Lock()
+_BULK_BUFFERS: dict[str, BulkIndexBuffer] = {}
+_BULK_FLUSHER: threading.Thread | None = None
+_BULK_STOP = threading.Event()
+_BULK_COUNTS = {
+    "batches": 0,
+    "actions": 0,
+    "indexed": 0,
+    "deleted": 0,
+    "failed": 0,
+    "retries": 0,
+    "bytes": 0,
+}
+_LAST_BULK_BATCH: dict[str, Any] | None = None
 _MAX_ERROR_MESSAGE_LENGTH = 300
 _SENSITIVE_ERROR_PATTERNS = (
     (
@@ -169,6 +189,7 @@ def indexer_status() -> dict[str, Any]:
         missing_handlers=missing_handlers,
         duplicate_handlers=duplicate_handlers,
     )
+    bulk = bulk_status()
     now = _now_utc()
     with _STATUS_LOCK:
         return {
@@ -210,9 +231,98 @@ def indexer_status() -> dict[str, Any]:
             "last_error_at": _LAST_ERROR_AT,
             "last_error_age_seconds": _age_seconds(now, _LAST_ERROR_RECORDED_AT),
             "last_error": _LAST_ERROR,
+            "bulk": bulk,
+        }
+
+
+def bulk_status() -> dict[str, Any]:
+    """Counters of the buffered ``_bulk`` pipeline (``indexer_status()["bulk"]``)."""
+    pending = sum(len(buffer) for buffer in list(_BULK_BUFFERS.values()))
+    with _STATUS_LOCK:
+        return {
+            "enabled": bool(get_settings().SEARCH_BULK_ENABLED),
+            "pending": pending,
+            **_BULK_COUNTS,
+            "last_batch": dict(_LAST_BULK_BATCH) if _LAST_BULK_BATCH else None,
+        }
+
+
+def _record_bulk_batch(stats: dict[str, Any]) -> None:
+    global _LAST_BULK_BATCH
+    with _STATUS_LOCK:
+        _BULK_COUNTS["batches"] += 1
+        for key in ("actions", "indexed", "deleted", "failed", "retries", "bytes"):
+            _BULK_COUNTS[key] += int(stats.get(key, 0))
+        _LAST_BULK_BATCH = {
+            **{key: value for key, value in stats.items() if key != "errors"},
+            "errors": [_format_error(RuntimeError(e)) for e in stats.get("errors", [])],
+            "at": _utc_now(),
         }
 
 
+def _bulk_buffer(service: SearchService, index_name: str) -> BulkIndexBuffer:
+    """Process-wide buffer per index, flushed by size/bytes or the flusher thread."""
+    global _BULK_FLUSHER
+    with _BULK_LOCK:
+        buffer = _BULK_BUFFERS.get(index_name)
+        if buffer is None:
+            buffer = service.bulk_buffer(index_name, on_batch=_record_bulk_batch)
+            _BULK_BUFFERS[index_name] = buffer
+        if not _BULK_STOP.is_set() and (
+            _BULK_FLUSHER is None or not _BULK_FLUSHER.is_alive()
+        ):
+            _BULK_FLUSHER = threading.Thread(
+                target=_run_bulk_flusher,
+                args=(_BULK_STOP,),
+                name="SearchBulkFlusher",
+                daemon=True,
+            )
+            _BULK_FLUSHER.start()
+        return buffer
+
+
+def _buffered(buffer: BulkIndexBuffer) -> None:
+    """After enqueueing: with the flusher stopped (shutdown) nothing else sends."""
+    if _BULK_STOP.is_set():
+        buffer.flush()
+
+
+def _run_bulk_flusher(stop: threading.Event) -> None:
+    interval = max(get_settings().SEARCH_BULK_FLUSH_INTERVAL_MS / 1000.0, 0.05)
+    while not stop.wait(min(interval / 2, 0.5)):
+        for buffer in list(_BULK_BUFFERS.values()):
+            try:
+                buffer.flush_if_due()
+            except Exception:
+                logger.exception("Search bulk flush failed")
+
+
+def flush_bulk_buffers() -> None:
+    """Send everything still buffered (tests, CLI)."""
+    for buffer in list(_BULK_BUFFERS.values()):
+        try:
+            buffer.flush()
+        except Exception:
+            logger.exception("Search bulk flush failed")
+
+
+def shutdown_bulk_indexing(timeout: float = 10.0) -> None:
+    """Stop the flusher thread, then send everything still buffered.
+
+    Later index actions are sent as soon as they are buffered.
+    """
+    global _BULK_FLUSHER
+    with _BULK_LOCK:
+        _BULK_STOP.set()
+        flusher, _BULK_FLUSHER = _BULK_FLUSHER, None
+    if flusher is not None:
+        flusher.join(timeout)
+    flush_bulk_buffers()
+
+
+atexit.register(shutdown_bulk_indexing)
+
+
 def _event_coverage() -> dict[str, str]:
     coverage = {event_type: "indexed" for event_type in _EVENT_TYPES.values()}
     coverage.update(
@@ -270,68 +380,93 @@ def _ensure_eco_index(service: SearchService) -> None:
 
 
 def _with_search_service(
-    event_type: str, handler: Callable[[SearchService], None]
+    event_type: str | list[str], handler: Callable[[SearchService], None]
 ) -> None:
+    event_types = [event_type] if isinstance(event_type, str) else event_type
     try:
         with get_db_session() as session:
             service = SearchService(session)
             if not service.client:
-                _record_event_skipped(event_type, "search-engine-disabled")
+                for name in event_types:
+                    _record_event_skipped(name, "search-engine-disabled")
                 return
             _ensure_index(service)
             handler(service)
-            _record_event_success(event_type)
+            for name in event_types:
+                _record_event_success(name)
     except Exception as exc:
-        _record_event_error(event_type, exc)
+        for name in event_types:
+            _record_event_error(name, exc)
         logger.exception("Search indexing handler failed")
 
 
-def _handle_item_created(event: ItemCreatedEvent) -> None:
-    _record_event_received(event.event_type)
-
-    def _index(service: SearchService) -> None:
-        item = service.session.get(Item, event.item_id) if service.session else None
-        if not item:
-            logger.debug("Search index skip (item missing): %s", event.item_id)
-            return
-        service.index_item(item)
-
-    _with_search_service(event.event_type, _index)
+def _as_batch(event_or_batch: DomainEvent | list[DomainEvent]) -> list[DomainEvent]:
+    if isinstance(event_or_batch, list):
+        return event_or_batch
+    return [event_or_batch]
 
 
-def _handle_item_updated(event: ItemUpdatedEvent) -> None:
-    _record_event_received(event.event_type)
+def _index_item_events(events: list[DomainEvent]) -> None:
+    """Index the current state of every item in ``events`` (one DB session)."""
+    if not events:
+        return
+    for event in events:
+        _record_event_received(event.event_type)
+    event_types = [event.event_type for event in events]
 
     def _index(service: SearchService) -> None:
-        item = service.session.get(Item, event.item_id) if service.session else None
-        if not item:
-            logger.debug("Search index skip (item missing): %s", event.item_id)
+        items = []
+        for item_id in dict.fromkeys(event.item_id for event in events):
+            item = service.session.get(Item, item_id) if service.session else None
+            if not item:
+                logger.debug("Search index skip (item missing): %s", item_id)
+                continue
+            items.append(item)
+        if not get_settings().SEARCH_BULK_ENABLED:
+            for item in items:
+                service.index_item(item)
             return
-        service.index_item(item)
+        buffer = _bulk_buffer(service, service.index_name)
+        for item_id, document in service.build_item_documents(items).items():
+            buffer.upsert(item_id, document)
+        _buffered(buffer)
 
-    _with_search_service(event.event_type, _index)
+    _with_search_service(event_types, _index)
 
 
-def _handle_item_deleted(event: ItemDeletedEvent) -> None:
-    _record_event_received(event.event_type)
+def _handle_item_created(event: ItemCreatedEvent | list[ItemCreatedEvent]) -> None:
+    _index_item_events(_as_batch(event))
 
-    def _delete(service: SearchService) -> None:
-        service.delete_item(event.item_id)
 
-    _with_search_service(event.event_type, _delete)
+def _handle_item_updated(event: ItemUpdatedEvent | list[ItemUpdatedEvent]) -> None:
+    _index_item_events(_as_batch(event))
 
 
-def _handle_item_state_changed(event: ItemStateChangedEvent) -> None:
-    _record_event_received(event.event_type)
+def _handle_item_deleted(event: ItemDeletedEvent | list[ItemDeletedEvent]) -> None:
+    events = _as_batch(event)
+    if not events:
+        return
+    for deleted in events:
+        _record_event_received(deleted.event_type)
 
-    def _index(service: SearchService) -> None:
-        item = service.session.get(Item, event.item_id) if service.session else None
-        if not item:
-            logger.debug("Search index skip (item missing): %s", event.item_id)
+    def _delete(service: SearchService) -> None:
+        item_ids = list(dict.fromkeys(deleted.item_id for deleted in events))
+        if not get_settings().SEARCH_BULK_ENABLED:
+            for item_id in item_ids:
+                service.delete_item(item_id)
             return
-        service.index_item(item)
+        buffer = _bulk_buffer(service, service.index_name)
+        for item_id in item_ids:
+            buffer.delete(item_id)
+        _buffered(buffer)
+
+    _with_search_service([deleted.event_type for deleted in events], _delete)
 
-    _with_search_service(event.event_type, _index)
+
+def _handle_item_state_changed(
+    event: ItemStateChangedEvent | list[ItemStateChangedEvent],
+) -> None:
+    _index_item_events(_as_batch(event))
 
 
 def _handle_eco_created(event: EcoCreatedEvent) -> None:
@@ -372,6 +507,15 @@ def _handle_eco_deleted(event: EcoDeletedEvent) -> None:
     _with_search_service(event.event_type, _delete)
 
 
+# Item handlers accept event lists: the bus batches (and, in async mode,
+# coalesces) them so bulk imports/ECO applies index in one session per batch.
+_BATCH_EVENT_TYPES = (
+    ItemCreatedEvent,
+    ItemUpdatedEvent,
+    ItemStateChangedEvent,
+    ItemDeletedEvent,
+)
+
 _HANDLERS_BY_EVENT = {
     ItemCreatedEvent: _handle_item_created,
     ItemUpdatedEvent: _handle_item_updated,
@@ -401,7 +545,9 @@ def register_search_index_handlers() -> None:
         if _REGISTERED:
             return
         for event_type, handler in _HANDLERS_BY_EVENT.items():
-            event_bus.subscribe(event_type, handler)
+            event_bus.subscribe(
+                event_type, handler, batch=event_type in _BATCH_EVENT_TYPES
+            )
         _REGISTERED = True
         _REGISTERED_AT = _utc_now()
         logger.info("Search index handlers registered")
@@ -0,0 +1,459 @@
+"""
+Zero-downtime, partitioned rebuild of the items search index.
+
+``SearchService.index_name`` (``<prefix>-items``) is served through an alias.
+A rebuild creates a versioned index ``<prefix>-items-v<UTC timestamp>`` next to
+the live one, splits ``meta_items`` into contiguous id ranges (``ntile`` over
+``id``) and indexes every range in its own worker process, each with its own
+session, search client and bulk buffer. Searches keep hitting the old index
+the whole time.
+
+When every range is done, items created or updated since the run started are
+re-indexed into the new index, which is then refreshed and swapped in with one
+atomic ``_aliases`` call. A pre-alias concrete ``<prefix>-items`` index is
+removed in that same call. Deletions during the build only reach the old
+index (they go through the alias), so before the swap every document in the
+new index whose item no longer exists is deleted from it as well.
+
+With a checkpoint directory the run records its target index and id ranges in
+``run.json`` and each range records the last id it flushed in
+``partition-<n>.json``, so an interrupted run resumes where it stopped instead
+of starting over.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
+
+from yuantus.context import org_id_var, tenant_id_var
+from yuantus.database import get_db_session
+from yuantus.meta_engine.models.item import Item
+from yuantus.meta_engine.services.search_service import (
+    ITEMS_INDEX_MAPPING,
+    SearchService,
+)
+from yuantus.meta_engine.services.sql_helpers import chunks
+
+logger = logging.getLogger(__name__)
+
+# Items touched this long before the recorded start are also caught up, to
+# absorb clock skew between the database and this host.
+_CATCH_UP_MARGIN = timedelta(minutes=5)
+
+_RUN_FILE = "run.json"
+
+
+def _write_json(path: str, payload: Dict[str, Any]) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as handle:
+        json.dump(payload, handle, default=str)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def _partition_file(checkpoint_dir: str, partition: int) -> str:
+    return os.path.join(checkpoint_dir, f"partition-{partition}.json")
+
+
+def plan_partitions(session: Session, partitions: int) -> List[Tuple[str, str]]:
+    """Inclusive ``(first_id, last_id)`` ranges splitting ``meta_items`` evenly."""
+    tiles = (
+        select(
+            Item.id.label("id"),
+            func.ntile(max(1, partitions)).over(order_by=Item.id).label("tile"),
+        )
+    ).subquery()
+    rows = session.execute(
+        select(func.min(tiles.c.id), func.max(tiles.c.id))
+        .group_by(tiles.c.tile)
+        .order_by(tiles.c.tile)
+    ).all()
+    return [(first, last) for first, last in rows]
+
+
+def reindex_partition(task: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Index one id range into ``task["index"]``.
+
+    Runs in a worker process: it opens its own session and search client under
+    the task's tenant/org scope. Progress is checkpointed after every batch.
+    """
+    if task.get("tenant_id"):
+        tenant_id_var.set(task["tenant_id"])
+    if task.get("org_id"):
+        org_id_var.set(task["org_id"])
+
+    from yuantus.meta_engine.bootstrap import import_all_models
+
+    import_all_models()
+    with get_db_session() as session:
+        return _index_range(SearchService(session), task)
+
+
+def _index_range(service: SearchService, task: Dict[str, Any]) -> Dict[str, Any]:
+    checkpoint_path = (
+        _partition_file(task["checkpoint_dir"], task["partition"])
+        if task.get("checkpoint_dir")
+        else None
+    )
+    progress = (checkpoint_path and _read_json(checkpoint_path)) or {}
+    totals = {
+        "partition": task["partition"],
+        "indexed": int(progress.get("indexed", 0)),
+        "failed": int(progress.get("failed", 0)),
+        "batches": int(progress.get("batches", 0)),
+        "retries": int(progress.get("retries", 0)),
+        "last_id": progress.get("last_id"),
+        "done": False,
+    }
+
+    stmt = (
+        select(Item)
+        .where(Item.id >= task["first_id"], Item.id <= task["last_id"])
+        .order_by(Item.id)
+    )
+    if totals["last_id"]:
+        stmt = stmt.where(Item.id > totals["last_id"])
+
+    batch_size = int(task["batch_size"])
+    buffer = service.bulk_buffer(
+        task["index"],
+        max_actions=batch_size,
+        on_batch=lambda stats: SearchService._merge_bulk_stats(totals, stats),
+    )
+    chunk: List[Item] = []
+
+    def _drain() -> None:
+        if not chunk:
+            return
+        failed_before = totals["failed"]
+        released = service._latest_released_ids(chunk)
+        for entry in chunk:
+            buffer.upsert(
+                entry.id, service._build_doc(entry, is_released=entry.id in released)
+            )
+        buffer.flush()
+        if totals["failed"] > failed_before:
+            # Stop before checkpointing so a resume retries this batch.
+            raise RuntimeError(
+                f"{totals['failed'] - failed_before} document(s) failed to index "
+                f"after {totals['last_id'] or 'start'}"
+            )
+        totals["last_id"] = chunk[-1].id
+        chunk.clear()
+        if checkpoint_path:
+            _write_json(checkpoint_path, totals)
+
+    for item in service.session.execute(stmt).scalars().yield_per(batch_size):
+        chunk.append(item)
+        if len(chunk) >= batch_size:
+            _drain()
+    _drain()
+
+    totals["done"] = True
+    if checkpoint_path:
+        _write_json(checkpoint_path, totals)
+    return totals
+
+
+class SearchReindexer:
+    """Builds a fresh items index in parallel and swaps the alias onto it."""
+
+    def __init__(self, session: Session, service: Optional[SearchService] = None):
+        self.session = session
+        self.service = service or SearchService(session)
+        self.client = self.service.client
+        self.alias = self.service.index_name
+
+    def run(
+        self,
+        *,
+        partitions: int = 4,
+        workers: Optional[int] = None,
+        batch_size: int = 500,
+        checkpoint_dir: Optional[str] = None,
+        keep_previous: bool = False,
+    ) -> Dict[str, Any]:
+        if not self.client:
+            raise ValueError("Partitioned reindex requires a configured search engine.")
+        partitions = max(1, int(partitions))
+        workers = max(1, int(workers or partitions))
+
+        run = self._load_run(checkpoint_dir)
+        resumed = run is not None
+        if run is None:
+            run = self._start_run(partitions, checkpoint_dir)
+
+        tasks = self._pending_tasks(run, batch_size, checkpoint_dir)
+        results = self._run_tasks(tasks, workers)
+        summary = self._summarize(run, results, checkpoint_dir)
+        summary.update(
+            {
+                "engine": "elasticsearch",
+                "alias": self.alias,
+                "index": run["index"],
+                "partitions": len(run["partitions"]),
+                "workers": workers,
+                "resumed": resumed,
+                "swapped": False,
+            }
+        )
+        if summary["pending"] or summary["failed"]:
+            summary["ok"] = False
+            return summary
+
+        catch_up = self._catch_up(run, batch_size)
+        pruned = self._prune_deleted(run, batch_size)
+        summary["caught_up"] = catch_up["caught_up"]
+        summary["pruned"] = pruned["pruned"]
+        summary["retries"] += catch_up["retries"] + pruned["retries"]
+        if catch_up["failed"] or pruned["failed"]:
+            # Swapping now would publish an index missing those writes.
+            summary["failed"] += catch_up["failed"] + pruned["failed"]
+            summary["ok"] = False
+            return summary
+
+        previous = self._swap(run["index"])
+        summary["swapped"] = True
+        summary["previous"] = previous
+        if not keep_previous:
+            for index_name in previous:
+                self.client.indices.delete(index=index_name, ignore=[400, 404])
+        if checkpoint_dir:
+            run["status"] = "swapped"
+            _write_json(os.path.join(checkpoint_dir, _RUN_FILE), run)
+        summary["ok"] = True
+        return summary
+
+    # ========== Run state ==========
+
+    def _load_run(self, checkpoint_dir: Optional[str]) -> Optional[Dict[str, Any]]:
+        if not checkpoint_dir:
+            return None
+        run = _read_json(os.path.join(checkpoint_dir, _RUN_FILE))
+        if not run or run.get("status") == "swapped" or run.get("alias") != self.alias:
+            return None
+        if not self.client.indices.exists(index=run["index"]):
+            return None
+        logger.info("Resuming search reindex into %s", run["index"])
+        return run
+
+    def _start_run(self, partitions: int, checkpoint_dir: Optional[str]) -> Dict[str, Any]:
+        started_at = datetime.now(timezone.utc)
+        index_name = f"{self.alias}-v{started_at:%Y%m%d%H%M%S}"
+        body = dict(ITEMS_INDEX_MAPPING)
+        # No refreshes while bulk loading; restored before the swap.
+        body["settings"] = {"index": {"refresh_interval": "-1"}}
+        self.client.indices.create(index=index_name, body=body)
+        run = {
+            "alias": self.alias,
+            "index": index_name,
+            "started_at": started_at.isoformat(),
+            "status": "building",
+            "partitions": [
+                {"partition": n, "first_id": first_id, "last_id": last_id}
+                for n, (first_id, last_id) in enumerate(
+                    plan_partitions(self.session, partitions)
+                )
+            ],
+        }
+        if checkpoint_dir:
+            os.makedirs(checkpoint_dir, exist_ok=True)
+            for name in os.listdir(checkpoint_dir):
+                if name.startswith("partition-"):
+                    os.unlink(os.path.join(checkpoint_dir, name))
+            _write_json(os.path.join(checkpoint_dir, _RUN_FILE), run)
+        return run
+
+    def _pending_tasks(
+        self, run: Dict[str, Any], batch_size: int, checkpoint_dir: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        tasks = []
+        for spec in run["partitions"]:
+            if checkpoint_dir:
+                progress = _read_json(_partition_file(checkpoint_dir, spec["partition"]))
+                if progress and progress.get("done"):
+                    continue
+            tasks.append(
+                {
+                    **spec,
+                    "index": run["index"],
+                    "batch_size": batch_size,
+                    "checkpoint_dir": checkpoint_dir,
+                    "tenant_id": tenant_id_var.get(),
+                    "org_id": org_id_var.get(),
+                }
+            )
+        return tasks
+
+    def _run_tasks(
+        self, tasks: List[Dict[str, Any]], workers: int
+    ) -> Dict[int, Dict[str, Any]]:
+        results: Dict[int, Dict[str, Any]] = {}
+        if workers <= 1 or len(tasks) <= 1:
+            for task in tasks:
+                try:
+                    results[task["partition"]] = _index_range(self.service, task)
+                except Exception as exc:
+                    logger.exception("Search reindex partition %s failed", task["partition"])
+                    results[task["partition"]] = {"done": False, "error": str(exc)}
+            return results
+
+        # spawn: workers must not inherit this process's DB pool or ES client.
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(tasks)), mp_context=context
+        ) as pool:
+            futures = {pool.submit(reindex_partition, task): task for task in tasks}
+            for future, task in futures.items():
+                try:
+                    results[task["partition"]] = future.result()
+                except Exception as exc:
+                    logger.error(
+                        "Search reindex partition %s failed: %s", task["partition"], exc
+                    )
+                    results[task["partition"]] = {"done": False, "error": str(exc)}
+        return results
+
+    def _summarize(
+        self,
+        run: Dict[str, Any],
+        results: Dict[int, Dict[str, Any]],
+        checkpoint_dir: Optional[str],
+    ) -> Dict[str, Any]:
+        summary: Dict[str, Any] = {
+            "indexed": 0,
+            "failed": 0,
+            "batches": 0,
+            "retries": 0,
+            "pending": [],
+            "errors": {},
+        }
+        for spec in run["partitions"]:
+            partition = spec["partition"]
+            result = results.get(partition)
+            if result is None and checkpoint_dir:
+                result = _read_json(_partition_file(checkpoint_dir, partition))
+            result = result or {}
+            for key in ("indexed", "failed", "batches", "retries"):
+                summary[key] += int(result.get(key, 0))
+            if not result.get("done"):
+                summary["pending"].append(partition)
+            if result.get("error"):
+                summary["errors"][str(partition)] = result["error"]
+        return summary
+
+    # ========== Finish ==========
+
+    def _catch_up(self, run: Dict[str, Any], batch_size: int) -> Dict[str, int]:
+        """Re-index items written while the ranges were being built.
+
+        Returns the number of items sent (``caught_up``) with the bulk outcome
+        counters of every batch, including the final flush.
+        """
+        since = datetime.fromisoformat(run["started_at"]) - _CATCH_UP_MARGIN
+        stmt = (
+            select(Item)
+            .where(or_(Item.updated_at >= since, Item.created_at >= since))
+            .order_by(Item.id)
+        )
+        totals = {"caught_up": 0, "indexed": 0, "failed": 0, "batches": 0, "retries": 0}
+        buffer = self.service.bulk_buffer(
+            run["index"],
+            max_actions=batch_size,
+            on_batch=lambda stats: SearchService._merge_bulk_stats(totals, stats),
+        )
+        chunk: List[Item] = []
+
+        def _drain() -> None:
+            released = self.service._latest_released_ids(chunk)
+            for entry in chunk:
+                buffer.upsert(
+                    entry.id,
+                    self.service._build_doc(entry, is_released=entry.id in released),
+                )
+            chunk.clear()
+
+        for item in self.session.execute(stmt).scalars().yield_per(batch_size):
+            chunk.append(item)
+            totals["caught_up"] += 1
+            if len(chunk) >= batch_size:
+                _drain()
+        _drain()
+        buffer.flush()
+        return totals
+
+    def _prune_deleted(self, run: Dict[str, Any], batch_size: int) -> Dict[str, int]:
+        """Delete documents of items removed while the ranges were being built."""
+        totals = {"pruned": 0, "indexed": 0, "failed": 0, "batches": 0, "retries": 0}
+        buffer = self.service.bulk_buffer(
+            run["index"],
+            max_actions=batch_size,
+            on_batch=lambda stats: SearchService._merge_bulk_stats(totals, stats),
+        )
+        # refresh_interval is off while building; make every document visible.
+        self.client.indices.refresh(index=run["index"])
+        body: Dict[str, Any] = {
+            "query": {"match_all": {}},
+            "_source": False,
+            "sort": [{"id": "asc"}],
+            "size": batch_size,
+        }
+        while True:
+            response = self.client.search(index=run["index"], body=body)
+            hits = (getattr(response, "body", response) or {})["hits"]["hits"]
+            if not hits:
+                break
+            doc_ids = [hit["_id"] for hit in hits]
+            existing = set()
+            for part in chunks(doc_ids):
+                existing.update(
+                    self.session.execute(select(Item.id).where(Item.id.in_(part))).scalars()
+                )
+            for doc_id in doc_ids:
+                if doc_id not in existing:
+                    buffer.delete(doc_id)
+                    totals["pruned"] += 1
+            body["search_after"] = hits[-1]["sort"]
+        buffer.flush()
+        return totals
+
+    def _swap(self, index_name: str) -> List[str]:
+        """Point the alias at ``index_name`` atomically; returns what it replaced."""
+        self.client.indices.put_settings(
+            index=index_name, body={"index": {"refresh_interval": None}}
+        )
+        self.client.indices.refresh(index=index_name)
+
+        actions: List[Dict[str, Any]] = [
+            {"add": {"index": index_name, "alias": self.alias}}
+        ]
+        previous: List[str] = []
+        if self.client.indices.exists_alias(name=self.alias):
+            previous = [
+                name for name in self.service.aliased_indices() if name != index_name
+            ]
+            actions.extend(
+                {"remove": {"index": name, "alias": self.alias}} for name in previous
+            )
+        elif self.client.indices.exists(index=self.alias):
+            # Pre-alias deployments: the live index itself carries the name.
+            actions.append({"remove_index": {"index": self.alias}})
+        self.client.indices.update_aliases(actions=actions)
+        logger.info("Search alias %s now points at %s", self.alias, index_name)
+        return previous
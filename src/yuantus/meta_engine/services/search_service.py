@@ -7,7 +7,7 @@ Phase 9: Advanced Search
 import json
 import logging
 from datetime import datetime, time, timedelta, timezone
-from typing import Dict, Any, Optional, Iterable
+from typing import Callable, Dict, Any, List, Optional, Iterable, Set
 
 from sqlalchemy import String, cast, func, or_, select
 from sqlalchemy.orm import Session
@@ -21,10 +21,55 @@ except ImportError:
 from yuantus.config import get_settings
 from yuantus.meta_engine.models.eco import ECO
 from yuantus.meta_engine.models.item import Item
+from yuantus.meta_engine.models.item_search import ItemSearchText
 from yuantus.meta_engine.services.item_number_keys import get_item_number
+from yuantus.meta_engine.services.item_search_index_service import (
+    ItemSearchIndexService,
+)
+from yuantus.meta_engine.services.search_bulk import BulkIndexBuffer
 
 logger = logging.getLogger(__name__)
 
+COUNT_MODES = ("exact", "estimate", "none")
+# "estimate" on dialects without planner estimates counts at most this many rows.
+_ESTIMATE_COUNT_CAP = 1000
+
+# Items index mapping; shared with the partitioned rebuild in search_reindex.
+ITEMS_INDEX_MAPPING: Dict[str, Any] = {
+    "mappings": {
+        "properties": {
+            "id": {"type": "keyword"},
+            "item_type_id": {"type": "keyword"},
+            "config_id": {"type": "keyword"},
+            "state": {"type": "keyword"},
+            "item_number": {"type": "keyword"},
+            "name": {"type": "text"},
+            "description": {"type": "text"},
+            "search_text": {"type": "text"},
+            # Dynamic properties field (flattened or object)
+            # Here we use 'properties' as an object with dynamic templates
+            "properties": {"type": "object", "dynamic": True},
+            "created_at": {"type": "date"},
+            "updated_at": {"type": "date"},
+        }
+    }
+}
+
+
+def planner_row_estimate(session: Session, stmt) -> int:
+    """Row count the PostgreSQL planner expects for ``stmt`` (EXPLAIN only)."""
+    connection = session.connection()
+    # Expand IN() parameters now; exec_driver_sql sends the text verbatim.
+    compiled = stmt.compile(
+        dialect=connection.dialect, compile_kwargs={"render_postcompile": True}
+    )
+    plan = connection.exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+    ).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
 
 class SearchService:
     def __init__(self, session: Optional[Session] = None):
@@ -58,29 +103,16 @@ class SearchService:
             return
 
         if not self.client.indices.exists(index=self.index_name):
-            # Define mapping for dynamic properties
-            mapping = {
-                "mappings": {
-                    "properties": {
-                        "id": {"type": "keyword"},
-                        "item_type_id": {"type": "keyword"},
-                        "config_id": {"type": "keyword"},
-                        "state": {"type": "keyword"},
-                        "item_number": {"type": "keyword"},
-                        "name": {"type": "text"},
-                        "description": {"type": "text"},
-                        "search_text": {"type": "text"},
-                        # Dynamic properties field (flattened or object)
-                        # Here we use 'properties' as an object with dynamic templates
-                        "properties": {"type": "object", "dynamic": True},
-                        "created_at": {"type": "date"},
-                        "updated_at": {"type": "date"},
-                    }
-                }
-            }
-            self.client.indices.create(index=self.index_name, body=mapping)
+            self.client.indices.create(index=self.index_name, body=ITEMS_INDEX_MAPPING)
             logger.info(f"Created search index: {self.index_name}")
 
+    def aliased_indices(self) -> List[str]:
+        """Concrete indices behind the ``index_name`` alias (empty if no alias)."""
+        if not self.client or not self.client.indices.exists_alias(name=self.index_name):
+            return []
+        current = self.client.indices.get_alias(name=self.index_name)
+        return sorted(getattr(current, "body", current) or {})
+
     def ensure_eco_index(self) -> None:
         """Creates the ECO index with mappings if it doesn't exist."""
         if not self.client:
@@ -130,6 +162,33 @@ class SearchService:
     def eco_status(self) -> Dict[str, Any]:
         return self._index_status(self.eco_index_name)
 
+    def bulk_buffer(
+        self,
+        index_name: Optional[str] = None,
+        *,
+        max_actions: Optional[int] = None,
+        on_batch: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> BulkIndexBuffer:
+        """Bulk buffer bound to this client (items index unless given)."""
+        settings = get_settings()
+        return BulkIndexBuffer(
+            self.client,
+            index_name or self.index_name,
+            max_actions=max_actions or settings.SEARCH_BULK_MAX_ACTIONS,
+            max_bytes=settings.SEARCH_BULK_MAX_BYTES,
+            flush_interval=settings.SEARCH_BULK_FLUSH_INTERVAL_MS / 1000.0,
+            max_retries=settings.SEARCH_BULK_MAX_RETRIES,
+            on_batch=on_batch,
+        )
+
+    @staticmethod
+    def _merge_bulk_stats(totals: Dict[str, int], stats: Optional[Dict[str, Any]]) -> None:
+        if not stats:
+            return
+        totals["batches"] += 1
+        for key in ("indexed", "failed", "retries"):
+            totals[key] += stats.get(key, 0)
+
     def reindex_items(
         self,
         *,
@@ -142,6 +201,18 @@ class SearchService:
             raise ValueError("SearchService requires a session for reindex.")
 
         if not self.client:
+            index = ItemSearchIndexService(self.session)
+            if index.enabled() and item_type_id is None and limit is None:
+                rebuilt = index.rebuild(batch_size=batch_size)
+                return {
+                    "ok": True,
+                    "engine": "db",
+                    "index": ItemSearchText.__tablename__,
+                    "indexed": rebuilt["items"],
+                    "reset": True,
+                    "item_type_id": item_type_id,
+                    "note": "db-index",
+                }
             count_stmt = select(func.count()).select_from(Item)
             if item_type_id:
                 count_stmt = count_stmt.where(Item.item_type_id == item_type_id)
@@ -158,7 +229,10 @@ class SearchService:
 
         if reset:
             try:
-                self.client.indices.delete(index=self.index_name, ignore=[400, 404])
+                # Behind an alias (partitioned rebuilds) delete the concrete
+                # indices; ES refuses to delete an index through its alias.
+                for index_name in self.aliased_indices() or [self.index_name]:
+                    self.client.indices.delete(index=index_name, ignore=[400, 404])
             except Exception as exc:
                 logger.warning("Search index delete failed: %s", exc)
 
@@ -170,20 +244,40 @@ class SearchService:
         if limit:
             stmt = stmt.limit(limit)
 
-        indexed = 0
+        totals = {"batches": 0, "indexed": 0, "failed": 0, "retries": 0}
+        buffer = self.bulk_buffer(
+            max_actions=batch_size,
+            on_batch=lambda stats: self._merge_bulk_stats(totals, stats),
+        )
+        chunk: List[Item] = []
+
+        def _drain() -> None:
+            released = self._latest_released_ids(chunk)
+            for entry in chunk:
+                buffer.upsert(
+                    entry.id, self._build_doc(entry, is_released=entry.id in released)
+                )
+            chunk.clear()
+
         for item in (
             self.session.execute(stmt)
             .scalars()
             .yield_per(batch_size)
         ):
-            self.index_item(item)
-            indexed += 1
+            chunk.append(item)
+            if len(chunk) >= batch_size:
+                _drain()
+        _drain()
+        buffer.flush()
 
         return {
-            "ok": True,
+            "ok": totals["failed"] == 0,
             "engine": "elasticsearch",
             "index": self.index_name,
-            "indexed": indexed,
+            "indexed": totals["indexed"],
+            "failed": totals["failed"],
+            "batches": totals["batches"],
+            "retries": totals["retries"],
             "reset": reset,
             "item_type_id": item_type_id,
         }
@@ -228,20 +322,28 @@ class SearchService:
         if limit:
             stmt = stmt.limit(limit)
 
-        indexed = 0
+        totals = {"batches": 0, "indexed": 0, "failed": 0, "retries": 0}
+        buffer = self.bulk_buffer(
+            self.eco_index_name,
+            max_actions=batch_size,
+            on_batch=lambda stats: self._merge_bulk_stats(totals, stats),
+        )
         for eco in (
             self.session.execute(stmt)
             .scalars()
             .yield_per(batch_size)
         ):
-            self.index_eco(eco)
-            indexed += 1
+            buffer.upsert(eco.id, self._eco_to_doc(eco))
+        buffer.flush()
 
         return {
-            "ok": True,
+            "ok": totals["failed"] == 0,
             "engine": "elasticsearch",
             "index": self.eco_index_name,
-            "indexed": indexed,
+            "indexed": totals["indexed"],
+            "failed": totals["failed"],
+            "batches": totals["batches"],
+            "retries": totals["retries"],
             "reset": reset,
             "state": state,
         }
@@ -276,7 +378,8 @@ class SearchService:
         except TypeError:
             return str(value)
 
-    def _build_search_text(self, props: Dict[str, Any]) -> str:
+    @classmethod
+    def _build_search_text(cls, props: Dict[str, Any]) -> str:
         preferred_keys = (
             "item_number",
             "name",
@@ -292,13 +395,13 @@ class SearchService:
         for key in preferred_keys:
             if key not in props:
                 continue
-            text = self._normalize_value(props.get(key))
+            text = cls._normalize_value(props.get(key))
             if text and text not in seen:
                 seen.add(text)
                 chunks.append(text)
 
-        for value in self._iter_values(props):
-            text = self._normalize_value(value)
+        for value in cls._iter_values(props):
+            text = cls._normalize_value(value)
             if text and text not in seen:
                 seen.add(text)
                 chunks.append(text)
@@ -306,8 +409,12 @@ class SearchService:
         search_text = " ".join(chunks)
         return search_text[:4000]
 
-    def _build_doc(self, item: Item) -> Dict[str, Any]:
+    def _build_doc(
+        self, item: Item, *, is_released: Optional[bool] = None
+    ) -> Dict[str, Any]:
         props = item.properties or {}
+        if is_released is None:
+            is_released = self._item_is_latest_released(item)
         return {
             "id": item.id,
             "item_type_id": item.item_type_id,
@@ -323,7 +430,7 @@ class SearchService:
             "is_current": bool(getattr(item, "is_current", False)),
             # WP3.4 C2: the "latest released face" signal -- a current item whose current
             # version is released (matches LatestReleasedGuardService semantics).
-            "is_released": self._item_is_latest_released(item),
+            "is_released": is_released,
         }
 
     def _item_is_latest_released(self, item: Item) -> bool:
@@ -341,6 +448,34 @@ class SearchService:
         version = self.session.get(ItemVersion, item.current_version_id)
         return bool(version and version.is_released and version.is_current)
 
+    def _latest_released_ids(self, items: List[Item]) -> Set[str]:
+        """Batch form of ``_item_is_latest_released`` (one version query)."""
+        candidates = {
+            item.current_version_id: item.id
+            for item in items
+            if getattr(item, "is_current", False) and item.current_version_id
+        }
+        if not candidates or not self.session:
+            return set()
+        from yuantus.meta_engine.version.models import ItemVersion
+
+        rows = self.session.execute(
+            select(ItemVersion.id).where(
+                ItemVersion.id.in_(list(candidates)),
+                ItemVersion.is_released.is_(True),
+                ItemVersion.is_current.is_(True),
+            )
+        ).scalars()
+        return {candidates[version_id] for version_id in rows}
+
+    def build_item_documents(self, items: List[Item]) -> Dict[str, Dict[str, Any]]:
+        """``{item_id: document}`` for ``items`` with batched release lookups."""
+        released = self._latest_released_ids(items)
+        return {
+            item.id: self._build_doc(item, is_released=item.id in released)
+            for item in items
+        }
+
     def index_item(self, item: Item):
         """Index or update an item document."""
         if not self.client:
@@ -393,19 +528,25 @@ class SearchService:
         filters: Dict[str, Any] = None,
         limit: int = 20,
         released_only: bool = False,
+        count_mode: str = "exact",
     ) -> Dict[str, Any]:
         """
         Execute a search query.
         Args:
             query_string: Full-text search string.
             filters: Dictionary of exact match filters (e.g. {'item_type_id': 'Part'}).
+            count_mode: "exact", "estimate" (planner/capped count) or "none".
+                Non-exact totals carry ``total_relation`` ("eq"/"gte"/"estimate").
         """
+        if count_mode not in COUNT_MODES:
+            raise ValueError(f"count_mode must be one of {', '.join(COUNT_MODES)}")
         if not self.client:
             return self._search_fallback_db(
                 query_string=query_string,
                 filters=filters or {},
                 limit=limit,
                 released_only=released_only,
+                count_mode=count_mode,
             )
 
         # Build Query DSL
@@ -443,12 +584,24 @@ class SearchService:
             must_clauses.append({"term": {"is_released": True}})
 
         body = {"query": {"bool": {"must": must_clauses}}, "size": limit}
+        if count_mode == "none":
+            body["track_total_hits"] = False
 
         try:
             response = self.client.search(index=self.index_name, body=body)
             hits = response["hits"]["hits"]
+            if count_mode == "exact":
+                return {
+                    "total": response["hits"]["total"]["value"],
+                    "hits": [h["_source"] for h in hits],
+                }
+            total = response["hits"].get("total") or {
+                "value": len(hits),
+                "relation": "gte",
+            }
             return {
-                "total": response["hits"]["total"]["value"],
+                "total": total["value"],
+                "total_relation": total.get("relation", "eq"),
                 "hits": [h["_source"] for h in hits],
             }
         except Exception as e:
@@ -462,6 +615,7 @@ class SearchService:
                     filters=filters or {},
                     limit=limit,
                     released_only=released_only,
+                    count_mode=count_mode,
                 )
             raise
 
@@ -472,11 +626,15 @@ class SearchService:
         filters: Dict[str, Any],
         limit: int,
         released_only: bool = False,
+        count_mode: str = "exact",
     ) -> Dict[str, Any]:
         """
         DB fallback for local/dev environments without Elasticsearch.
 
         Returns the same shape as the ES implementation: {'hits': [...], 'total': N}.
+        With ``SEARCH_DB_INDEX_ENABLED`` the text match goes through the
+        ``meta_item_search`` full-text index and hits are ranked; otherwise it is
+        the best-effort ILIKE scan.
         """
         if not self.session:
             return {"hits": [], "total": 0}
@@ -500,8 +658,16 @@ class SearchService:
             else:
                 stmt = stmt.where(cast(json_expr, String) == str(value))
 
-        # Simple full-text-ish matching (best-effort; not meant to replace ES)
+        matches = None
         if query_string:
+            index = ItemSearchIndexService(self.session)
+            if index.enabled():
+                matches = index.matches(query_string)
+
+        if matches is not None:
+            stmt = stmt.join(matches, matches.c.item_id == Item.id)
+        elif query_string:
+            # Simple full-text-ish matching (best-effort; not meant to replace ES)
             like = f"%{query_string}%"
             stmt = stmt.where(
                 or_(
@@ -525,12 +691,33 @@ class SearchService:
                 Item.current_version_id.in_(released_version_ids),
             )
 
-        count_stmt = select(func.count()).select_from(stmt.subquery())
-        total = self.session.execute(count_stmt).scalar() or 0
+        total, relation = self._count_db(stmt, count_mode)
 
-        items = self.session.execute(stmt.limit(limit)).scalars().all()
+        page = stmt.limit(limit)
+        if matches is not None:
+            page = page.order_by(matches.c.rank.desc(), Item.id)
+        items = self.session.execute(page).scalars().all()
         hits = [self._item_to_doc(item) for item in items]
-        return {"hits": hits, "total": total}
+        if count_mode == "exact":
+            return {"hits": hits, "total": total}
+        if total is None:
+            total = len(hits)
+            relation = "gte" if len(hits) >= limit else "eq"
+        return {"hits": hits, "total": total, "total_relation": relation}
+
+    def _count_db(self, stmt, count_mode: str):
+        """``(total, relation)`` for the fallback query per ``count_mode``."""
+        if count_mode == "none":
+            return None, None
+        if count_mode == "estimate":
+            if self.session.get_bind().dialect.name == "postgresql":
+                return planner_row_estimate(self.session, stmt), "estimate"
+            capped = stmt.limit(_ESTIMATE_COUNT_CAP)
+            count_stmt = select(func.count()).select_from(capped.subquery())
+            total = self.session.execute(count_stmt).scalar() or 0
+            return total, "gte" if total >= _ESTIMATE_COUNT_CAP else "eq"
+        count_stmt = select(func.count()).select_from(stmt.subquery())
+        return self.session.execute(count_stmt).scalar() or 0, "eq"
 
     def search_ecos(
         self, query_string: str, *, state: Optional[str] = None, limit: int = 20
@@ -0,0 +1,52 @@
+"""Small SQL helpers shared by the meta-engine services."""
+
+from __future__ import annotations
+
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+from yuantus.context import org_id_var, tenant_id_var
+
+T = TypeVar("T")
+
+IN_CHUNK = 500  # keep the IN() clause well under SQLite's parameter cap
+
+# A missing table is looked up again after this long, so a migration applied
+# to a running process is picked up without a restart.
+MISSING_TABLE_RECHECK_SECONDS = 30.0
+
+ScopeKey = Tuple[str, Optional[str], Optional[str]]
+TableKey = Tuple[str, Optional[str], Optional[str], str]
+_PRESENT = float("inf")
+_TABLE_PRESENT: Dict[TableKey, float] = {}  # _PRESENT, or missing until (monotonic)
+
+
+def chunks(seq: Sequence[T], size: int = IN_CHUNK) -> Iterable[List[T]]:
+    """Consecutive slices of ``seq`` sized for an ``IN()`` clause."""
+    for i in range(0, len(seq), size):
+        yield list(seq[i : i + size])
+
+
+def session_scope_key(session: Session) -> ScopeKey:
+    """Cache key of the database/schema ``session`` reads in this request."""
+    bind = session.get_bind()
+    engine = getattr(bind, "engine", bind)
+    # schema-per-tenant shares one URL, so the request scope is part of the key.
+    return (str(engine.url), tenant_id_var.get(), org_id_var.get())
+
+
+def table_present(session: Session, table_name: str) -> bool:
+    """Whether ``table_name`` exists in the session's tenant database/schema."""
+    key = (*session_scope_key(session), table_name)
+    now = time.monotonic()
+    cached = _TABLE_PRESENT.get(key)
+    if cached is not None and cached > now:
+        return cached == _PRESENT
+
+    # The session's connection carries the tenant search_path.
+    present = inspect(session.connection()).has_table(table_name)
+    _TABLE_PRESENT[key] = _PRESENT if present else now + MISSING_TABLE_RECHECK_SECONDS
+    return present
@@ -18,6 +18,7 @@ from yuantus.meta_engine.models.meta_schema import ItemType
 from yuantus.meta_engine.services.latest_released_guard import assert_latest_released
 from yuantus.meta_engine.services.suspended_guard import assert_not_suspended
 from yuantus.meta_engine.services.engine import AMLEngine
+from yuantus.meta_engine.services.sql_helpers import IN_CHUNK, chunks
 from yuantus.security.rbac.permissions import (
     PermissionManager as MetaPermissionService,
 )
@@ -134,27 +135,66 @@ class SubstituteService:
             # Fetch details of the substitute part
             part = self.session.get(Item, sub.related_id)
             if part:
-                part_data = part.to_dict()
-                part_props = part.properties or {}
-                part_number = part_props.get("item_number") or part_props.get("number")
-                sub_dict = sub.to_dict()
-                sub_props = sub.properties or {}
-                # Include properties in relationship dict for backward compatibility
-                sub_dict["properties"] = sub_props
-                # Return format supporting both test expectations
-                result.append(
-                    {
-                        "id": sub.id,
-                        "substitute_part": part_data,  # For test_substitutes.py
-                        "rank": sub_props.get("rank"),  # For test_substitutes.py
-                        "relationship": sub_dict,  # For test_substitute_management.py
-                        "part": part_data,  # Keep for backwards compatibility
-                        "substitute_number": part_number,
-                        "substitute_name": part_props.get("name"),
-                    }
-                )
+                result.append(self._format_bom_substitute(sub, part))
         return result
 
+    def load_bom_substitute_rows(
+        self, bom_line_ids: List[str], chunk_size: int = IN_CHUNK
+    ) -> Dict[str, List[tuple]]:
+        """
+        Batch-load substitutes for many BOM lines.
+
+        Returns ``{bom_line_id: [(substitute_rel, part), ...]}`` using one
+        relationship query and one part query per chunk of line ids. Callers
+        format each occurrence with ``_format_bom_substitute`` so the output is
+        identical to ``get_bom_substitutes``.
+        """
+        line_ids = list(dict.fromkeys(i for i in bom_line_ids if i))
+        rows: Dict[str, List[tuple]] = {line_id: [] for line_id in line_ids}
+        subs: List[Item] = []
+        for chunk in chunks(line_ids, chunk_size):
+            subs.extend(
+                self.session.query(Item)
+                .filter(
+                    Item.item_type_id == "Part BOM Substitute",
+                    Item.source_id.in_(chunk),
+                    Item.is_current.is_(True),
+                )
+                .all()
+            )
+
+        part_ids = list(dict.fromkeys(s.related_id for s in subs if s.related_id))
+        parts: Dict[str, Item] = {}
+        for chunk in chunks(part_ids, chunk_size):
+            for part in self.session.query(Item).filter(Item.id.in_(chunk)).all():
+                parts[part.id] = part
+
+        for sub in subs:
+            part = parts.get(sub.related_id)
+            if part:
+                rows[sub.source_id].append((sub, part))
+        return rows
+
+    @staticmethod
+    def _format_bom_substitute(sub: Item, part: Item) -> Dict[str, Any]:
+        part_data = part.to_dict()
+        part_props = part.properties or {}
+        part_number = part_props.get("item_number") or part_props.get("number")
+        sub_dict = sub.to_dict()
+        sub_props = sub.properties or {}
+        # Include properties in relationship dict for backward compatibility
+        sub_dict["properties"] = sub_props
+        # Return format supporting both test expectations
+        return {
+            "id": sub.id,
+            "substitute_part": part_data,  # For test_substitutes.py
+            "rank": sub_props.get("rank"),  # For test_substitutes.py
+            "relationship": sub_dict,  # For test_substitute_management.py
+            "part": part_data,  # Keep for backwards compatibility
+            "substitute_number": part_number,
+            "substitute_name": part_props.get("name"),
+        }
+
     # Method aliases for backward compatibility with tests
     def add_bom_substitute(
         self,
@@ -3,13 +3,18 @@ Local Storage Provider
 Implements StorageProvider for local filesystem storage.
 """
 
+import hashlib
 import os
 import shutil
 from pathlib import Path
-from typing import BinaryIO, Dict, Any, Optional, List
+from typing import BinaryIO, Dict, Any, Iterator, Optional, List
 import uuid  # Import uuid
 
-from yuantus.meta_engine.storage.storage_interface import StorageProvider
+from yuantus.meta_engine.storage.storage_interface import (
+    DEFAULT_STREAM_CHUNK_SIZE,
+    StorageProvider,
+    _read_range,
+)
 from yuantus.config.settings import Settings  # Import Settings
 
 
@@ -60,6 +65,30 @@ class LocalStorageProvider(StorageProvider):
     def file_exists(self, file_path: str) -> bool:
         return self._full_path(file_path).exists()
 
+    def get_file_info(self, file_path: str) -> Optional[Dict[str, Any]]:
+        try:
+            st = self._full_path(file_path).stat()
+        except FileNotFoundError:
+            return None
+        # Same validator as starlette's FileResponse, so both paths agree.
+        etag_base = f"{st.st_mtime}-{st.st_size}"
+        etag = hashlib.md5(etag_base.encode(), usedforsecurity=False).hexdigest()
+        return {"size": st.st_size, "etag": f'"{etag}"', "last_modified": st.st_mtime}
+
+    def iter_file(
+        self,
+        file_path: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        full_path = self._full_path(file_path)
+        if not full_path.exists():
+            raise FileNotFoundError(f"File not found: {full_path}")
+        with open(full_path, "rb") as f:
+            f.seek(start)
+            yield from _read_range(f, start, end, chunk_size)
+
     def get_presigned_url(
         self, file_path: str, expiration: int = 3600, http_method: str = "GET"
     ) -> str:
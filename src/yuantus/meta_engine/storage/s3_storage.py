@@ -4,7 +4,7 @@ Implements StorageProvider for AWS S3 compatible storage (e.g., MinIO).
 """
 
 import logging
-from typing import BinaryIO, Dict, Any, Optional, List
+from typing import BinaryIO, Dict, Any, Iterator, Optional, List
 
 # Optional boto3 dependency for S3 storage
 try:
@@ -17,7 +17,10 @@ except ImportError:
     ClientError = Exception  # type: ignore
     _BOTO3_AVAILABLE = False
 
-from yuantus.meta_engine.storage.storage_interface import StorageProvider
+from yuantus.meta_engine.storage.storage_interface import (
+    DEFAULT_STREAM_CHUNK_SIZE,
+    StorageProvider,
+)
 from yuantus.config.settings import Settings  # Import Settings
 
 logger = logging.getLogger(__name__)  # Initialize logger
@@ -103,6 +106,41 @@ class S3StorageProvider(StorageProvider):
             logger.error(f"Error checking existence of {file_path} in S3: {e}")
             raise
 
+    def get_file_info(self, file_path: str) -> Optional[Dict[str, Any]]:
+        try:
+            head = self.s3_client.head_object(Bucket=self.bucket_name, Key=file_path)
+        except ClientError as e:
+            if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+                return None
+            logger.error(f"Failed to stat {file_path} in S3: {e}")
+            raise
+        last_modified = head.get("LastModified")
+        return {
+            "size": int(head.get("ContentLength") or 0),
+            "etag": head.get("ETag"),
+            "last_modified": last_modified.timestamp() if last_modified else None,
+        }
+
+    def iter_file(
+        self,
+        file_path: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        params: Dict[str, Any] = {"Bucket": self.bucket_name, "Key": file_path}
+        if start or end is not None:
+            params["Range"] = f"bytes={start}-{'' if end is None else end}"
+        try:
+            body = self.s3_client.get_object(**params)["Body"]
+        except ClientError as e:
+            logger.error(f"Failed to read {file_path} from S3: {e}")
+            raise
+        try:
+            yield from body.iter_chunks(chunk_size)
+        finally:
+            body.close()
+
     def get_presigned_url(
         self, file_path: str, expiration: int = 3600, http_method: str = "GET"
     ) -> str:
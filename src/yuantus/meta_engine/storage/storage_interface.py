@@ -3,8 +3,11 @@ Storage Service Interface
 Abstract base class for different storage providers.
 """
 
+import tempfile
 from abc import ABC, abstractmethod
-from typing import BinaryIO, Dict, Any, Optional, List  # Added List
+from typing import BinaryIO, Dict, Any, Iterator, Optional, List  # Added List
+
+DEFAULT_STREAM_CHUNK_SIZE = 1024 * 1024
 
 
 class StorageProvider(ABC):
@@ -109,9 +112,49 @@ class StorageProvider(ABC):
         """
         pass
 
+    def get_file_info(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Size and cache validators of a stored file, without reading it.
+        Returns:
+            {"size": int, "etag": str (quoted), "last_modified": float (epoch)},
+            or None when the provider cannot tell.
+        """
+        return None
+
+    def iter_file(
+        self,
+        file_path: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+    ) -> Iterator[bytes]:
+        """
+        Yields the file, or the inclusive byte range start..end, in chunks.
+        The default spools download_file() through a temporary file so memory
+        stays bounded; providers override it with a native ranged read.
+        """
+        with tempfile.SpooledTemporaryFile(max_size=chunk_size) as spool:
+            self.download_file(file_path, spool)
+            spool.seek(start)
+            yield from _read_range(spool, start, end, chunk_size)
+
     def get_local_path(self, file_path: str) -> Optional[str]:
         """
         Returns local filesystem path if applicable.
         Returns None if storage is not local (e.g. S3).
         """
         return None
+
+
+def _read_range(
+    file_obj: BinaryIO, start: int, end: Optional[int], chunk_size: int
+) -> Iterator[bytes]:
+    remaining = None if end is None else end - start + 1
+    while remaining is None or remaining > 0:
+        size = chunk_size if remaining is None else min(chunk_size, remaining)
+        chunk = file_obj.read(size)
+        if not chunk:
+            return
+        if remaining is not None:
+            remaining -= len(chunk)
+        yield chunk
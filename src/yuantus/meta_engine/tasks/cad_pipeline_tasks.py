@@ -33,6 +33,9 @@ from yuantus.meta_engine.services.cadgf_converter_service import (
     CADGFConverterService,
     CadgfConversionError,
 )
+from yuantus.meta_engine.services.cad_artifact_cache_service import (
+    CadArtifactCacheService,
+)
 from yuantus.meta_engine.services.cad_backend_profile_service import (
     CadBackendProfileService,
 )
@@ -350,6 +353,96 @@ def _call_cad_connector_convert(
         raise JobFatalError("CAD connector returned invalid payload")
     return resp
 
+
+# FileContainer fields a preview/geometry run derives; linked as-is on a hit.
+_CAD_ARTIFACT_FIELDS = {
+    "preview": ("preview_path",),
+    "geometry": (
+        "geometry_path",
+        "cad_manifest_path",
+        "cad_document_path",
+        "cad_metadata_path",
+        "cad_document_schema_version",
+    ),
+}
+
+
+def _cad_artifact_scope(
+    kind: str,
+    file_container: FileContainer,
+    session: Session,
+    **params: Any,
+) -> tuple[str, Dict[str, Any]]:
+    """Converter backend and inputs that, with the checksum, determine the output."""
+    settings = get_settings()
+    ext = (file_container.get_extension() or "").lower()
+    scope_params: Dict[str, Any] = {
+        "ext": ext,
+        "document_type": file_container.document_type,
+        "cad_format": file_container.cad_format,
+        "cad_connector_id": file_container.cad_connector_id,
+        **params,
+    }
+    if kind == "extract":
+        # Mirrors CadService.extract_attributes_for_file backend selection.
+        connector_mode = (settings.CAD_CONNECTOR_MODE or "optional").strip().lower()
+        backends = []
+        if settings.CAD_CONNECTOR_BASE_URL and connector_mode != "disabled":
+            backends.append("connector")
+        if settings.CAD_EXTRACTOR_BASE_URL:
+            backends.append("extractor")
+        return "+".join(backends) or "local", scope_params
+
+    profile = _cad_backend_profile_resolution(session)["effective"]
+    if kind == "bom":
+        return f"{profile}:connector", scope_params
+    connector = (
+        _cad_connector_enabled_for_file(file_container, session=session)
+        and file_container.document_type == "3d"
+    )
+    if kind == "geometry":
+        connector = connector and ext not in {"dwg", "dxf"}
+    if kind == "preview":
+        scope_params["render_service"] = bool(settings.RENDER_SERVICE_BASE_URL)
+        scope_params["cad_ml"] = bool(settings.CAD_ML_BASE_URL)
+    return f"{profile}:{'connector' if connector else 'local'}", scope_params
+
+
+def _cad_artifact_lookup(
+    cache: CadArtifactCacheService,
+    kind: str,
+    file_container: FileContainer,
+    session: Session,
+    **params: Any,
+) -> tuple[Optional[Dict[str, Any]], Optional[tuple[str, Dict[str, Any]]]]:
+    """Returns (cached artifacts, scope); scope is None when caching is off."""
+    if not cache.enabled() or not file_container.checksum:
+        return None, None
+    scope = _cad_artifact_scope(kind, file_container, session, **params)
+    return cache.lookup(file_container, kind, *scope), scope
+
+
+def _cad_artifact_store(
+    cache: CadArtifactCacheService,
+    kind: str,
+    file_container: FileContainer,
+    scope: Optional[tuple[str, Dict[str, Any]]],
+    artifacts: Optional[Dict[str, Any]] = None,
+) -> None:
+    if scope is None:
+        return
+    if artifacts is None:
+        artifacts = {
+            field: getattr(file_container, field)
+            for field in _CAD_ARTIFACT_FIELDS[kind]
+            if getattr(file_container, field) is not None
+        }
+    if not artifacts:
+        return
+    backend, params = scope
+    cache.store(file_container, kind, backend, artifacts, params)
+
+
 def _is_missing_storage_error(exc: Exception) -> bool:
     if isinstance(exc, FileNotFoundError):
         return True
@@ -729,6 +822,25 @@ def cad_preview(payload: Dict[str, Any], session: Session) -> Dict[str, Any]:
     vault_base_path = _vault_base_path()
     _require_connector_for_remote_3d(file_container, operation="preview", session=session)
 
+    artifact_cache = CadArtifactCacheService(session, file_service)
+    cached, cache_scope = _cad_artifact_lookup(
+        artifact_cache, "preview", file_container, session
+    )
+    if cached is not None:
+        artifact_cache.link(file_container, cached)
+        file_container.preview_data = None
+        if file_container.conversion_status:
+            file_container.conversion_status = ConversionStatus.COMPLETED.value
+        session.add(file_container)
+        session.flush()
+        return {
+            "ok": True,
+            "file_id": file_container.id,
+            "preview_path": file_container.preview_path,
+            "preview_url": f"/api/v1/file/{file_container.id}/preview",
+            "source": "cache",
+        }
+
     if (
         _cad_connector_enabled_for_file(file_container, session=session)
         and file_container.document_type == "3d"
@@ -754,6 +866,7 @@ def cad_preview(payload: Dict[str, Any], session: Session) -> Dict[str, Any]:
                 file_container.conversion_status = ConversionStatus.COMPLETED.value
                 session.add(file_container)
                 session.flush()
+                _cad_artifact_store(artifact_cache, "preview", file_container, cache_scope)
                 return {
                     "ok": True,
                     "file_id": file_container.id,
@@ -867,6 +980,7 @@ def cad_preview(payload: Dict[str, Any], session: Session) -> Dict[str, Any]:
             file_container.conversion_status = ConversionStatus.COMPLETED.value
         session.add(file_container)
         session.flush()
+        _cad_artifact_store(artifact_cache, "preview", file_container, cache_scope)
 
         return {
             "ok": True,
@@ -925,6 +1039,41 @@ def cad_geometry(payload: Dict[str, Any], session: Session) -> Dict[str, Any]:
 
     _require_connector_for_remote_3d(file_container, operation="geometry", session=session)
 
+    artifact_cache = CadArtifactCacheService(session, file_service)
+    cached, cache_scope = _cad_artifact_lookup(
+        artifact_cache, "geometry", file_container, session, target_format=target_format
+    )
+    if cached is not None:
+        artifact_cache.link(file_container, cached)
+        file_container.conversion_status = ConversionStatus.COMPLETED.value
+        file_container.conversion_error = None
+        session.add(file_container)
+        session.flush()
+        return {
+            "ok": True,
+            "file_id": file_container.id,
+            "geometry_path": file_container.geometry_path,
+            "geometry_url": f"/api/v1/file/{file_container.id}/geometry",
+            "cad_manifest_url": (
+                f"/api/v1/file/{file_container.id}/cad_manifest"
+                if file_container.cad_manifest_path
+                else None
+            ),
+            "cad_document_url": (
+                f"/api/v1/file/{file_container.id}/cad_document"
+                if file_container.cad_document_path
+                else None
+            ),
+            "cad_metadata_url": (
+                f"/api/v1/file/{file_container.id}/cad_metadata"
+                if file_container.cad_metadata_path
+                else None
+            ),
+            "target_format": Path(file_container.geometry_path).suffix.lstrip(".")
+            or target_format,
+            "source": "cache",
+        }
+
     if (
         _cad_connector_enabled_for_file(file_container, session=session)
         and file_container.document_type == "3d"
@@ -963,6 +1112,7 @@ def cad_geometry(payload: Dict[str, Any], session: Session) -> Dict[str, Any]:
                 file_container.conversion_error = None
                 session.add(file_container)
                 session.flush()
+                _cad_artifact_store(artifact_cache, "geometry", file_container, cache_scope)
                 return {
                     "ok": True,
                     "file_id": file_container.id,
@@ -1075,6 +1225,7 @@ def cad_geometry(payload: Dict[str, Any], session: Session) -> Dict[str, Any]:
             file_container.conversion_error = None
             session.add(file_container)
             session.flush()
+            _cad_artifact_store(artifact_cache, "geometry", file_container, cache_scope)
             return {
                 "ok": True,
                 "file_id": file_container.id,
@@ -1164,6 +1315,7 @@ def cad_geometry(payload: Dict[str, Any], session: Session) -> Dict[str, Any]:
             file_container.conversion_error = None
             session.add(file_container)
             session.flush()
+            _cad_artifact_store(artifact_cache, "geometry", file_container, cache_scope)
             return {
                 "ok": True,
                 "file_id": file_container.id,
@@ -1451,9 +1603,24 @@ def cad_extract(payload: Dict[str, Any], session: Session) -> Dict[str, Any]:
 
     cad_service = CadService(session)
     file_service = FileService()
-    attributes, source = cad_service.extract_attributes_for_file(
-        file_container, file_service=file_service, return_source=True
+    artifact_cache = CadArtifactCacheService(session, file_service)
+    cached, cache_scope = _cad_artifact_lookup(
+        artifact_cache, "extract", file_container, session, filename=file_container.filename
     )
+    if cached is not None:
+        attributes = cached.get("cad_attributes") or {}
+        source = cached.get("cad_attributes_source")
+    else:
+        attributes, source = cad_service.extract_attributes_for_file(
+            file_container, file_service=file_service, return_source=True
+        )
+        _cad_artifact_store(
+            artifact_cache,
+            "extract",
+            file_container,
+            cache_scope,
+            {"cad_attributes": dict(attributes or {}), "cad_attributes_source": source},
+        )
 
     file_container.cad_attributes = dict(attributes or {})
     file_container.cad_attributes_source = source
@@ -1477,7 +1644,7 @@ def cad_extract(payload: Dict[str, Any], session: Session) -> Dict[str, Any]:
     session.add(file_container)
     session.flush()
 
-    return {
+    result = {
         "ok": True,
         "file_id": file_container.id,
         "cad_format": file_container.cad_format,
@@ -1485,6 +1652,9 @@ def cad_extract(payload: Dict[str, Any], session: Session) -> Dict[str, Any]:
         "extracted_attributes": attributes,
         "source": source,
     }
+    if cached is not None:
+        result["cached"] = True
+    return result
 
 
 def cad_bom(payload: Dict[str, Any], session: Session) -> Dict[str, Any]:
@@ -1506,14 +1676,21 @@ def cad_bom(payload: Dict[str, Any], session: Session) -> Dict[str, Any]:
     if not _cad_connector_enabled(session):
         raise JobFatalError("CAD connector not configured")
 
-    resp = _call_cad_connector_convert(
-        payload=payload,
-        file_container=file_container,
-        file_service=file_service,
-        mode="bom",
+    artifact_cache = CadArtifactCacheService(session, file_service)
+    cached, cache_scope = _cad_artifact_lookup(
+        artifact_cache, "bom", file_container, session, filename=file_container.filename
     )
-    artifacts = resp.get("artifacts") or {}
-    bom_payload = artifacts.get("bom") or resp.get("bom") or {}
+    if cached is not None:
+        bom_payload = _load_stored_bom(file_service, cached["cad_bom_path"])
+    else:
+        resp = _call_cad_connector_convert(
+            payload=payload,
+            file_container=file_container,
+            file_service=file_service,
+            mode="bom",
+        )
+        artifacts = resp.get("artifacts") or {}
+        bom_payload = artifacts.get("bom") or resp.get("bom") or {}
     if not bom_payload:
         return {
             "ok": True,
@@ -1547,14 +1724,28 @@ def cad_bom(payload: Dict[str, Any], session: Session) -> Dict[str, Any]:
     file_container.cad_bom_path = stored_key
     session.add(file_container)
     session.flush()
-
-    return {
+    result = {
         "ok": True,
         "file_id": file_container.id,
         "item_id": item_id,
         "cad_bom_path": stored_key,
         "import_result": import_result,
     }
+    if cached is not None:
+        result["cached"] = True
+    else:
+        _cad_artifact_store(
+            artifact_cache, "bom", file_container, cache_scope, {"cad_bom_path": stored_key}
+        )
+    return result
+
+
+def _load_stored_bom(file_service: FileService, bom_path: str) -> Dict[str, Any]:
+    """The connector BOM payload recorded in a stored ``cad_bom`` JSON."""
+    buf = io.BytesIO()
+    file_service.download_file(bom_path, buf)
+    stored = json.loads(buf.getvalue().decode("utf-8") or "{}")
+    return stored.get("bom") or {}
 
 
 def _enrich_with_derived_files(
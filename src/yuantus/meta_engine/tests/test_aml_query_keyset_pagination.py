@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+
+from yuantus.meta_engine.bootstrap import import_all_models
+from yuantus.meta_engine.models.item import Item
+from yuantus.meta_engine.models.meta_schema import ItemType
+from yuantus.meta_engine.schemas.aml import AMLQueryRequest
+from yuantus.meta_engine.services.query_service import AMLQueryService
+from yuantus.models import user as _user  # noqa: F401 - registers users table
+from yuantus.models.base import Base
+
+import_all_models()
+
+BASE_TIME = datetime(2026, 1, 1, 8, 0, 0)
+
+
+@pytest.fixture()
+def db(tmp_path: Path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'keyset.db'}",
+        connect_args={"check_same_thread": False},
+        future=True,
+    )
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    session.add(ItemType(id="Part"))
+    for n in range(23):
+        props = {"item_number": f"P-{n % 7:02d}"}
+        if n % 5:
+            props["weight"] = str(n % 4)
+        session.add(
+            Item(
+                id=f"p-{n:03d}",
+                item_type_id="Part",
+                config_id=f"cfg-{n}",
+                generation=1,
+                is_current=True,
+                state="Draft",
+                # Ties on created_at: three items share each timestamp.
+                created_at=BASE_TIME + timedelta(minutes=n // 3),
+                properties=props,
+            )
+        )
+    session.commit()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def _walk(db, **kwargs):
+    svc = AMLQueryService(db)
+    seen, cursor, pages = [], None, 0
+    while True:
+        response = svc.query(
+            AMLQueryRequest(type="Part", page_size=5, cursor=cursor, **kwargs)
+        )
+        seen.extend(item["id"] for item in response.items)
+        pages += 1
+        if not response.has_more:
+            assert response.next_cursor is None
+            return seen, pages
+        cursor = response.next_cursor
+
+
+def _offset_all(db, **kwargs):
+    response = AMLQueryService(db).query(
+        AMLQueryRequest(type="Part", page_size=1000, **kwargs)
+    )
+    return [item["id"] for item in response.items]
+
+
+@pytest.mark.parametrize(
+    "order_by",
+    [None, ["created_at:asc"], ["number:asc", "created_at:desc"], ["properties.weight:desc"]],
+)
+def test_keyset_walk_matches_offset_order(db, order_by):
+    seen, pages = _walk(db, order_by=order_by, count_mode="none")
+    assert seen == _offset_all(db, order_by=order_by)
+    assert len(seen) == len(set(seen)) == 23
+    assert pages == 5
+
+
+def test_keyset_pages_seek_instead_of_offset(db):
+    statements = []
+    event.listen(
+        db.get_bind(),
+        "before_cursor_execute",
+        lambda _c, _cur, stmt, params, *_a: statements.append((stmt, params)),
+    )
+    _walk(db, count_mode="none")
+    seeks = [params for stmt, params in statements if "meta_items.id < ?" in stmt]
+    assert len(seeks) == 4
+    # SQLite always renders OFFSET; keyset pages bind it to 0.
+    assert all(params[-1] == 0 for params in seeks)
+
+
+def test_count_modes(db):
+    svc = AMLQueryService(db)
+    exact = svc.query(AMLQueryRequest(type="Part", page_size=5))
+    assert (exact.total, exact.total_relation, exact.has_more) == (23, None, True)
+
+    none = svc.query(AMLQueryRequest(type="Part", page_size=5, count_mode="none"))
+    assert (none.total, none.total_relation, none.has_more) == (None, None, True)
+
+    estimate = svc.query(AMLQueryRequest(type="Part", page_size=5, count_mode="estimate"))
+    assert (estimate.total, estimate.total_relation) == (23, "eq")
+
+    last = svc.query(AMLQueryRequest(type="Part", page=5, page_size=5))
+    assert len(last.items) == 3 and not last.has_more and last.next_cursor is None
+
+
+def test_estimate_count_with_in_filter_on_postgres(db):
+    pg = MagicMock()
+    pg.get_bind.return_value.dialect.name = "postgresql"
+    connection = pg.connection.return_value
+    connection.dialect = postgresql.psycopg.dialect()
+    connection.exec_driver_sql.return_value.scalar.return_value = '[{"Plan": {"Plan Rows": 9}}]'
+    svc = AMLQueryService(pg)
+    query = svc._apply_where(
+        db.query(Item).filter(Item.item_type_id == "Part"),
+        {"weight": {"$in": [1, 2]}, "state": "Draft"},
+    )
+
+    assert svc._count(query, "estimate") == (9, "estimate")
+    sql, params = connection.exec_driver_sql.call_args.args
+    assert "POSTCOMPILE" not in sql
+    assert {"1", "2", "Draft"} <= set(params.values())
+
+
+def test_cursor_must_match_order_by(db):
+    svc = AMLQueryService(db)
+    first = svc.query(AMLQueryRequest(type="Part", page_size=5))
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        svc.query(
+            AMLQueryRequest(
+                type="Part", page_size=5, cursor=first.next_cursor, order_by=["name:asc"]
+            )
+        )
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        svc.query(AMLQueryRequest(type="Part", cursor="not-a-cursor"))
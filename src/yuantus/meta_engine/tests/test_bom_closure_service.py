@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from yuantus.config import get_settings
+from yuantus.meta_engine.bootstrap import import_all_models
+from yuantus.meta_engine.models.bom_closure import BOMClosure
+from yuantus.meta_engine.models.item import Item
+from yuantus.meta_engine.services.bom_closure_service import BOMClosureService
+from yuantus.meta_engine.services.bom_service import BOMService, CycleDetectedError
+from yuantus.models.base import Base
+from yuantus.models import user as _user  # noqa: F401 - registers users table
+
+import_all_models()
+
+
+def _part(item_id: str) -> Item:
+    return Item(
+        id=item_id,
+        item_type_id="Part",
+        config_id=f"cfg-{item_id}",
+        generation=1,
+        is_current=True,
+        state="Released",
+        properties={"item_number": item_id.upper()},
+    )
+
+
+def _closure_rows(session):
+    return sorted(
+        (r.ancestor_id, r.descendant_id, r.depth, r.path_count)
+        for r in session.query(BOMClosure).all()
+    )
+
+
+@pytest.fixture()
+def closure_env(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(get_settings(), "BOM_CLOSURE_ENABLED", True)
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'bom_closure.db'}",
+        connect_args={"check_same_thread": False},
+        future=True,
+    )
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    session.add_all([_part(i) for i in ("top", "mid-a", "mid-b", "bolt", "nut")])
+    session.commit()
+    try:
+        with patch(
+            "yuantus.meta_engine.services.bom_service.assert_latest_released"
+        ), patch("yuantus.meta_engine.services.bom_service.assert_not_suspended"):
+            yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def _build_diamond(service: BOMService) -> None:
+    # top -> mid-a -> bolt, top -> mid-b -> bolt, mid-a -> nut
+    service.add_child("top", "mid-a")
+    service.add_child("top", "mid-b")
+    service.add_child("mid-a", "bolt")
+    service.add_child("mid-b", "bolt")
+    service.add_child("mid-a", "nut")
+
+
+def test_add_child_maintains_closure_incrementally(closure_env):
+    service = BOMService(closure_env)
+    _build_diamond(service)
+    closure_env.commit()
+
+    assert ("top", "bolt", 2, 2) in _closure_rows(closure_env)
+    incremental = _closure_rows(closure_env)
+
+    result = BOMClosureService(closure_env).rebuild()
+    assert result["rows"] == len(incremental)
+    assert _closure_rows(closure_env) == incremental
+
+
+def test_remove_child_subtracts_only_its_paths(closure_env):
+    service = BOMService(closure_env)
+    _build_diamond(service)
+    service.remove_child("mid-b", "bolt")
+    closure_env.commit()
+
+    rows = _closure_rows(closure_env)
+    assert ("top", "bolt", 2, 1) in rows
+    assert not any(r[0] == "mid-b" and r[1] == "bolt" for r in rows)
+
+    BOMClosureService(closure_env).rebuild()
+    assert _closure_rows(closure_env) == rows
+
+
+def test_superseding_a_line_drops_it_from_closure(closure_env):
+    service = BOMService(closure_env)
+    _build_diamond(service)
+    line = service.get_bom_line_by_parent_child("mid-a", "nut")
+    line.is_current = False
+    closure_env.commit()
+
+    assert not BOMClosureService(closure_env).has_path("top", "nut")
+    assert BOMClosureService(closure_env).has_path("top", "bolt")
+
+
+def test_cycle_detection_walks_one_query_per_level(closure_env):
+    service = BOMService(closure_env)
+    _build_diamond(service)
+    closure_env.flush()
+
+    with patch.object(closure_env, "query", wraps=closure_env.query) as spy:
+        assert service.detect_cycle_with_path("mid-b", "mid-a") == {
+            "has_cycle": False,
+            "cycle_path": None,
+        }
+    # mid-a -> {bolt, nut} -> {}: no per-node queries
+    assert spy.call_count == 2
+
+    with pytest.raises(CycleDetectedError) as exc:
+        service.add_child("bolt", "top")
+    assert exc.value.cycle_path[0] == "bolt"
+    assert exc.value.cycle_path[-1] == "bolt"
+
+
+def test_cycle_detection_sees_paths_deeper_than_closure_cap(closure_env, monkeypatch):
+    monkeypatch.setattr(get_settings(), "BOM_CLOSURE_MAX_DEPTH", 2)
+    closure_env.add(_part("deep"))
+    service = BOMService(closure_env)
+    for parent, child in (("top", "mid-a"), ("mid-a", "bolt"), ("bolt", "deep")):
+        service.add_child(parent, child)
+    closure_env.flush()
+    assert not BOMClosureService(closure_env).has_path("top", "deep")
+
+    assert service.detect_cycle_with_path("deep", "top") == {
+        "has_cycle": True,
+        "cycle_path": ["deep", "top", "mid-a", "bolt", "deep"],
+    }
+    with pytest.raises(CycleDetectedError):
+        service.add_child("deep", "top")
+
+
+@pytest.mark.parametrize("max_levels", [1, 2, 10])
+def test_where_used_from_closure_matches_recursive_walk(closure_env, monkeypatch, max_levels):
+    service = BOMService(closure_env)
+    _build_diamond(service)
+    closure_env.commit()
+
+    via_closure = service.get_where_used("bolt", recursive=True, max_levels=max_levels)
+    monkeypatch.setattr(get_settings(), "BOM_CLOSURE_ENABLED", False)
+    via_walk = service.get_where_used("bolt", recursive=True, max_levels=max_levels)
+
+    assert via_closure == via_walk
+    assert {e["parent"]["id"] for e in via_walk if e["level"] == 1} == {"mid-a", "mid-b"}
+    assert max(e["level"] for e in via_walk) == min(max_levels, 2)
+
+
+def test_where_used_deeper_than_closure_cap_falls_back_to_walk(closure_env, monkeypatch):
+    monkeypatch.setattr(get_settings(), "BOM_CLOSURE_MAX_DEPTH", 1)
+    closure_env.add(_part("deep"))
+    service = BOMService(closure_env)
+    for parent, child in (("top", "mid-a"), ("mid-a", "bolt"), ("bolt", "deep")):
+        service.add_child(parent, child)
+    closure_env.commit()
+
+    via_closure = service.get_where_used("deep", recursive=True, max_levels=10)
+    monkeypatch.setattr(get_settings(), "BOM_CLOSURE_ENABLED", False)
+    via_walk = service.get_where_used("deep", recursive=True, max_levels=10)
+
+    assert via_closure == via_walk
+    assert [e["parent"]["id"] for e in via_closure] == ["bolt", "mid-a", "top"]
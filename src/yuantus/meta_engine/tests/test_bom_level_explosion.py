@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from yuantus.meta_engine.bootstrap import import_all_models
+from yuantus.meta_engine.models.effectivity import Effectivity
+from yuantus.meta_engine.models.item import Item
+from yuantus.meta_engine.services.bom_service import BOMService
+from yuantus.models.base import Base
+from yuantus.models import user as _user  # noqa: F401 - registers users table
+
+import_all_models()
+
+
+def _part(item_id: str, **props) -> Item:
+    return Item(
+        id=item_id,
+        item_type_id="Part",
+        config_id=f"cfg-{item_id}",
+        generation=1,
+        is_current=True,
+        state="Released",
+        properties={"item_number": item_id.upper(), **props},
+    )
+
+
+def _line(line_id: str, parent: str, child: str, type_id: str = "Part BOM", **props):
+    return Item(
+        id=line_id,
+        item_type_id=type_id,
+        config_id=f"cfg-{line_id}",
+        generation=1,
+        is_current=True,
+        state="Active",
+        source_id=parent,
+        related_id=child,
+        properties={"quantity": 1, "uom": "EA", **props},
+    )
+
+
+@pytest.fixture()
+def bom_env(tmp_path: Path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'bom_level.db'}",
+        connect_args={"check_same_thread": False},
+        future=True,
+    )
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    # ROOT -> A (x2 lines, one lot-gated) ; ROOT -> B ; A -> SHARED ; B -> SHARED
+    # SHARED -> LEAF ; B -> OLD (not current) ; ROOT -> VARIANT (config gated)
+    old = _part("old")
+    old.is_current = False
+    session.add_all(
+        [
+            _part("root"),
+            _part("a"),
+            _part("b"),
+            _part("shared"),
+            _part("leaf"),
+            _part("variant"),
+            _part("sub-part"),
+            old,
+            _line("l-root-a", "root", "a", find_num="10"),
+            _line("l-root-a-lot", "root", "a", uom="KG"),
+            _line("l-root-b", "root", "b", find_num="20"),
+            _line("l-root-var", "root", "variant", config_condition={"color": "red"}),
+            _line("l-a-shared", "a", "shared"),
+            _line("l-b-shared", "b", "shared"),
+            _line("l-b-old", "b", "old"),
+            _line("l-shared-leaf", "shared", "leaf"),
+            _line("l-dangling", "shared", None),
+            _line("s-a-shared", "l-a-shared", "sub-part", "Part BOM Substitute", rank=1),
+            Effectivity(
+                id="eff-lot",
+                item_id="l-root-a-lot",
+                effectivity_type="Lot",
+                payload={"lot_start": "L100", "lot_end": "L199"},
+            ),
+            Effectivity(
+                id="eff-date",
+                item_id="l-root-b",
+                effectivity_type="Date",
+                start_date=datetime(2025, 1, 1),
+                end_date=datetime(2025, 12, 31),
+            ),
+        ]
+    )
+    session.commit()
+    try:
+        yield engine, session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"levels": 1},
+        {"levels": 2},
+        {"include_substitutes": True},
+        {"effective_date": datetime(2025, 6, 1)},
+        {"effective_date": datetime(2026, 6, 1), "lot_number": "L150"},
+        {"config_selection": {"color": "red"}},
+        {"config_selection": {"color": "blue"}},
+        {"relationship_types": ["Part BOM"]},
+    ],
+)
+def test_level_explosion_matches_recursive_shape(bom_env, kwargs):
+    _engine, session = bom_env
+    service = BOMService(session)
+
+    by_level = service.get_bom_structure("root", **kwargs)
+    recursive = service.get_bom_structure("root", explosion_mode="recursive", **kwargs)
+
+    assert by_level == recursive
+
+
+def test_level_explosion_expands_shared_subassembly_per_occurrence(bom_env):
+    _engine, session = bom_env
+    tree = BOMService(session).get_bom_structure("root", include_substitutes=True)
+
+    by_line = {c["relationship"]["id"]: c for c in tree["children"]}
+    assert set(by_line) == {"l-root-a", "l-root-a-lot", "l-root-b", "l-root-var"}
+    shared_under_a = by_line["l-root-a"]["child"]["children"][0]
+    shared_under_b = by_line["l-root-b"]["child"]["children"][0]
+    assert shared_under_a["child"]["id"] == shared_under_b["child"]["id"] == "shared"
+    assert shared_under_a["child"] is not shared_under_b["child"]
+    assert [c["child"]["id"] for c in shared_under_a["child"]["children"]] == ["leaf"]
+    assert [s["id"] for s in shared_under_a["substitutes"]] == ["s-a-shared"]
+    assert shared_under_b["substitutes"] == []
+
+
+def test_level_explosion_query_count_is_per_level_not_per_line(bom_env):
+    engine, session = bom_env
+    service = BOMService(session)
+    statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        service.get_bom_structure(
+            "root", effective_date=datetime(2025, 6, 1), include_substitutes=True
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+
+    # root fetch + 3 explosion levels x (rels, effectivity, children, subs, sub parts)
+    # + the final empty-frontier probe; independent of the number of lines.
+    assert len(statements) <= 1 + 4 * 5
+
+
+def test_unknown_explosion_mode_is_rejected(bom_env):
+    _engine, session = bom_env
+    with pytest.raises(ValueError, match="explosion_mode"):
+        BOMService(session).get_bom_structure("root", explosion_mode="cte")
+
+
+def _flatten_nested(tree, level=0, path=()):
+    path = path + (tree["id"],)
+    yield level, list(path), tree["id"]
+    for entry in tree.get("children", []):
+        yield from _flatten_nested(entry["child"], level + 1, path)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"levels": -1},
+        {"levels": 1},
+        {"levels": 2},
+        {"effective_date": datetime(2026, 6, 1), "lot_number": "L150"},
+        {"config_selection": {"color": "red"}},
+    ],
+)
+def test_iter_bom_nodes_streams_nested_structure_in_preorder(bom_env, kwargs):
+    _engine, session = bom_env
+    service = BOMService(session)
+
+    tree = service.get_bom_structure("root", **kwargs)
+    nodes = list(service.iter_bom_nodes("root", **kwargs))
+
+    assert [(n["level"], n["path"], n["item"]["id"]) for n in nodes] == list(
+        _flatten_nested(tree)
+    )
+    assert nodes[0]["relationship"] is None
+    for node in nodes[1:]:
+        assert node["parent_id"] == node["path"][-2]
+        assert node["relationship"]["related_id"] == node["item"]["id"]
+
+
+def test_iter_bom_nodes_rejects_missing_root_eagerly(bom_env):
+    _engine, session = bom_env
+    with pytest.raises(ValueError, match="not found"):
+        BOMService(session).iter_bom_nodes("missing")
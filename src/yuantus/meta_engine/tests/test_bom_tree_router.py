@@ -20,6 +20,7 @@ Uses the isolated-router test pattern (FastAPI + include_router) so the
 AuthEnforcementMiddleware is not in the stack -- no AUTH_MODE=optional
 fixture needed.
 """
+import json
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -295,6 +296,53 @@ def test_tree_invalid_config_json_returns_400(client, mock_db_session):
     assert response.json()["detail"] == "Invalid config JSON"
 
 
+def test_tree_stream_returns_ndjson_nodes_and_closes_session(client, mock_db_session):
+    root = MagicMock()
+    root.item_type_id = "Part"
+    mock_db_session.get.return_value = root
+    nodes = [
+        {"level": 0, "path": ["PART-1"], "parent_id": None, "relationship": None,
+         "item": {"id": "PART-1"}},
+        {"level": 1, "path": ["PART-1", "C-1"], "parent_id": "PART-1",
+         "relationship": {"id": "L-1"}, "item": {"id": "C-1"}},
+    ]
+    with patch(
+        "yuantus.meta_engine.web.bom_tree_router.MetaPermissionService"
+    ) as mock_perm, patch(
+        "yuantus.meta_engine.web.bom_tree_router.BOMService"
+    ) as mock_service:
+        mock_perm.return_value.check_permission.return_value = True
+        mock_service.return_value.iter_bom_nodes.return_value = iter(nodes)
+        response = client.get("/api/v1/bom/PART-1/tree?stream=true&depth=-1&lot_number=LOT9")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert lines == nodes
+    called = mock_service.return_value.iter_bom_nodes.call_args
+    assert called.args == ("PART-1",)
+    assert called.kwargs["levels"] == -1
+    assert called.kwargs["lot_number"] == "LOT9"
+    mock_service.return_value.get_tree.assert_not_called()
+    mock_db_session.close.assert_called()
+
+
+def test_tree_stream_missing_root_returns_404(client, mock_db_session):
+    root = MagicMock()
+    root.item_type_id = "Part"
+    mock_db_session.get.return_value = root
+    with patch(
+        "yuantus.meta_engine.web.bom_tree_router.MetaPermissionService"
+    ) as mock_perm, patch(
+        "yuantus.meta_engine.web.bom_tree_router.BOMService"
+    ) as mock_service:
+        mock_perm.return_value.check_permission.return_value = True
+        mock_service.return_value.iter_bom_nodes.side_effect = ValueError(
+            "Item PART-1 not found"
+        )
+        response = client.get("/api/v1/bom/PART-1/tree?stream=true")
+    assert response.status_code == 404
+
+
 # ---------------------------------------------------------------------------
 # GET /api/v1/bom/mbom/{parent_id}/tree
 # ---------------------------------------------------------------------------
@@ -327,3 +375,26 @@ def test_mbom_tree_forwards_manufacturing_bom_relationship_types(client, mock_db
     kwargs = called.kwargs
     assert kwargs["depth"] == 3
     assert kwargs["relationship_types"] == ["Manufacturing BOM"]
+
+
+def test_mbom_tree_stream_forwards_manufacturing_bom_relationship_types(
+    client, mock_db_session
+):
+    root = MagicMock()
+    root.item_type_id = "Manufacturing Part"
+    mock_db_session.get.return_value = root
+    with patch(
+        "yuantus.meta_engine.web.bom_tree_router.MetaPermissionService"
+    ) as mock_perm, patch(
+        "yuantus.meta_engine.web.bom_tree_router.BOMService"
+    ) as mock_service:
+        mock_perm.return_value.check_permission.return_value = True
+        mock_service.return_value.iter_bom_nodes.return_value = iter(
+            [{"level": 0, "path": ["MP-1"], "item": {"id": "MP-1"}}]
+        )
+        response = client.get("/api/v1/bom/mbom/MP-1/tree?depth=3&stream=true")
+    assert response.status_code == 200
+    assert json.loads(response.text.splitlines()[0])["path"] == ["MP-1"]
+    kwargs = mock_service.return_value.iter_bom_nodes.call_args.kwargs
+    assert kwargs["levels"] == 3
+    assert kwargs["relationship_types"] == ["Manufacturing BOM"]
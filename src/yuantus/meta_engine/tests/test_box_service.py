@@ -5,8 +5,16 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from yuantus.meta_engine.bootstrap import import_all_models
 from yuantus.meta_engine.box.models import BoxContent, BoxItem, BoxState, BoxType
 from yuantus.meta_engine.box.service import BoxService
+from yuantus.models import user as _user  # noqa: F401 - registers users table
+from yuantus.models.base import Base
+
+import_all_models()
 
 
 # ---------------------------------------------------------------------------
@@ -23,6 +31,33 @@ def _mock_session():
     return session
 
 
+def _seeded_session(boxes, contents_map=None):
+    """In-memory SQLite session holding *boxes* (fakes from ``_make_box``).
+
+    Fleet analytics run as SQL aggregates, so they need real rows rather than
+    a mocked ``query().all()``. ``contents_map`` maps box id to a list of
+    ``BoxContent`` column overrides, one dict per content line.
+    """
+    engine = create_engine("sqlite://", future=True)
+    Base.metadata.create_all(
+        engine, tables=[BoxItem.__table__, BoxContent.__table__]
+    )
+    session = sessionmaker(bind=engine)()
+    columns = [
+        c.key
+        for c in BoxItem.__table__.columns
+        if c.key not in ("created_at", "updated_at")
+    ]
+    for box in boxes:
+        session.add(BoxItem(**{key: getattr(box, key) for key in columns}))
+    for box_id, lines in (contents_map or {}).items():
+        for n, line in enumerate(lines):
+            fields = {"item_id": f"item-{n}", **line}
+            session.add(BoxContent(id=f"{box_id}-c{n}", box_id=box_id, **fields))
+    session.flush()
+    return session
+
+
 def _make_box(box_id="box-1", name="Test Box", box_type="box", state="draft"):
     box = MagicMock(spec=BoxItem)
     box.id = box_id
@@ -212,14 +247,8 @@ class TestBoxContents:
 
 class TestBoxAnalytics:
     def _session_with_boxes(self, boxes):
-        """Session whose query(BoxItem).all() returns *boxes*."""
-        session = _mock_session()
-        query_mock = MagicMock()
-        session.query.return_value = query_mock
-        query_mock.all.return_value = boxes
-        query_mock.filter.return_value = query_mock
-        query_mock.order_by.return_value = query_mock
-        return session
+        """Real session seeded with *boxes*."""
+        return _seeded_session(boxes)
 
     def test_overview(self):
         boxes = [
@@ -375,14 +404,8 @@ class TestBoxAnalytics:
 
 class TestOpsReport:
     def _session_with_boxes(self, boxes):
-        """Session whose query(BoxItem).all() returns *boxes*."""
-        session = _mock_session()
-        query_mock = MagicMock()
-        session.query.return_value = query_mock
-        query_mock.all.return_value = boxes
-        query_mock.filter.return_value = query_mock
-        query_mock.order_by.return_value = query_mock
-        return session
+        """Real session seeded with *boxes*."""
+        return _seeded_session(boxes)
 
     def test_transition_summary(self):
         boxes = [
@@ -550,45 +573,8 @@ class TestOpsReport:
 
 class TestReconciliationAudit:
     def _session_with_boxes_and_contents(self, boxes, contents_map=None):
-        """Session whose query(BoxItem).all() returns boxes and list_contents is routed via contents_map."""
-        session = _mock_session()
-        _contents_map = contents_map or {}
-
-        def mock_query(model):
-            q = MagicMock()
-            if model is BoxItem:
-                q.all.return_value = boxes
-                q.filter.return_value = q
-                q.order_by.return_value = q
-            elif model is BoxContent:
-                # For list_contents: filter by box_id
-                def content_filter(*args, **kwargs):
-                    fq = MagicMock()
-                    # Return all contents for simplicity; per-box filtering via contents_map
-                    fq.all.return_value = []
-                    fq.order_by.return_value = fq
-                    return fq
-
-                q.filter.side_effect = content_filter
-                q.order_by.return_value = q
-                q.all.return_value = []
-            else:
-                q.all.return_value = []
-                q.filter.return_value = q
-                q.order_by.return_value = q
-            return q
-
-        session.query.side_effect = mock_query
-
-        # Support session.get for per-box reconciliation
-        def get_side_effect(model, pk):
-            if model is BoxItem:
-                return next((b for b in boxes if b.id == pk), None)
-            return None
-
-        session.get.side_effect = get_side_effect
-
-        return session
+        """Real session seeded with *boxes* and the contents in *contents_map*."""
+        return _seeded_session(boxes, contents_map)
 
     def test_reconciliation_overview(self):
         b1 = _make_box(box_id="b1", state="active")
@@ -777,42 +763,8 @@ class TestReconciliationAudit:
 
 class TestCapacityCompliance:
     def _session_with_boxes_and_contents(self, boxes, contents_map=None):
-        """Session whose query(BoxItem).all() returns boxes and list_contents is routed via contents_map."""
-        session = _mock_session()
-        _contents_map = contents_map or {}
-
-        def mock_query(model):
-            q = MagicMock()
-            if model is BoxItem:
-                q.all.return_value = boxes
-                q.filter.return_value = q
-                q.order_by.return_value = q
-            elif model is BoxContent:
-                def content_filter(*args, **kwargs):
-                    fq = MagicMock()
-                    fq.all.return_value = []
-                    fq.order_by.return_value = fq
-                    return fq
-
-                q.filter.side_effect = content_filter
-                q.order_by.return_value = q
-                q.all.return_value = []
-            else:
-                q.all.return_value = []
-                q.filter.return_value = q
-                q.order_by.return_value = q
-            return q
-
-        session.query.side_effect = mock_query
-
-        def get_side_effect(model, pk):
-            if model is BoxItem:
-                return next((b for b in boxes if b.id == pk), None)
-            return None
-
-        session.get.side_effect = get_side_effect
-
-        return session
+        """Real session seeded with *boxes* and the contents in *contents_map*."""
+        return _seeded_session(boxes, contents_map)
 
     def test_capacity_overview(self):
         b1 = _make_box(box_id="b1")
@@ -1004,42 +956,8 @@ class TestCapacityCompliance:
 
 class TestPolicyExceptions:
     def _session_with_boxes_and_contents(self, boxes, contents_map=None):
-        """Session whose query(BoxItem).all() returns boxes and list_contents is routed via contents_map."""
-        session = _mock_session()
-        _contents_map = contents_map or {}
-
-        def mock_query(model):
-            q = MagicMock()
-            if model is BoxItem:
-                q.all.return_value = boxes
-                q.filter.return_value = q
-                q.order_by.return_value = q
-            elif model is BoxContent:
-                def content_filter(*args, **kwargs):
-                    fq = MagicMock()
-                    fq.all.return_value = []
-                    fq.order_by.return_value = fq
-                    return fq
-
-                q.filter.side_effect = content_filter
-                q.order_by.return_value = q
-                q.all.return_value = []
-            else:
-                q.all.return_value = []
-                q.filter.return_value = q
-                q.order_by.return_value = q
-            return q
-
-        session.query.side_effect = mock_query
-
-        def get_side_effect(model, pk):
-            if model is BoxItem:
-                return next((b for b in boxes if b.id == pk), None)
-            return None
-
-        session.get.side_effect = get_side_effect
-
-        return session
+        """Real session seeded with *boxes* and the contents in *contents_map*."""
+        return _seeded_session(boxes, contents_map)
 
     def test_policy_overview(self):
         b1 = _make_box(box_id="b1", state="active")
@@ -1225,42 +1143,8 @@ class TestPolicyExceptions:
 
 class TestReservationsTraceability:
     def _session_with_boxes_and_contents(self, boxes, contents_map=None):
-        """Session whose query(BoxItem).all() returns boxes and list_contents is routed via contents_map."""
-        session = _mock_session()
-        _contents_map = contents_map or {}
-
-        def mock_query(model):
-            q = MagicMock()
-            if model is BoxItem:
-                q.all.return_value = boxes
-                q.filter.return_value = q
-                q.order_by.return_value = q
-            elif model is BoxContent:
-                def content_filter(*args, **kwargs):
-                    fq = MagicMock()
-                    fq.all.return_value = []
-                    fq.order_by.return_value = fq
-                    return fq
-
-                q.filter.side_effect = content_filter
-                q.order_by.return_value = q
-                q.all.return_value = []
-            else:
-                q.all.return_value = []
-                q.filter.return_value = q
-                q.order_by.return_value = q
-            return q
-
-        session.query.side_effect = mock_query
-
-        def get_side_effect(model, pk):
-            if model is BoxItem:
-                return next((b for b in boxes if b.id == pk), None)
-            return None
-
-        session.get.side_effect = get_side_effect
-
-        return session
+        """Real session seeded with *boxes* and the contents in *contents_map*."""
+        return _seeded_session(boxes, contents_map)
 
     def test_reservations_overview(self):
         b1 = _make_box(box_id="b1", state="active")
@@ -1405,42 +1289,8 @@ class TestReservationsTraceability:
 
 class TestAllocationsCustody:
     def _session_with_boxes_and_contents(self, boxes, contents_map=None):
-        """Session whose query(BoxItem).all() returns boxes and list_contents is routed via contents_map."""
-        session = _mock_session()
-        _contents_map = contents_map or {}
-
-        def mock_query(model):
-            q = MagicMock()
-            if model is BoxItem:
-                q.all.return_value = boxes
-                q.filter.return_value = q
-                q.order_by.return_value = q
-            elif model is BoxContent:
-                def content_filter(*args, **kwargs):
-                    fq = MagicMock()
-                    fq.all.return_value = []
-                    fq.order_by.return_value = fq
-                    return fq
-
-                q.filter.side_effect = content_filter
-                q.order_by.return_value = q
-                q.all.return_value = []
-            else:
-                q.all.return_value = []
-                q.filter.return_value = q
-                q.order_by.return_value = q
-            return q
-
-        session.query.side_effect = mock_query
-
-        def get_side_effect(model, pk):
-            if model is BoxItem:
-                return next((b for b in boxes if b.id == pk), None)
-            return None
-
-        session.get.side_effect = get_side_effect
-
-        return session
+        """Real session seeded with *boxes* and the contents in *contents_map*."""
+        return _seeded_session(boxes, contents_map)
 
     def test_allocations_overview(self):
         b1 = _make_box(box_id="b1", state="active")
@@ -1608,42 +1458,8 @@ class TestAllocationsCustody:
 
 class TestOccupancyTurnover:
     def _session_with_boxes_and_contents(self, boxes, contents_map=None):
-        """Session whose query(BoxItem).all() returns boxes and list_contents is routed via contents_map."""
-        session = _mock_session()
-        _contents_map = contents_map or {}
-
-        def mock_query(model):
-            q = MagicMock()
-            if model is BoxItem:
-                q.all.return_value = boxes
-                q.filter.return_value = q
-                q.order_by.return_value = q
-            elif model is BoxContent:
-                def content_filter(*args, **kwargs):
-                    fq = MagicMock()
-                    fq.all.return_value = []
-                    fq.order_by.return_value = fq
-                    return fq
-
-                q.filter.side_effect = content_filter
-                q.order_by.return_value = q
-                q.all.return_value = []
-            else:
-                q.all.return_value = []
-                q.filter.return_value = q
-                q.order_by.return_value = q
-            return q
-
-        session.query.side_effect = mock_query
-
-        def get_side_effect(model, pk):
-            if model is BoxItem:
-                return next((b for b in boxes if b.id == pk), None)
-            return None
-
-        session.get.side_effect = get_side_effect
-
-        return session
+        """Real session seeded with *boxes* and the contents in *contents_map*."""
+        return _seeded_session(boxes, contents_map)
 
     def test_occupancy_overview(self):
         b1 = _make_box(box_id="b1", state="active")
@@ -1810,42 +1626,8 @@ class TestOccupancyTurnover:
 
 class TestDwellAging:
     def _session_with_boxes_and_contents(self, boxes, contents_map=None):
-        """Session whose query(BoxItem).all() returns boxes and list_contents is routed via contents_map."""
-        session = _mock_session()
-        _contents_map = contents_map or {}
-
-        def mock_query(model):
-            q = MagicMock()
-            if model is BoxItem:
-                q.all.return_value = boxes
-                q.filter.return_value = q
-                q.order_by.return_value = q
-            elif model is BoxContent:
-                def content_filter(*args, **kwargs):
-                    fq = MagicMock()
-                    fq.all.return_value = []
-                    fq.order_by.return_value = fq
-                    return fq
-
-                q.filter.side_effect = content_filter
-                q.order_by.return_value = q
-                q.all.return_value = []
-            else:
-                q.all.return_value = []
-                q.filter.return_value = q
-                q.order_by.return_value = q
-            return q
-
-        session.query.side_effect = mock_query
-
-        def get_side_effect(model, pk):
-            if model is BoxItem:
-                return next((b for b in boxes if b.id == pk), None)
-            return None
-
-        session.get.side_effect = get_side_effect
-
-        return session
+        """Real session seeded with *boxes* and the contents in *contents_map*."""
+        return _seeded_session(boxes, contents_map)
 
     # -- dwell_overview --
 
@@ -1880,21 +1662,11 @@ class TestDwellAging:
         b1 = _make_box(box_id="b1", state="active")
         b2 = _make_box(box_id="b2", state="active")
 
-        session = self._session_with_boxes_and_contents([b1, b2])
+        session = self._session_with_boxes_and_contents(
+            [b1, b2],
+            {"b1": [{"quantity": 1.0}] * 12, "b2": [{"quantity": 1.0}]},
+        )
         service = BoxService(session)
-
-        # Patch list_contents to return different counts per box
-        contents_b1 = [MagicMock(spec=BoxContent, quantity=1.0) for _ in range(12)]
-        contents_b2 = [MagicMock(spec=BoxContent, quantity=1.0)]
-
-        def mock_list_contents(box_id):
-            if box_id == "b1":
-                return contents_b1
-            elif box_id == "b2":
-                return contents_b2
-            return []
-
-        service.list_contents = mock_list_contents
         result = service.dwell_overview()
 
         assert result["total"] == 2
@@ -2036,3 +1808,172 @@ class TestDwellAging:
         assert result["dwell_overview"]["total"] == 0
         assert result["aging_summary"]["total"] == 0
         assert result["per_box_aging"] == []
+
+
+# ---------------------------------------------------------------------------
+# TestFleetAggregates – set-based fleet analytics + panel cache
+# ---------------------------------------------------------------------------
+
+
+def _count_statements(session, fn):
+    engine = session.get_bind()
+    statements = []
+
+    def before(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before)
+    try:
+        result = fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", before)
+    return result, len(statements)
+
+
+class TestFleetAggregates:
+    def _fleet(self):
+        b1 = _make_box(box_id="b1", state="active")
+        b1.max_quantity = 4
+        b2 = _make_box(box_id="b2", state="archived")
+        b2.max_quantity = 2
+        b2.max_gross_weight = None
+        b3 = _make_box(box_id="b3", state="draft")
+        b3.max_quantity = None
+        return _seeded_session(
+            [b1, b2, b3],
+            {
+                "b1": [
+                    {"quantity": 1.0, "lot_serial": "LOT-1"},
+                    {"quantity": 2.0},
+                    {"quantity": 3.0, "lot_serial": ""},
+                ],
+                "b2": [{"quantity": 1.0}, {"quantity": 1.0}, {"quantity": 0.5}],
+            },
+        )
+
+    def test_panels_aggregate_contents(self):
+        service = BoxService(self._fleet())
+
+        assert service.occupancy_overview() == {
+            "total": 3,
+            "occupied": 2,
+            "empty": 1,
+            "occupancy_rate": 66.7,
+            "avg_fill_level": 137.5,
+        }
+        assert service.capacity_overview() == {
+            "total": 3,
+            "with_max_quantity": 2,
+            "with_weight_limit": 2,
+            "average_fill_rate": 112.5,
+            "bands": {"high": 1, "medium": 1, "low": 0},
+        }
+        compliance = service.compliance_summary()
+        assert compliance["exceeding_weight_limit"] == 1
+        assert compliance["over_capacity"] == 1
+        assert (compliance["compliant"], compliance["non_compliant"]) == (2, 1)
+        exceptions = service.exceptions_summary()
+        assert exceptions["archived_active_contents"] == ["b2"]
+        assert exceptions["over_max_quantity"] == ["b2"]
+        assert exceptions["total_exceptions"] == 2
+        reservations = service.reservations_overview()
+        assert (reservations["reserved"], reservations["unreserved"]) == (2, 1)
+        assert reservations["average_fill_rate"] == 112.5
+        assert service.traceability_summary() == {
+            "total_contents": 6,
+            "with_lot_serial": 1,
+            "without_lot_serial": 5,
+            "boxes_with_traceability": 1,
+            "boxes_without_traceability": 1,
+            "traceability_pct": 16.7,
+        }
+        custody = service.custody_summary()
+        assert (custody["max_custody_depth"], custody["avg_contents_per_box"]) == (3, 2.0)
+        turnover = service.turnover_summary()
+        assert (turnover["active_boxes"], turnover["avg_contents_per_active"]) == (1, 3.0)
+        assert [
+            (row["box_id"], row["contents_count"], row["fill_ratio"], row["classification"])
+            for row in service.export_turnover()["per_box_turnover"]
+        ] == [("b1", 3, 75.0, "normal"), ("b2", 3, 150.0, "normal"), ("b3", 0, 0.0, "low")]
+        assert [
+            (row["box_id"], row["total_quantity"])
+            for row in service.export_aging()["per_box_aging"]
+        ] == [("b1", 6.0), ("b2", 2.5), ("b3", 0.0)]
+
+    def test_statement_count_does_not_grow_with_fleet(self):
+        small = BoxService(_seeded_session([_make_box(box_id="b0")]))
+        boxes = [_make_box(box_id=f"b{n:02d}") for n in range(40)]
+        large = BoxService(
+            _seeded_session(boxes, {b.id: [{"quantity": 1.0}] * 3 for b in boxes})
+        )
+        for panel in (
+            "overview",
+            "reconciliation_overview",
+            "audit_summary",
+            "capacity_overview",
+            "occupancy_overview",
+            "dwell_overview",
+            "aging_summary",
+            "export_custody",
+        ):
+            _, few = _count_statements(small.session, getattr(small, panel))
+            _, many = _count_statements(large.session, getattr(large, panel))
+            assert few == many, panel
+
+    def test_panel_cache_is_shared_and_invalidated_by_writes(self, monkeypatch):
+        from yuantus.config import get_settings
+        from yuantus.meta_engine.box import service as box_service
+
+        monkeypatch.setattr(get_settings(), "BOX_ANALYTICS_CACHE_TTL_SECONDS", 60)
+        box_service.invalidate_box_analytics_cache()
+        try:
+            session = self._fleet()
+            session.commit()  # flushed, uncommitted box rows bypass the cache
+            first = BoxService(session).custody_summary()
+            first["total"] = -1
+
+            again, statements = _count_statements(
+                session, BoxService(session).custody_summary
+            )
+            assert statements == 0
+            assert again["total"] == 3
+
+            BoxService(session).add_content("b3", item_id="item-x")
+            _, statements = _count_statements(
+                session, BoxService(session).custody_summary
+            )
+            assert statements > 0
+            assert BoxService(session).custody_summary()["boxes_with_contents"] == 3
+        finally:
+            box_service.invalidate_box_analytics_cache()
+
+    def test_uncommitted_box_writes_are_never_cached(self, monkeypatch):
+        from yuantus.config import get_settings
+        from yuantus.meta_engine.box import service as box_service
+
+        monkeypatch.setattr(get_settings(), "BOX_ANALYTICS_CACHE_TTL_SECONDS", 60)
+        box_service.invalidate_box_analytics_cache()
+        try:
+            session = self._fleet()
+            session.commit()
+            BoxService(session).add_content("b3", item_id="item-x")
+            assert BoxService(session).custody_summary()["boxes_with_contents"] == 3
+            session.rollback()
+
+            # The rolled-back content never reached the cache.
+            assert BoxService(session).custody_summary()["boxes_with_contents"] == 2
+            _, statements = _count_statements(
+                session, BoxService(session).custody_summary
+            )
+            assert statements == 0
+
+            BoxService(session).add_content("b3", item_id="item-x")
+            session.commit()
+            # Committing the write drops the panel cached before it.
+            _, statements = _count_statements(
+                session, BoxService(session).custody_summary
+            )
+            assert statements > 0
+            assert BoxService(session).custody_summary()["boxes_with_contents"] == 3
+        finally:
+            box_service.invalidate_box_analytics_cache()
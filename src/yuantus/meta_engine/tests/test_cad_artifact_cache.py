@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from yuantus.config import get_settings
+from yuantus.meta_engine.bootstrap import import_all_models
+from yuantus.meta_engine.models.cad_artifact_cache import CadArtifactCacheEntry
+from yuantus.meta_engine.models.file import FileContainer
+from yuantus.meta_engine.services import cad_artifact_cache_service as cache_mod
+from yuantus.meta_engine.services.cad_artifact_cache_service import (
+    CadArtifactCacheService,
+    cad_artifact_cache_stats,
+)
+from yuantus.meta_engine.tasks import cad_pipeline_tasks as cpt
+from yuantus.models import user as _user  # noqa: F401 - registers users table
+from yuantus.models.base import Base
+from yuantus.observability.metrics import render_cad_artifact_cache_metrics
+
+import_all_models()
+
+
+@pytest.fixture()
+def cache_env(tmp_path: Path, monkeypatch):
+    settings = get_settings()
+    vault = tmp_path / "vault"
+    vault.mkdir()
+    monkeypatch.setattr(settings, "STORAGE_TYPE", "local")
+    monkeypatch.setattr(settings, "LOCAL_STORAGE_PATH", str(vault))
+    monkeypatch.setattr(settings, "CAD_ARTIFACT_CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "CAD_ARTIFACT_CACHE_MAX_ENTRIES", 0)
+    monkeypatch.setattr(settings, "CAD_ARTIFACT_CACHE_MAX_BYTES", 0)
+    cache_mod.reset_cad_artifact_cache_stats()
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'cache.db'}", future=True)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    try:
+        yield session, vault
+    finally:
+        session.close()
+        engine.dispose()
+        cache_mod.reset_cad_artifact_cache_stats()
+
+
+def _file(session, vault: Path, file_id: str, checksum: str = "sha-1") -> FileContainer:
+    system_path = f"2d/{file_id}/drawing.dwg"
+    (vault / system_path).parent.mkdir(parents=True)
+    (vault / system_path).write_bytes(b"AC1032")
+    fc = FileContainer(
+        id=file_id,
+        filename="drawing.dwg",
+        file_type="dwg",
+        system_path=system_path,
+        checksum=checksum,
+        document_type="2d",
+    )
+    session.add(fc)
+    session.flush()
+    return fc
+
+
+def _run_preview(session, vault: Path, file_id: str):
+    converter = MagicMock()
+    converter._get_file_path.side_effect = lambda fc: str(vault / fc.system_path)
+
+    def generate(_source, fc):
+        out = vault / "generated" / fc.id / "preview.png"
+        out.parent.mkdir(parents=True, exist_ok=True)
+        out.write_bytes(b"\x89PNG" + b"\0" * 64)
+        return str(out)
+
+    converter._generate_preview.side_effect = generate
+    with patch.object(
+        cpt, "_cad_backend_profile_resolution", return_value={"effective": "local-baseline"}
+    ), patch.object(cpt, "CADConverterService", return_value=converter):
+        result = cpt.cad_preview({"file_id": file_id}, session)
+    return result, converter
+
+
+def test_preview_links_cached_artifacts_for_same_content(cache_env):
+    session, vault = cache_env
+    first = _file(session, vault, "file-a")
+    second = _file(session, vault, "file-b")
+    other = _file(session, vault, "file-c", checksum="sha-2")
+
+    result, converter = _run_preview(session, vault, "file-a")
+    assert "source" not in result
+    assert converter._generate_preview.call_count == 1
+
+    result, converter = _run_preview(session, vault, "file-b")
+    assert result["source"] == "cache"
+    converter._generate_preview.assert_not_called()
+    assert second.preview_path == first.preview_path
+
+    result, converter = _run_preview(session, vault, "file-c")
+    assert converter._generate_preview.call_count == 1
+    assert other.preview_path != first.preview_path
+
+    assert cad_artifact_cache_stats() == {
+        "preview": {"hits": 1, "misses": 2, "stores": 2, "evictions": 0}
+    }
+    text = render_cad_artifact_cache_metrics(cad_artifact_cache_stats())
+    assert 'yuantus_cad_artifact_cache_hits_total{kind="preview"} 1' in text
+    assert 'yuantus_cad_artifact_cache_misses_total{kind="preview"} 2' in text
+
+
+def test_stale_entry_is_dropped_and_recomputed(cache_env):
+    session, vault = cache_env
+    first = _file(session, vault, "file-a")
+    _file(session, vault, "file-b")
+    _run_preview(session, vault, "file-a")
+    (vault / first.preview_path).unlink()
+
+    result, converter = _run_preview(session, vault, "file-b")
+    assert "source" not in result
+    assert converter._generate_preview.call_count == 1
+    [entry] = session.query(CadArtifactCacheEntry).all()
+    assert entry.source_file_id == "file-b"
+
+
+def test_concurrent_store_for_same_content_keeps_the_conversion(cache_env):
+    session, vault = cache_env
+    _file(session, vault, "file-a")
+    second = _file(session, vault, "file-b")
+    _run_preview(session, vault, "file-a")
+    session.commit()
+    [winner] = session.query(CadArtifactCacheEntry).all()
+    session.expunge(winner)
+
+    # file-b's worker looked the key up before file-a's store landed.
+    real_get = session.get
+
+    def racing_get(model, ident, **kwargs):
+        if model is CadArtifactCacheEntry:
+            return None
+        return real_get(model, ident, **kwargs)
+
+    with patch.object(session, "get", side_effect=racing_get):
+        result, converter = _run_preview(session, vault, "file-b")
+
+    assert "source" not in result
+    assert converter._generate_preview.call_count == 1
+    assert second.preview_path.endswith("preview.png")
+    session.commit()
+    [entry] = session.query(CadArtifactCacheEntry).all()
+    assert entry.source_file_id == "file-a"
+    assert cad_artifact_cache_stats()["preview"]["stores"] == 1
+
+
+def test_extract_reuses_attributes(cache_env):
+    session, vault = cache_env
+    _file(session, vault, "file-a")
+    second = _file(session, vault, "file-b")
+
+    extract = MagicMock(return_value=({"part_number": "P-1"}, "external"))
+    with patch.object(cpt.CadService, "extract_attributes_for_file", extract):
+        cpt.cad_extract({"file_id": "file-a"}, session)
+        result = cpt.cad_extract({"file_id": "file-b"}, session)
+
+    assert extract.call_count == 1
+    assert result["cached"] is True
+    assert second.cad_attributes == {"part_number": "P-1"}
+    assert second.cad_attributes_source == "external"
+    assert second.cad_metadata_path.endswith("file-b.json")
+
+
+def test_eviction_drops_least_recently_used(cache_env, monkeypatch):
+    session, vault = cache_env
+    monkeypatch.setattr(get_settings(), "CAD_ARTIFACT_CACHE_MAX_ENTRIES", 2)
+    cache = CadArtifactCacheService(session)
+    files = [_file(session, vault, f"file-{n}", checksum=f"sha-{n}") for n in range(3)]
+    for fc in files[:2]:
+        cache.store(fc, "extract", "local", {"cad_attributes": {"n": fc.id}})
+
+    reader = _file(session, vault, "reader", checksum="sha-0")
+    assert cache.lookup(reader, "extract", "local") == {"cad_attributes": {"n": "file-0"}}
+    cache.store(files[2], "extract", "local", {"cad_attributes": {"n": "file-2"}})
+
+    remaining = {entry.source_file_id for entry in session.query(CadArtifactCacheEntry)}
+    assert remaining == {"file-0", "file-2"}
+    assert cad_artifact_cache_stats()["extract"]["evictions"] == 1
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from yuantus.config import get_settings
+from yuantus.meta_engine.bootstrap import import_all_models
+from yuantus.meta_engine.cutted_parts.models import CutPlan, CutRollup
+from yuantus.meta_engine.cutted_parts.rollups import rollup_period
+from yuantus.meta_engine.cutted_parts.service import CuttedPartsService
+from yuantus.meta_engine.services import sql_helpers
+from yuantus.models import user as _user  # noqa: F401 - registers users table
+from yuantus.models.base import Base
+
+import_all_models()
+
+_PANELS = (
+    "overview",
+    "utilization_overview",
+    "material_utilization",
+    "variance_overview",
+    "throughput_overview",
+    "bottlenecks_summary",
+)
+
+
+@pytest.fixture()
+def rollup_env(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(get_settings(), "CUTTED_PARTS_ROLLUPS_ENABLED", True)
+    sql_helpers._TABLE_PRESENT.clear()
+    engine = create_engine(f"sqlite:///{tmp_path / 'cut.db'}", future=True)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+        sql_helpers._TABLE_PRESENT.clear()
+
+
+def _seed(service: CuttedPartsService):
+    steel = service.create_material(
+        name="Steel", stock_quantity=100.0, cost_per_unit=12.5
+    )
+    alu = service.create_material(name="Alu", stock_quantity=40.0, cost_per_unit=3.0)
+    service.create_material(name="Unused", stock_quantity=5.0)
+
+    specs = [
+        (steel.id, 4.0, 10, 9, 5.0),
+        (steel.id, 2.0, 10, 6, 18.0),
+        (alu.id, 3.0, 8, 2, 40.0),
+        (alu.id, 1.0, 0, 0, None),
+        (None, 1.0, 5, 5, 2.0),
+    ]
+    plans = []
+    for material_id, qty, total, ok, waste in specs:
+        plan = service.create_plan(
+            name=f"plan-{len(plans)}", material_id=material_id, material_quantity=qty
+        )
+        service.update_plan(
+            plan.id,
+            total_parts=total,
+            ok_count=ok,
+            scrap_count=total - ok,
+            waste_pct=waste,
+        )
+        plans.append(plan)
+
+    # Distinct cut counts per plan, so max/min throughput plans are unambiguous.
+    for status in ("ok", "ok", "scrap", "rework"):
+        service.add_cut(plans[0].id, status=status, scrap_weight=0.5)
+    for status in ("ok", "rework"):
+        service.add_cut(plans[1].id, status=status)
+    service.add_cut(plans[2].id, status="scrap", scrap_weight=2.0)
+    for _ in range(3):
+        service.add_cut(plans[4].id)
+    service.transition_plan_state(plans[0].id, "confirmed")
+    return plans, steel, alu
+
+
+def _panels(service: CuttedPartsService):
+    panels = {name: getattr(service, name)() for name in _PANELS}
+    # The scan path lists materials in storage order; compare them by id.
+    panels["material_utilization"]["materials"].sort(key=lambda m: m["material_id"])
+    return panels
+
+
+def test_rollup_panels_match_full_scan(rollup_env, monkeypatch):
+    service = CuttedPartsService(rollup_env)
+    _seed(service)
+    assert rollup_env.query(CutRollup).count() == 3
+
+    from_rollups = _panels(service)
+    monkeypatch.setattr(get_settings(), "CUTTED_PARTS_ROLLUPS_ENABLED", False)
+    assert _panels(service) == from_rollups
+
+
+def test_writes_keep_rollups_current(rollup_env):
+    service = CuttedPartsService(rollup_env)
+    plans, steel, alu = _seed(service)
+    period = rollup_period(datetime.now(timezone.utc))
+
+    steel_row = rollup_env.get(CutRollup, f"{period}:{steel.id}")
+    assert steel_row.plan_count == 2
+    assert steel_row.plans_by_state == {"confirmed": 1, "draft": 1}
+    assert (steel_row.cut_count, steel_row.cut_ok, steel_row.cut_scrap) == (6, 3, 1)
+    assert steel_row.cut_scrap_weight == pytest.approx(2.0)
+
+    # Moving a plan to another material updates both rows.
+    service.update_plan(plans[1].id, material_id=alu.id)
+    rollup_env.refresh(steel_row)
+    alu_row = rollup_env.get(CutRollup, f"{period}:{alu.id}")
+    assert steel_row.plan_count == 1 and steel_row.material_quantity == 4.0
+    assert alu_row.plan_count == 3 and alu_row.material_quantity == 6.0
+    assert (steel_row.cut_count, alu_row.cut_count) == (4, 3)
+
+    service.update_plan(plans[4].id, material_id=steel.id)
+    assert rollup_env.get(CutRollup, f"{period}:-") is None
+
+
+def test_concurrent_first_write_for_a_month_updates_the_winning_row(rollup_env):
+    service = CuttedPartsService(rollup_env)
+    steel = service.create_material(name="Steel", stock_quantity=100.0)
+    rollup_env.commit()
+
+    # Another worker creates the first steel plan of the month and commits.
+    other = sessionmaker(bind=rollup_env.get_bind(), expire_on_commit=False)()
+    try:
+        CuttedPartsService(other).create_plan(
+            name="theirs", material_id=steel.id, material_quantity=2.0
+        )
+        other.commit()
+    finally:
+        other.close()
+
+    # This worker had looked the row up before that insert landed.
+    real_get = rollup_env.get
+    missed = []
+
+    def racing_get(model, ident, **kwargs):
+        if model is CutRollup and not missed:
+            missed.append(ident)
+            return None
+        return real_get(model, ident, **kwargs)
+
+    with patch.object(rollup_env, "get", side_effect=racing_get):
+        service.create_plan(name="ours", material_id=steel.id, material_quantity=3.0)
+    rollup_env.commit()
+
+    assert missed
+    [row] = rollup_env.query(CutRollup).all()
+    assert row.plan_count == 2 and row.material_quantity == 5.0
+
+
+def test_rebuild_recomputes_rows(rollup_env):
+    service = CuttedPartsService(rollup_env)
+    _seed(service)
+    expected = _panels(service)
+
+    # Plans written behind the service's back are picked up by a rebuild.
+    rollup_env.query(CutRollup).delete()
+    rollup_env.add(CutPlan(id="bulk", name="bulk", state="draft", total_parts=4))
+    rollup_env.flush()
+
+    assert service.rollups.rebuild() == {"rows": 3}
+    rebuilt = _panels(service)
+    assert rebuilt["overview"]["total_plans"] == expected["overview"]["total_plans"] + 1
+    assert rebuilt["utilization_overview"]["low_utilization"] == (
+        expected["utilization_overview"]["low_utilization"] + 1
+    )
@@ -127,3 +127,75 @@ class TestEffectivity:
             service._check_serial(eff, EffectivityContext(serial_number="SN-9"))
             is False
         )
+
+    def test_batch_matches_single_checks(self, mock_session):
+        service = EffectivityService(mock_session)
+        now = datetime(2026, 3, 1)
+        rows = [
+            # I1: two overlapping date windows + a disjoint one
+            self._eff(item_id="I1", effectivity_type="Date",
+                      start_date=now - timedelta(days=30), end_date=now - timedelta(days=10),
+                      payload={}),
+            self._eff(item_id="I1", effectivity_type="Date",
+                      start_date=now - timedelta(days=15), end_date=now - timedelta(days=5),
+                      payload={}),
+            self._eff(item_id="I1", effectivity_type="Date",
+                      start_date=now + timedelta(days=5), end_date=None, payload={}),
+            # I2: lot + serial + unit
+            self._eff(item_id="I2", effectivity_type="Lot", start_date=None,
+                      end_date=None, payload={"lot_start": "L010", "lot_end": "L020"}),
+            self._eff(item_id="I2", effectivity_type="Serial", start_date=None,
+                      end_date=None, payload={"serials": ["SN-1"]}),
+            self._eff(item_id="I2", effectivity_type="Unit", start_date=None,
+                      end_date=None, payload={"unit_positions": ["U-1"]}),
+            # I3: unknown type only -> never effective
+            self._eff(item_id="I3", effectivity_type="Custom", start_date=None,
+                      end_date=None, payload={}),
+        ]
+        mock_session.query.return_value.filter.return_value.all.return_value = rows
+        contexts = [
+            EffectivityContext(reference_date=now - timedelta(days=20)),
+            EffectivityContext(reference_date=now - timedelta(days=7)),
+            EffectivityContext(reference_date=now - timedelta(days=2)),
+            EffectivityContext(reference_date=now + timedelta(days=400)),
+            EffectivityContext(reference_date=now, lot_number="L015"),
+            EffectivityContext(reference_date=now, lot_number="L030"),
+            EffectivityContext(reference_date=now, serial_number="SN-1"),
+            EffectivityContext(reference_date=now, unit_position="U-2"),
+        ]
+        for ctx in contexts:
+            result = service.check_effectivity_batch(["I1", "I2", "I3", "I4"], ctx)
+            for item_id in ("I1", "I2", "I3"):
+                expected = any(
+                    service._check_single(eff, ctx)
+                    for eff in rows
+                    if eff.item_id == item_id
+                )
+                assert result[item_id] is expected, (item_id, ctx)
+            # No effectivity defined = always effective
+            assert result["I4"] is True
+
+    def test_batch_loads_effectivities_in_one_query(self, mock_session):
+        service = EffectivityService(mock_session)
+        mock_session.query.return_value.filter.return_value.all.return_value = []
+
+        result = service.check_effectivity_batch(
+            ["I1", "I2", "I1", None], EffectivityContext(reference_date=datetime.utcnow())
+        )
+
+        assert result == {"I1": True, "I2": True}
+        assert mock_session.query.call_count == 1
+
+    def test_filter_bom_by_effectivity_uses_batch(self, mock_session):
+        service = EffectivityService(mock_session)
+        now = datetime.utcnow()
+        mock_session.query.return_value.filter.return_value.all.return_value = [
+            self._eff(item_id="L2", effectivity_type="Date",
+                      start_date=now + timedelta(days=1), end_date=None, payload={}),
+        ]
+        lines = [{"item_id": "L1"}, {"item_id": "L2"}]
+
+        assert service.filter_bom_by_effectivity(
+            lines, EffectivityContext(reference_date=now)
+        ) == [{"item_id": "L1"}]
+        assert mock_session.query.call_count == 1
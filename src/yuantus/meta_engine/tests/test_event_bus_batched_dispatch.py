@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from yuantus.config import get_settings
+from yuantus.context import tenant_id_var
+from yuantus.meta_engine.events.domain_events import (
+    ItemCreatedEvent,
+    ItemDeletedEvent,
+    ItemUpdatedEvent,
+)
+from yuantus.meta_engine.events.event_bus import coalesce_item_updates, event_bus
+from yuantus.meta_engine.services import search_indexer
+
+
+def _updated(item_id: str, **changes) -> ItemUpdatedEvent:
+    return ItemUpdatedEvent(item_id=item_id, item_type_id="Part", changes=changes)
+
+
+@pytest.fixture()
+def bus(monkeypatch):
+    monkeypatch.setattr(event_bus, "_subscribers", {})
+    monkeypatch.setattr(event_bus, "_batch_handlers", set())
+    monkeypatch.setattr(event_bus, "_dispatch_stopped", False)
+    try:
+        yield event_bus
+    finally:
+        event_bus.stop_async_dispatch()
+
+
+def test_coalesce_merges_consecutive_updates_per_item_only():
+    created = ItemCreatedEvent(item_id="a", item_type_id="Part", properties={})
+    deleted = ItemDeletedEvent(item_id="a", item_type_id="Part")
+    events = [
+        created,
+        _updated("a", name="x", qty=1),
+        _updated("b", name="b1"),
+        _updated("a", name="y"),
+        deleted,
+        _updated("a", name="z"),
+    ]
+
+    merged = coalesce_item_updates(events)
+
+    assert [(e.event_type, e.item_id) for e in merged] == [
+        ("item.created", "a"),
+        ("item.updated", "a"),
+        ("item.updated", "b"),
+        ("item.deleted", "a"),
+        ("item.updated", "a"),
+    ]
+    assert merged[1].changes == {"name": "y", "qty": 1}
+    assert merged[1].event_id == events[3].event_id
+    assert merged[1].metadata["coalesced"] == 2
+    assert merged[4].changes == {"name": "z"}
+
+
+def test_batch_handler_is_called_synchronously_when_async_disabled(bus, monkeypatch):
+    monkeypatch.setattr(get_settings(), "EVENT_BUS_ASYNC_ENABLED", False)
+    calls = []
+
+    def _batch(events):
+        calls.append([e.item_id for e in events])
+
+    bus.subscribe(ItemUpdatedEvent, _batch, batch=True)
+    bus.publish(_updated("a"))
+    bus.publish(_updated("a"))
+
+    assert calls == [["a"], ["a"]]
+
+
+def test_async_dispatch_batches_coalesces_and_keeps_publisher_context(bus, monkeypatch):
+    monkeypatch.setattr(get_settings(), "EVENT_BUS_ASYNC_ENABLED", True)
+    plain_calls = []
+    batches = []
+
+    def _plain(event):
+        plain_calls.append((threading.current_thread().name, event.item_id))
+
+    def _batch(events):
+        batches.append(
+            (
+                threading.current_thread().name,
+                tenant_id_var.get(),
+                [(e.item_id, e.changes) for e in events],
+            )
+        )
+
+    bus.start_async_dispatch(batch_window_ms=200)
+    bus.subscribe(ItemUpdatedEvent, _plain)
+    bus.subscribe(ItemUpdatedEvent, _batch, batch=True)
+
+    token = tenant_id_var.set("tenant-7")
+    try:
+        for i in range(5):
+            bus.publish(_updated("a", rev=i))
+        bus.publish(_updated("b", rev=0))
+    finally:
+        tenant_id_var.reset(token)
+
+    assert [item for _, item in plain_calls] == ["a"] * 5 + ["b"]
+    assert all(name != "EventBus-Dispatcher" for name, _ in plain_calls)
+    assert bus.flush(timeout=5)
+    assert batches == [
+        ("EventBus-Dispatcher", "tenant-7", [("a", {"rev": 4}), ("b", {"rev": 0})])
+    ]
+
+
+def test_async_dispatch_falls_back_to_sync_when_queue_is_full(bus, monkeypatch):
+    monkeypatch.setattr(get_settings(), "EVENT_BUS_ASYNC_ENABLED", True)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def _batch(events):
+        on_dispatcher = threading.current_thread().name == "EventBus-Dispatcher"
+        calls.append((on_dispatcher, [e.item_id for e in events]))
+        if on_dispatcher and not started.is_set():
+            started.set()
+            release.wait(5)
+
+    bus.start_async_dispatch(queue_size=1, batch_window_ms=0)
+    bus.subscribe(ItemUpdatedEvent, _batch, batch=True)
+
+    bus.publish(_updated("first"))
+    assert started.wait(5)
+    bus.publish(_updated("queued"))
+    bus.publish(_updated("overflow"))
+    assert calls[-1] == (False, ["overflow"])
+
+    release.set()
+    assert bus.flush(timeout=5)
+    assert (True, ["queued"]) in calls
+
+
+def test_publish_after_stop_stays_synchronous(bus, monkeypatch):
+    monkeypatch.setattr(get_settings(), "EVENT_BUS_ASYNC_ENABLED", True)
+    calls = []
+    bus.subscribe(
+        ItemUpdatedEvent,
+        lambda events: calls.append(threading.current_thread().name),
+        batch=True,
+    )
+    bus.publish(_updated("lazy"))
+    assert bus.flush(timeout=5)
+    assert calls == ["EventBus-Dispatcher"]
+
+    bus.stop_async_dispatch()
+    bus.publish(_updated("after-stop"))
+
+    assert calls[-1] == threading.current_thread().name
+    assert bus._queue is None
+    assert not any(t.name == "EventBus-Dispatcher" for t in threading.enumerate())
+
+    bus.start_async_dispatch()
+    bus.publish(_updated("restarted"))
+    assert bus.flush(timeout=5)
+    assert calls[-1] == "EventBus-Dispatcher"
+
+
+def test_search_indexer_item_handler_indexes_a_batch_in_one_session(monkeypatch):
+    sessions = []
+    indexed = []
+
+    class FakeSession:
+        def get(self, _model, item_id: str):
+            return SimpleNamespace(id=item_id)
+
+    class FakeSearchService:
+        def __init__(self, session):
+            self.session = session
+            self.client = object()
+
+        def ensure_index(self) -> None:
+            return None
+
+        def index_item(self, item) -> None:
+            indexed.append(item.id)
+
+    @contextmanager
+    def fake_db_session():
+        sessions.append(1)
+        yield FakeSession()
+
+    monkeypatch.setattr(search_indexer, "SearchService", FakeSearchService)
+    monkeypatch.setattr(search_indexer, "get_db_session", fake_db_session)
+    before = search_indexer.indexer_status()["success_counts"]["item.updated"]
+
+    search_indexer._handle_item_updated(
+        [_updated("a"), _updated("b"), _updated("a")]
+    )
+
+    assert len(sessions) == 1
+    assert indexed == ["a", "b"]
+    after = search_indexer.indexer_status()["success_counts"]["item.updated"]
+    assert after == before + 3
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+from yuantus.api.app import create_app
+from yuantus.config import get_settings
+from yuantus.database import get_db
+from yuantus.meta_engine.services.file_service import FileService
+from yuantus.meta_engine.storage.local_storage import LocalStorageProvider
+from yuantus.meta_engine.web import file_storage_router, file_viewer_router
+
+PAYLOAD = bytes(range(256)) * 40  # 10 KiB
+
+
+class _RemoteStorage(LocalStorageProvider):
+    """Local files without a local path or presigned URL: the streaming path."""
+
+    def get_local_path(self, file_path):
+        return None
+
+    def download_file(self, file_path, output_file_obj):  # pragma: no cover
+        raise AssertionError("downloads must stream, not buffer")
+
+
+@pytest.fixture()
+def download_env(tmp_path, monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "AUTH_MODE", "optional")
+    monkeypatch.setattr(settings, "LOCAL_STORAGE_PATH", str(tmp_path))
+    monkeypatch.setattr(settings, "LOCAL_STORAGE_PUBLIC_URL_PREFIX", "")
+    (tmp_path / "3d").mkdir()
+    (tmp_path / "3d" / "part.step").write_bytes(PAYLOAD)
+    (tmp_path / "3d" / "mesh.gltf").write_bytes(PAYLOAD)
+
+    container = SimpleNamespace(
+        id="f1",
+        filename="part.step",
+        mime_type="model/step",
+        system_path="3d/part.step",
+        geometry_path="3d/mesh.gltf",
+    )
+    db = MagicMock()
+    db.get.return_value = container
+    app = create_app()
+    app.dependency_overrides[get_db] = lambda: db
+
+    def use(provider_cls):
+        service = lambda: FileService(provider_cls(settings))  # noqa: E731
+        monkeypatch.setattr(file_storage_router, "FileService", service)
+        monkeypatch.setattr(file_viewer_router, "FileService", service)
+
+    return TestClient(app), use
+
+
+@pytest.mark.parametrize("provider_cls", [_RemoteStorage, LocalStorageProvider])
+def test_download_supports_ranges_and_etags(download_env, provider_cls):
+    client, use = download_env
+    use(provider_cls)
+
+    full = client.get("/api/v1/file/f1/download")
+    assert full.status_code == 200
+    assert full.content == PAYLOAD
+    assert full.headers["accept-ranges"] == "bytes"
+    assert full.headers["content-disposition"] == 'attachment; filename="part.step"'
+    etag = full.headers["etag"]
+
+    part = client.get("/api/v1/file/f1/download", headers={"Range": "bytes=100-199"})
+    assert part.status_code == 206
+    assert part.content == PAYLOAD[100:200]
+    assert part.headers["content-range"] == f"bytes 100-199/{len(PAYLOAD)}"
+
+    tail = client.get("/api/v1/file/f1/download", headers={"Range": "bytes=-10"})
+    assert tail.status_code == 206
+    assert tail.content == PAYLOAD[-10:]
+
+    cached = client.get("/api/v1/file/f1/download", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    stale = client.get(
+        "/api/v1/file/f1/download",
+        headers={"Range": "bytes=0-9", "If-Range": '"stale"'},
+    )
+    assert stale.status_code == 200
+    assert stale.content == PAYLOAD
+
+    beyond = client.get(
+        "/api/v1/file/f1/download", headers={"Range": f"bytes={len(PAYLOAD)}-"}
+    )
+    assert beyond.status_code == 416
+    assert beyond.headers["content-range"] == f"bytes */{len(PAYLOAD)}"
+
+
+def test_viewer_geometry_streams_ranges(download_env):
+    client, use = download_env
+    use(_RemoteStorage)
+
+    resp = client.get("/api/v1/file/f1/geometry", headers={"Range": "bytes=0-15"})
+    assert resp.status_code == 206
+    assert resp.content == PAYLOAD[:16]
+    assert resp.headers["content-type"] == "model/gltf+json"
+
+
+def test_missing_object_is_a_clean_error(download_env):
+    client, use = download_env
+    use(_RemoteStorage)
+    container = client.app.dependency_overrides[get_db]().get.return_value
+    container.system_path = "3d/missing.step"
+
+    resp = client.get("/api/v1/file/f1/download")
+    assert resp.status_code == 500
+    assert resp.json()["detail"].startswith("Download failed:")
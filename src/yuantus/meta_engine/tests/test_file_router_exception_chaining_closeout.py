@@ -123,7 +123,7 @@ def test_file_storage_upload_failure_preserves_exception_cause_and_rollback() ->
     class FailingUploadFile:
         filename = "part.stp"
 
-        async def read(self) -> bytes:
+        async def read(self, size: int = -1) -> bytes:
             raise RuntimeError("read failed")
 
     with pytest.raises(HTTPException) as exc_info:
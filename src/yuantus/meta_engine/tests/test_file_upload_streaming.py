@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import hashlib
+import io
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.datastructures import UploadFile
+
+from yuantus.api.app import create_app
+from yuantus.config import get_settings
+from yuantus.database import get_db
+from yuantus.meta_engine.models.file import FileContainer
+from yuantus.security.auth.database import get_identity_db
+
+CHUNK = 64 * 1024
+
+
+@pytest.fixture()
+def upload_env(tmp_path, monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "AUTH_MODE", "optional")
+    monkeypatch.setattr(settings, "STORAGE_TYPE", "local")
+    monkeypatch.setattr(settings, "LOCAL_STORAGE_PATH", str(tmp_path / "vault"))
+    monkeypatch.setattr(settings, "FILE_UPLOAD_CHUNK_BYTES", CHUNK)
+
+    read_sizes = []
+    real_read = UploadFile.read
+
+    async def recording_read(self, size: int = -1):
+        read_sizes.append(size)
+        return await real_read(self, size)
+
+    monkeypatch.setattr(UploadFile, "read", recording_read)
+
+    db = MagicMock()
+    db.query.return_value.filter.return_value.first.return_value = None
+    app = create_app()
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_identity_db] = lambda: MagicMock()
+    return TestClient(app), db, tmp_path / "vault", read_sizes
+
+
+def test_upload_hashes_and_stores_in_chunks(upload_env):
+    client, db, vault, read_sizes = upload_env
+    payload = bytes(range(256)) * (5 * CHUNK // 256 + 7)
+
+    resp = client.post(
+        "/api/v1/file/upload",
+        files={"file": ("drawing.pdf", io.BytesIO(payload), "application/pdf")},
+    )
+
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["size"] == len(payload)
+    [container] = [c.args[0] for c in db.add.call_args_list]
+    assert isinstance(container, FileContainer)
+    assert container.checksum == hashlib.sha256(payload).hexdigest()
+    assert (vault / container.system_path).read_bytes() == payload
+    # never a whole-body read
+    assert read_sizes and all(0 < size <= CHUNK for size in read_sizes)
+
+
+def test_upload_over_limit_is_rejected_before_storage(upload_env, monkeypatch):
+    client, db, vault, _ = upload_env
+    monkeypatch.setattr(get_settings(), "FILE_UPLOAD_MAX_BYTES", 3 * CHUNK)
+
+    resp = client.post(
+        "/api/v1/file/upload",
+        files={"file": ("part.stp", io.BytesIO(b"x" * (4 * CHUNK)), "model/step")},
+    )
+
+    assert resp.status_code == 413
+    assert resp.json()["detail"]["code"] == "FILE_TOO_LARGE"
+    assert resp.json()["detail"]["file_size"] == 4 * CHUNK
+    assert not db.add.called
+    assert not any(path.is_file() for path in vault.rglob("*"))
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+pytest.importorskip("strawberry")
+
+import strawberry  # noqa: E402
+
+from yuantus.config import get_settings  # noqa: E402
+from yuantus.meta_engine.bootstrap import import_all_models  # noqa: E402
+from yuantus.meta_engine.models.item import Item  # noqa: E402
+from yuantus.meta_engine.models.meta_schema import ItemType  # noqa: E402
+from yuantus.meta_engine.web.graphql.loaders import create_data_loaders  # noqa: E402
+from yuantus.meta_engine.web.graphql.schema import (  # noqa: E402
+    QueryWithInfo,
+    _schema_extensions,
+    schema,
+)
+from yuantus.models import user as _user  # noqa: E402,F401 - registers users table
+from yuantus.models.base import Base  # noqa: E402
+
+import_all_models()
+
+EXPLODE = """
+query ($id: String!, $maxLevel: Int!) {
+  bomExplode(partId: $id, maxLevel: $maxLevel) { level path componentNumber quantity }
+}
+"""
+
+
+@pytest.fixture()
+def bom_env(tmp_path: Path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'gql.db'}",
+        connect_args={"check_same_thread": False},
+        future=True,
+    )
+    Base.metadata.create_all(engine)
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda _c, _cur, stmt, *_a: statements.append((stmt, threading.get_ident())),
+    )
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    session.add_all([ItemType(id="Part"), ItemType(id="Part BOM", is_relationship=True)])
+
+    def add(item_id, type_id, source_id=None, related_id=None, **props):
+        session.add(
+            Item(
+                id=item_id,
+                item_type_id=type_id,
+                config_id=f"cfg-{item_id}",
+                generation=1,
+                is_current=True,
+                state="Draft",
+                source_id=source_id,
+                related_id=related_id,
+                properties=props,
+            )
+        )
+
+    for part in "ABCD":
+        add(part, "Part", item_number=f"P-{part}")
+    # A -> B, A -> C, B -> D, C -> B (shared), D -> A (cycle)
+    add("l1", "Part BOM", "A", "B", quantity=2)
+    add("l2", "Part BOM", "A", "C")
+    add("l3", "Part BOM", "B", "D")
+    add("l4", "Part BOM", "C", "B")
+    add("l5", "Part BOM", "D", "A")
+    session.commit()
+    statements.clear()
+    try:
+        yield session, statements
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def _execute(session, query, variables, gql_schema=schema):
+    context = {"db": session, **create_data_loaders(session)}
+    return asyncio.run(
+        gql_schema.execute(query, variable_values=variables, context_value=context)
+    )
+
+
+def test_bom_explode_walks_levels_in_batches(bom_env):
+    session, statements = bom_env
+    result = _execute(session, EXPLODE, {"id": "A", "maxLevel": 10})
+    assert result.errors is None
+    rows = [(r["level"], r["path"]) for r in result.data["bomExplode"]]
+    # Depth-first order; shared and cyclic parents are expanded once.
+    assert rows == [(1, "A/B"), (2, "A/B/D"), (3, "A/B/D/A"), (1, "A/C"), (2, "A/C/B")]
+    assert result.data["bomExplode"][0]["quantity"] == 2.0
+    assert result.data["bomExplode"][0]["componentNumber"] == "P-B"
+
+    item_queries = [s for s, _ in statements if "FROM meta_items" in s]
+    # lines + children per level (A; B, C; D), not one select + get per line
+    assert len(item_queries) <= 6
+    # all DB work ran in worker threads
+    assert threading.get_ident() not in {tid for _, tid in statements}
+
+    shallow = _execute(session, EXPLODE, {"id": "A", "maxLevel": 2})
+    assert [r["path"] for r in shallow.data["bomExplode"]] == [
+        "A/B",
+        "A/B/D",
+        "A/C",
+        "A/C/B",
+    ]
+
+
+def test_bom_explode_line_limit(bom_env, monkeypatch):
+    session, _ = bom_env
+    monkeypatch.setattr(get_settings(), "GRAPHQL_BOM_EXPLODE_MAX_LINES", 3)
+    result = _execute(session, EXPLODE, {"id": "A", "maxLevel": 10})
+    assert result.errors and "exceeds 3 lines" in result.errors[0].message
+    assert _execute(session, EXPLODE, {"id": "B", "maxLevel": 1}).errors is None
+
+
+def test_query_depth_limit(bom_env, monkeypatch):
+    session, _ = bom_env
+    monkeypatch.setattr(get_settings(), "GRAPHQL_MAX_QUERY_DEPTH", 3)
+    limited = strawberry.Schema(query=QueryWithInfo, extensions=_schema_extensions())
+    deep = """
+    { bomLines(partId: "A") { childBomLines { childBomLines { childBomLines { id } } } } }
+    """
+    result = _execute(session, deep, None, limited)
+    assert result.errors and "exceeds maximum operation depth" in result.errors[0].message
+    shallow = _execute(session, '{ bomLines(partId: "A") { childId } }', None, limited)
+    assert shallow.errors is None
+    assert sorted(line["childId"] for line in shallow.data["bomLines"]) == ["B", "C"]
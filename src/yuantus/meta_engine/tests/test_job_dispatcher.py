@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from yuantus.config import get_settings
+from yuantus.meta_engine.bootstrap import import_all_models
+from yuantus.meta_engine.models.job import ConversionJob, JobStatus
+from yuantus.meta_engine.services import job_dispatcher as dispatcher_mod
+from yuantus.meta_engine.services import job_worker as worker_mod
+from yuantus.meta_engine.services.job_dispatcher import JobDispatcher, parse_task_limits
+from yuantus.meta_engine.services.job_service import JobService
+from yuantus.meta_engine.services.job_worker import JobWorker
+from yuantus.models.base import Base
+
+
+@pytest.fixture()
+def session_factory(tmp_path: Path, monkeypatch):
+    import_all_models()
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'jobs.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(engine, tables=[ConversionJob.__table__])
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+
+    @contextmanager
+    def _session():
+        db = factory()
+        try:
+            yield db
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    monkeypatch.setattr(dispatcher_mod, "get_db_session", _session)
+    monkeypatch.setattr(worker_mod, "get_db_session", _session)
+    try:
+        yield factory
+    finally:
+        engine.dispose()
+
+
+def _enqueue(factory, task_type: str, count: int) -> None:
+    with factory() as db:
+        svc = JobService(db)
+        for i in range(count):
+            svc.create_job(task_type, {"n": i})
+
+
+def _statuses(factory) -> dict:
+    with factory() as db:
+        return {
+            job.id: (job.task_type, job.status, job.worker_id)
+            for job in db.query(ConversionJob).all()
+        }
+
+
+def _wait_until(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return predicate()
+
+
+def test_parse_task_limits():
+    assert parse_task_limits("") == {}
+    assert parse_task_limits(" cad_conversion=2, cad_ml_vision=1 ,") == {
+        "cad_conversion": 2,
+        "cad_ml_vision": 1,
+    }
+    for bad in ("cad_conversion", "cad_conversion=x", "cad_conversion=0", "=2"):
+        with pytest.raises(ValueError):
+            parse_task_limits(bad)
+
+
+def test_dispatch_respects_total_and_per_task_concurrency(session_factory):
+    release = threading.Event()
+    seen = []
+
+    def _blocking(payload):
+        seen.append(payload["n"])
+        release.wait(5)
+        return {"ok": True}
+
+    worker = JobWorker("w-pool", poll_interval=1)
+    worker.register_handler("slow", _blocking)
+    worker.register_handler("fast", _blocking)
+    _enqueue(session_factory, "slow", 4)
+    _enqueue(session_factory, "fast", 4)
+
+    dispatcher = JobDispatcher(
+        worker,
+        concurrency=3,
+        task_limits={"slow": 1},
+        reaper_interval=0,
+        listen=False,
+    )
+    dispatcher._executor = dispatcher_mod.ThreadPoolExecutor(max_workers=3)
+    try:
+        assert dispatcher.dispatch_once() == 3
+        inflight = dispatcher.inflight()
+        assert inflight.get("slow", 0) <= 1
+        assert sum(inflight.values()) == 3
+        # Full: nothing more is claimed until a slot frees up.
+        assert dispatcher.dispatch_once() == 0
+        processing = [
+            s for s in _statuses(session_factory).values()
+            if s[1] == JobStatus.PROCESSING.value
+        ]
+        assert len(processing) == 3
+        assert all(worker_id == "w-pool" for _, _, worker_id in processing)
+    finally:
+        release.set()
+        dispatcher._executor.shutdown(wait=True)
+
+    assert dispatcher.inflight() == {}
+
+
+def test_started_dispatcher_drains_queue_and_wakes_on_completion(session_factory):
+    done = []
+    lock = threading.Lock()
+
+    def _handler(payload):
+        time.sleep(0.01)
+        with lock:
+            done.append(payload["n"])
+        return {"n": payload["n"]}
+
+    worker = JobWorker("w-drain", poll_interval=30)
+    worker.register_handler("slow", _handler)
+    _enqueue(session_factory, "slow", 6)
+
+    dispatcher = JobDispatcher(
+        worker, concurrency=2, task_limits={}, reaper_interval=0, listen=False
+    )
+    dispatcher.start()
+    try:
+        # The poll interval is 30s, so draining relies on completion wake-ups.
+        assert _wait_until(lambda: len(done) == 6)
+        assert _wait_until(
+            lambda: all(
+                s[1] == JobStatus.COMPLETED.value
+                for s in _statuses(session_factory).values()
+            )
+        )
+    finally:
+        dispatcher.stop()
+    assert sorted(done) == list(range(6))
+
+
+def test_reaper_requeues_stale_jobs(session_factory, monkeypatch):
+    monkeypatch.setattr(get_settings(), "JOB_STALE_TIMEOUT_SECONDS", 60)
+    monkeypatch.setattr(get_settings(), "JOB_RETRY_BACKOFF_SECONDS", 0)
+    with session_factory() as db:
+        db.add(
+            ConversionJob(
+                id="stale-1",
+                task_type="slow",
+                status=JobStatus.PROCESSING.value,
+                payload={},
+                worker_id="dead-worker",
+                started_at=datetime.utcnow() - timedelta(minutes=5),
+                attempt_count=1,
+                max_attempts=3,
+            )
+        )
+        db.commit()
+
+    dispatcher = JobDispatcher(JobWorker("w-reaper"), listen=False)
+    assert dispatcher.reap_stale_jobs() == 1
+    assert _statuses(session_factory)["stale-1"][1] == JobStatus.PENDING.value
+
+
+def test_legacy_loop_requeue_is_throttled(monkeypatch):
+    monkeypatch.setattr(get_settings(), "JOB_REAPER_INTERVAL_SECONDS", 60)
+    job_service = MagicMock()
+    job_service.requeue_stale_jobs.return_value = 0
+    worker = JobWorker("w-legacy")
+
+    for _ in range(3):
+        worker._maybe_requeue_stale(job_service)
+
+    assert job_service.requeue_stale_jobs.call_count == 1
+
+
+def test_non_positive_reaper_interval_means_every_poll(monkeypatch):
+    monkeypatch.setattr(get_settings(), "JOB_REAPER_INTERVAL_SECONDS", 0)
+    worker = JobWorker("w-every-poll", poll_interval=5)
+    assert JobDispatcher(worker, listen=False)._reaper_wait() == 5
+    assert JobDispatcher(worker, reaper_interval=30, listen=False)._reaper_wait() == 30
+
+    job_service = MagicMock()
+    job_service.requeue_stale_jobs.return_value = 0
+    for _ in range(3):
+        worker._maybe_requeue_stale(job_service)
+    assert job_service.requeue_stale_jobs.call_count == 3
+
+
+def test_create_job_notifies_listeners_on_postgres_only(monkeypatch):
+    monkeypatch.setattr(get_settings(), "QUOTA_MODE", "disabled")
+    session = MagicMock()
+    session.get_bind.return_value.dialect.name = "postgresql"
+    JobService(session).create_job("cad_preview", {"file_id": "f1"})
+
+    statement = session.execute.call_args.args[0]
+    compiled = statement.compile(compile_kwargs={"literal_binds": True})
+    assert "pg_notify('yuantus_jobs', 'cad_preview')" in str(compiled)
+
+    session = MagicMock()
+    session.get_bind.return_value.dialect.name = "sqlite"
+    JobService(session).create_job("cad_preview", {"file_id": "f1"})
+    session.execute.assert_not_called()
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+from unittest.mock import MagicMock
+
+from yuantus.config import get_settings
+from yuantus.meta_engine.bootstrap import import_all_models
+from yuantus.meta_engine.models.job import ConversionJob, JobStatus
+from yuantus.meta_engine.services.job_service import JobService
+from yuantus.models.base import Base
+
+
+@pytest.fixture()
+def session():
+    import_all_models()
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine, tables=[ConversionJob.__table__])
+    SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _job(job_id: str, task_type: str = "cad_preview", **kwargs) -> ConversionJob:
+    now = datetime.utcnow()
+    values = dict(
+        id=job_id,
+        task_type=task_type,
+        payload={},
+        status=JobStatus.PENDING.value,
+        priority=10,
+        attempt_count=0,
+        max_attempts=3,
+        created_at=now,
+        scheduled_at=now - timedelta(seconds=1),
+    )
+    values.update(kwargs)
+    return ConversionJob(**values)
+
+
+def test_claim_batch_marks_up_to_n_jobs_in_priority_order(session):
+    base = datetime.utcnow() - timedelta(minutes=1)
+    session.add_all(
+        [
+            _job("low", priority=20, created_at=base),
+            _job("urgent", priority=1, created_at=base + timedelta(seconds=2)),
+            _job("older", priority=10, created_at=base),
+            _job("newer", priority=10, created_at=base + timedelta(seconds=1)),
+            _job("later", scheduled_at=datetime.utcnow() + timedelta(hours=1)),
+            _job("busy", status=JobStatus.PROCESSING.value),
+        ]
+    )
+    session.commit()
+
+    claimed = JobService(session).claim_batch("w-1", 3)
+
+    assert [job.id for job in claimed] == ["urgent", "older", "newer"]
+    for job in claimed:
+        assert job.status == JobStatus.PROCESSING.value
+        assert job.worker_id == "w-1"
+        assert job.started_at is not None
+        assert job.attempt_count == 1
+    remaining = {
+        job.id
+        for job in session.query(ConversionJob).filter(
+            ConversionJob.status == JobStatus.PENDING.value
+        )
+    }
+    assert remaining == {"low", "later"}
+
+
+def test_claim_batch_filters_task_types_and_handles_empty_queue(session):
+    session.add_all([_job("a", "cad_preview"), _job("b", "cad_bom"), _job("c", "cad_bom")])
+    session.commit()
+    svc = JobService(session)
+
+    assert [j.id for j in svc.claim_batch("w-1", 10, task_types=["cad_bom"])] == ["b", "c"]
+    assert svc.claim_batch("w-1", 10, task_types=["cad_bom"]) == []
+    assert svc.claim_batch("w-1", 0) == []
+
+
+def test_claim_batch_uses_one_commit_per_batch(session):
+    session.add_all([_job(f"j{i}") for i in range(5)])
+    session.commit()
+    commits = []
+    event.listen(session, "after_commit", lambda _s: commits.append(1))
+
+    assert len(JobService(session).claim_batch("w-1", 5)) == 5
+    assert len(commits) == 1
+
+
+def test_claim_batch_caps_batch_to_processing_quota(session, monkeypatch):
+    session.add_all([_job(f"j{i}") for i in range(5)])
+    session.commit()
+    svc = JobService(session)
+    monkeypatch.setattr(svc, "_processing_slots", lambda requested: min(requested, 2))
+
+    assert len(svc.claim_batch("w-1", 5)) == 2
+
+
+def test_claim_batch_uses_skip_locked_update_returning_on_postgres():
+    session = MagicMock()
+    session.bind.dialect.name = "postgresql"
+    session.execute.return_value.scalars.return_value = []
+    svc = JobService(session)
+    svc._processing_slots = lambda requested: requested
+
+    assert svc.claim_batch("w-1", 4, task_types=["cad_bom"]) == []
+
+    statement = session.execute.call_args_list[0].args[0]
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert sql.startswith("UPDATE meta_conversion_jobs SET")
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert "RETURNING meta_conversion_jobs.id" in sql
+    assert session.commit.call_count == 1
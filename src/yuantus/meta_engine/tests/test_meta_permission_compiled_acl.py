@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from yuantus.config import get_settings
+from yuantus.meta_engine.bootstrap import import_all_models
+from yuantus.meta_engine.lifecycle.models import (
+    LifecycleMap,
+    LifecycleState,
+    StateIdentityPermission,
+)
+from yuantus.meta_engine.models.item import Item
+from yuantus.meta_engine.models.meta_schema import ItemType
+from yuantus.meta_engine.permission.models import Access, Permission
+from yuantus.meta_engine.schemas.aml import AMLAction
+from yuantus.meta_engine.services import meta_permission_service
+from yuantus.meta_engine.services.meta_permission_service import MetaPermissionService
+from yuantus.models import user as _user  # noqa: F401 - registers users table
+from yuantus.models.base import Base
+
+import_all_models()
+
+
+@pytest.fixture()
+def acl_env(tmp_path: Path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'acl.db'}",
+        connect_args={"check_same_thread": False},
+        future=True,
+    )
+    Base.metadata.create_all(engine)
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda _c, _cur, stmt, *_a: statements.append(stmt),
+    )
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    session.add_all(
+        [
+            LifecycleMap(id="lc-1", name="Part LC"),
+            Permission(id="perm-part", name="Part Access"),
+            Permission(id="perm-released", name="Released Read Only"),
+        ]
+    )
+    session.flush()
+    session.add_all(
+        [
+            ItemType(id="Part", permission_id="perm-part", lifecycle_map_id="lc-1"),
+            LifecycleState(id="st-draft", lifecycle_map_id="lc-1", name="Draft"),
+            LifecycleState(
+                id="st-rel",
+                lifecycle_map_id="lc-1",
+                name="Released",
+                permission_id="perm-released",
+            ),
+            Access(
+                id="a-1",
+                permission_id="perm-part",
+                identity_id="engineer",
+                can_get=True,
+                can_update=True,
+            ),
+            Access(id="a-2", permission_id="perm-part", identity_id="Owner", can_delete=True),
+            Access(id="a-3", permission_id="perm-released", identity_id="world", can_get=True),
+            StateIdentityPermission(
+                state_id="st-draft",
+                identity_type="role",
+                identity_value="reviewer",
+                can_read=True,
+            ),
+        ]
+    )
+    session.commit()
+    statements.clear()
+    try:
+        yield session, statements
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def _item(item_id: str, state: str, created_by_id=None) -> Item:
+    return Item(
+        id=item_id,
+        item_type_id="Part",
+        config_id=f"cfg-{item_id}",
+        generation=1,
+        is_current=True,
+        state=state,
+        created_by_id=created_by_id,
+        properties={},
+    )
+
+
+def test_compiled_acl_matches_rules(acl_env):
+    session, _ = acl_env
+    svc = MetaPermissionService(session)
+
+    def allowed(action, roles, state=None, owner=None, user="u-1"):
+        return svc.check_permission(
+            "Part", action, user, roles, item_state=state, item_owner_id=owner
+        )
+
+    assert allowed(AMLAction.get, ["engineer"], "Draft")
+    assert allowed(AMLAction.promote, ["engineer"], "Draft")
+    assert not allowed(AMLAction.add, ["engineer"], "Draft")
+    assert not allowed(AMLAction.delete, ["engineer"], "Draft")
+    assert allowed(AMLAction.delete, [], "Draft", owner="u-1")
+    assert allowed(AMLAction.get, ["reviewer"], "Draft")
+    assert not allowed(AMLAction.get, ["reviewer"])
+    # The Released state swaps in a world-readable, read-only permission set.
+    assert allowed(AMLAction.get, [], "Released")
+    assert not allowed(AMLAction.update, ["engineer"], "Released")
+    assert allowed(AMLAction.delete, ["admin"], "Released")
+    assert svc.check_permission(permission_id="perm-released", user_roles=[])
+
+
+def test_filter_readable_resolves_each_type_state_once(acl_env):
+    session, statements = acl_env
+    items = [_item(f"d-{n}", "Draft", created_by_id=n) for n in range(50)]
+    items += [_item(f"r-{n}", "Released") for n in range(50)]
+    svc = MetaPermissionService(session)
+
+    visible = svc.filter_readable(items, "guest", ["reviewer"])
+    assert len(visible) == 100
+    queries = len(statements)
+    # item type, 2 states (+ identity perms), 2 permission sets; not per item
+    assert queries <= 7
+
+    deletable = svc.filter_readable(items, "7", [], AMLAction.delete)
+    assert [item.id for item in deletable] == ["d-7"]
+    assert svc.filter_readable(items[:3], "guest", ["engineer"], AMLAction.update) == items[:3]
+    assert len(statements) == queries
+    assert [
+        item.id
+        for item in items
+        if svc.check_permission(
+            "Part",
+            AMLAction.delete,
+            "7",
+            [],
+            item_state=item.state,
+            item_owner_id=str(item.created_by_id) if item.created_by_id else None,
+        )
+    ] == ["d-7"]
+
+
+def test_acl_writes_invalidate_compiled_data(acl_env):
+    session, _ = acl_env
+    svc = MetaPermissionService(session)
+    assert not svc.check_permission("Part", AMLAction.add, "u-1", ["engineer"], "Draft")
+
+    session.get(Access, "a-1").can_create = True
+    session.commit()
+    assert svc.check_permission("Part", AMLAction.add, "u-1", ["engineer"], "Draft")
+
+    session.get(LifecycleState, "st-draft").permission_id = "perm-released"
+    session.commit()
+    assert not svc.check_permission("Part", AMLAction.add, "u-1", ["engineer"], "Draft")
+
+
+def test_shared_cache_serves_later_services_until_invalidated(acl_env, monkeypatch):
+    session, statements = acl_env
+    monkeypatch.setattr(get_settings(), "META_PERMISSION_CACHE_TTL_SECONDS", 60)
+    meta_permission_service.invalidate_permission_cache()
+
+    assert MetaPermissionService(session).check_permission(
+        "Part", AMLAction.get, "u-1", ["engineer"], "Draft"
+    )
+    compiled = len(statements)
+    assert MetaPermissionService(session).check_permission(
+        "Part", AMLAction.get, "u-1", ["engineer"], "Draft"
+    )
+    assert len(statements) == compiled
+
+    session.delete(session.get(Access, "a-1"))
+    session.commit()
+    statements.clear()
+    assert not MetaPermissionService(session).check_permission(
+        "Part", AMLAction.get, "u-1", ["engineer"], "Draft"
+    )
+    assert statements
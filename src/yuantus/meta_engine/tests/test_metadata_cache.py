@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from yuantus.config import get_settings
+from yuantus.meta_engine.bootstrap import import_all_models
+from yuantus.meta_engine.models.item import Item
+from yuantus.meta_engine.models.meta_schema import ItemType, Property
+from yuantus.meta_engine.schemas.aml import AMLQueryRequest
+from yuantus.meta_engine.services import metadata_cache
+from yuantus.meta_engine.services.engine import AMLEngine
+from yuantus.meta_engine.services.meta_schema_service import MetaSchemaService
+from yuantus.meta_engine.services.query_service import AMLQueryService
+from yuantus.models import user as _user  # noqa: F401 - registers users table
+from yuantus.models.base import Base
+
+import_all_models()
+
+
+@pytest.fixture()
+def meta_env(tmp_path: Path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'meta.db'}",
+        connect_args={"check_same_thread": False},
+        future=True,
+    )
+    Base.metadata.create_all(engine)
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda _c, _cur, stmt, *_a: statements.append(stmt),
+    )
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    session = factory()
+    session.add_all(
+        [
+            ItemType(id="Part", label="Part"),
+            ItemType(id="Document"),
+            ItemType(id="Part BOM", label="BOM", is_relationship=True),
+            ItemType(id="Document Part", is_relationship=True),
+            Property(item_type_id="Part", name="weight", data_type="float"),
+        ]
+    )
+    rows = [("a", "Part", None, None), ("b", "Part", None, None), ("c", "Part", None, None)]
+    rows += [("ab", "Part BOM", "a", "b"), ("bc", "Part BOM", "b", "c")]
+    for item_id, type_id, source_id, related_id in rows:
+        session.add(
+            Item(
+                id=item_id,
+                item_type_id=type_id,
+                config_id=f"cfg-{item_id}",
+                generation=1,
+                is_current=True,
+                state="Draft",
+                source_id=source_id,
+                related_id=related_id,
+                properties={"name": item_id},
+            )
+        )
+    session.commit()
+    statements.clear()
+    try:
+        yield factory, session, statements
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def _meta_queries(statements) -> int:
+    return sum("FROM meta_item_types" in stmt for stmt in statements)
+
+
+def test_expand_resolves_relationships_from_one_snapshot(meta_env):
+    _, session, statements = meta_env
+    response = AMLQueryService(session).query(
+        AMLQueryRequest(type="Part", where={"id": "a"}, expand=["BOM", "BOM.BOM"], depth=3)
+    )
+    [item] = response.items
+    assert [child["id"] for child in item["BOM"]] == ["b"]
+    assert [child["id"] for child in item["BOM"][0]["BOM"]] == ["c"]
+    # type lookup + one lookup per relation and level used to query each time
+    assert _meta_queries(statements) == 1
+
+    snapshot = metadata_cache.get_metadata(session)
+    assert snapshot.resolve("BOM").id == "Part BOM"
+    assert [p.name for p in snapshot.get("Part").properties] == ["weight"]
+
+
+def test_shared_snapshot_is_versioned_by_meta_writes(meta_env, monkeypatch):
+    factory, session, statements = meta_env
+    monkeypatch.setattr(get_settings(), "META_METADATA_CACHE_TTL_SECONDS", 60)
+    metadata_cache.bump_schema_version()
+
+    assert metadata_cache.get_metadata(session).get("Part")
+    other = factory()
+    statements.clear()
+    assert metadata_cache.get_metadata(other).get("Part")
+    assert _meta_queries(statements) == 0
+
+    # Uncommitted meta writes stay private to the writing session.
+    other.add(ItemType(id="Tool"))
+    other.flush()
+    assert metadata_cache.get_metadata(other).get("Tool")
+    assert metadata_cache.get_metadata(factory()).get("Tool") is None
+
+    other.commit()
+    assert metadata_cache.get_metadata(factory()).get("Tool")
+    other.close()
+
+
+def test_schema_service_writes_bump_version(meta_env):
+    _, session, _ = meta_env
+    before = metadata_cache.schema_version()
+    MetaSchemaService(session).update_cached_schema("Part")
+    assert metadata_cache.schema_version() > before
+    assert metadata_cache.get_metadata(session).get("Part").properties_schema["properties"]
+
+    before = metadata_cache.schema_version()
+    MetaSchemaService(session).invalidate_cache("Part")
+    assert metadata_cache.schema_version() > before
+    assert metadata_cache.get_metadata(session).get("Part").properties_schema is None
+
+
+def test_engine_lookup_uses_snapshot(meta_env):
+    _, session, statements = meta_env
+    engine = AMLEngine(session, identity_id="1", roles=["admin"])
+    part = engine._get_item_type("Part")
+    assert isinstance(part, ItemType) and part.id == "Part"
+    assert engine._get_item_type("Missing") is None
+    assert engine._get_item_type("Part") is part
+    # snapshot + the row itself; the repeat lookup hits the identity map
+    assert _meta_queries(statements) == 2
+
+
+def test_graphql_type_patterns_use_snapshot(meta_env):
+    pytest.importorskip("strawberry")
+    from yuantus.meta_engine.web.graphql.loaders import item_type_ids_like
+
+    _, session, statements = meta_env
+    assert item_type_ids_like(session, "part%", "%part", is_relationship=False) == ["Part"]
+    assert item_type_ids_like(session, "%bom%", is_relationship=True) == ["Part BOM"]
+    assert item_type_ids_like(
+        session, "%document%part%", "%part%document%", is_relationship=True
+    ) == ["Document Part"]
+    assert _meta_queries(statements) == 1
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from yuantus.config import get_settings
+from yuantus.meta_engine.bootstrap import import_all_models
+from yuantus.meta_engine.models.job import ConversionJob
+from yuantus.meta_engine.models.parallel_ops_job_stats import ParallelOpsJobStat
+from yuantus.meta_engine.services import parallel_ops_job_stats as stats_mod
+from yuantus.meta_engine.services import parallel_tasks_service as pts
+from yuantus.meta_engine.services import sql_helpers
+from yuantus.meta_engine.services.parallel_ops_job_stats import ParallelOpsJobStatsService
+from yuantus.meta_engine.services.parallel_tasks_service import ParallelOpsOverviewService
+from yuantus.models import user as _user  # noqa: F401 - registers users table
+from yuantus.models.base import Base
+
+import_all_models()
+
+NOW = datetime.utcnow().replace(minute=23, second=17, microsecond=0)
+
+
+@pytest.fixture()
+def ops_env(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(get_settings(), "PARALLEL_OPS_JOB_STATS_ENABLED", False)
+    sql_helpers._TABLE_PRESENT.clear()
+    engine = create_engine(f"sqlite:///{tmp_path / 'ops.db'}", future=True)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    try:
+        with patch.object(pts, "_utcnow", return_value=NOW):
+            yield session
+    finally:
+        session.close()
+        engine.dispose()
+        sql_helpers._TABLE_PRESENT.clear()
+
+
+def _job(session, n, *, hours_ago, task_type="document_sync_push", status="completed",
+         payload=None, attempts=1, max_attempts=3):
+    session.add(
+        ConversionJob(
+            id=f"job-{n}",
+            task_type=task_type,
+            status=status,
+            payload=payload if payload is not None else {},
+            attempt_count=attempts,
+            max_attempts=max_attempts,
+            created_at=NOW - timedelta(hours=hours_ago),
+        )
+    )
+
+
+def _seed_doc_sync(session):
+    specs = [
+        # hours_ago, task_type, status, payload, attempts
+        (1, "document_sync_push", "completed", {"site_id": "site-1"}, 1),
+        (5, "document_sync_pull", "failed", {"site_id": " site-1 "}, 3),
+        (30, "document_sync_push", "failed", {"site_id": "site-2"}, 1),
+        (30, "document_sync_custom", "failed", {"site_id": "site-2", "direction": "Pull"}, 3),
+        (50, "document_sync_custom", "pending", {"site_id": "site-1"}, 0),
+        (70, "document_sync_pull", "completed", {}, 2),
+        (150, "document_sync_push", "completed", {"site_id": "site-1"}, 1),
+        (160, "document_sync_push", "failed", {"site_id": "site-1"}, 3),
+    ]
+    for n, (hours_ago, task_type, status, payload, attempts) in enumerate(specs):
+        _job(session, n, hours_ago=hours_ago, task_type=task_type, status=status,
+             payload=payload, attempts=attempts)
+    _job(session, "cad", hours_ago=2, task_type="cad_conversion")
+    session.commit()
+
+
+def test_doc_sync_counts_resolve_site_direction_and_dead_letter(ops_env):
+    _seed_doc_sync(ops_env)
+    service = ParallelOpsOverviewService(ops_env)
+
+    summary = service._doc_sync_summary(since=NOW - timedelta(days=7))
+    assert summary["total"] == 8
+    assert summary["by_status"] == {"completed": 3, "failed": 4, "pending": 1}
+    assert summary["by_direction"] == {"push": 4, "pull": 3, "unknown": 1}
+    assert summary["dead_letter_total"] == 3
+    assert summary["avg_attempt_count"] == 1.75
+
+    site = service._doc_sync_summary(since=NOW - timedelta(days=7), site_id="site-1 ")
+    assert site["total"] == 5 and site["dead_letter_total"] == 2
+
+    trends = service.trends(window_days=7, bucket_days=1)
+    assert [p["doc_sync"]["total"] for p in trends["points"]] == [2, 0, 0, 0, 2, 2, 2]
+    assert trends["aggregates"]["doc_sync_dead_letter_pull_total"] == 2
+    assert trends["aggregates"]["doc_sync_dead_letter_push_total"] == 1
+
+
+def test_hourly_stats_match_live_counts(ops_env, monkeypatch):
+    _seed_doc_sync(ops_env)
+    stats = ParallelOpsJobStatsService(ops_env)
+    out = stats.rebuild()
+    assert out["rows"] == ops_env.query(ParallelOpsJobStat).count() > 0
+    # Created after the refresh: only the live part of the read can see it.
+    _job(ops_env, "late", hours_ago=0, payload={"site_id": "site-1"})
+    ops_env.commit()
+
+    service = ParallelOpsOverviewService(ops_env)
+
+    def panels():
+        return (
+            [p["doc_sync"] for p in service.trends(window_days=7, bucket_days=1)["points"]],
+            [
+                p["doc_sync"]
+                for p in service.trends(window_days=7, bucket_days=1, site_id="site-1")["points"]
+            ],
+            service.summary(window_days=7)["doc_sync"],
+            service.summary(window_days=1, site_id="site-2")["doc_sync"],
+        )
+
+    live = panels()
+    monkeypatch.setattr(get_settings(), "PARALLEL_OPS_JOB_STATS_ENABLED", True)
+    assert stats.enabled()
+    assert panels() == live
+    assert live[2]["total"] == 9
+
+    # Refreshed whole hours are answered from the pre-aggregates alone.
+    ops_env.delete(ops_env.get(ConversionJob, "job-6"))
+    ops_env.commit()
+    assert service.summary(window_days=7)["doc_sync"]["total"] == 9
+
+
+def test_refresh_recomputes_settle_window(ops_env, monkeypatch):
+    _seed_doc_sync(ops_env)
+    monkeypatch.setattr(get_settings(), "PARALLEL_OPS_JOB_STATS_SETTLE_HOURS", 12)
+    stats = ParallelOpsJobStatsService(ops_env)
+    stats.rebuild()
+    before = {row.id: row.job_count for row in ops_env.query(ParallelOpsJobStat)}
+
+    job = ops_env.get(ConversionJob, "job-1")  # 5h old: inside the settle window
+    job.status = "completed"
+    old = ops_env.get(ConversionJob, "job-7")  # 160h old: outside it
+    old.status = "completed"
+    ops_env.commit()
+    stats.refresh()
+
+    rows = {
+        (row.status, row.dead_letter, row.hour_start): row.job_count
+        for row in ops_env.query(ParallelOpsJobStat)
+    }
+    assert not any(
+        status == "failed" and hour == stats_mod._floor_hour(job.created_at)
+        for status, _, hour in rows
+    )
+    assert rows[("failed", True, stats_mod._floor_hour(old.created_at))] == 1
+    assert len(before) == len(rows)
+
+
+def test_helpdesk_failure_trends_resolve_payload_fallbacks(ops_env):
+    task_type = ParallelOpsOverviewService._BREAKAGE_HELPDESK_TASK_TYPE
+    payloads = [
+        ("completed", {"helpdesk_sync": {"provider": "Jira", "sync_status": "failed",
+                                         "failure_category": "Timeout"}}),
+        ("failed", {"integration": {"provider": "jira"}, "result": {"failure_category": ""},
+                    "failure_category": "auth"}),
+        ("failed", {"provider": "zendesk", "provider_ticket_status": "Resolved"}),
+        ("completed", {"helpdesk_sync": "not-a-dict", "provider": "jira"}),
+        ("failed", {}),
+    ]
+    for n, (status, payload) in enumerate(payloads):
+        _job(ops_env, f"hd-{n}", hours_ago=3 + n * 30, task_type=task_type,
+             status=status, payload=payload)
+    ops_env.commit()
+    service = ParallelOpsOverviewService(ops_env)
+
+    out = service.breakage_helpdesk_failure_trends(window_days=7, bucket_days=1)
+    assert out["aggregates"]["total_jobs"] == 5
+    assert out["aggregates"]["failed_jobs"] == 4
+    assert out["by_failure_category"] == {"timeout": 1, "auth": 1, "unknown": 2}
+
+    jira = service.breakage_helpdesk_failure_trends(window_days=7, provider="JIRA")
+    assert jira["aggregates"] == {"total_jobs": 3, "failed_jobs": 2, "failed_rate": 2 / 3}
+    resolved = service.breakage_helpdesk_failure_trends(
+        window_days=7, provider_ticket_status="resolved"
+    )
+    assert resolved["aggregates"]["total_jobs"] == 1
+    assert out["points"][-1]["total_jobs"] == 1
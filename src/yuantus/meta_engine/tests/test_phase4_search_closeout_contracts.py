@@ -47,6 +47,7 @@ EXPECTED_SEARCH_INDEXER_STATUS_FIELDS = {
     "last_error_at",
     "last_error_age_seconds",
     "last_error",
+    "bulk",
 }
 EXPECTED_INDEXED_EVENTS = [
     "item.created",
@@ -94,6 +95,9 @@ EXPECTED_SEARCH_INDEXER_METRICS = {
     "yuantus_search_indexer_events_total",
     "yuantus_search_indexer_event_coverage",
     "yuantus_search_indexer_last_event_age_seconds",
+    "yuantus_search_indexer_bulk_pending",
+    "yuantus_search_indexer_bulk_total",
+    "yuantus_search_indexer_bulk_bytes_total",
 }
 
 
@@ -250,6 +254,7 @@ def test_search_indexer_prometheus_surface_is_phase4_final_contract() -> None:
             "last_success_age_seconds": 6,
             "last_skipped_age_seconds": 5,
             "last_error_age_seconds": 4,
+            "bulk": {"pending": 3, "batches": 2, "actions": 9, "bytes": 1024},
         }
     )
 
@@ -88,6 +88,44 @@ def test_get_flattened_bom_returns_uom_without_changing_legacy_fields():
     ]
 
 
+def _node(level, path, qty, *, uom=None, name=None):
+    props = {"quantity": qty}
+    if uom is not None:
+        props["uom"] = uom
+    return {
+        "level": level,
+        "path": path,
+        "parent_id": path[-2],
+        "relationship": {"id": f"rel-{path[-1]}", "properties": props},
+        "item": {"id": path[-1], "properties": {"name": name or path[-1]}},
+    }
+
+
+def test_iter_flattened_bom_lines_extends_quantity_per_path():
+    service = ReportService(MagicMock())
+    service.bom_service = MagicMock()
+    service.bom_service.iter_bom_nodes.return_value = iter(
+        [
+            {"level": 0, "path": ["root"], "parent_id": None, "relationship": None,
+             "item": {"id": "root", "properties": {}}},
+            _node(1, ["root", "asm"], 3, name="Asm"),
+            _node(2, ["root", "asm", "bolt"], 4, uom="ea", name="Bolt"),
+            _node(1, ["root", "bolt"], 2, uom="mm", name="Bolt"),
+        ]
+    )
+
+    lines = list(service.iter_flattened_bom_lines("root"))
+
+    service.bom_service.iter_bom_nodes.assert_called_once_with("root", levels=-1)
+    assert [(l["level"], l["path"], l["total_quantity"], l["uom"]) for l in lines] == [
+        (1, ["root", "asm"], 3.0, "EA"),
+        (2, ["root", "asm", "bolt"], 12.0, "EA"),
+        (1, ["root", "bolt"], 2.0, "MM"),
+    ]
+    assert lines[1]["quantity"] == 4.0
+    assert lines[1]["name"] == "Bolt"
+
+
 def test_generate_bom_comparison_reports_uom_buckets_separately():
     service = ReportService(MagicMock())
     service.bom_service = MagicMock()
@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from yuantus.config import get_settings
+from yuantus.meta_engine.events.domain_events import ItemDeletedEvent, ItemUpdatedEvent
+from yuantus.meta_engine.services import search_indexer
+from yuantus.meta_engine.services.search_bulk import BulkIndexBuffer
+from yuantus.meta_engine.services.search_service import SearchService
+from yuantus.observability.metrics import render_search_indexer_metrics
+
+
+class FakeBulkClient:
+    """Records ``bulk`` calls; ``statuses`` scripts per-call item statuses."""
+
+    def __init__(self, statuses=None):
+        self.calls = []
+        self.statuses = list(statuses or [])
+
+    def bulk(self, *, operations):
+        self.calls.append(operations)
+        actions = [op for op in operations if set(op) & {"index", "delete"}]
+        scripted = self.statuses.pop(0) if self.statuses else {}
+        items = []
+        for action in actions:
+            op, meta = next(iter(action.items()))
+            status = scripted.get(meta["_id"], 200)
+            outcome = {"_id": meta["_id"], "status": status}
+            if status >= 300:
+                outcome["error"] = {"type": "mapper_parsing_exception"}
+            items.append({op: outcome})
+        return {"errors": any(i for i in scripted.values() if i >= 300), "items": items}
+
+
+def _ids(operations):
+    return [
+        (op, meta["_id"])
+        for action in operations
+        for op, meta in action.items()
+        if op in {"index", "delete"}
+    ]
+
+
+def test_buffer_keeps_last_operation_per_id_and_flushes_on_size():
+    client = FakeBulkClient()
+    buffer = BulkIndexBuffer(client, "items", max_actions=3, retry_backoff=0)
+
+    buffer.upsert("a", {"name": "a1"})
+    buffer.upsert("a", {"name": "a2"})
+    buffer.upsert("b", {"name": "b"})
+    buffer.delete("b")
+    assert client.calls == []
+    assert len(buffer) == 2
+
+    stats = buffer.upsert("c", {"name": "c"})
+
+    assert _ids(client.calls[0]) == [("index", "a"), ("delete", "b"), ("index", "c")]
+    assert client.calls[0][1] == {"name": "a2"}
+    assert stats["indexed"] == 2 and stats["deleted"] == 1 and stats["failed"] == 0
+    assert len(buffer) == 0
+
+
+def test_buffer_flushes_on_bytes_and_when_due(monkeypatch):
+    client = FakeBulkClient()
+    buffer = BulkIndexBuffer(
+        client, "items", max_actions=100, max_bytes=200, flush_interval=60
+    )
+
+    buffer.upsert("small", {"name": "x"})
+    assert client.calls == []
+    assert buffer.flush_if_due() is None
+
+    buffer.upsert("big", {"text": "y" * 300})
+    assert _ids(client.calls[0]) == [("index", "small"), ("index", "big")]
+
+    buffer.flush_interval = 0
+    buffer.upsert("late", {"name": "z"})
+    assert buffer.flush_if_due()["indexed"] == 1
+    assert buffer.flush() is None
+
+
+def test_buffer_retries_throttled_items_only():
+    client = FakeBulkClient(statuses=[{"b": 429}, {}])
+    batches = []
+    buffer = BulkIndexBuffer(
+        client, "items", retry_backoff=0, on_batch=batches.append
+    )
+    buffer.upsert("a", {"n": 1})
+    buffer.upsert("b", {"n": 2})
+
+    stats = buffer.flush()
+
+    assert [_ids(call) for call in client.calls] == [
+        [("index", "a"), ("index", "b")],
+        [("index", "b")],
+    ]
+    assert stats["indexed"] == 2 and stats["retries"] == 1 and stats["failed"] == 0
+    assert batches == [stats]
+
+
+def test_buffer_counts_rejected_items_and_exhausted_retries():
+    client = FakeBulkClient(statuses=[{"bad": 400, "busy": 503}, {"busy": 503}])
+    buffer = BulkIndexBuffer(client, "items", max_retries=1, retry_backoff=0)
+    buffer.upsert("ok", {})
+    buffer.upsert("bad", {})
+    buffer.upsert("busy", {})
+    buffer.delete("gone")
+
+    stats = buffer.flush()
+
+    assert len(client.calls) == 2
+    assert stats["indexed"] == 1
+    assert stats["deleted"] == 1
+    assert stats["failed"] == 2
+    assert stats["errors"] == ["bad: mapper_parsing_exception"]
+
+
+def test_producers_are_not_blocked_by_a_batch_in_flight():
+    in_flight = threading.Event()
+    release = threading.Event()
+
+    class StalledClient(FakeBulkClient):
+        def bulk(self, *, operations):
+            in_flight.set()
+            assert release.wait(5)
+            return super().bulk(operations=operations)
+
+    client = StalledClient()
+    buffer = BulkIndexBuffer(client, "items", max_actions=1, retry_backoff=0)
+    sender = threading.Thread(target=buffer.upsert, args=("a", {"name": "a1"}))
+    sender.start()
+    try:
+        assert in_flight.wait(5)
+        # Full again, but the send in flight leaves these queued instead of blocking.
+        assert buffer.upsert("b", {"name": "b"}) is None
+        assert buffer.upsert("a", {"name": "a2"}) is None
+        assert len(buffer) == 2
+    finally:
+        release.set()
+        sender.join(5)
+
+    buffer.flush()
+    assert [_ids(call) for call in client.calls] == [
+        [("index", "a")],
+        [("index", "b"), ("index", "a")],
+    ]
+    assert client.calls[1][3] == {"name": "a2"}
+
+
+def test_reindex_items_sends_bulk_batches_with_batched_release_lookup():
+    session = MagicMock()
+    items = [
+        SimpleNamespace(
+            id=f"i{n}",
+            item_type_id="Part",
+            config_id=f"P-{n}",
+            state="released",
+            properties={"item_number": f"P-{n}", "name": f"Part {n}"},
+            created_at=None,
+            updated_at=None,
+            is_current=True,
+            current_version_id=f"v{n}",
+        )
+        for n in range(5)
+    ]
+    session.execute.side_effect = [
+        MagicMock(**{"scalars.return_value.yield_per.return_value": iter(items)}),
+        MagicMock(**{"scalars.return_value": iter(["v0", "v1"])}),
+        MagicMock(**{"scalars.return_value": iter(["v3"])}),
+        MagicMock(**{"scalars.return_value": iter([])}),
+    ]
+    service = SearchService(session)
+    service.client = FakeBulkClient()
+    service.ensure_index = lambda: None
+
+    out = service.reindex_items(batch_size=2)
+
+    assert out["ok"] is True
+    assert out["indexed"] == 5
+    assert out["batches"] == 3
+    assert [len(_ids(call)) for call in service.client.calls] == [2, 2, 1]
+    released = {
+        doc["id"]: doc["is_released"]
+        for call in service.client.calls
+        for doc in call
+        if "id" in doc
+    }
+    assert released == {"i0": True, "i1": True, "i2": False, "i3": True, "i4": False}
+    session.get.assert_not_called()
+
+
+@pytest.fixture()
+def bulk_indexer(monkeypatch):
+    monkeypatch.setattr(get_settings(), "SEARCH_BULK_ENABLED", True)
+    monkeypatch.setattr(search_indexer, "_BULK_BUFFERS", {})
+    monkeypatch.setattr(search_indexer, "_BULK_STOP", threading.Event())
+    monkeypatch.setattr(search_indexer, "_BULK_FLUSHER", None)
+    client = FakeBulkClient()
+
+    class FakeSearchService:
+        index_name = "yuantus-items-test"
+
+        def __init__(self, session):
+            self.session = session
+            self.client = client
+
+        def ensure_index(self) -> None:
+            return None
+
+        def index_item(self, item) -> None:
+            raise AssertionError("bulk mode must not index per item")
+
+        def build_item_documents(self, items):
+            return {item.id: {"id": item.id} for item in items}
+
+        def bulk_buffer(self, index_name, *, on_batch=None):
+            return BulkIndexBuffer(
+                self.client, index_name, flush_interval=60, on_batch=on_batch
+            )
+
+    @contextmanager
+    def fake_db_session():
+        yield SimpleNamespace(get=lambda _model, item_id: SimpleNamespace(id=item_id))
+
+    monkeypatch.setattr(search_indexer, "SearchService", FakeSearchService)
+    monkeypatch.setattr(search_indexer, "get_db_session", fake_db_session)
+    yield client
+    search_indexer.shutdown_bulk_indexing()
+
+
+def test_indexer_bulk_mode_buffers_events_and_reports_batches(bulk_indexer):
+    before = search_indexer.bulk_status()
+
+    search_indexer._handle_item_updated(
+        [
+            ItemUpdatedEvent(item_id="a", item_type_id="Part", changes={}),
+            ItemUpdatedEvent(item_id="b", item_type_id="Part", changes={}),
+        ]
+    )
+    search_indexer._handle_item_deleted(ItemDeletedEvent(item_id="b", item_type_id="Part"))
+
+    status = search_indexer.bulk_status()
+    assert status["enabled"] is True
+    assert status["pending"] == 2
+    assert bulk_indexer.calls == []
+
+    search_indexer.flush_bulk_buffers()
+
+    assert _ids(bulk_indexer.calls[0]) == [("index", "a"), ("delete", "b")]
+    status = search_indexer.bulk_status()
+    assert status["pending"] == 0
+    assert status["batches"] == before["batches"] + 1
+    assert status["indexed"] == before["indexed"] + 1
+    assert status["deleted"] == before["deleted"] + 1
+    assert status["last_batch"]["index"] == "yuantus-items-test"
+
+    assert search_indexer.indexer_status()["bulk"] == status
+    text = render_search_indexer_metrics(search_indexer.indexer_status())
+    assert f'yuantus_search_indexer_bulk_total{{kind="batches"}} {status["batches"]}' in text
+    assert "yuantus_search_indexer_bulk_pending 0" in text
+
+
+def test_shutdown_stops_the_flusher_before_the_final_flush(bulk_indexer):
+    search_indexer._handle_item_updated(
+        ItemUpdatedEvent(item_id="a", item_type_id="Part", changes={})
+    )
+    flusher = search_indexer._BULK_FLUSHER
+    assert flusher is not None and flusher.is_alive()
+    assert bulk_indexer.calls == []
+
+    search_indexer.shutdown_bulk_indexing(timeout=5)
+
+    assert not flusher.is_alive()
+    assert [_ids(call) for call in bulk_indexer.calls] == [[("index", "a")]]
+
+    # After shutdown no flusher comes back; actions are sent right away.
+    search_indexer._handle_item_deleted(ItemDeletedEvent(item_id="a", item_type_id="Part"))
+    assert search_indexer._BULK_FLUSHER is None
+    assert _ids(bulk_indexer.calls[-1]) == [("delete", "a")]
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+from unittest.mock import MagicMock
+
+from yuantus.config import get_settings
+from yuantus.meta_engine.bootstrap import import_all_models
+from yuantus.meta_engine.models.item import Item
+from yuantus.meta_engine.models.item_search import ItemSearchText
+from yuantus.meta_engine.services.item_search_index_service import (
+    ItemSearchIndexService,
+)
+from yuantus.meta_engine.services.search_service import (
+    SearchService,
+    planner_row_estimate,
+)
+from yuantus.models import user as _user  # noqa: F401 - registers users table
+from yuantus.models.base import Base
+
+import_all_models()
+
+
+def _part(item_id: str, name: str, state: str = "Draft", **props) -> Item:
+    return Item(
+        id=item_id,
+        item_type_id="Part",
+        config_id=f"cfg-{item_id}",
+        generation=1,
+        is_current=True,
+        state=state,
+        properties={"item_number": item_id.upper(), "name": name, **props},
+    )
+
+
+def _svc(session) -> SearchService:
+    svc = SearchService(session)
+    svc.client = None
+    return svc
+
+
+def _indexed(session):
+    return {
+        row.item_id: row.search_text for row in session.query(ItemSearchText).all()
+    }
+
+
+@pytest.fixture()
+def index_env(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(get_settings(), "SEARCH_DB_INDEX_ENABLED", True)
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'item_search.db'}",
+        connect_args={"check_same_thread": False},
+        future=True,
+    )
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def test_flush_hook_keeps_index_in_step_with_items(index_env):
+    session = index_env
+    session.add_all(
+        [_part("p-1", "Hex Bolt M8"), _part("p-2", "Hex Nut M8"), _part("p-3", "Washer")]
+    )
+    session.commit()
+    assert set(_indexed(session)) == {"p-1", "p-2", "p-3"}
+    assert "Hex Bolt M8" in _indexed(session)["p-1"]
+
+    bolt = session.get(Item, "p-1")
+    bolt.properties = {**bolt.properties, "name": "Carriage Bolt M8"}
+    session.delete(session.get(Item, "p-3"))
+    session.commit()
+
+    indexed = _indexed(session)
+    assert set(indexed) == {"p-1", "p-2"}
+    assert "Carriage Bolt" in indexed["p-1"]
+    assert [h["id"] for h in _svc(session).search("washer")["hits"]] == []
+    assert [h["id"] for h in _svc(session).search("carriage")["hits"]] == ["p-1"]
+
+
+def test_indexed_search_matches_token_prefixes_ranks_and_filters(index_env):
+    session = index_env
+    session.add_all(
+        [
+            _part("p-1", "Hex Bolt M8", state="Released"),
+            _part("p-2", "Hex Nut M8"),
+            _part("p-3", "Bolt bolt bolt anchor", state="Released"),
+            _part("p-4", "Gasket"),
+        ]
+    )
+    session.commit()
+    svc = _svc(session)
+
+    hits = [h["id"] for h in svc.search("bol")["hits"]]
+    assert hits == ["p-3", "p-1"]
+    assert {h["id"] for h in svc.search("hex m8")["hits"]} == {"p-1", "p-2"}
+    assert svc.search("hex m8", filters={"state": "Released"})["hits"][0]["id"] == "p-1"
+    assert svc.search("P-00", limit=10)["total"] == 0
+    assert svc.search("P-4")["hits"][0]["id"] == "p-4"
+    assert svc.search("bolt")["total"] == 2
+
+
+def test_count_modes_report_relation(index_env):
+    session = index_env
+    session.add_all([_part(f"p-{n}", f"Bolt {n}") for n in range(5)])
+    session.commit()
+    svc = _svc(session)
+
+    assert "total_relation" not in svc.search("bolt", limit=2)
+    estimated = svc.search("bolt", limit=2, count_mode="estimate")
+    assert (estimated["total"], estimated["total_relation"]) == (5, "eq")
+    skipped = svc.search("bolt", limit=2, count_mode="none")
+    assert (skipped["total"], skipped["total_relation"]) == (2, "gte")
+    assert len(skipped["hits"]) == 2
+    with pytest.raises(ValueError):
+        svc.search("bolt", count_mode="bogus")
+
+
+def test_planner_estimate_expands_in_lists_for_postgres():
+    session = MagicMock()
+    connection = session.connection.return_value
+    connection.dialect = postgresql.psycopg.dialect()
+    connection.exec_driver_sql.return_value.scalar.return_value = [
+        {"Plan": {"Plan Rows": 42}}
+    ]
+    stmt = select(Item.id).where(
+        Item.state.in_(["Released", "Obsolete"]), Item.id.notin_(["p-1"])
+    )
+
+    assert planner_row_estimate(session, stmt) == 42
+    sql, params = connection.exec_driver_sql.call_args.args
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT")
+    assert "POSTCOMPILE" not in sql
+    assert sorted(params.values()) == ["Obsolete", "Released", "p-1"]
+
+
+def test_rebuild_recovers_rows_written_behind_the_orm(index_env, monkeypatch):
+    session = index_env
+    monkeypatch.setattr(get_settings(), "SEARCH_DB_INDEX_ENABLED", False)
+    session.add_all([_part("p-1", "Flange"), _part("p-2", "Spacer")])
+    session.commit()
+    assert _indexed(session) == {}
+    monkeypatch.setattr(get_settings(), "SEARCH_DB_INDEX_ENABLED", True)
+
+    out = _svc(session).reindex_items()
+    session.commit()
+
+    assert out["note"] == "db-index"
+    assert out["indexed"] == 2
+    assert [h["id"] for h in _svc(session).search("spac")["hits"]] == ["p-2"]
+
+
+def test_disabled_index_keeps_ilike_fallback(index_env, monkeypatch):
+    session = index_env
+    session.add(_part("p-1", "Hex Bolt"))
+    session.commit()
+    monkeypatch.setattr(get_settings(), "SEARCH_DB_INDEX_ENABLED", False)
+
+    assert [h["id"] for h in _svc(session).search("ex Bo")["hits"]] == ["p-1"]
+
+
+def test_postgres_match_uses_prefix_tsquery_on_indexed_expression():
+    session = MagicMock()
+    session.get_bind.return_value.dialect.name = "postgresql"
+
+    matches = ItemSearchIndexService(session).matches("Hex-Bolt m8")
+    sql = str(
+        select(matches).compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+    assert "to_tsvector('simple', meta_item_search.search_text) @@ " in sql
+    assert "to_tsquery('simple', 'hex:* & bolt:* & m8:*')" in sql
+    assert "ts_rank(" in sql
+    assert ItemSearchIndexService(session).matches("  --  ") is None
@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from yuantus.meta_engine.bootstrap import import_all_models
+from yuantus.meta_engine.models.item import Item
+from yuantus.meta_engine.services.search_reindex import (
+    SearchReindexer,
+    plan_partitions,
+)
+from yuantus.meta_engine.services.search_service import SearchService
+from yuantus.models import user as _user  # noqa: F401 - registers users table
+from yuantus.models.base import Base
+
+import_all_models()
+
+
+class FakeIndices:
+    def __init__(self, client):
+        self.client = client
+
+    def exists(self, *, index):
+        return index in self.client.docs or index in self.client.aliases
+
+    def create(self, *, index, body):
+        self.client.docs[index] = {}
+        self.client.settings[index] = body.get("settings")
+
+    def delete(self, *, index, ignore=None):
+        # Like ES, an alias name is not deletable (a 400 the caller ignores).
+        if self.client.docs.pop(index, None) is not None:
+            self.client.aliases = {
+                alias: target
+                for alias, target in self.client.aliases.items()
+                if target != index
+            }
+
+    def put_settings(self, *, index, body):
+        self.client.settings[index] = body
+
+    def refresh(self, *, index):
+        self.client.refreshed.append(index)
+
+    def exists_alias(self, *, name):
+        return name in self.client.aliases
+
+    def get_alias(self, *, name):
+        return {self.client.aliases[name]: {"aliases": {name: {}}}}
+
+    def update_aliases(self, *, actions):
+        self.client.alias_calls.append(actions)
+        for action in actions:
+            op, spec = next(iter(action.items()))
+            if op == "add":
+                self.client.aliases[spec["alias"]] = spec["index"]
+            elif op == "remove_index":
+                self.client.docs.pop(spec["index"])
+
+
+class FakeSearchClient:
+    """Just enough of the Elasticsearch client for an alias-swapped rebuild."""
+
+    def __init__(self):
+        self.docs = {}
+        self.aliases = {}
+        self.settings = {}
+        self.refreshed = []
+        self.alias_calls = []
+        self.bulk_calls = []
+        self.fail_ids = set()
+        self.indices = FakeIndices(self)
+
+    def bulk(self, *, operations):
+        self.bulk_calls.append(operations)
+        items = []
+        ops = iter(operations)
+        for action in ops:
+            op, meta = next(iter(action.items()))
+            docs = self.docs[meta["_index"]]
+            status = 400 if meta["_id"] in self.fail_ids else 200
+            if op == "delete":
+                if status < 300:
+                    status = 200 if docs.pop(meta["_id"], None) is not None else 404
+            else:
+                doc = next(ops)
+                if status < 300:
+                    docs[meta["_id"]] = doc
+            items.append({op: {"_id": meta["_id"], "status": status}})
+        return {"items": items}
+
+    def search(self, *, index, body):
+        after = (body.get("search_after") or [""])[0]
+        ids = sorted(doc_id for doc_id in self.docs[index] if doc_id > after)
+        return {
+            "hits": {
+                "hits": [
+                    {"_id": doc_id, "sort": [doc_id]} for doc_id in ids[: body["size"]]
+                ]
+            }
+        }
+
+    def index(self, *, index, id, document):
+        self.docs[self.aliases.get(index, index)][id] = document
+
+    def delete(self, *, index, id):
+        self.docs[self.aliases.get(index, index)].pop(id, None)
+
+
+@pytest.fixture()
+def reindex_env(tmp_path: Path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'reindex.db'}", future=True)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    session.add_all(
+        Item(
+            id=f"item-{n:02d}",
+            item_type_id="Part",
+            config_id=f"cfg-{n}",
+            generation=1,
+            is_current=True,
+            state="Draft",
+            properties={"item_number": f"P-{n:02d}", "name": f"Part {n}"},
+        )
+        for n in range(10)
+    )
+    session.commit()
+
+    client = FakeSearchClient()
+    service = SearchService(session)
+    service.client = client
+    try:
+        yield session, service, client, tmp_path / "checkpoint"
+    finally:
+        session.close()
+        engine.dispose()
+
+
+def test_plan_partitions_covers_all_ids_in_order(reindex_env):
+    session, *_ = reindex_env
+    ranges = plan_partitions(session, 3)
+    assert ranges == [
+        ("item-00", "item-03"),
+        ("item-04", "item-06"),
+        ("item-07", "item-09"),
+    ]
+
+
+def test_rebuild_swaps_alias_over_legacy_index(reindex_env):
+    session, service, client, checkpoint = reindex_env
+    client.docs["yuantus-items"] = {"stale": {}}
+
+    out = SearchReindexer(session, service).run(
+        partitions=3, workers=1, batch_size=2, checkpoint_dir=str(checkpoint)
+    )
+
+    assert out["ok"] is True and out["swapped"] is True
+    target = out["index"]
+    assert target.startswith("yuantus-items-v")
+    assert sorted(client.docs[target]) == [f"item-{n:02d}" for n in range(10)]
+    assert out["indexed"] == 10
+    # bulk loading ran without refreshes; restored before the swap
+    assert client.settings[target] == {"index": {"refresh_interval": None}}
+    # refreshed only after loading: once to prune deletions, once for the swap
+    assert client.refreshed == [target, target]
+    [actions] = client.alias_calls
+    assert actions == [
+        {"add": {"index": target, "alias": "yuantus-items"}},
+        {"remove_index": {"index": "yuantus-items"}},
+    ]
+    assert "yuantus-items" not in client.docs
+    assert json.loads((checkpoint / "run.json").read_text())["status"] == "swapped"
+
+
+def test_items_deleted_during_the_build_are_pruned_before_the_swap(reindex_env):
+    session, service, client, checkpoint = reindex_env
+    reindexer = SearchReindexer(session, service)
+    catch_up = reindexer._catch_up
+
+    def delete_then_catch_up(run, batch_size):
+        session.delete(session.get(Item, "item-04"))
+        session.commit()
+        # The incremental indexer deletes through the alias: the old index.
+        service.delete_item("item-04")
+        return catch_up(run, batch_size)
+
+    reindexer._catch_up = delete_then_catch_up
+    out = reindexer.run(
+        partitions=2, workers=1, batch_size=3, checkpoint_dir=str(checkpoint)
+    )
+
+    assert out["ok"] is True and out["pruned"] == 1
+    assert "item-04" not in client.docs[out["index"]]
+    assert len(client.docs[out["index"]]) == 9
+
+
+def test_reset_after_a_swap_deletes_the_aliased_index(reindex_env):
+    session, service, client, checkpoint = reindex_env
+    built = SearchReindexer(session, service).run(partitions=2, workers=1, batch_size=4)
+    assert client.aliases == {"yuantus-items": built["index"]}
+
+    out = service.reindex_items(reset=True, batch_size=4)
+
+    assert out["indexed"] == 10
+    assert built["index"] not in client.docs
+    assert client.aliases == {}
+    assert sorted(client.docs["yuantus-items"]) == [f"item-{n:02d}" for n in range(10)]
+
+
+def test_failed_catch_up_keeps_the_old_index_live(reindex_env):
+    session, service, client, checkpoint = reindex_env
+    client.docs["yuantus-items"] = {"stale": {}}
+    reindexer = SearchReindexer(session, service)
+    catch_up = reindexer._catch_up
+
+    def failing_catch_up(run, batch_size):
+        client.fail_ids = {"item-03"}
+        return catch_up(run, batch_size)
+
+    reindexer._catch_up = failing_catch_up
+    out = reindexer.run(
+        partitions=2, workers=1, batch_size=4, checkpoint_dir=str(checkpoint)
+    )
+
+    assert out["ok"] is False and out["swapped"] is False
+    assert out["caught_up"] == 10
+    assert out["failed"] == 1
+    assert client.alias_calls == []
+    assert client.docs["yuantus-items"] == {"stale": {}}
+    assert json.loads((checkpoint / "run.json").read_text())["status"] == "building"
+
+
+def test_interrupted_rebuild_resumes_from_checkpoint(reindex_env):
+    session, service, client, checkpoint = reindex_env
+    client.fail_ids = {"item-07"}
+
+    first = SearchReindexer(session, service).run(
+        partitions=2, workers=1, batch_size=2, checkpoint_dir=str(checkpoint)
+    )
+    assert first["ok"] is False and first["swapped"] is False
+    assert first["pending"] == [1]
+    assert "1" in first["errors"]
+    assert client.alias_calls == []
+    progress = json.loads((checkpoint / "partition-1.json").read_text())
+    assert progress["last_id"] == "item-06" and progress["done"] is False
+
+    client.fail_ids = set()
+    client.bulk_calls.clear()
+    second = SearchReindexer(session, service).run(
+        partitions=2, workers=1, batch_size=2, checkpoint_dir=str(checkpoint)
+    )
+
+    assert second["ok"] is True and second["resumed"] is True
+    assert second["index"] == first["index"]
+    sent = {
+        action["index"]["_id"]
+        for call in client.bulk_calls[:2]
+        for action in call[::2]
+    }
+    # partition 0 was not re-sent; partition 1 restarted after its checkpoint
+    assert sent == {"item-07", "item-08", "item-09"}
+    assert sorted(client.docs[second["index"]]) == [
+        f"item-{n:02d}" for n in range(10)
+    ]
+    assert client.aliases == {"yuantus-items": second["index"]}
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from yuantus.context import org_id_var, tenant_id_var
+from yuantus.meta_engine.services import sql_helpers
+from yuantus.meta_engine.services.sql_helpers import (
+    chunks,
+    session_scope_key,
+    table_present,
+)
+
+
+@pytest.fixture()
+def session(tmp_path: Path):
+    sql_helpers._TABLE_PRESENT.clear()
+    engine = create_engine(f"sqlite:///{tmp_path / 'helpers.db'}", future=True)
+    session = sessionmaker(bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+        sql_helpers._TABLE_PRESENT.clear()
+
+
+def test_chunks_split_under_the_in_clause_cap():
+    ids = [str(i) for i in range(1201)]
+    assert [len(chunk) for chunk in chunks(ids)] == [500, 500, 201]
+    assert [chunk for chunk in chunks(ids[:3], size=2)] == [["0", "1"], ["2"]]
+
+
+def test_session_scope_key_includes_the_request_scope(session, tmp_path):
+    url = f"sqlite:///{tmp_path / 'helpers.db'}"
+    assert session_scope_key(session) == (url, None, None)
+    tenant, org = tenant_id_var.set("tenant-a"), org_id_var.set("org-1")
+    try:
+        assert session_scope_key(session) == (url, "tenant-a", "org-1")
+    finally:
+        tenant_id_var.reset(tenant)
+        org_id_var.reset(org)
+
+
+def test_table_present_rechecks_missing_tables(session, monkeypatch):
+    assert table_present(session, "meta_widgets") is False
+    session.execute(text("CREATE TABLE meta_widgets (id INTEGER PRIMARY KEY)"))
+    session.commit()
+    # Still inside the recheck window: the negative answer is reused.
+    assert table_present(session, "meta_widgets") is False
+
+    monkeypatch.setattr(sql_helpers, "MISSING_TABLE_RECHECK_SECONDS", 0.0)
+    sql_helpers._TABLE_PRESENT.clear()
+    assert table_present(session, "meta_widgets") is True
+    session.execute(text("DROP TABLE meta_widgets"))
+    session.commit()
+    # A table that was seen stays cached as present.
+    assert table_present(session, "meta_widgets") is True
+
+
+def test_table_presence_is_cached_per_tenant(session, monkeypatch):
+    monkeypatch.setattr(sql_helpers, "MISSING_TABLE_RECHECK_SECONDS", 3600.0)
+    token = tenant_id_var.set("tenant-a")
+    try:
+        assert table_present(session, "meta_widgets") is False
+    finally:
+        tenant_id_var.reset(token)
+
+    session.execute(text("CREATE TABLE meta_widgets (id INTEGER PRIMARY KEY)"))
+    session.commit()
+    token = tenant_id_var.set("tenant-b")
+    try:
+        assert table_present(session, "meta_widgets") is True
+    finally:
+        tenant_id_var.reset(token)
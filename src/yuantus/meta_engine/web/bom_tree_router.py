@@ -11,6 +11,7 @@ from yuantus.meta_engine.services.bom_service import BOMService
 from yuantus.meta_engine.services.bom_conversion_service import BOMConversionService
 from yuantus.meta_engine.services.meta_permission_service import MetaPermissionService
 from yuantus.api.dependencies.auth import CurrentUser, get_current_user
+from yuantus.meta_engine.web.ndjson_stream import ndjson_response
 
 bom_tree_router = APIRouter(prefix="/bom", tags=["BOM"])
 
@@ -205,6 +206,9 @@ async def get_bom_tree(
     serial_number: Optional[str] = Query(None, description="Serial number for effectivity"),
     unit_position: Optional[str] = Query(None, description="Unit position for effectivity"),
     config: Optional[str] = Query(None, description="Configuration selection JSON"),
+    stream: bool = Query(
+        False, description="Stream nodes as NDJSON (one node per line, depth-first)"
+    ),
     user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -215,6 +219,8 @@ async def get_bom_tree(
         parent_id: Root item ID
         depth: Maximum depth (-1 for unlimited, default 10)
         effective_date: Optional date for effectivity filtering
+        stream: Emit ``{"level", "path", "parent_id", "relationship", "item"}``
+            records as NDJSON instead of one nested document
 
     Returns:
         Tree structure with children
@@ -242,6 +248,20 @@ async def get_bom_tree(
 
     service = BOMService(db)
     config_selection = _parse_config_selection(config)
+    if stream:
+        try:
+            nodes = service.iter_bom_nodes(
+                parent_id,
+                levels=depth,
+                effective_date=effective_date,
+                config_selection=config_selection,
+                lot_number=lot_number,
+                serial_number=serial_number,
+                unit_position=unit_position,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e)) from e
+        return ndjson_response(nodes, session=db)
     try:
         return service.get_tree(
             parent_id,
@@ -261,6 +281,9 @@ async def get_mbom_tree(
     parent_id: str,
     depth: int = Query(10, description="Maximum depth to traverse (-1 for unlimited)"),
     config: Optional[str] = Query(None, description="Configuration selection JSON"),
+    stream: bool = Query(
+        False, description="Stream nodes as NDJSON (one node per line, depth-first)"
+    ),
     user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -291,6 +314,17 @@ async def get_mbom_tree(
 
     service = BOMService(db)
     config_selection = _parse_config_selection(config)
+    if stream:
+        try:
+            nodes = service.iter_bom_nodes(
+                parent_id,
+                levels=depth,
+                relationship_types=["Manufacturing BOM"],
+                config_selection=config_selection,
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=404, detail=str(e)) from e
+        return ndjson_response(nodes, session=db)
     try:
         return service.get_tree(
             parent_id,
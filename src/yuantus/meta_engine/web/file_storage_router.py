@@ -9,12 +9,10 @@ from __future__ import annotations
 
 import base64
 import hashlib
-import io
 import mimetypes
-import os
 import uuid
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from fastapi import (
     APIRouter,
@@ -23,10 +21,11 @@ from fastapi import (
     Form,
     HTTPException,
     Query,
+    Request,
     Response,
     UploadFile,
 )
-from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 
@@ -38,6 +37,7 @@ from yuantus.meta_engine.models.file import ConversionStatus, DocumentType, File
 from yuantus.meta_engine.services.file_service import FileService
 from yuantus.meta_engine.version.file_service import VersionFileError, VersionFileService
 from yuantus.meta_engine.web.file_conversion_router import _queue_file_conversion_job
+from yuantus.meta_engine.web.storage_stream import storage_file_response
 from yuantus.security.auth.database import get_identity_db
 from yuantus.security.auth.quota_service import QuotaService
 
@@ -70,9 +70,35 @@ class FileUploadResponse(BaseModel):
     document_version: Optional[str] = None
 
 
-def _calculate_checksum(file_content: bytes) -> str:
-    """Calculate SHA256 checksum."""
-    return hashlib.sha256(file_content).hexdigest()
+async def _hash_upload(file: UploadFile) -> Tuple[str, int]:
+    """
+    SHA256 checksum and size of an upload, read in FILE_UPLOAD_CHUNK_BYTES chunks.
+
+    The multipart parser spools the body to a disk-backed temp file, so only one
+    chunk is held in memory. FILE_UPLOAD_MAX_BYTES is enforced as bytes arrive and
+    the upload is rewound for the storage copy afterwards.
+    """
+    settings = get_settings()
+    max_bytes = settings.FILE_UPLOAD_MAX_BYTES
+    chunk_bytes = max(int(settings.FILE_UPLOAD_CHUNK_BYTES or 0), 64 * 1024)
+    digest = hashlib.sha256()
+    file_size = 0
+    while True:
+        chunk = await file.read(chunk_bytes)
+        if not chunk:
+            break
+        file_size += len(chunk)
+        if max_bytes and file_size > max_bytes:
+            raise _file_too_large(max_bytes, getattr(file, "size", None) or file_size)
+        digest.update(chunk)
+    await file.seek(0)
+    return digest.hexdigest(), file_size
+
+
+async def _store_upload(file_service: FileService, file: UploadFile, key: str) -> None:
+    """Stream the spooled upload to storage without blocking the event loop."""
+    await file.seek(0)
+    await run_in_threadpool(file_service.upload_file, file.file, key)
 
 
 def _get_mime_type(filename: str) -> str:
@@ -213,18 +239,22 @@ def _get_cad_format(extension: str) -> Optional[str]:
     return cad_formats.get(extension.lower().lstrip("."))
 
 
+def _file_too_large(max_bytes: int, file_size: int) -> HTTPException:
+    return HTTPException(
+        status_code=413,
+        detail={
+            "code": "FILE_TOO_LARGE",
+            "max_bytes": max_bytes,
+            "file_size": file_size,
+        },
+    )
+
+
 def _validate_upload(filename: str, file_size: int) -> None:
     settings = get_settings()
     max_bytes = settings.FILE_UPLOAD_MAX_BYTES
     if max_bytes and file_size > max_bytes:
-        raise HTTPException(
-            status_code=413,
-            detail={
-                "code": "FILE_TOO_LARGE",
-                "max_bytes": max_bytes,
-                "file_size": file_size,
-            },
-        )
+        raise _file_too_large(max_bytes, file_size)
 
     allowed = {
         ext.strip().lower().lstrip(".")
@@ -262,13 +292,12 @@ async def upload_file(
     Upload a file to the vault.
 
     Creates a FileContainer record and optionally triggers CAD preview generation.
+    The body is hashed and copied to storage in chunks, never read whole.
     """
     try:
-        content = await file.read()
-        file_size = len(content)
-        _validate_upload(file.filename, file_size)
-
-        checksum = _calculate_checksum(content)
+        # Extension and declared size are checked before any bytes are hashed.
+        _validate_upload(file.filename, getattr(file, "size", None) or 0)
+        checksum, file_size = await _hash_upload(file)
 
         existing = (
             db.query(FileContainer).filter(FileContainer.checksum == checksum).first()
@@ -281,7 +310,7 @@ async def upload_file(
                     existing,
                     user_id=user_id,
                 )
-                file_service.upload_file(io.BytesIO(content), existing.system_path)
+                await _store_upload(file_service, file, existing.system_path)
                 existing.file_size = file_size
                 existing.mime_type = _get_mime_type(file.filename)
                 db.add(existing)
@@ -345,7 +374,7 @@ async def upload_file(
         storage_key = f"{type_dir}/{file_id[:2]}/{stored_filename}"
 
         file_service = FileService()
-        file_service.upload_file(io.BytesIO(content), storage_key)
+        await _store_upload(file_service, file, storage_key)
 
         file_container = FileContainer(
             id=file_id,
@@ -421,45 +450,24 @@ async def upload_file(
 
 
 @file_storage_router.get("/{file_id}/download")
-async def download_file(file_id: str, db: Session = Depends(get_db)):
-    """Download the original file."""
+async def download_file(file_id: str, request: Request, db: Session = Depends(get_db)):
+    """Download the original file (supports Range and If-None-Match)."""
     file_container = db.get(FileContainer, file_id)
     if not file_container:
         raise HTTPException(status_code=404, detail="File not found")
 
-    file_service = FileService()
-
-    local_path = file_service.get_local_path(file_container.system_path)
-    if local_path and os.path.exists(local_path):
-        return FileResponse(
-            path=local_path,
-            filename=file_container.filename,
-            media_type=file_container.mime_type,
-        )
-
-    try:
-        url = file_service.get_presigned_url(file_container.system_path)
-        return RedirectResponse(url=url)
-    except NotImplementedError:
-        try:
-            output_stream = io.BytesIO()
-            file_service.download_file(file_container.system_path, output_stream)
-            output_stream.seek(0)
-            return StreamingResponse(
-                output_stream,
-                media_type=file_container.mime_type,
-                headers={
-                    "Content-Disposition": f'attachment; filename="{file_container.filename}"'
-                },
-            )
-        except Exception as e:
-            raise HTTPException(
-                status_code=500, detail=f"Download failed: {str(e)}"
-            ) from e
+    return storage_file_response(
+        request,
+        FileService(),
+        file_container.system_path,
+        media_type=file_container.mime_type,
+        filename=file_container.filename,
+        redirect_status_code=307,
+    )
 
 
 @file_storage_router.get("/{file_id}/preview")
-async def get_preview(file_id: str, db: Session = Depends(get_db)):
+async def get_preview(file_id: str, request: Request, db: Session = Depends(get_db)):
     """Get preview image for a file."""
     file_container = db.get(FileContainer, file_id)
     if not file_container:
@@ -470,27 +478,16 @@ async def get_preview(file_id: str, db: Session = Depends(get_db)):
         return Response(content=preview_bytes, media_type="image/png")
 
     if file_container.preview_path:
-        file_service = FileService()
-
-        local_path = file_service.get_local_path(file_container.preview_path)
-        if local_path and os.path.exists(local_path):
-            return FileResponse(path=local_path, media_type="image/png")
-
-        try:
-            url = file_service.get_presigned_url(file_container.preview_path)
-            return RedirectResponse(url=url, status_code=302)
-        except NotImplementedError:
-            pass
-
         try:
-            output_stream = io.BytesIO()
-            file_service.download_file(file_container.preview_path, output_stream)
-            output_stream.seek(0)
-            return StreamingResponse(
-                output_stream,
+            return storage_file_response(
+                request,
+                FileService(),
+                file_container.preview_path,
                 media_type="image/png",
+                error_prefix="Preview",
             )
-        except Exception:
-            pass
+        except HTTPException as exc:
+            if exc.status_code != 500:
+                raise
 
     raise HTTPException(status_code=404, detail="Preview not available")
@@ -16,7 +16,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from fastapi.responses import FileResponse, JSONResponse, RedirectResponse, StreamingResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
@@ -26,6 +26,7 @@ from yuantus.meta_engine.models.cad_audit import CadChangeLog
 from yuantus.meta_engine.models.file import FileContainer
 from yuantus.meta_engine.services.cad_converter_service import CADConverterService
 from yuantus.meta_engine.services.file_service import FileService
+from yuantus.meta_engine.web.storage_stream import storage_file_response
 from yuantus.security.auth.database import get_identity_db_session
 from yuantus.security.rbac.models import RBACUser
 
@@ -60,34 +61,16 @@ def _guess_media_type(path: str) -> str:
     return media_types.get(ext, "application/octet-stream")
 
 
-def _serve_storage_path(storage_path: str, media_type: str, error_prefix: str):
-    file_service = FileService()
-
-    # Try local path first (for local storage or performance)
-    local_path = file_service.get_local_path(storage_path)
-    if local_path and os.path.exists(local_path):
-        return FileResponse(path=local_path, media_type=media_type)
-
-    # Try presigned URL (S3) - return 302 redirect
-    try:
-        url = file_service.get_presigned_url(storage_path)
-        return RedirectResponse(url=url, status_code=302)
-    except NotImplementedError:
-        pass
-
-    # Fallback: stream from storage
-    try:
-        output_stream = io.BytesIO()
-        file_service.download_file(storage_path, output_stream)
-        output_stream.seek(0)
-        return StreamingResponse(
-            output_stream,
-            media_type=media_type,
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"{error_prefix} download failed: {str(e)}"
-        ) from e
+def _serve_storage_path(
+    request: Request, storage_path: str, media_type: str, error_prefix: str
+):
+    return storage_file_response(
+        request,
+        FileService(),
+        storage_path,
+        media_type=media_type,
+        error_prefix=error_prefix,
+    )
 
 
 def _sanitize_asset_name(asset_name: str) -> str:
@@ -566,7 +549,9 @@ async def geometry_pack_summary(
 
 
 @file_viewer_router.get("/{file_id}/geometry")
-async def get_geometry(file_id: str, db: Session = Depends(get_db)):
+async def get_geometry(
+    file_id: str, request: Request, db: Session = Depends(get_db)
+):
     """Get converted geometry file for 3D viewer."""
     file_container = db.get(FileContainer, file_id)
     if not file_container:
@@ -577,13 +562,13 @@ async def get_geometry(file_id: str, db: Session = Depends(get_db)):
 
     media_type = _guess_media_type(file_container.geometry_path)
     return _serve_storage_path(
-        file_container.geometry_path, media_type, error_prefix="Geometry"
+        request, file_container.geometry_path, media_type, error_prefix="Geometry"
     )
 
 
 @file_viewer_router.get("/{file_id}/asset/{asset_name}")
 async def get_geometry_asset(
-    file_id: str, asset_name: str, db: Session = Depends(get_db)
+    file_id: str, asset_name: str, request: Request, db: Session = Depends(get_db)
 ):
     """Get geometry sidecar asset (e.g., mesh.bin) for glTF."""
     file_container = db.get(FileContainer, file_id)
@@ -598,13 +583,13 @@ async def get_geometry_asset(
     asset_path = f"{base_dir}/{safe_name}" if base_dir else safe_name
     media_type = _guess_media_type(asset_path)
     return _serve_storage_path(
-        asset_path, media_type, error_prefix="Geometry asset"
+        request, asset_path, media_type, error_prefix="Geometry asset"
     )
 
 
 @file_viewer_router.get("/{file_id}/cad_asset/{asset_name}", name="get_cad_asset")
 async def get_cad_asset(
-    file_id: str, asset_name: str, db: Session = Depends(get_db)
+    file_id: str, asset_name: str, request: Request, db: Session = Depends(get_db)
 ):
     """Get CADGF conversion assets (mesh.gltf, mesh.bin, etc.)."""
     file_container = db.get(FileContainer, file_id)
@@ -625,7 +610,7 @@ async def get_cad_asset(
 
     media_type = _guess_media_type(asset_path)
     return _serve_storage_path(
-        asset_path, media_type, error_prefix="CAD asset"
+        request, asset_path, media_type, error_prefix="CAD asset"
     )
 
 
@@ -644,6 +629,7 @@ async def get_cad_manifest(
         raise HTTPException(status_code=404, detail="CAD manifest not available")
     if not rewrite:
         return _serve_storage_path(
+            request,
             file_container.cad_manifest_path,
             _guess_media_type(file_container.cad_manifest_path),
             error_prefix="CAD manifest",
@@ -654,7 +640,9 @@ async def get_cad_manifest(
 
 
 @file_viewer_router.get("/{file_id}/cad_document")
-async def get_cad_document(file_id: str, db: Session = Depends(get_db)):
+async def get_cad_document(
+    file_id: str, request: Request, db: Session = Depends(get_db)
+):
     """Get CADGF document.json for 2D CAD conversions."""
     file_container = db.get(FileContainer, file_id)
     if not file_container:
@@ -662,6 +650,7 @@ async def get_cad_document(file_id: str, db: Session = Depends(get_db)):
     if not file_container.cad_document_path:
         raise HTTPException(status_code=404, detail="CAD document not available")
     return _serve_storage_path(
+        request,
         file_container.cad_document_path,
         _guess_media_type(file_container.cad_document_path),
         error_prefix="CAD document",
@@ -669,7 +658,9 @@ async def get_cad_document(file_id: str, db: Session = Depends(get_db)):
 
 
 @file_viewer_router.get("/{file_id}/cad_metadata")
-async def get_cad_metadata(file_id: str, db: Session = Depends(get_db)):
+async def get_cad_metadata(
+    file_id: str, request: Request, db: Session = Depends(get_db)
+):
     """Get CADGF mesh_metadata.json for 2D CAD conversions."""
     file_container = db.get(FileContainer, file_id)
     if not file_container:
@@ -677,6 +668,7 @@ async def get_cad_metadata(file_id: str, db: Session = Depends(get_db)):
     if not file_container.cad_metadata_path:
         raise HTTPException(status_code=404, detail="CAD metadata not available")
     return _serve_storage_path(
+        request,
         file_container.cad_metadata_path,
         _guess_media_type(file_container.cad_metadata_path),
         error_prefix="CAD metadata",
@@ -684,7 +676,9 @@ async def get_cad_metadata(file_id: str, db: Session = Depends(get_db)):
 
 
 @file_viewer_router.get("/{file_id}/cad_bom")
-async def get_cad_bom(file_id: str, db: Session = Depends(get_db)):
+async def get_cad_bom(
+    file_id: str, request: Request, db: Session = Depends(get_db)
+):
     """Get CAD BOM payload (connector-derived)."""
     file_container = db.get(FileContainer, file_id)
     if not file_container:
@@ -692,6 +686,7 @@ async def get_cad_bom(file_id: str, db: Session = Depends(get_db)):
     if not file_container.cad_bom_path:
         raise HTTPException(status_code=404, detail="CAD BOM not available")
     return _serve_storage_path(
+        request,
         file_container.cad_bom_path,
         _guess_media_type(file_container.cad_bom_path),
         error_prefix="CAD BOM",
@@ -699,7 +694,9 @@ async def get_cad_bom(file_id: str, db: Session = Depends(get_db)):
 
 
 @file_viewer_router.get("/{file_id}/cad_dedup")
-async def get_cad_dedup(file_id: str, db: Session = Depends(get_db)):
+async def get_cad_dedup(
+    file_id: str, request: Request, db: Session = Depends(get_db)
+):
     """Get CAD dedup similarity payload (DedupCAD Vision)."""
     file_container = db.get(FileContainer, file_id)
     if not file_container:
@@ -707,6 +704,7 @@ async def get_cad_dedup(file_id: str, db: Session = Depends(get_db)):
     if not file_container.cad_dedup_path:
         raise HTTPException(status_code=404, detail="CAD dedup not available")
     return _serve_storage_path(
+        request,
         file_container.cad_dedup_path,
         _guess_media_type(file_container.cad_dedup_path),
         error_prefix="CAD dedup",
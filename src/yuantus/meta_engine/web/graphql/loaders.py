@@ -2,13 +2,21 @@
 DataLoader Implementations for GraphQL Meta Engine (ADR-007)
 
 Uses DataLoader pattern to batch database queries and prevent N+1 problems.
+Loader functions are synchronous; ``SessionRunner`` runs them (and the
+resolvers' own queries) in a bounded threadpool, off the event loop.
 """
 
-from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import re
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
 from collections import defaultdict
+
+import anyio
 from sqlalchemy.orm import Session
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, and_
 
+from yuantus.config import get_settings
 from yuantus.meta_engine.services.item_number_keys import get_item_number
 from .types import (
     Part,
@@ -26,6 +34,43 @@ from .types import (
 )
 
 
+T = TypeVar("T")
+
+_DB_LIMITER: Optional[anyio.CapacityLimiter] = None
+
+
+def _db_limiter() -> anyio.CapacityLimiter:
+    global _DB_LIMITER
+    if _DB_LIMITER is None:
+        threads = max(1, get_settings().GRAPHQL_DB_MAX_THREADS)
+        _DB_LIMITER = anyio.CapacityLimiter(threads)
+    return _DB_LIMITER
+
+
+class SessionRunner:
+    """
+    Runs one GraphQL request's synchronous DB work in worker threads.
+
+    Sibling resolvers are awaited concurrently but share one Session, so
+    calls are serialized per request; the process-wide limiter bounds the
+    threads all requests together may occupy.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._lock = asyncio.Lock()
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        async with self._lock:
+            return await anyio.to_thread.run_sync(
+                partial(fn, *args), limiter=_db_limiter()
+            )
+
+
+class QueryTooComplex(ValueError):
+    """A single query would load more rows than GRAPHQL limits allow."""
+
+
 # ============================================================
 # Helper Functions
 # ============================================================
@@ -100,33 +145,47 @@ def _bom_item_to_line(item, level: int = 1) -> BOMLine:
     )
 
 
+def item_type_ids_like(
+    db: Session, *patterns: str, is_relationship: bool
+) -> List[str]:
+    """
+    ItemType ids matching any SQL LIKE ``patterns`` (case-insensitive).
+
+    Resolved against the cached metadata snapshot rather than one
+    ``meta_item_types`` query per loader call.
+    """
+    from yuantus.meta_engine.services.metadata_cache import get_metadata
+
+    regexes = [
+        re.compile(
+            "".join(
+                ".*" if ch == "%" else "." if ch == "_" else re.escape(ch)
+                for ch in pattern
+            ),
+            re.IGNORECASE | re.DOTALL,
+        )
+        for pattern in patterns
+    ]
+    return get_metadata(db).type_ids(
+        lambda it: it.is_relationship == is_relationship
+        and any(regex.fullmatch(it.id) for regex in regexes)
+    )
+
+
 # ============================================================
 # DataLoader Factory Functions
 # ============================================================
 
 
-async def load_parts_by_ids(ids: List[str], db: Session) -> List[Optional[Part]]:
+def load_parts_by_ids(ids: List[str], db: Session) -> List[Optional[Part]]:
     """
     Batch load Parts by IDs.
     """
     from yuantus.meta_engine.models.item import Item
-    from yuantus.meta_engine.models.meta_schema import ItemType
 
     # Get Part ItemType IDs
-    part_types = (
-        db.execute(
-            select(ItemType.id).where(
-                and_(
-                    ItemType.is_relationship.is_(False),
-                    or_(
-                        ItemType.id.ilike("part%"),
-                        ItemType.id.ilike("%part"),
-                    ),
-                )
-            )
-        )
-        .scalars()
-        .all()
+    part_types = item_type_ids_like(
+        db, "part%", "%part", is_relationship=False
     )
 
     items = (
@@ -146,30 +205,17 @@ async def load_parts_by_ids(ids: List[str], db: Session) -> List[Optional[Part]]
     return [item_map.get(id) for id in ids]
 
 
-async def load_documents_by_ids(
+def load_documents_by_ids(
     ids: List[str], db: Session
 ) -> List[Optional[Document]]:
     """
     Batch load Documents by IDs.
     """
     from yuantus.meta_engine.models.item import Item
-    from yuantus.meta_engine.models.meta_schema import ItemType
 
     # Get Document ItemType IDs
-    doc_types = (
-        db.execute(
-            select(ItemType.id).where(
-                and_(
-                    ItemType.is_relationship.is_(False),
-                    or_(
-                        ItemType.id.ilike("document%"),
-                        ItemType.id.ilike("%document"),
-                    ),
-                )
-            )
-        )
-        .scalars()
-        .all()
+    doc_types = item_type_ids_like(
+        db, "document%", "%document", is_relationship=False
     )
 
     items = (
@@ -189,7 +235,7 @@ async def load_documents_by_ids(
     return [item_map.get(id) for id in ids]
 
 
-async def load_generic_items_by_ids(
+def load_generic_items_by_ids(
     ids: List[str], db: Session
 ) -> List[Optional[GenericItem]]:
     """
@@ -203,7 +249,7 @@ async def load_generic_items_by_ids(
     return [item_map.get(id) for id in ids]
 
 
-async def load_bom_lines_by_parent(
+def load_bom_lines_by_parent(
     keys: List[Tuple[str, int]], db: Session
 ) -> List[List[BOMLine]]:
     """
@@ -212,23 +258,13 @@ async def load_bom_lines_by_parent(
     Keys are tuples of (parent_id, depth).
     """
     from yuantus.meta_engine.models.item import Item
-    from yuantus.meta_engine.models.meta_schema import ItemType
 
     # Extract unique parent IDs
     parent_ids = list(set(key[0] for key in keys))
 
     # Get BOM relationship ItemType
-    bom_types = (
-        db.execute(
-            select(ItemType.id).where(
-                and_(
-                    ItemType.is_relationship.is_(True),
-                    ItemType.id.ilike("%bom%"),
-                )
-            )
-        )
-        .scalars()
-        .all()
+    bom_types = item_type_ids_like(
+        db, "%bom%", is_relationship=True
     )
 
     # Query BOM lines where source_id (parent) is in parent_ids
@@ -254,7 +290,75 @@ async def load_bom_lines_by_parent(
     return [lines_by_parent.get(key[0], []) for key in keys]
 
 
-async def load_where_used(
+def load_bom_tree(
+    root_id: str, max_level: int, db: Session
+) -> Tuple[Dict[str, List[Any]], Dict[str, Any]]:
+    """
+    Level-batched BOM fetch for explosion.
+
+    One query loads the BOM lines of a whole level and one more their child
+    Items, instead of a query per parent plus a get per line. Returns
+    ``(lines_by_parent, items_by_id)`` covering every parent that can be
+    expanded within ``max_level``.
+
+    Raises QueryTooComplex past GRAPHQL_BOM_EXPLODE_MAX_LINES lines.
+    """
+    from yuantus.meta_engine.models.item import Item
+
+    max_lines = get_settings().GRAPHQL_BOM_EXPLODE_MAX_LINES
+    bom_types = item_type_ids_like(db, "%bom%", is_relationship=True)
+
+    lines_by_parent: Dict[str, List[Any]] = {}
+    items_by_id: Dict[str, Any] = {}
+    loaded = 0
+    frontier = [root_id]
+    for _ in range(max_level):
+        frontier = [pid for pid in frontier if pid not in lines_by_parent]
+        if not frontier:
+            break
+        for pid in frontier:
+            lines_by_parent[pid] = []
+
+        lines = (
+            db.execute(
+                select(Item).where(
+                    and_(
+                        Item.source_id.in_(frontier),
+                        Item.item_type_id.in_(bom_types) if bom_types else True,
+                    )
+                )
+            )
+            .scalars()
+            .all()
+        )
+        loaded += len(lines)
+        if max_lines and loaded > max_lines:
+            raise QueryTooComplex(
+                f"BOM explosion exceeds {max_lines} lines; lower max_level"
+            )
+        for line in lines:
+            lines_by_parent[line.source_id].append(line)
+
+        child_ids = {
+            line.related_id
+            for line in lines
+            if line.related_id and line.related_id not in items_by_id
+        }
+        if child_ids:
+            children = db.execute(select(Item).where(Item.id.in_(child_ids)))
+            for child in children.scalars():
+                items_by_id[child.id] = child
+
+        frontier = list(
+            dict.fromkeys(
+                line.related_id for line in lines if line.related_id in items_by_id
+            )
+        )
+
+    return lines_by_parent, items_by_id
+
+
+def load_where_used(
     keys: List[Tuple[str, int]], db: Session
 ) -> List[List[WhereUsedItem]]:
     """
@@ -263,23 +367,13 @@ async def load_where_used(
     Keys are tuples of (item_id, max_level).
     """
     from yuantus.meta_engine.models.item import Item
-    from yuantus.meta_engine.models.meta_schema import ItemType
 
     # Extract unique item IDs
     item_ids = list(set(key[0] for key in keys))
 
     # Get BOM relationship ItemType
-    bom_types = (
-        db.execute(
-            select(ItemType.id).where(
-                and_(
-                    ItemType.is_relationship.is_(True),
-                    ItemType.id.ilike("%bom%"),
-                )
-            )
-        )
-        .scalars()
-        .all()
+    bom_types = item_type_ids_like(
+        db, "%bom%", is_relationship=True
     )
 
     # Query BOM lines where related_id (child) is in item_ids
@@ -327,7 +421,7 @@ async def load_where_used(
     return [where_used_by_item.get(key[0], []) for key in keys]
 
 
-async def load_item_versions(ids: List[str], db: Session) -> List[List[ItemVersion]]:
+def load_item_versions(ids: List[str], db: Session) -> List[List[ItemVersion]]:
     """
     Batch load item versions.
     """
@@ -356,7 +450,7 @@ async def load_item_versions(ids: List[str], db: Session) -> List[List[ItemVersi
     return [versions_by_item.get(id, []) for id in ids]
 
 
-async def load_document_files(
+def load_document_files(
     ids: List[str], db: Session
 ) -> List[List[FileAttachment]]:
     """
@@ -383,7 +477,7 @@ async def load_document_files(
     return [files_by_doc.get(id, []) for id in ids]
 
 
-async def load_ecos_by_ids(ids: List[str], db: Session) -> List[Optional[ECO]]:
+def load_ecos_by_ids(ids: List[str], db: Session) -> List[Optional[ECO]]:
     """
     Batch load ECOs by IDs.
     """
@@ -412,7 +506,7 @@ async def load_ecos_by_ids(ids: List[str], db: Session) -> List[Optional[ECO]]:
     return [eco_map.get(id) for id in ids]
 
 
-async def load_eco_stages_by_ids(
+def load_eco_stages_by_ids(
     ids: List[str], db: Session
 ) -> List[Optional[ECOStage]]:
     """
@@ -440,7 +534,7 @@ async def load_eco_stages_by_ids(
     return [stage_map.get(id) for id in ids]
 
 
-async def load_eco_approvals(ids: List[str], db: Session) -> List[List[ECOApproval]]:
+def load_eco_approvals(ids: List[str], db: Session) -> List[List[ECOApproval]]:
     """
     Batch load ECO approvals by ECO ID.
     """
@@ -470,7 +564,7 @@ async def load_eco_approvals(ids: List[str], db: Session) -> List[List[ECOApprov
     return [approvals_by_eco.get(id, []) for id in ids]
 
 
-async def load_eco_bom_changes(ids: List[str], db: Session) -> List[List[ECOBOMChange]]:
+def load_eco_bom_changes(ids: List[str], db: Session) -> List[List[ECOBOMChange]]:
     """
     Batch load ECO BOM changes by ECO ID.
     """
@@ -503,7 +597,7 @@ async def load_eco_bom_changes(ids: List[str], db: Session) -> List[List[ECOBOMC
     return [changes_by_eco.get(id, []) for id in ids]
 
 
-async def load_users_by_ids(ids: List[int], db: Session) -> List[Optional[User]]:
+def load_users_by_ids(ids: List[int], db: Session) -> List[Optional[User]]:
     """
     Batch load users by IDs.
     """
@@ -524,28 +618,15 @@ async def load_users_by_ids(ids: List[int], db: Session) -> List[Optional[User]]
     return [user_map.get(id) for id in ids]
 
 
-async def load_part_documents(ids: List[str], db: Session) -> List[List[Document]]:
+def load_part_documents(ids: List[str], db: Session) -> List[List[Document]]:
     """
     Batch load documents related to parts.
     """
     from yuantus.meta_engine.models.item import Item
-    from yuantus.meta_engine.models.meta_schema import ItemType
 
     # Get document-part relationship ItemType
-    rel_types = (
-        db.execute(
-            select(ItemType.id).where(
-                and_(
-                    ItemType.is_relationship.is_(True),
-                    or_(
-                        ItemType.id.ilike("%document%part%"),
-                        ItemType.id.ilike("%part%document%"),
-                    ),
-                )
-            )
-        )
-        .scalars()
-        .all()
+    rel_types = item_type_ids_like(
+        db, "%document%part%", "%part%document%", is_relationship=True
     )
 
     # Query relationships
@@ -580,28 +661,15 @@ async def load_part_documents(ids: List[str], db: Session) -> List[List[Document
     return [docs_by_part.get(id, []) for id in ids]
 
 
-async def load_document_parts(ids: List[str], db: Session) -> List[List[Part]]:
+def load_document_parts(ids: List[str], db: Session) -> List[List[Part]]:
     """
     Batch load parts related to documents.
     """
     from yuantus.meta_engine.models.item import Item
-    from yuantus.meta_engine.models.meta_schema import ItemType
 
     # Get document-part relationship ItemType
-    rel_types = (
-        db.execute(
-            select(ItemType.id).where(
-                and_(
-                    ItemType.is_relationship.is_(True),
-                    or_(
-                        ItemType.id.ilike("%document%part%"),
-                        ItemType.id.ilike("%part%document%"),
-                    ),
-                )
-            )
-        )
-        .scalars()
-        .all()
+    rel_types = item_type_ids_like(
+        db, "%document%part%", "%part%document%", is_relationship=True
     )
 
     # Query relationships (reverse lookup)
@@ -643,45 +711,61 @@ async def load_document_parts(ids: List[str], db: Session) -> List[List[Part]]:
 # ============================================================
 
 
-def create_data_loaders(db: Session) -> Dict[str, Any]:
+def create_data_loaders(
+    db: Session, runner: Optional[SessionRunner] = None
+) -> Dict[str, Any]:
     """
     Create all DataLoaders for GraphQL context.
+
+    Batches run through ``runner`` (one per request) off the event loop;
+    it is returned as ``db_runner`` for the resolvers' own queries.
     """
     from strawberry.dataloader import DataLoader
 
+    runner = runner or SessionRunner(db)
+
     return {
-        "part_loader": DataLoader(load_fn=lambda ids: load_parts_by_ids(ids, db)),
+        "db_runner": runner,
+        "part_loader": DataLoader(
+            load_fn=lambda ids: runner.run(load_parts_by_ids, ids, db)
+        ),
         "document_loader": DataLoader(
-            load_fn=lambda ids: load_documents_by_ids(ids, db)
+            load_fn=lambda ids: runner.run(load_documents_by_ids, ids, db)
         ),
         "generic_item_loader": DataLoader(
-            load_fn=lambda ids: load_generic_items_by_ids(ids, db)
+            load_fn=lambda ids: runner.run(load_generic_items_by_ids, ids, db)
         ),
         "bom_lines_loader": DataLoader(
-            load_fn=lambda keys: load_bom_lines_by_parent(keys, db)
+            load_fn=lambda keys: runner.run(load_bom_lines_by_parent, keys, db)
+        ),
+        "where_used_loader": DataLoader(
+            load_fn=lambda keys: runner.run(load_where_used, keys, db)
         ),
-        "where_used_loader": DataLoader(load_fn=lambda keys: load_where_used(keys, db)),
         "item_versions_loader": DataLoader(
-            load_fn=lambda ids: load_item_versions(ids, db)
+            load_fn=lambda ids: runner.run(load_item_versions, ids, db)
         ),
         "document_files_loader": DataLoader(
-            load_fn=lambda ids: load_document_files(ids, db)
+            load_fn=lambda ids: runner.run(load_document_files, ids, db)
+        ),
+        "eco_loader": DataLoader(
+            load_fn=lambda ids: runner.run(load_ecos_by_ids, ids, db)
         ),
-        "eco_loader": DataLoader(load_fn=lambda ids: load_ecos_by_ids(ids, db)),
         "eco_stage_loader": DataLoader(
-            load_fn=lambda ids: load_eco_stages_by_ids(ids, db)
+            load_fn=lambda ids: runner.run(load_eco_stages_by_ids, ids, db)
         ),
         "eco_approvals_loader": DataLoader(
-            load_fn=lambda ids: load_eco_approvals(ids, db)
+            load_fn=lambda ids: runner.run(load_eco_approvals, ids, db)
         ),
         "eco_bom_changes_loader": DataLoader(
-            load_fn=lambda ids: load_eco_bom_changes(ids, db)
+            load_fn=lambda ids: runner.run(load_eco_bom_changes, ids, db)
+        ),
+        "user_loader": DataLoader(
+            load_fn=lambda ids: runner.run(load_users_by_ids, ids, db)
         ),
-        "user_loader": DataLoader(load_fn=lambda ids: load_users_by_ids(ids, db)),
         "part_documents_loader": DataLoader(
-            load_fn=lambda ids: load_part_documents(ids, db)
+            load_fn=lambda ids: runner.run(load_part_documents, ids, db)
         ),
         "document_parts_loader": DataLoader(
-            load_fn=lambda ids: load_document_parts(ids, db)
+            load_fn=lambda ids: runner.run(load_document_parts, ids, db)
         ),
     }
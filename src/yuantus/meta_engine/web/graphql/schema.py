@@ -6,11 +6,13 @@ Provides Query type and schema configuration for the GraphQL aggregation layer.
 
 from typing import List, Optional
 import strawberry
+from strawberry.extensions import MaxTokensLimiter, QueryDepthLimiter
 from strawberry.types import Info
 from strawberry.fastapi import GraphQLRouter
 from sqlalchemy.orm import Session
 from sqlalchemy import select, and_, or_, func
 
+from yuantus.config import get_settings
 from yuantus.meta_engine.services.item_number_keys import (
     ITEM_NUMBER_READ_KEYS,
     get_item_number,
@@ -39,17 +41,28 @@ from .types import (
     User,
 )
 from .loaders import (
+    SessionRunner,
     _item_to_part,
     _item_to_document,
     _item_to_generic,
+    item_type_ids_like,
+    load_bom_tree,
 )
 
 
 # ============================================================
-# Query Type
+# Resolver Bodies (synchronous; run off the event loop)
 # ============================================================
 
 
+def _runner(info: Info) -> SessionRunner:
+    """The request's SessionRunner (created on demand for bare contexts)."""
+    runner = info.context.get("db_runner")
+    if runner is None:
+        runner = info.context["db_runner"] = SessionRunner(info.context["db"])
+    return runner
+
+
 def _item_number_filter_clause(item_model, number: str):
     return or_(
         *[
@@ -59,6 +72,372 @@ def _item_number_filter_clause(item_model, number: str):
     )
 
 
+def _parts(
+    db: Session,
+    filter: Optional[PartFilter],
+    first: int,
+    after: Optional[str],
+) -> PartConnection:
+    from yuantus.meta_engine.models.item import Item
+
+    # Get Part ItemType IDs
+    part_types = item_type_ids_like(
+        db, "part%", "%part", is_relationship=False
+    )
+
+    # Build query
+    query = select(Item).where(
+        Item.item_type_id.in_(part_types) if part_types else True
+    )
+
+    # Apply filters
+    if filter:
+        if filter.is_current is not None:
+            query = query.where(Item.is_current == filter.is_current)
+        if filter.state:
+            query = query.where(Item.state == filter.state)
+        if filter.number:
+            query = query.where(_item_number_filter_clause(Item, filter.number))
+        if filter.name_contains:
+            query = query.where(
+                Item.properties["name"].as_string().ilike(f"%{filter.name_contains}%")
+            )
+
+    # Count total
+    count_query = select(func.count()).select_from(query.subquery())
+    total_count = db.execute(count_query).scalar() or 0
+
+    # Pagination
+    offset = int(after) if after else 0
+    query = query.offset(offset).limit(first + 1)
+
+    items = db.execute(query).scalars().all()
+
+    # Check for more
+    has_next = len(items) > first
+    if has_next:
+        items = items[:-1]
+
+    # Build edges
+    edges = [
+        PartEdge(
+            node=_item_to_part(item),
+            cursor=str(offset + i),
+        )
+        for i, item in enumerate(items)
+    ]
+
+    page_info = PageInfo(
+        has_next_page=has_next,
+        has_previous_page=offset > 0,
+        start_cursor=str(offset) if items else None,
+        end_cursor=str(offset + len(items) - 1) if items else None,
+        total_count=total_count,
+    )
+
+    return PartConnection(edges=edges, page_info=page_info)
+
+
+def _documents(
+    db: Session,
+    filter: Optional[DocumentFilter],
+    first: int,
+    after: Optional[str],
+) -> DocumentConnection:
+    from yuantus.meta_engine.models.item import Item
+
+    # Get Document ItemType IDs
+    doc_types = item_type_ids_like(
+        db, "document%", "%document", is_relationship=False
+    )
+
+    # Build query
+    query = select(Item).where(
+        Item.item_type_id.in_(doc_types) if doc_types else True
+    )
+
+    # Apply filters
+    if filter:
+        if filter.is_current is not None:
+            query = query.where(Item.is_current == filter.is_current)
+        if filter.state:
+            query = query.where(Item.state == filter.state)
+        if filter.number:
+            query = query.where(_item_number_filter_clause(Item, filter.number))
+        if filter.name_contains:
+            query = query.where(
+                Item.properties["name"].as_string().ilike(f"%{filter.name_contains}%")
+            )
+
+    # Count total
+    count_query = select(func.count()).select_from(query.subquery())
+    total_count = db.execute(count_query).scalar() or 0
+
+    # Pagination
+    offset = int(after) if after else 0
+    query = query.offset(offset).limit(first + 1)
+
+    items = db.execute(query).scalars().all()
+
+    # Check for more
+    has_next = len(items) > first
+    if has_next:
+        items = items[:-1]
+
+    # Build edges
+    edges = [
+        DocumentEdge(
+            node=_item_to_document(item),
+            cursor=str(offset + i),
+        )
+        for i, item in enumerate(items)
+    ]
+
+    page_info = PageInfo(
+        has_next_page=has_next,
+        has_previous_page=offset > 0,
+        start_cursor=str(offset) if items else None,
+        end_cursor=str(offset + len(items) - 1) if items else None,
+        total_count=total_count,
+    )
+
+    return DocumentConnection(edges=edges, page_info=page_info)
+
+
+def _bom_explode(
+    db: Session, part_id: str, max_level: int, include_properties: bool
+) -> List[ExplodedBOMItem]:
+    # Lines and children are fetched a level at a time; the walk is in memory.
+    lines_by_parent, items_by_id = load_bom_tree(part_id, max_level, db)
+
+    result = []
+    visited = set()
+
+    def _explode(parent_id: str, level: int, path: List[str]):
+        if level > max_level or parent_id in visited:
+            return
+        visited.add(parent_id)
+
+        for item in lines_by_parent.get(parent_id, []):
+            if not item.related_id:
+                continue
+
+            child = items_by_id.get(item.related_id)
+            if not child:
+                continue
+
+            child_props = child.properties or {}
+            bom_props = item.properties or {}
+            current_path = path + [item.related_id]
+
+            result.append(
+                ExplodedBOMItem(
+                    level=level,
+                    path="/".join(current_path),
+                    component_id=item.related_id,
+                    component_number=get_item_number(child_props),
+                    component_name=child_props.get("name"),
+                    quantity=float(bom_props.get("quantity", 1)),
+                    unit=bom_props.get("unit") or bom_props.get("uom"),
+                    find_number=bom_props.get("find_number"),
+                    properties=bom_props if include_properties else None,
+                )
+            )
+
+            # Recurse
+            _explode(item.related_id, level + 1, current_path)
+
+    _explode(part_id, 1, [part_id])
+    return result
+
+
+def _ecos(
+    db: Session,
+    filter: Optional[ECOFilter],
+    first: int,
+    after: Optional[str],
+) -> ECOConnection:
+    from yuantus.meta_engine.models.eco import ECO as ECOModel
+
+    # Build query
+    query = select(ECOModel)
+
+    # Apply filters
+    if filter:
+        if filter.state:
+            query = query.where(ECOModel.state == filter.state)
+        if filter.eco_type:
+            query = query.where(ECOModel.eco_type == filter.eco_type)
+        if filter.priority:
+            query = query.where(ECOModel.priority == filter.priority)
+        if filter.stage_id:
+            query = query.where(ECOModel.stage_id == filter.stage_id)
+        if filter.product_id:
+            query = query.where(ECOModel.product_id == filter.product_id)
+
+    # Order by created_at desc
+    query = query.order_by(ECOModel.created_at.desc())
+
+    # Count total
+    count_query = select(func.count()).select_from(query.subquery())
+    total_count = db.execute(count_query).scalar() or 0
+
+    # Pagination
+    offset = int(after) if after else 0
+    query = query.offset(offset).limit(first + 1)
+
+    ecos = db.execute(query).scalars().all()
+
+    # Check for more
+    has_next = len(ecos) > first
+    if has_next:
+        ecos = ecos[:-1]
+
+    # Build edges
+
+    edges = []
+    for i, e in enumerate(ecos):
+        edges.append(
+            ECOEdge(
+                node=ECO(
+                    id=e.id,
+                    name=e.name,
+                    eco_type=e.eco_type,
+                    product_id=e.product_id,
+                    stage_id=e.stage_id,
+                    state=e.state,
+                    kanban_state=e.kanban_state,
+                    priority=e.priority,
+                    description=e.description,
+                    effectivity_date=e.effectivity_date,
+                    created_at=e.created_at,
+                    updated_at=e.updated_at,
+                    created_by_id=e.created_by_id,
+                ),
+                cursor=str(offset + i),
+            )
+        )
+
+    page_info = PageInfo(
+        has_next_page=has_next,
+        has_previous_page=offset > 0,
+        start_cursor=str(offset) if ecos else None,
+        end_cursor=str(offset + len(ecos) - 1) if ecos else None,
+        total_count=total_count,
+    )
+
+    return ECOConnection(edges=edges, page_info=page_info)
+
+
+def _eco_stages(db: Session) -> List[ECOStage]:
+    from yuantus.meta_engine.models.eco import ECOStage as ECOStageModel
+
+    stages = (
+        db.execute(select(ECOStageModel).order_by(ECOStageModel.sequence))
+        .scalars()
+        .all()
+    )
+
+    return [
+        ECOStage(
+            id=s.id,
+            name=s.name,
+            sequence=s.sequence,
+            is_blocking=s.is_blocking,
+            approval_type=s.approval_type,
+            min_approvals=s.min_approvals,
+        )
+        for s in stages
+    ]
+
+
+def _item(db: Session, type: str, id: str) -> Optional[GenericItem]:
+    from yuantus.meta_engine.models.item import Item
+
+    item = db.execute(
+        select(Item).where(
+            and_(
+                Item.id == id,
+                Item.item_type_id == type,
+            )
+        )
+    ).scalar_one_or_none()
+
+    if not item:
+        return None
+
+    return _item_to_generic(item)
+
+
+def _items(
+    db: Session,
+    filter: GenericItemFilter,
+    first: int,
+    after: Optional[str],
+) -> GenericItemConnection:
+    from yuantus.meta_engine.models.item import Item
+
+    # Build query
+    query = select(Item).where(Item.item_type_id == filter.type)
+
+    # Apply filters
+    if filter.is_current is not None:
+        query = query.where(Item.is_current == filter.is_current)
+    if filter.state:
+        query = query.where(Item.state == filter.state)
+    if filter.number:
+        query = query.where(_item_number_filter_clause(Item, filter.number))
+    if filter.name_contains:
+        query = query.where(
+            Item.properties["name"]
+            .as_string()
+            .ilike(f"%{filter.name_contains}%")
+        )
+    if filter.properties:
+        # Apply JSONB property filters
+        for key, value in filter.properties.items():
+            query = query.where(Item.properties[key].as_string() == str(value))
+
+    # Count total
+    count_query = select(func.count()).select_from(query.subquery())
+    total_count = db.execute(count_query).scalar() or 0
+
+    # Pagination
+    offset = int(after) if after else 0
+    query = query.offset(offset).limit(first + 1)
+
+    items = db.execute(query).scalars().all()
+
+    # Check for more
+    has_next = len(items) > first
+    if has_next:
+        items = items[:-1]
+
+    # Build edges
+    edges = [
+        GenericItemEdge(
+            node=_item_to_generic(item),
+            cursor=str(offset + i),
+        )
+        for i, item in enumerate(items)
+    ]
+
+    page_info = PageInfo(
+        has_next_page=has_next,
+        has_previous_page=offset > 0,
+        start_cursor=str(offset) if items else None,
+        end_cursor=str(offset + len(items) - 1) if items else None,
+        total_count=total_count,
+    )
+
+    return GenericItemConnection(edges=edges, page_info=page_info)
+
+
+# ============================================================
+# Query Type
+# ============================================================
+
+
 @strawberry.type
 class Query:
     """
@@ -98,79 +477,7 @@ class Query:
         """
         Get paginated Parts with optional filtering.
         """
-        from yuantus.meta_engine.models.item import Item
-        from yuantus.meta_engine.models.meta_schema import ItemType
-
-        db: Session = info.context["db"]
-
-        # Get Part ItemType IDs
-        part_types = (
-            db.execute(
-                select(ItemType.id).where(
-                    and_(
-                        ItemType.is_relationship.is_(False),
-                        or_(
-                            ItemType.id.ilike("part%"),
-                            ItemType.id.ilike("%part"),
-                        ),
-                    )
-                )
-            )
-            .scalars()
-            .all()
-        )
-
-        # Build query
-        query = select(Item).where(
-            Item.item_type_id.in_(part_types) if part_types else True
-        )
-
-        # Apply filters
-        if filter:
-            if filter.is_current is not None:
-                query = query.where(Item.is_current == filter.is_current)
-            if filter.state:
-                query = query.where(Item.state == filter.state)
-            if filter.number:
-                query = query.where(_item_number_filter_clause(Item, filter.number))
-            if filter.name_contains:
-                query = query.where(
-                    Item.properties["name"].as_string().ilike(f"%{filter.name_contains}%")
-                )
-
-        # Count total
-        count_query = select(func.count()).select_from(query.subquery())
-        total_count = db.execute(count_query).scalar() or 0
-
-        # Pagination
-        offset = int(after) if after else 0
-        query = query.offset(offset).limit(first + 1)
-
-        items = db.execute(query).scalars().all()
-
-        # Check for more
-        has_next = len(items) > first
-        if has_next:
-            items = items[:-1]
-
-        # Build edges
-        edges = [
-            PartEdge(
-                node=_item_to_part(item),
-                cursor=str(offset + i),
-            )
-            for i, item in enumerate(items)
-        ]
-
-        page_info = PageInfo(
-            has_next_page=has_next,
-            has_previous_page=offset > 0,
-            start_cursor=str(offset) if items else None,
-            end_cursor=str(offset + len(items) - 1) if items else None,
-            total_count=total_count,
-        )
-
-        return PartConnection(edges=edges, page_info=page_info)
+        return await _runner(info).run(_parts, info.context["db"], filter, first, after)
 
     # --------------------------------------------------------
     # Document Queries
@@ -197,80 +504,10 @@ class Query:
         """
         Get paginated Documents with optional filtering.
         """
-        from yuantus.meta_engine.models.item import Item
-        from yuantus.meta_engine.models.meta_schema import ItemType
-
-        db: Session = info.context["db"]
-
-        # Get Document ItemType IDs
-        doc_types = (
-            db.execute(
-                select(ItemType.id).where(
-                    and_(
-                        ItemType.is_relationship.is_(False),
-                        or_(
-                            ItemType.id.ilike("document%"),
-                            ItemType.id.ilike("%document"),
-                        ),
-                    )
-                )
-            )
-            .scalars()
-            .all()
+        return await _runner(info).run(
+            _documents, info.context["db"], filter, first, after
         )
 
-        # Build query
-        query = select(Item).where(
-            Item.item_type_id.in_(doc_types) if doc_types else True
-        )
-
-        # Apply filters
-        if filter:
-            if filter.is_current is not None:
-                query = query.where(Item.is_current == filter.is_current)
-            if filter.state:
-                query = query.where(Item.state == filter.state)
-            if filter.number:
-                query = query.where(_item_number_filter_clause(Item, filter.number))
-            if filter.name_contains:
-                query = query.where(
-                    Item.properties["name"].as_string().ilike(f"%{filter.name_contains}%")
-                )
-
-        # Count total
-        count_query = select(func.count()).select_from(query.subquery())
-        total_count = db.execute(count_query).scalar() or 0
-
-        # Pagination
-        offset = int(after) if after else 0
-        query = query.offset(offset).limit(first + 1)
-
-        items = db.execute(query).scalars().all()
-
-        # Check for more
-        has_next = len(items) > first
-        if has_next:
-            items = items[:-1]
-
-        # Build edges
-        edges = [
-            DocumentEdge(
-                node=_item_to_document(item),
-                cursor=str(offset + i),
-            )
-            for i, item in enumerate(items)
-        ]
-
-        page_info = PageInfo(
-            has_next_page=has_next,
-            has_previous_page=offset > 0,
-            start_cursor=str(offset) if items else None,
-            end_cursor=str(offset + len(items) - 1) if items else None,
-            total_count=total_count,
-        )
-
-        return DocumentConnection(edges=edges, page_info=page_info)
-
     # --------------------------------------------------------
     # BOM Queries
     # --------------------------------------------------------
@@ -290,81 +527,14 @@ class Query:
             part_id: Root part ID
             max_level: Maximum depth to explode (default 10)
             include_properties: Whether to include full properties (default False)
+
+        Fails once the explosion loads more than
+        GRAPHQL_BOM_EXPLODE_MAX_LINES lines (when set).
         """
-        from yuantus.meta_engine.models.item import Item
-        from yuantus.meta_engine.models.meta_schema import ItemType
-
-        db: Session = info.context["db"]
-
-        # Get BOM relationship ItemType
-        bom_types = (
-            db.execute(
-                select(ItemType.id).where(
-                    and_(
-                        ItemType.is_relationship.is_(True),
-                        ItemType.id.ilike("%bom%"),
-                    )
-                )
-            )
-            .scalars()
-            .all()
+        return await _runner(info).run(
+            _bom_explode, info.context["db"], part_id, max_level, include_properties
         )
 
-        result = []
-        visited = set()
-
-        def _explode(parent_id: str, level: int, path: List[str]):
-            if level > max_level or parent_id in visited:
-                return
-            visited.add(parent_id)
-
-            # Get BOM lines for this parent
-            bom_items = (
-                db.execute(
-                    select(Item).where(
-                        and_(
-                            Item.source_id == parent_id,
-                            Item.item_type_id.in_(bom_types) if bom_types else True,
-                        )
-                    )
-                )
-                .scalars()
-                .all()
-            )
-
-            for item in bom_items:
-                if not item.related_id:
-                    continue
-
-                # Get child item details
-                child = db.get(Item, item.related_id)
-                if not child:
-                    continue
-
-                child_props = child.properties or {}
-                bom_props = item.properties or {}
-                current_path = path + [item.related_id]
-
-                result.append(
-                    ExplodedBOMItem(
-                        level=level,
-                        path="/".join(current_path),
-                        component_id=item.related_id,
-                        component_number=get_item_number(child_props),
-                        component_name=child_props.get("name"),
-                        quantity=float(bom_props.get("quantity", 1)),
-                        unit=bom_props.get("unit") or bom_props.get("uom"),
-                        find_number=bom_props.get("find_number"),
-                        properties=bom_props if include_properties else None,
-                    )
-                )
-
-                # Recurse
-                _explode(item.related_id, level + 1, current_path)
-
-        _explode(part_id, 1, [part_id])
-        return result
-
     @strawberry.field
     async def bom_lines(
         self,
@@ -409,105 +579,14 @@ class Query:
         """
         Get paginated ECOs with optional filtering.
         """
-        from yuantus.meta_engine.models.eco import ECO as ECOModel
-
-        db: Session = info.context["db"]
-
-        # Build query
-        query = select(ECOModel)
-
-        # Apply filters
-        if filter:
-            if filter.state:
-                query = query.where(ECOModel.state == filter.state)
-            if filter.eco_type:
-                query = query.where(ECOModel.eco_type == filter.eco_type)
-            if filter.priority:
-                query = query.where(ECOModel.priority == filter.priority)
-            if filter.stage_id:
-                query = query.where(ECOModel.stage_id == filter.stage_id)
-            if filter.product_id:
-                query = query.where(ECOModel.product_id == filter.product_id)
-
-        # Order by created_at desc
-        query = query.order_by(ECOModel.created_at.desc())
-
-        # Count total
-        count_query = select(func.count()).select_from(query.subquery())
-        total_count = db.execute(count_query).scalar() or 0
-
-        # Pagination
-        offset = int(after) if after else 0
-        query = query.offset(offset).limit(first + 1)
-
-        ecos = db.execute(query).scalars().all()
-
-        # Check for more
-        has_next = len(ecos) > first
-        if has_next:
-            ecos = ecos[:-1]
-
-        # Build edges
-
-        edges = []
-        for i, e in enumerate(ecos):
-            edges.append(
-                ECOEdge(
-                    node=ECO(
-                        id=e.id,
-                        name=e.name,
-                        eco_type=e.eco_type,
-                        product_id=e.product_id,
-                        stage_id=e.stage_id,
-                        state=e.state,
-                        kanban_state=e.kanban_state,
-                        priority=e.priority,
-                        description=e.description,
-                        effectivity_date=e.effectivity_date,
-                        created_at=e.created_at,
-                        updated_at=e.updated_at,
-                        created_by_id=e.created_by_id,
-                    ),
-                    cursor=str(offset + i),
-                )
-            )
-
-        page_info = PageInfo(
-            has_next_page=has_next,
-            has_previous_page=offset > 0,
-            start_cursor=str(offset) if ecos else None,
-            end_cursor=str(offset + len(ecos) - 1) if ecos else None,
-            total_count=total_count,
-        )
-
-        return ECOConnection(edges=edges, page_info=page_info)
+        return await _runner(info).run(_ecos, info.context["db"], filter, first, after)
 
     @strawberry.field
     async def eco_stages(self, info: Info) -> List[ECOStage]:
         """
         Get all ECO stages.
         """
-        from yuantus.meta_engine.models.eco import ECOStage as ECOStageModel
-
-        db: Session = info.context["db"]
-
-        stages = (
-            db.execute(select(ECOStageModel).order_by(ECOStageModel.sequence))
-            .scalars()
-            .all()
-        )
-
-        return [
-            ECOStage(
-                id=s.id,
-                name=s.name,
-                sequence=s.sequence,
-                is_blocking=s.is_blocking,
-                approval_type=s.approval_type,
-                min_approvals=s.min_approvals,
-            )
-            for s in stages
-        ]
+        return await _runner(info).run(_eco_stages, info.context["db"])
 
     # --------------------------------------------------------
     # Generic Item Queries (Dynamic ItemTypes)
@@ -525,23 +604,7 @@ class Query:
 
         Use this for dynamic ItemTypes not covered by Part/Document/ECO.
         """
-        from yuantus.meta_engine.models.item import Item
-
-        db: Session = info.context["db"]
-
-        item = db.execute(
-            select(Item).where(
-                and_(
-                    Item.id == id,
-                    Item.item_type_id == type,
-                )
-            )
-        ).scalar_one_or_none()
-
-        if not item:
-            return None
-
-        return _item_to_generic(item)
+        return await _runner(info).run(_item, info.context["db"], type, id)
 
     @strawberry.field
     async def items(
@@ -556,64 +619,7 @@ class Query:
 
         Use this for dynamic ItemTypes not covered by Part/Document/ECO.
         """
-        from yuantus.meta_engine.models.item import Item
-
-        db: Session = info.context["db"]
-
-        # Build query
-        query = select(Item).where(Item.item_type_id == filter.type)
-
-        # Apply filters
-        if filter.is_current is not None:
-            query = query.where(Item.is_current == filter.is_current)
-        if filter.state:
-            query = query.where(Item.state == filter.state)
-        if filter.number:
-            query = query.where(_item_number_filter_clause(Item, filter.number))
-        if filter.name_contains:
-            query = query.where(
-                Item.properties["name"]
-                .as_string()
-                .ilike(f"%{filter.name_contains}%")
-            )
-        if filter.properties:
-            # Apply JSONB property filters
-            for key, value in filter.properties.items():
-                query = query.where(Item.properties[key].as_string() == str(value))
-
-        # Count total
-        count_query = select(func.count()).select_from(query.subquery())
-        total_count = db.execute(count_query).scalar() or 0
-
-        # Pagination
-        offset = int(after) if after else 0
-        query = query.offset(offset).limit(first + 1)
-
-        items = db.execute(query).scalars().all()
-
-        # Check for more
-        has_next = len(items) > first
-        if has_next:
-            items = items[:-1]
-
-        # Build edges
-        edges = [
-            GenericItemEdge(
-                node=_item_to_generic(item),
-                cursor=str(offset + i),
-            )
-            for i, item in enumerate(items)
-        ]
-
-        page_info = PageInfo(
-            has_next_page=has_next,
-            has_previous_page=offset > 0,
-            start_cursor=str(offset) if items else None,
-            end_cursor=str(offset + len(items) - 1) if items else None,
-            total_count=total_count,
-        )
-
-        return GenericItemConnection(edges=edges, page_info=page_info)
+        return await _runner(info).run(_items, info.context["db"], filter, first, after)
 
     # --------------------------------------------------------
     # User Query
@@ -677,8 +683,29 @@ class QueryWithInfo(Query):
         )
 
 
+class _DepthLimit(QueryDepthLimiter):
+    def __init__(self):
+        super().__init__(max_depth=get_settings().GRAPHQL_MAX_QUERY_DEPTH)
+
+
+class _TokenLimit(MaxTokensLimiter):
+    def __init__(self):
+        super().__init__(max_token_count=get_settings().GRAPHQL_MAX_QUERY_TOKENS)
+
+
+def _schema_extensions() -> list:
+    """Query depth / size guards enabled in settings (0 disables each)."""
+    settings = get_settings()
+    extensions = []
+    if settings.GRAPHQL_MAX_QUERY_DEPTH > 0:
+        extensions.append(_DepthLimit)
+    if settings.GRAPHQL_MAX_QUERY_TOKENS > 0:
+        extensions.append(_TokenLimit)
+    return extensions
+
+
 # Create schema (read-only, no mutations per ADR-007)
-schema = strawberry.Schema(query=QueryWithInfo)
+schema = strawberry.Schema(query=QueryWithInfo, extensions=_schema_extensions())
 
 
 def create_graphql_router(
@@ -715,7 +742,7 @@ def create_graphql_router(
             "user_id": user_id,
         }
 
-        # Add all data loaders
+        # Add all data loaders (and the runner that keeps DB work off the loop)
         context.update(create_data_loaders(db))
 
         return context
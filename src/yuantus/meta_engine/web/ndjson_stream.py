@@ -0,0 +1,44 @@
+"""Newline-delimited JSON streaming helpers."""
+from __future__ import annotations
+
+import json
+from typing import Any, Iterable, Iterator, Mapping, Optional
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def iter_ndjson_lines(
+    records: Iterable[Mapping[str, Any]], *, session: Optional[Session] = None
+) -> Iterator[bytes]:
+    """Encode ``records`` one JSON document per line, lazily.
+
+    When ``session`` is given it is closed once the stream ends (or the client
+    disconnects): the records are produced while the response is being sent,
+    which may be after the request-scoped session dependency has exited.
+    """
+
+    try:
+        for record in records:
+            yield (json.dumps(record, default=str, ensure_ascii=False) + "\n").encode(
+                "utf-8"
+            )
+    finally:
+        if session is not None:
+            session.close()
+
+
+def ndjson_response(
+    records: Iterable[Mapping[str, Any]],
+    *,
+    session: Optional[Session] = None,
+    headers: Optional[Mapping[str, str]] = None,
+) -> StreamingResponse:
+    return StreamingResponse(
+        iter_ndjson_lines(records, session=session),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers=dict(headers or {}),
+    )
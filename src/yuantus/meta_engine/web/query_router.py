@@ -3,21 +3,47 @@ AML Query Router (ADR-007)
 增强的 AML 查询 API
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from typing import Dict, Any, List, Optional
 
+from yuantus.api.dependencies.auth import CurrentUser, get_current_user_optional
+from yuantus.config import get_settings
 from yuantus.database import get_db
 from yuantus.meta_engine.schemas.aml import AMLQueryRequest, AMLQueryResponse
+from yuantus.meta_engine.services.meta_permission_service import pushdown_user_kwargs
 from yuantus.meta_engine.services.query_service import AMLQueryService
+from yuantus.security.auth.database import get_identity_db
 
 query_router = APIRouter(prefix="/aml", tags=["AML Query"])
 
 
+def get_pushdown_user(
+    request: Request, db: Session = Depends(get_db)
+) -> Optional[CurrentUser]:
+    """
+    The caller whose read ACLs are pushed into SQL.
+
+    Resolved only while QUERY_ACL_PUSHDOWN_ENABLED is on, so the default
+    configuration neither touches the identity DB nor adds org/membership
+    errors to the query endpoint.
+    """
+    if not get_settings().QUERY_ACL_PUSHDOWN_ENABLED:
+        return None
+    identity_dbs = get_identity_db()
+    try:
+        return get_current_user_optional(
+            request, identity_db=next(identity_dbs), db=db
+        )
+    finally:
+        identity_dbs.close()
+
+
 @query_router.post("/query", response_model=AMLQueryResponse)
 def aml_query(
     request: AMLQueryRequest,
     db: Session = Depends(get_db),
+    current_user: Optional[CurrentUser] = Depends(get_pushdown_user),
 ):
     """
     增强的 AML 查询接口
@@ -42,9 +68,15 @@ def aml_query(
         "page_size": 50
     }
     ```
+
+    大数据量同步: 传入上一页的 next_cursor 作为 cursor (keyset 分页),
+    并用 count_mode="none"/"estimate" 跳过精确计数。
     """
     service = AMLQueryService(db)
-    return service.query(request)
+    try:
+        return service.query(request, **pushdown_user_kwargs(current_user))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
 
 
 @query_router.get("/{item_type}/{item_id}")
@@ -10,6 +10,7 @@ from sqlalchemy.orm import Session
 from yuantus.api.dependencies.auth import CurrentUser, get_current_user
 from yuantus.database import get_db
 from yuantus.meta_engine.reports.search_service import SavedSearchService
+from yuantus.meta_engine.services.meta_permission_service import pushdown_user_kwargs
 
 report_saved_search_router = APIRouter(prefix="/reports", tags=["Reports"])
 
@@ -183,4 +184,5 @@ def run_saved_search(
         saved_search_id,
         page=page,
         page_size=page_size or None,
+        **pushdown_user_kwargs(user),
     )
@@ -12,6 +12,7 @@ from yuantus.config import get_settings
 from yuantus.context import get_request_context
 from yuantus.database import get_db
 from yuantus.meta_engine.reports.search_service import AdvancedSearchService
+from yuantus.meta_engine.services.meta_permission_service import pushdown_user_kwargs
 from yuantus.meta_engine.services.report_service import ReportService
 
 report_summary_search_router = APIRouter(prefix="/reports", tags=["Reports"])
@@ -68,4 +69,5 @@ def advanced_search(
         page=req.page,
         page_size=req.page_size,
         include_count=req.include_count,
+        **pushdown_user_kwargs(_user),
     )
@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, Body
 from sqlalchemy.orm import Session
 from typing import Any, Dict, List, Optional
+import inspect
 import os
 
 from yuantus.database import get_db
 from yuantus.exceptions.handlers import PLMException
+from .ndjson_stream import ndjson_response
 from .rpc_registry import get_handler
 from yuantus.meta_engine.services.engine import AMLEngine
 
@@ -75,6 +77,10 @@ async def rpc_dispatch(
 
         result = handler(engine, args, kwargs)
         db.commit()
+        if inspect.isgenerator(result):
+            # Streaming handlers (e.g. Report.flatten_bom with stream=True)
+            # produce records lazily; send them as NDJSON instead of buffering.
+            return ndjson_response(result, session=db)
         return {"result": result}
     except PLMException as exc:
         db.rollback()
@@ -28,6 +28,19 @@ class SearchStatusResponse(BaseModel):
     index_exists: bool = False
 
 
+class SearchIndexerBulkStatus(BaseModel):
+    enabled: bool
+    pending: int
+    batches: int
+    actions: int
+    indexed: int
+    deleted: int
+    failed: int
+    retries: int
+    bytes: int
+    last_batch: Optional[Dict[str, Any]] = None
+
+
 class SearchIndexerStatusResponse(BaseModel):
     registered: bool
     registered_at: Optional[str] = None
@@ -63,6 +76,7 @@ class SearchIndexerStatusResponse(BaseModel):
     last_error_at: Optional[str] = None
     last_error_age_seconds: Optional[int] = None
     last_error: Optional[str] = None
+    bulk: SearchIndexerBulkStatus
 
 
 class SearchReportBucket(BaseModel):
@@ -172,6 +186,11 @@ def search_items(
     state: Optional[str] = None,
     limit: int = 20,
     released_only: bool = False,
+    count_mode: str = Query(
+        "exact",
+        pattern="^(exact|estimate|none)$",
+        description="exact | estimate (planner/capped total) | none (skip the count)",
+    ),
     db: Session = Depends(get_db),
 ) -> Dict[str, Any]:
     service = SearchService(db)
@@ -182,7 +201,13 @@ def search_items(
         filters["state"] = state
     # WP3.4 C2: opt-in latest-released selection surface; default off preserves
     # browsing drafts/WIP. Never applied to the general GetOperation.
-    return service.search(q, filters=filters, limit=limit, released_only=released_only)
+    return service.search(
+        q,
+        filters=filters,
+        limit=limit,
+        released_only=released_only,
+        count_mode=count_mode,
+    )
 
 
 @search_router.get("/ecos")
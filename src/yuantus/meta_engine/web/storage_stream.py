@@ -0,0 +1,162 @@
+"""Streaming, range-aware responses for files held in storage."""
+from __future__ import annotations
+
+import itertools
+import os
+import re
+from email.utils import formatdate
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
+
+from yuantus.meta_engine.services.file_service import FileService
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def storage_file_response(
+    request: Request,
+    file_service: FileService,
+    storage_path: str,
+    *,
+    media_type: Optional[str],
+    error_prefix: Optional[str] = None,
+    filename: Optional[str] = None,
+    redirect_status_code: int = 302,
+) -> Response:
+    """Serve ``storage_path`` without buffering it in API memory.
+
+    Local files go out through ``FileResponse`` (sendfile, Range, ETag); other
+    providers redirect to a presigned URL when they can, and otherwise stream
+    ``FileService.iter_file`` chunks with Range/ETag handled here. A matching
+    ``If-None-Match`` answers 304 on both direct paths.
+    """
+    local_path = file_service.get_local_path(storage_path)
+    if local_path and os.path.exists(local_path):
+        response = FileResponse(
+            path=local_path,
+            filename=filename,
+            media_type=media_type,
+            stat_result=os.stat(local_path),
+        )
+        if _not_modified(request, response.headers.get("etag")):
+            return _not_modified_response(response.headers)
+        return response
+
+    try:
+        url = file_service.get_presigned_url(storage_path)
+        return RedirectResponse(url=url, status_code=redirect_status_code)
+    except NotImplementedError:
+        pass
+
+    try:
+        info = file_service.get_file_info(storage_path) or {}
+    except Exception as e:
+        raise _download_failed(error_prefix, e) from e
+    response_headers = _validator_headers(info)
+    if filename:
+        response_headers["content-disposition"] = f'attachment; filename="{filename}"'
+    if _not_modified(request, info.get("etag")):
+        return _not_modified_response(response_headers)
+
+    status_code = 200
+    start, end = 0, None
+    if info.get("size") is not None:
+        size = int(info["size"])
+        response_headers["accept-ranges"] = "bytes"
+        byte_range = _requested_range(request, info.get("etag"), size)
+        if byte_range:
+            start, end = byte_range
+            status_code = 206
+            response_headers["content-range"] = f"bytes {start}-{end}/{size}"
+            response_headers["content-length"] = str(end - start + 1)
+        else:
+            response_headers["content-length"] = str(size)
+
+    try:
+        chunks = iter(file_service.iter_file(storage_path, start, end))
+        # Pull the first chunk now so a missing object is still a clean error.
+        first = next(chunks, b"")
+    except Exception as e:
+        raise _download_failed(error_prefix, e) from e
+    return StreamingResponse(
+        _chain(first, chunks),
+        status_code=status_code,
+        media_type=media_type,
+        headers=response_headers,
+    )
+
+
+def _download_failed(error_prefix: Optional[str], exc: Exception) -> HTTPException:
+    action = f"{error_prefix} download" if error_prefix else "Download"
+    return HTTPException(status_code=500, detail=f"{action} failed: {str(exc)}")
+
+
+def _chain(first: bytes, rest: Iterator[bytes]) -> Iterator[bytes]:
+    return itertools.chain((first,) if first else (), rest)
+
+
+def _validator_headers(info: Mapping[str, Any]) -> Dict[str, str]:
+    headers: Dict[str, str] = {}
+    if info.get("etag"):
+        headers["etag"] = str(info["etag"])
+    if info.get("last_modified") is not None:
+        headers["last-modified"] = formatdate(float(info["last_modified"]), usegmt=True)
+    return headers
+
+
+def _not_modified(request: Request, etag: Optional[str]) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match or not etag:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {_strip_weak(tag.strip()) for tag in if_none_match.split(",")}
+    return _strip_weak(etag) in candidates
+
+
+def _strip_weak(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def _not_modified_response(headers: Mapping[str, str]) -> Response:
+    keep = ("etag", "last-modified", "cache-control")
+    return Response(
+        status_code=304,
+        headers={key: value for key, value in headers.items() if key.lower() in keep},
+    )
+
+
+def _requested_range(
+    request: Request, etag: Optional[str], size: int
+) -> Optional[Tuple[int, int]]:
+    """Inclusive (start, end) of a single satisfiable Range, else None.
+
+    Multi-range and malformed headers are ignored and the full body is sent,
+    which RFC 9110 allows; a stale If-Range also falls back to the full body.
+    """
+    header = request.headers.get("range")
+    if not header:
+        return None
+    if_range = request.headers.get("if-range")
+    if if_range and if_range != etag:
+        return None
+    match = _RANGE_RE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        if last and int(last) < start:
+            return None
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        start, end = max(size - int(last), 0), size - 1
+    if start >= size:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
@@ -30,6 +30,14 @@ _SEARCH_INDEXER_AGE_FIELDS: Tuple[Tuple[str, str], ...] = (
     ("skipped", "last_skipped_age_seconds"),
     ("error", "last_error_age_seconds"),
 )
+_SEARCH_INDEXER_BULK_KINDS: Tuple[str, ...] = (
+    "batches",
+    "actions",
+    "indexed",
+    "deleted",
+    "failed",
+    "retries",
+)
 
 
 class _Registry:
@@ -136,7 +144,11 @@ def render_runtime_prometheus_text() -> str:
     from yuantus.integrations.athena import build_athena_breaker
     from yuantus.integrations.cad_ml import build_cad_ml_breaker
     from yuantus.integrations.dedup_vision import build_dedup_vision_breaker
+    from yuantus.integrations.http_pool import list_http_pools
     from yuantus.meta_engine.services import search_indexer
+    from yuantus.meta_engine.services.cad_artifact_cache_service import (
+        cad_artifact_cache_stats,
+    )
 
     # Pre-register Phase 6 breakers so a cold-scrape of /api/v1/metrics
     # emits the yuantus_circuit_breaker_* families even before any client
@@ -154,6 +166,10 @@ def render_runtime_prometheus_text() -> str:
             render_prometheus_text(),
             render_search_indexer_metrics(search_indexer.indexer_status()),
             render_circuit_breaker_metrics(breaker_statuses),
+            render_http_pool_metrics(
+                pool.status() for pool in list_http_pools().values()
+            ),
+            render_cad_artifact_cache_metrics(cad_artifact_cache_stats()),
         )
     )
 
@@ -250,6 +266,106 @@ def render_circuit_breaker_metrics(statuses: Iterable[Mapping[str, Any]]) -> str
     return "\n".join(lines) + "\n"
 
 
+def render_http_pool_metrics(statuses: Iterable[Mapping[str, Any]]) -> str:
+    """Render Prometheus text for the integration keep-alive client pools.
+
+    `statuses` is an iterable of `HttpClientPool.status()` snapshots; an empty
+    iterable produces empty output, like the circuit breaker section.
+    """
+    snapshots = sorted(
+        (dict(s) for s in statuses),
+        key=lambda s: str(s.get("name", "")),
+    )
+    if not snapshots:
+        return ""
+
+    fields: Tuple[Tuple[str, str, str, str], ...] = (
+        (
+            "yuantus_http_pool_connections",
+            "connections",
+            "gauge",
+            "Open connections held by the integration client pool",
+        ),
+        (
+            "yuantus_http_pool_idle_connections",
+            "idle_connections",
+            "gauge",
+            "Idle keep-alive connections in the integration client pool",
+        ),
+        (
+            "yuantus_http_pool_in_flight",
+            "in_flight",
+            "gauge",
+            "Outbound calls currently borrowing a pooled client",
+        ),
+        (
+            "yuantus_http_pool_requests_total",
+            "requests_total",
+            "counter",
+            "Outbound calls served from the integration client pool",
+        ),
+    )
+    lines: List[str] = []
+    for metric_name, field_name, metric_type, help_text in fields:
+        if lines:
+            lines.append("")
+        lines.append(f"# HELP {metric_name} {help_text}")
+        lines.append(f"# TYPE {metric_name} {metric_type}")
+        for snapshot in snapshots:
+            name = _escape(str(snapshot.get("name", "unknown")))
+            lines.append(
+                f'{metric_name}{{name="{name}"}} '
+                f"{_int_metric(snapshot.get(field_name))}"
+            )
+    return "\n".join(lines) + "\n"
+
+
+def render_cad_artifact_cache_metrics(stats: Mapping[str, Mapping[str, Any]]) -> str:
+    """Render Prometheus text for the CAD artifact cache counters.
+
+    `stats` maps task kind to its `cad_artifact_cache_stats()` counters; no
+    recorded activity produces empty output.
+    """
+    kinds = sorted(stats)
+    if not kinds:
+        return ""
+
+    fields: Tuple[Tuple[str, str, str], ...] = (
+        (
+            "yuantus_cad_artifact_cache_hits_total",
+            "hits",
+            "CAD pipeline runs served from the artifact cache",
+        ),
+        (
+            "yuantus_cad_artifact_cache_misses_total",
+            "misses",
+            "CAD pipeline runs that found no usable cached artifacts",
+        ),
+        (
+            "yuantus_cad_artifact_cache_stores_total",
+            "stores",
+            "Derived CAD artifacts recorded in the artifact cache",
+        ),
+        (
+            "yuantus_cad_artifact_cache_evictions_total",
+            "evictions",
+            "CAD artifact cache entries evicted to stay within bounds",
+        ),
+    )
+    lines: List[str] = []
+    for metric_name, field_name, help_text in fields:
+        if lines:
+            lines.append("")
+        lines.append(f"# HELP {metric_name} {help_text}")
+        lines.append(f"# TYPE {metric_name} counter")
+        for kind in kinds:
+            lines.append(
+                f'{metric_name}{{kind="{_escape(str(kind))}"}} '
+                f"{_int_metric(stats[kind].get(field_name))}"
+            )
+    return "\n".join(lines) + "\n"
+
+
 def render_search_indexer_metrics(status: Mapping[str, Any]) -> str:
     handlers = _status_handlers(status)
     health = str(status.get("health") or "unknown")
@@ -348,6 +464,32 @@ def render_search_indexer_metrics(status: Mapping[str, Any]) -> str:
                 *age_lines,
             ]
         )
+    bulk = _status_map(status, "bulk")
+    if bulk:
+        lines.extend(
+            [
+                "",
+                "# HELP yuantus_search_indexer_bulk_pending Search index actions buffered for _bulk",
+                "# TYPE yuantus_search_indexer_bulk_pending gauge",
+                f"yuantus_search_indexer_bulk_pending {_int_metric(bulk.get('pending'))}",
+                "",
+                "# HELP yuantus_search_indexer_bulk_total Search _bulk batches and action outcomes",
+                "# TYPE yuantus_search_indexer_bulk_total counter",
+            ]
+        )
+        for kind in _SEARCH_INDEXER_BULK_KINDS:
+            lines.append(
+                f'yuantus_search_indexer_bulk_total{{kind="{_escape(kind)}"}} '
+                f"{_int_metric(bulk.get(kind))}"
+            )
+        lines.extend(
+            [
+                "",
+                "# HELP yuantus_search_indexer_bulk_bytes_total Search _bulk request body bytes sent",
+                "# TYPE yuantus_search_indexer_bulk_bytes_total counter",
+                f"yuantus_search_indexer_bulk_bytes_total {_int_metric(bulk.get('bytes'))}",
+            ]
+        )
     return "\n".join(lines) + "\n"
 
 
@@ -4,7 +4,7 @@ import re
 import argparse
 from typing import Iterable
 
-from sqlalchemy import MetaData, create_engine, text
+from sqlalchemy import MetaData, Table, create_engine, text
 from sqlalchemy.pool import NullPool
 
 from yuantus.config import get_settings
@@ -87,9 +87,28 @@ def _copy_tables(source: MetaData, target: MetaData, *, exclude: Iterable[str])
         if name in excluded or name in target.tables:
             continue
         if hasattr(table, "to_metadata"):
-            table.to_metadata(target)
+            copied = table.to_metadata(target)
         else:  # SQLAlchemy < 1.4 compatibility.
-            table.tometadata(target)
+            copied = table.tometadata(target)
+        _copy_index_ddl_conditions(table, copied)
+
+
+def _copy_index_ddl_conditions(source: Table, copied: Table) -> None:
+    # Table.to_metadata() drops Index.ddl_if(); keep dialect-only indexes (e.g. the
+    # PostgreSQL GIN index on meta_item_search) from being emitted on SQLite.
+    conditions = {
+        index.name: index._ddl_if
+        for index in source.indexes
+        if getattr(index, "_ddl_if", None) is not None
+    }
+    for index in copied.indexes:
+        condition = conditions.get(index.name)
+        if condition is not None:
+            index.ddl_if(
+                dialect=condition.dialect,
+                callable_=condition.callable_,
+                state=condition.state,
+            )
 
 
 def build_combined_metadata() -> MetaData:
@@ -0,0 +1,196 @@
+"""
+Batched audit log writer.
+
+``AuditLogMiddleware`` hands each request's row to ``AuditLogSink.submit``;
+a background thread drains the bounded queue and bulk-inserts up to
+``AUDIT_ASYNC_BATCH_SIZE`` rows per identity-DB transaction, at least every
+``AUDIT_ASYNC_FLUSH_INTERVAL_MS``. Retention pruning runs on the writer thread
+after each batch (still throttled by ``AUDIT_RETENTION_PRUNE_INTERVAL_SECONDS``),
+so it never lands on a request. When the queue is full the caller writes its
+row synchronously: rows are never dropped. ``stop()`` drains what is queued.
+"""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from yuantus.config import get_settings
+from yuantus.models.audit import AuditLog
+from yuantus.security.audit_retention import maybe_prune_audit_logs
+from yuantus.security.auth.database import get_identity_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+AuditRow = Dict[str, Any]
+
+_STOP = object()
+
+
+def build_audit_row(**values: Any) -> AuditRow:
+    """Column values for one ``audit_logs`` row, with id/timestamp filled in."""
+    row: AuditRow = {"id": str(uuid.uuid4()), "created_at": datetime.utcnow()}
+    row.update(values)
+    return row
+
+
+def write_audit_rows(rows: List[AuditRow], *, prune: bool = True) -> None:
+    """Insert ``rows`` in one transaction, then apply retention per tenant."""
+    if not rows:
+        return
+    settings = get_settings()
+    db = get_identity_sessionmaker()()
+    try:
+        db.execute(AuditLog.__table__.insert(), rows)
+        db.commit()
+        if prune:
+            for tenant_id in dict.fromkeys(row.get("tenant_id") for row in rows):
+                maybe_prune_audit_logs(db, settings, tenant_id)
+    finally:
+        db.close()
+
+
+class AuditLogSink:
+    def __init__(
+        self,
+        *,
+        queue_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+    ):
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(flush_interval, 0.0)
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(queue_size, 1))
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stats = {"queued": 0, "written": 0, "batches": 0, "sync_writes": 0, "failed": 0}
+
+    # ========== Producer side ==========
+
+    def submit(self, row: AuditRow) -> None:
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(row)
+            with self._lock:
+                self._stats["queued"] += 1
+            return
+        except queue.Full:
+            logger.warning("Audit queue full; writing audit row synchronously")
+        with self._lock:
+            self._stats["sync_writes"] += 1
+        write_audit_rows([row], prune=False)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "pending": self._queue.qsize()}
+
+    # ========== Lifecycle ==========
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="AuditLogSink", daemon=True
+            )
+            self._thread.start()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued row was written (or failed)."""
+        q = self._queue
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with q.all_tasks_done:
+            while q.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                q.all_tasks_done.wait(remaining)
+        return True
+
+    def stop(self, timeout: Optional[float] = 10.0) -> None:
+        """Write what is queued, then stop the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+
+    # ========== Writer thread ==========
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                self._queue.task_done()
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    entry = (
+                        self._queue.get(timeout=remaining)
+                        if remaining > 0
+                        else self._queue.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(entry)
+            try:
+                self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, batch: List[AuditRow]) -> None:
+        try:
+            write_audit_rows(batch)
+        except Exception:
+            # Never let audit failures take the writer down; the rows are lost.
+            logger.exception("Audit batch of %s row(s) failed", len(batch))
+            with self._lock:
+                self._stats["failed"] += len(batch)
+            return
+        with self._lock:
+            self._stats["written"] += len(batch)
+            self._stats["batches"] += 1
+
+
+_SINK: Optional[AuditLogSink] = None
+_SINK_LOCK = threading.Lock()
+
+
+def get_audit_sink() -> AuditLogSink:
+    global _SINK
+    if _SINK is None:
+        with _SINK_LOCK:
+            if _SINK is None:
+                settings = get_settings()
+                _SINK = AuditLogSink(
+                    queue_size=settings.AUDIT_ASYNC_QUEUE_SIZE,
+                    batch_size=settings.AUDIT_ASYNC_BATCH_SIZE,
+                    flush_interval=settings.AUDIT_ASYNC_FLUSH_INTERVAL_MS / 1000.0,
+                )
+    return _SINK
+
+
+def shutdown_audit_sink(timeout: Optional[float] = 10.0) -> None:
+    if _SINK is not None:
+        _SINK.stop(timeout)
+
+
+atexit.register(shutdown_audit_sink)
@@ -0,0 +1,211 @@
+"""
+Resolved-principal cache for ``AuthEnforcementMiddleware``.
+
+A principal is the identity-DB view of a token: the active ``AuthUser`` and,
+for org-scoped requests, the roles of its active ``OrgMembership``. Entries are
+keyed by (tenant, org, user, token ``iat``), expire after
+``AUTH_PRINCIPAL_CACHE_TTL_SECONDS`` and are evicted LRU beyond
+``AUTH_PRINCIPAL_CACHE_MAX_ENTRIES``. A flush hook drops a user's entries as
+soon as its ``AuthUser`` or any of its memberships is written in this process;
+other processes see the change after at most one TTL.
+
+The middleware stores the principal on ``request.state.principal`` so the auth
+dependencies reuse it instead of querying the identity DB again.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Hashable, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from yuantus.config import get_settings
+from yuantus.security.auth.models import AuthUser, OrgMembership
+from yuantus.security.auth.service import AuthService
+
+PrincipalKey = Tuple[str, Optional[str], int, Optional[Hashable]]
+
+_REGISTER_LOCK = threading.Lock()
+_REGISTERED = False
+
+
+@dataclass(frozen=True)
+class Principal:
+    tenant_id: str
+    user_id: int
+    org_id: Optional[str]
+    username: str
+    email: Optional[str]
+    is_superuser: bool
+    # None for tenant-only requests, where no org membership was checked.
+    roles: Optional[Tuple[str, ...]] = None
+
+
+class PrincipalUnavailable(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+def load_principal(
+    db: Session, *, tenant_id: str, user_id: int, org_id: Optional[str]
+) -> Principal:
+    """Resolve from the identity DB; ``org_id=None`` skips the membership check."""
+    user = (
+        db.query(AuthUser)
+        .filter(AuthUser.id == user_id, AuthUser.tenant_id == tenant_id)
+        .first()
+    )
+    if not user or not user.is_active:
+        raise PrincipalUnavailable(401, "User not found or inactive")
+
+    roles: Optional[Tuple[str, ...]] = None
+    if org_id is not None:
+        try:
+            roles = tuple(
+                AuthService(db).get_roles_for_user_org(
+                    tenant_id=tenant_id, org_id=org_id, user_id=user_id
+                )
+            )
+        except Exception:
+            raise PrincipalUnavailable(403, "Not a member of this org")
+
+    return Principal(
+        tenant_id=tenant_id,
+        user_id=user.id,
+        org_id=org_id,
+        username=user.username,
+        email=user.email,
+        is_superuser=bool(user.is_superuser),
+        roles=roles,
+    )
+
+
+class PrincipalCache:
+    def __init__(self, *, ttl_seconds: float, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[PrincipalKey, Tuple[float, Principal]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get(self, key: PrincipalKey) -> Optional[Principal]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, principal = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return principal
+
+    def put(self, key: PrincipalKey, principal: Principal) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, principal)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, tenant_id: Optional[str], user_id: int) -> None:
+        with self._lock:
+            for key in [
+                k
+                for k in self._entries
+                if k[2] == user_id and (tenant_id is None or k[0] == tenant_id)
+            ]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+_CACHE: Optional[PrincipalCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_principal_cache() -> PrincipalCache:
+    global _CACHE
+    settings = get_settings()
+    ttl = max(0, int(settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS or 0))
+    with _CACHE_LOCK:
+        if _CACHE is None or _CACHE.ttl_seconds != ttl:
+            _CACHE = PrincipalCache(
+                ttl_seconds=ttl,
+                max_entries=int(settings.AUTH_PRINCIPAL_CACHE_MAX_ENTRIES or 1),
+            )
+        return _CACHE
+
+
+# ========== Session hook ==========
+
+
+def _touched_users(session: Session) -> Set[Tuple[Optional[str], int]]:
+    touched: Set[Tuple[Optional[str], int]] = set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, AuthUser) and obj.id is not None:
+            touched.add((obj.tenant_id, obj.id))
+        elif isinstance(obj, OrgMembership) and obj.user_id is not None:
+            touched.add((obj.tenant_id, obj.user_id))
+    return touched
+
+
+_TOUCHED_KEY = "auth_principal_cache_touched"
+
+
+def _after_flush(session: Session, flush_context) -> None:  # type: ignore[no-untyped-def]
+    if _CACHE is None:
+        return
+    touched = _touched_users(session)
+    if not touched:
+        return
+    for tenant_id, user_id in touched:
+        _CACHE.invalidate_user(tenant_id, user_id)
+    # Again at commit: a request may re-cache the pre-commit rows meanwhile.
+    session.info.setdefault(_TOUCHED_KEY, set()).update(touched)
+
+
+def _after_commit(session: Session) -> None:
+    touched = session.info.pop(_TOUCHED_KEY, None)
+    if touched and _CACHE is not None:
+        for tenant_id, user_id in touched:
+            _CACHE.invalidate_user(tenant_id, user_id)
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_TOUCHED_KEY, None)
+
+
+def register_session_hooks() -> None:
+    global _REGISTERED
+    if _REGISTERED:
+        return
+    with _REGISTER_LOCK:
+        if _REGISTERED:
+            return
+        event.listen(Session, "after_flush", _after_flush)
+        event.listen(Session, "after_commit", _after_commit)
+        event.listen(Session, "after_rollback", _after_rollback)
+        _REGISTERED = True
+
+
+register_session_hooks()